@@ -0,0 +1,104 @@
+"""
+ソース横断の商品集約
+
+全スクレイパーの抽選・予約情報を正規化した商品キーで束ね、
+店舗ごとのオファー（抽選/予約の受付情報）を持つ商品ビューを作成する。
+キーはハッシュで引くため、件数に対してほぼ線形で集約できる。
+"""
+from typing import Any, Dict, List, Optional
+
+from catalog import classify, normalize
+
+
+def product_key(name: str) -> Optional[str]:
+    """商品名から正規化済みの商品キーを作成
+
+    カタログでセット名が分かる場合は「セット名|形態」、分からない場合は
+    正規化済みの商品名そのものをキーにする。
+
+    Args:
+        name: 商品名
+
+    Returns:
+        商品キー（商品名が空の場合はNone）
+    """
+    normalized = normalize(name)
+    if not normalized:
+        return None
+
+    info = classify(name)
+    if info['set'] is None:
+        return f'name:{normalized}'
+
+    return f"set:{info['set']['name']}|{info['form'] or 'other'}"
+
+
+def _build_offer(item: Dict[str, Any], source_name: str, kind: str) -> Dict[str, Any]:
+    """抽選・予約アイテムから店舗オファーを作成"""
+    return {
+        'kind': kind,
+        'store': item.get('store', '') or source_name,
+        'source': source_name,
+        'price': item.get('price', ''),
+        'status': item.get('status', '') or item.get('availability', ''),
+        'url': item.get('detail_url', '') or item.get('url', ''),
+        'end_date': item.get('end_date', ''),
+        'timestamp': item.get('timestamp', '') or item.get('detected_at', ''),
+    }
+
+
+def build_product_view(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """全ソースの抽選・予約情報を商品単位に集約
+
+    Args:
+        sources: all_lotteries.json の sources 相当のリスト
+
+    Returns:
+        商品リスト（各商品に店舗ごとのオファーを保持、オファー数の多い順）
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+
+    for source in sources:
+        source_name = source.get('source', '')
+        for kind, items, name_field in (
+            ('lottery', source.get('lotteries', []), 'product'),
+            ('reservation', source.get('reservations', []), 'title'),
+        ):
+            for item in items:
+                name = item.get(name_field, '') or item.get('product', '') or item.get('title', '')
+                key = product_key(name)
+                if key is None:
+                    continue
+
+                product = index.get(key)
+                if product is None:
+                    set_name, _, form = key[4:].partition('|') if key.startswith('set:') else ('', '', '')
+                    product = {
+                        'key': key,
+                        'name': name,
+                        'set_name': set_name,
+                        'form': form,
+                        'offers': [],
+                        '_seen': set(),
+                    }
+                    index[key] = product
+                elif len(name) < len(product['name']):
+                    # 表示名は最も簡潔な表記を採用
+                    product['name'] = name
+
+                offer = _build_offer(item, source_name, kind)
+                offer_key = (offer['store'], offer['url'], kind)
+                if offer_key in product['_seen']:
+                    continue
+                product['_seen'].add(offer_key)
+                product['offers'].append(offer)
+
+    products = []
+    for product in index.values():
+        del product['_seen']
+        product['stores'] = sorted({offer['store'] for offer in product['offers'] if offer['store']})
+        product['offer_count'] = len(product['offers'])
+        products.append(product)
+
+    products.sort(key=lambda p: (-p['offer_count'], p['name']))
+    return products
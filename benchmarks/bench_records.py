@@ -0,0 +1,83 @@
+"""
+アイテム表現のメモリ使用量ベンチマーク
+
+合成した抽選情報を、スクレイパーが返す辞書のまま保持した場合と
+records.LotteryRecord（__slots__ + 文字列インターン）に変換した場合で
+tracemalloc の確保量を比較する。あわせて JSON 変換（to_dict / from_dict）の時間を計測する。
+
+使い方:
+    python benchmarks/bench_records.py [--items 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import LotteryRecord  # noqa: E402
+
+STORES = ['ポケモンセンターオンライン', 'ヨドバシカメラ', 'ビックカメラ', 'Amazon', '楽天ブックス', 'セブンネット']
+SOURCES = ['pokemon_center', 'yodobashi', 'biccamera', 'amazon', 'rakuten', 'seven_net']
+TYPES = ['抽選', '先着', '予約']
+
+
+def synthetic_items(count: int):
+    """スクレイパーの出力に近い辞書を生成（店舗名等はパースごとに別オブジェクト）"""
+    for i in range(count):
+        n = i % len(STORES)
+        yield {
+            # ''.join でパース結果と同様にインターンされていない文字列にする
+            'product': f'ポケモンカードゲーム 拡張パック{i} BOX',
+            'store': ''.join(STORES[n]),
+            'source': ''.join(SOURCES[n]),
+            'lottery_type': ''.join(TYPES[i % len(TYPES)]),
+            'start_date': '2026-05-01',
+            'end_date': f'2026-05-{1 + i % 28:02d}',
+            'detail_url': f'https://example.com/lottery/{i}',
+            'price': '5,400円',
+            'status': ''.join('active'),
+            'timestamp': '2026-05-01T10:00:00',
+        }
+
+
+def measure(build) -> tuple:
+    """build() が確保したメモリ（バイト）と所要時間を計測"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='アイテム表現のメモリ使用量ベンチマーク')
+    parser.add_argument('--items', type=int, default=100_000, help='合成アイテム数')
+    args = parser.parse_args()
+
+    dicts, dict_bytes, _ = measure(lambda: list(synthetic_items(args.items)))
+    del dicts
+    records, record_bytes, _ = measure(lambda: [LotteryRecord.from_dict(item) for item in synthetic_items(args.items)])
+
+    print(f"items: {args.items:,}")
+    print(f"{'dict':>8}: {dict_bytes / 1e6:8.1f} MB ({dict_bytes / args.items:6.0f} B/item)")
+    print(f"{'record':>8}: {record_bytes / 1e6:8.1f} MB ({record_bytes / args.items:6.0f} B/item)")
+    print(f"削減率: {(1 - record_bytes / dict_bytes) * 100:.1f}%")
+
+    start = time.perf_counter()
+    dumped = [record.to_dict() for record in records]
+    to_dict_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    [LotteryRecord.from_dict(item) for item in dumped]
+    from_dict_ms = (time.perf_counter() - start) * 1000
+    print(f"to_dict: {to_dict_ms:.0f} ms / from_dict: {from_dict_ms:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
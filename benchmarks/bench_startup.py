@@ -0,0 +1,86 @@
+"""
+main.py 起動時間ベンチマーク
+
+`python -X importtime` で `import main` の import 時間を計測し、
+累積時間の大きいモジュールを表示する。あわせて `main.py --dry-run` の
+実行時間（設定検証のみ、スクレイパーはimportしない）を計測する。
+
+使い方:
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--max-ms 500]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 起動時に読み込まれてはいけない重い依存
+HEAVY_MODULES = ('bs4', 'requests', 'tweepy', 'playwright')
+
+
+def parse_importtime(stderr: str) -> dict:
+    """-X importtime の出力を {モジュール名: 累積マイクロ秒} に変換"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            _, cum, name = line[len('import time:'):].split('|')
+            cumulative[name.strip()] = int(cum)
+        except ValueError:
+            continue
+    return cumulative
+
+
+def measure_import() -> dict:
+    """import main の import 時間を1回計測"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_dry_run() -> float:
+    """main.py --dry-run の実行時間（ミリ秒）を1回計測"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', '--dry-run'], cwd=ROOT, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='main.py 起動時間ベンチマーク')
+    parser.add_argument('--runs', type=int, default=5, help='計測回数（中央値を表示）')
+    parser.add_argument('--top', type=int, default=15, help='表示するモジュール数')
+    parser.add_argument('--max-ms', type=float, default=None, help='import main の上限（超えたら終了コード1）')
+    args = parser.parse_args()
+
+    samples = [measure_import() for _ in range(args.runs)]
+    totals = [sample.get('main', 0) / 1000 for sample in samples]
+    last = samples[-1]
+
+    print(f"import main: median {statistics.median(totals):.1f} ms ({args.runs} runs)")
+    print(f"{'cumulative(ms)':>15}  module")
+    top_level = {name: us for name, us in last.items() if '.' not in name}
+    for name, us in sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"{us / 1000:>15.1f}  {name}")
+
+    dry_runs = [measure_dry_run() for _ in range(args.runs)]
+    print(f"main.py --dry-run: median {statistics.median(dry_runs):.1f} ms")
+
+    status = 0
+    loaded_heavy = [name for name in HEAVY_MODULES if name in last]
+    if loaded_heavy:
+        print(f"✗ 起動時に重い依存が読み込まれています: {', '.join(loaded_heavy)}")
+        status = 1
+    if args.max_ms is not None and statistics.median(totals) > args.max_ms:
+        print(f"✗ import main が上限 {args.max_ms:.0f} ms を超えています")
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
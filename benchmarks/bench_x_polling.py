@@ -0,0 +1,66 @@
+"""
+X(Twitter) ポーリングのベンチマーク（ローカル偽APIサーバー使用）
+
+tests/fake_x_api.py の偽サーバーに監視対象アカウント分のツイートを用意し、
+初回（期間指定で全件取得）と2回目以降（since_id で新着のみ取得）の
+API呼び出し回数・所要時間・次回へ回したアカウント数を計測する。
+
+使い方:
+    python benchmarks/bench_x_polling.py [--tweets 100] [--latency 0.05] [--tweets-limit 4]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.x_api import USER_LOOKUP, USER_TWEETS  # noqa: E402
+from scrapers.x_lottery_scraper import XLotteryScraper  # noqa: E402
+from tests.fake_x_api import FakeXApi  # noqa: E402
+
+
+def run(api, scraper, label):
+    before = dict(api.calls)
+    start = time.perf_counter()
+    data = scraper.scrape()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with open(scraper.state_file, encoding='utf-8') as f:
+        state = json.load(f)
+    checkpointed = sum(1 for entry in state['accounts'].values() if entry.get('since_id'))
+    print(f"{label:<10} {elapsed:8.1f} ms  lookups={api.calls[USER_LOOKUP] - before[USER_LOOKUP]:<3} "
+          f"timelines={api.calls[USER_TWEETS] - before[USER_TWEETS]:<3} "
+          f"lotteries={len(data['lotteries']):<4} checkpointed={checkpointed}/{len(scraper.target_accounts)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='X ポーリングのベンチマーク')
+    parser.add_argument('--tweets', type=int, default=100, help='アカウントあたりの既存ツイート数')
+    parser.add_argument('--latency', type=float, default=0.05, help='偽サーバーの応答遅延（秒）')
+    parser.add_argument('--tweets-limit', type=int, default=900, help='タイムライン取得の上限回数')
+    args = parser.parse_args()
+
+    with FakeXApi(limits={USER_TWEETS: args.tweets_limit}, latency=args.latency) as api, \
+            tempfile.TemporaryDirectory() as tmp:
+        with patch.dict(os.environ, {'X_BEARER_TOKEN': 'bench', 'X_API_BASE_URL': api.base_url}):
+            scraper = XLotteryScraper()
+        scraper.state_file = os.path.join(tmp, 'x_state.json')
+
+        for account in scraper.target_accounts:
+            for i in range(args.tweets):
+                text = f'ポケモンカード【テラスタルフェスex BOX {i}】抽選受付開始' if i % 10 == 0 else f'お知らせ {i}'
+                api.add_tweet(account, text, days_ago=(args.tweets - i) % 6)
+
+        run(api, scraper, 'initial')
+        for account in scraper.target_accounts[:2]:
+            api.add_tweet(account, 'ポケカ【バトルパートナーズ BOX】予約受付中')
+        run(api, scraper, 'increment')
+        run(api, scraper, 'idle')
+
+
+if __name__ == '__main__':
+    main()
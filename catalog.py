@@ -0,0 +1,227 @@
+"""
+ポケモンカード商品カタログ
+
+セット名・商品形態（BOX/パック/デッキ）・発売日・JANコードを一元管理し、
+Aho-Corasick オートマトンで商品タイトルを1パスで分類する。
+ポケカ判定（スクレイパー/main.py のフィルタ）と商品集約はすべてこのモジュールを参照する。
+"""
+import re
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# セット情報（発売日は公式発表で確認できたもののみ、JANコードは判明分のみ登録）
+SETS: List[Dict[str, Any]] = [
+    {'name': 'スカーレットex', 'aliases': [], 'series': 'SV', 'release_date': '2023-01-20', 'jan': {}},
+    {'name': 'バイオレットex', 'aliases': [], 'series': 'SV', 'release_date': '2023-01-20', 'jan': {}},
+    {'name': 'トリプレットビート', 'aliases': [], 'series': 'SV', 'release_date': '2023-03-10', 'jan': {}},
+    {'name': 'スノーハザード', 'aliases': [], 'series': 'SV', 'release_date': '2023-04-14', 'jan': {}},
+    {'name': 'クレイバースト', 'aliases': [], 'series': 'SV', 'release_date': '2023-04-14', 'jan': {}},
+    {'name': 'ポケモンカード151', 'aliases': ['ポケカ151'], 'series': 'SV', 'release_date': '2023-06-16', 'jan': {}},
+    {'name': '黒炎の支配者', 'aliases': [], 'series': 'SV', 'release_date': '2023-07-28', 'jan': {}},
+    {'name': 'レイジングサーフ', 'aliases': [], 'series': 'SV', 'release_date': '2023-09-22', 'jan': {}},
+    {'name': '古代の咆哮', 'aliases': [], 'series': 'SV', 'release_date': '2023-10-27', 'jan': {}},
+    {'name': '未来の一閃', 'aliases': [], 'series': 'SV', 'release_date': '2023-10-27', 'jan': {}},
+    {'name': 'シャイニートレジャーex', 'aliases': ['シャイニートレジャー'], 'series': 'SV', 'release_date': '2023-12-01', 'jan': {}},
+    {'name': 'ワイルドフォース', 'aliases': [], 'series': 'SV', 'release_date': '2024-01-26', 'jan': {}},
+    {'name': 'サイバージャッジ', 'aliases': [], 'series': 'SV', 'release_date': '2024-01-26', 'jan': {}},
+    {'name': 'クリムゾンヘイズ', 'aliases': [], 'series': 'SV', 'release_date': '2024-03-22', 'jan': {}},
+    {'name': '変幻の仮面', 'aliases': [], 'series': 'SV', 'release_date': '2024-04-26', 'jan': {}},
+    {'name': 'ナイトワンダラー', 'aliases': [], 'series': 'SV', 'release_date': '2024-06-07', 'jan': {}},
+    {'name': 'ステラミラクル', 'aliases': [], 'series': 'SV', 'release_date': '2024-07-19', 'jan': {}},
+    {'name': '楽園ドラゴーナ', 'aliases': [], 'series': 'SV', 'release_date': '2024-09-13', 'jan': {}},
+    {'name': '超電ブレイカー', 'aliases': [], 'series': 'SV', 'release_date': '2024-10-18', 'jan': {}},
+    {'name': 'テラスタルフェスex', 'aliases': [], 'series': 'SV', 'release_date': '2024-12-06', 'jan': {}},
+    {'name': 'バトルパートナーズ', 'aliases': [], 'series': 'SV', 'release_date': '2025-01-24', 'jan': {}},
+    {'name': '熱風のアリーナ', 'aliases': [], 'series': 'SV', 'release_date': '2025-03-14', 'jan': {}},
+    {'name': 'ロケット団の栄光', 'aliases': [], 'series': 'SV', 'release_date': '2025-04-18', 'jan': {}},
+    {'name': 'ブラックボルト', 'aliases': [], 'series': 'SV', 'release_date': '2025-06-06', 'jan': {}},
+    {'name': 'ホワイトフレア', 'aliases': [], 'series': 'SV', 'release_date': '2025-06-06', 'jan': {}},
+    {'name': 'メガブレイブ', 'aliases': [], 'series': 'MEGA', 'release_date': '2025-08-01', 'jan': {}},
+    {'name': 'メガシンフォニア', 'aliases': [], 'series': 'MEGA', 'release_date': '2025-08-01', 'jan': {}},
+    {'name': 'インフェルノX', 'aliases': [], 'series': 'MEGA', 'release_date': None, 'jan': {}},
+    {'name': 'MEGAドリームex', 'aliases': ['MEGAドリーム'], 'series': 'MEGA', 'release_date': None, 'jan': {}},
+    {'name': 'ムニキスゼロ', 'aliases': [], 'series': 'MEGA', 'release_date': None, 'jan': {}},
+]
+
+# 商品形態（優先順: BOX > デッキ > セット > パック）
+FORMS: List[Tuple[str, List[str]]] = [
+    ('box', ['BOX', 'ボックス']),
+    ('deck', ['デッキ', 'deck']),
+    ('set', ['セット', 'set']),
+    ('pack', ['パック', 'pack']),
+]
+
+# ポケモンカード商品を示す語（main.py のフィルタで使用する厳密な判定）
+CARD_TERMS = [
+    'ポケモンカード', 'ポケカ', 'pokemon card', 'pokemon tcg', 'ポケモン カード', 'ポケモンtcg',
+    'プロモカード', 'ポケセン', 'トレカ',
+]
+
+# シリーズ名（セット名より広い表記）
+SERIES_TERMS = ['スカーレット', 'バイオレット', 'テラスタル', 'バトルマスター']
+
+# スクレイパーでの一次判定に使う広めの語
+BROAD_TERMS = ['ポケモン', 'pokemon', 'TCG', 'ロケット団', 'メガエルレイド']
+
+# 抽選・予約を示す語（Playwright系スクレイパーは抽選ページ内の候補判定に併用）
+LOTTERY_TERMS = ['抽選', '予約']
+
+# 除外キーワード（ポケモンカード以外の商品を除外）
+EXCLUDE_TERMS = [
+    'ぬいぐるみ', 'フィギュア', 'ギフト', 'Tシャツ', 'アパレル',
+    'ハイキュー', '一番くじ', 'グッズセット', 'ミスド', 'クッション',
+    'タオル', 'バッグ', 'ポーチ', '母の日', 'スリッパ', 'パジャマ',
+    'キーホルダー', 'ストラップ', 'マグカップ', 'お菓子', 'お弁当',
+]
+
+# 正規化時に除去する記号・空白
+_NOISE_RE = re.compile(r'[\s　・/／\-‐―－~〜～「」『』【】\[\]()（）<>＜＞!！?？、。,.:：;；"\'`]+')
+_JAN_RE = re.compile(r'(?<!\d)(\d{13})(?!\d)')
+
+
+def normalize(text: Optional[str]) -> str:
+    """NFKC正規化（全角英数・半角カナの幅を統一）+ 小文字化 + 記号・空白除去"""
+    if not text:
+        return ''
+    return _NOISE_RE.sub('', unicodedata.normalize('NFKC', text).lower())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick オートマトン（全パターンを1パスで検出）"""
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: str, value: Any) -> None:
+        """パターン（正規化済み）と対応する値を登録"""
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._output[node].append((len(pattern), value))
+
+    def build(self) -> 'KeywordAutomaton':
+        """失敗遷移を構築"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(開始位置, 長さ, 値) を出現順に返す"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._output[node]:
+                yield i - length + 1, length, value
+
+
+def _build_automaton() -> KeywordAutomaton:
+    automaton = KeywordAutomaton()
+    for entry in SETS:
+        for term in [entry['name']] + entry['aliases']:
+            automaton.add(normalize(term), ('set', entry))
+    for form, terms in FORMS:
+        for term in terms:
+            automaton.add(normalize(term), ('form', form))
+    for tag, terms in (('card', CARD_TERMS), ('series', SERIES_TERMS), ('broad', BROAD_TERMS),
+                       ('lottery', LOTTERY_TERMS), ('exclude', EXCLUDE_TERMS)):
+        for term in terms:
+            automaton.add(normalize(term), (tag, term))
+    return automaton.build()
+
+
+_AUTOMATON = _build_automaton()
+_FORM_PRIORITY = {form: i for i, (form, _) in enumerate(FORMS)}
+_JAN_INDEX = {code: (entry, form) for entry in SETS for form, code in entry['jan'].items()}
+
+# ポケカ判定で採用するタグ
+STRICT_TAGS = frozenset({'card', 'series', 'set'})
+BROAD_TAGS = STRICT_TAGS | {'broad'}
+
+
+def classify(text: Optional[str]) -> Dict[str, Any]:
+    """商品タイトルを1パスで分類
+
+    Args:
+        text: 商品タイトル等
+
+    Returns:
+        {'set': セット情報（最長一致、なければNone）, 'form': 商品形態またはNone,
+         'tags': 一致したタグの集合, 'excluded': 除外キーワードに一致したか}
+    """
+    result = {'set': None, 'form': None, 'tags': set(), 'excluded': False}
+    if not text:
+        return result
+
+    set_length = 0
+    for _, length, (tag, value) in _AUTOMATON.iter_matches(normalize(text)):
+        result['tags'].add(tag)
+        if tag == 'set' and length > set_length:
+            result['set'], set_length = value, length
+        elif tag == 'form':
+            if result['form'] is None or _FORM_PRIORITY[value] < _FORM_PRIORITY[result['form']]:
+                result['form'] = value
+
+    result['excluded'] = 'exclude' in result['tags']
+
+    # JANコードが記載されていればカタログを優先
+    if _JAN_INDEX:
+        for code in _JAN_RE.findall(text):
+            if code in _JAN_INDEX:
+                result['set'], result['form'] = _JAN_INDEX[code]
+                result['tags'].add('set')
+                break
+
+    return result
+
+
+def is_pokemon_card(text: Optional[str], broad: bool = False, extra_tags: Iterable[str] = ()) -> bool:
+    """ポケモンカード関連か判定
+
+    Args:
+        text: 判定対象テキスト
+        broad: True の場合「ポケモン」「TCG」等の広い語も採用（スクレイパーでの一次判定用）
+        extra_tags: 追加で採用するタグ（例: 'lottery'）
+
+    Returns:
+        関連していればTrue
+    """
+    if not text:
+        return False
+    accepted = (BROAD_TAGS if broad else STRICT_TAGS) | set(extra_tags)
+    return any(tag in accepted for _, _, (tag, _) in _AUTOMATON.iter_matches(normalize(text)))
+
+
+def lookup(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """商品タイトルに対応するカタログのセット情報を返す（なければNone）"""
+    return classify(text)['set']
+
+
+def keywords(broad: bool = False) -> List[str]:
+    """判定に使われるキーワード一覧（表示・ログ用）"""
+    terms = list(CARD_TERMS) + list(SERIES_TERMS)
+    terms += [term for entry in SETS for term in [entry['name']] + entry['aliases']]
+    if broad:
+        terms += BROAD_TERMS
+    return terms
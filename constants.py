@@ -3,27 +3,6 @@
 全scraperで共通して使用する定数を集約
 """
 
-# ポケモンカード関連キーワード
-POKEMON_KEYWORDS = [
-    'ポケモンカード', 'ポケカ', 'pokemon card', 'pokemon tcg',
-    'ポケモン カード', 'ポケモンtcg',
-    'スカーレット', 'バイオレット', 'テラスタル',
-    'バトルマスター', 'シャイニートレジャー',
-    'サイバージャッジ', 'ワイルドフォース',
-    'クリムゾンヘイズ', 'ステラミラクル',
-    'レイジングサーフ', 'ナイトワンダラー',
-    '変幻の仮面', 'プロモカード',
-    'ポケセン', 'トレカ',
-]
-
-# 除外キーワード（ポケモンカード以外の商品を除外）
-EXCLUDE_KEYWORDS = [
-    'ぬいぐるみ', 'フィギュア', 'ギフト', 'Tシャツ', 'アパレル',
-    'ハイキュー', '一番くじ', 'グッズセット', 'ミスド', 'クッション',
-    'タオル', 'バッグ', 'ポーチ', '母の日', 'スリッパ', 'パジャマ',
-    'キーホルダー', 'ストラップ', 'マグカップ', 'お菓子', 'お弁当',
-]
-
 # User-Agent リスト（Playwright用、2026年4月最新版Chrome/Firefox対応）
 USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36',
@@ -53,3 +32,84 @@ DEFAULT_NAVIGATION_TIMEOUT = 45000  # ナビゲーション: 45秒
 
 # リトライ設定
 DEFAULT_MAX_RETRIES = 2  # Playwright/requests のリトライ回数
+
+# ホストごとの同時ページ取得数の初期値（host_control で自動調整）
+DEFAULT_PAGE_CONCURRENCY = 3
+
+# Playwright ストレージ状態（Cookie/localStorage）の保存先と有効期限
+STORAGE_STATE_DIR = '.cache/playwright_state'
+STORAGE_STATE_TTL_HOURS = 12
+
+# 常駐モードのHTML解析プロセスプールのワーカー数（環境変数 PARSE_WORKERS で上書き、1以下で無効）
+DEFAULT_PARSE_WORKERS = 2
+
+# X(Twitter) の取得状態（since_id・ユーザーIDキャッシュ）と抽出済み抽選情報の保持期間
+X_STATE_FILE = 'data/x_state.json'
+X_RETENTION_DAYS = 7
+X_ACCOUNT_CONCURRENCY = 3  # アカウントの同時取得数
+
+# スクレイパーの種類別の同時実行数（環境変数 CONCURRENCY_BROWSER / _HTTP / _API で上書き）
+# browser は Chromium を起動するため、2コアのランナーでも詰まらない数にする
+SCRAPER_CONCURRENCY = {'browser': 2, 'http': 8, 'api': 2}
+
+# 統合データの保存先
+ALL_LOTTERIES_FILE = 'data/all_lotteries.json'
+
+# 分割実行（main.py --shard）の部分結果の保存先と、シャード割り当てに使う実行時間の履歴
+SHARD_DIR = 'data/shards'
+SCRAPER_COSTS_FILE = 'data/scraper_costs.json'
+
+# --merge（パス省略時）で同じ実行とみなすシャード結果の開始時刻の幅（分）
+# 最新のシャード結果と分割数が違うもの・これより古いものは以前の実行の残りとして無視する
+SHARD_RUN_WINDOW_MINUTES = 60
+
+# 常駐モード（main.py --watch）の既定の実行間隔（分）と、期限・設定変更の確認間隔（秒）
+WATCH_INTERVAL_MINUTES = 30
+WATCH_POLL_SECONDS = 5
+
+# 実行時間の上限（秒）。ワークフローは10分でステップを強制終了するため、
+# 保存・URL検証・通知の時間を残して打ち切る。スクレイパー別は timeout_seconds で指定
+RUN_DEADLINE_SECONDS = 480
+DEFAULT_SCRAPER_TIMEOUT_SECONDS = 300
+
+# ソースごとの取得状態（サーキットブレーカー）。連続失敗でソースを停止し、
+# 停止時間は停止のたびに倍（上限あり）。再試行は短い制限時間で1回だけ行う
+SOURCE_HEALTH_FILE = 'data/source_health.json'
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_HOURS = 6
+BREAKER_MAX_COOLDOWN_HOURS = 72
+BREAKER_PROBE_TIMEOUT_SECONDS = 60
+
+# 実行全体の再試行回数の上限（retry モジュールのポリシー別）。
+# 障害で全ソースが失敗しても再試行の待ち時間で実行時間を使い切らないようにする
+RETRY_BUDGETS = {'http': 40, 'browser': 8, 'api': 6, 'smtp': 2}
+
+# ホストごとの同時リクエスト数の自動調整（host_control、AIMD）。
+# 初期値は DEFAULT_PAGE_CONCURRENCY、学習結果は HOST_LIMITS_FILE に保存して次回に引き継ぐ
+HOST_LIMITS_FILE = 'data/host_limits.json'
+HOST_CONCURRENCY_MAX = 8
+HOST_DECREASE_FACTOR = 0.5  # 429/403/5xx 時の倍率
+HOST_LATENCY_FACTOR = 2.0  # 基準レイテンシの何倍までを健全とみなすか
+HOST_DECREASE_COOLDOWN_SECONDS = 10
+
+# 事前プローブ（設定の probe）。ブラウザ描画の前に HTTP で軽く取得して前回の指紋と比べ、
+# 変化がなければ前回データを再利用する。PROBE_MAX_STALE_HOURS を超えたら変化がなくても描画する
+PROBE_STATE_FILE = 'data/probe_state.json'
+PROBE_TIMEOUT_SECONDS = 10
+PROBE_MAX_STALE_HOURS = 24
+
+# ネットワークキャプチャ（PlaywrightBaseScraper.API_CAPTURE）。描画中の JSON 応答から一覧の
+# エンドポイントを記録し、次回以降は HTTP で直接取得する（形が変わったら描画に戻す）
+API_ENDPOINTS_FILE = 'data/api_endpoints.json'
+API_MODE_TIMEOUT_SECONDS = 15
+
+# Google Forms の静的取得（埋め込みデータ FB_PUBLIC_LOAD_DATA_ の抽出）の条件付き GET 用キャッシュ
+GOOGLE_FORMS_CACHE_FILE = 'data/google_forms_cache.json'
+
+# 取得手段の段階的な切り替え（設定の fallback）。十分な結果を得た段をソースごとに記録し、
+# 段 1 以降の記録は TIER_RECHECK_HOURS ごとに段 0（requests）から試し直す
+TIER_STATE_FILE = 'data/tier_state.json'
+TIER_RECHECK_HOURS = 24
+
+# サイト別抽出定義（scrapers.site_spec）。セレクタ・正規表現・URLの基準を宣言的に記述する
+SITE_SPECS_FILE = 'config/site_specs.yaml'
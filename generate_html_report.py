@@ -8,7 +8,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List
 
+from records import LotteryRecord, UpcomingProductRecord
 from utils import parse_date_flexible
+from view_model import STATUS_LABELS, VIEW_KEY, multi_store_offers, view_of
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,16 @@ logger = logging.getLogger(__name__)
 DEFAULT_CLEANUP_DAYS = 30
 MAX_CONDITION_LENGTH = 200
 
+# レポートで使うフィールド
+REPORT_LOTTERY_FIELDS = frozenset({
+    'product', 'store', 'lottery_type', 'start_date', 'end_date',
+    'announcement_date', 'conditions', 'detail_url', VIEW_KEY,
+})
+REPORT_UPCOMING_FIELDS = frozenset({'product_name', 'release_date', 'lottery_schedule', 'store', 'detail_url'})
+
+# レポートに表示するソースの取得状態（closed は表示しない）
+HEALTH_LABELS = {'open': '🔴 停止中', 'half_open': '🟡 再試行待ち'}
+
 
 def normalize_schema(data: Dict[str, Any]) -> Dict[str, Any]:
     """H8: all_lotteries.json スキーマ整理
@@ -35,38 +47,53 @@ def normalize_schema(data: Dict[str, Any]) -> Dict[str, Any]:
         if 'scraped_at' in source:
             normalized_source['scraped_at'] = source['scraped_at']
 
-        # 各ロッテリーのスキーマ統一
+        # 各ロッテリーのスキーマ統一（不要フィールド status, _source などは除去）
+        # main.py で判定済みのビューモデルは引き継ぐ
         for lottery in source.get('lotteries', []):
-            normalized_lottery = {
-                'product': lottery.get('product', ''),
-                'store': lottery.get('store', ''),
-                'lottery_type': lottery.get('lottery_type', ''),
-                'start_date': lottery.get('start_date', ''),
-                'end_date': lottery.get('end_date', ''),
-                'announcement_date': lottery.get('announcement_date', ''),
-                'conditions': lottery.get('conditions', ''),
-                'detail_url': lottery.get('detail_url', ''),
-            }
-            # 不要フィールドを除去（status, _source など）
-
-            normalized_source['lotteries'].append(normalized_lottery)
+            normalized_source['lotteries'].append(LotteryRecord.from_dict(lottery, keep=REPORT_LOTTERY_FIELDS))
 
         # 今後の発売予定情報のスキーマ統一
         for upcoming in source.get('upcoming_products', []):
-            normalized_upcoming = {
-                'product_name': upcoming.get('product_name', ''),
-                'release_date': upcoming.get('release_date', ''),
-                'lottery_schedule': upcoming.get('lottery_schedule', ''),
-                'store': upcoming.get('store', ''),
-                'detail_url': upcoming.get('detail_url', ''),
-            }
-            normalized_source['upcoming_products'].append(normalized_upcoming)
+            normalized_source['upcoming_products'].append(
+                UpcomingProductRecord.from_dict(upcoming, keep=REPORT_UPCOMING_FIELDS)
+            )
 
         normalized_sources.append(normalized_source)
 
+    # 集約済み商品ビュー（main.py で作成）はそのまま引き継ぐ
+    normalized_products = []
+    for product in data.get('products', []):
+        offers = []
+        for offer in product.get('offers', []):
+            normalized_offer = {
+                'kind': offer.get('kind', ''),
+                'store': offer.get('store', ''),
+                'price': offer.get('price', ''),
+                'url': offer.get('url', ''),
+            }
+            if VIEW_KEY in offer:
+                normalized_offer[VIEW_KEY] = offer[VIEW_KEY]
+            offers.append(normalized_offer)
+        normalized_products.append({
+            'name': product.get('name', ''),
+            'set_name': product.get('set_name', ''),
+            'form': product.get('form', ''),
+            'stores': product.get('stores', []),
+            'offers': offers,
+        })
+
+    # ソースの取得状態（main.py で付与）は停止中・再試行待ちのものだけ引き継ぐ
+    source_health = [
+        {key: entry.get(key) for key in ('source', 'state', 'failures', 'last_success', 'last_error', 'retry_at')}
+        for entry in data.get('source_health', [])
+        if entry.get('state') in HEALTH_LABELS
+    ]
+
     return {
         'timestamp': data.get('timestamp', ''),
-        'sources': normalized_sources
+        'sources': normalized_sources,
+        'products': normalized_products,
+        'source_health': source_health,
     }
 
 
@@ -92,39 +119,6 @@ def parse_date(date_string: Any) -> Any:
     return date_string
 
 
-def get_lottery_status(lottery: Dict[str, Any]) -> str:
-    """抽選のステータスを判定（受付中/終了/予定）"""
-    start_date_str = lottery.get('start_date', '')
-    end_date_str = lottery.get('end_date', '')
-    today = datetime.now().date()
-
-    start_date = parse_date(start_date_str)
-    end_date = parse_date(end_date_str)
-
-    # datetime オブジェクトに変換できたかチェック
-    if isinstance(end_date, datetime):
-        if end_date.date() < today:
-            return '終了'
-    if isinstance(start_date, datetime):
-        if start_date.date() > today:
-            return '予定'
-
-    return '受付中'
-
-
-def is_new_lottery(timestamp: str) -> bool:
-    """24時間以内に追加されたかチェック（新着判定）"""
-    if not timestamp or not isinstance(timestamp, str):
-        return False
-    try:
-        from datetime import timedelta
-        item_time = datetime.fromisoformat(timestamp)
-        current_time = datetime.now()
-        return (current_time - item_time) < timedelta(hours=24)
-    except (ValueError, TypeError):
-        return False
-
-
 def cleanup_old_data(data: Dict[str, Any], days: int = 30) -> Dict[str, Any]:
     """M6: 30日以上前のデータを削除＆2025年以前のデータを非表示"""
     if 'timestamp' not in data:
@@ -147,7 +141,13 @@ def cleanup_old_data(data: Dict[str, Any], days: int = 30) -> Dict[str, Any]:
         for lottery in source['lotteries']:
             start_date_str = lottery.get('start_date', '')
             if start_date_str:
-                start_dt = parse_date(start_date_str)
+                view = lottery.get(VIEW_KEY)
+                if view is not None and ':' not in start_date_str and 'T' not in start_date_str:
+                    # 判定済みのビューモデルがあれば再パースしない（view の start は日付のみのため、
+                    # 時刻付きの値は従来どおり parse_date で時刻まで比較する）
+                    start_dt = datetime.fromisoformat(view['start']) if view['start'] else start_date_str
+                else:
+                    start_dt = parse_date(start_date_str)
                 if isinstance(start_dt, datetime):
                     # 年が2025以下のデータは完全に除外
                     if start_dt.year <= cutoff_year:
@@ -200,6 +200,7 @@ def generate_html_report(data: Dict[str, Any], output_file: str = 'data/lottery_
     """HTMLレポートを生成"""
 
     timestamp = datetime.fromisoformat(data['timestamp'])
+    now = datetime.now()
 
     # 全抽選情報と今後の発売予定を収集
     all_lotteries = []
@@ -1026,6 +1027,68 @@ def generate_html_report(data: Dict[str, Any], output_file: str = 'data/lottery_
         </div>
 """
 
+    # 取得停止中のソース（サーキットブレーカー）
+    unhealthy_sources = data.get('source_health', [])
+    if unhealthy_sources:
+        html_content += f"""
+        <div class="upcoming-section">
+            <h2>🔌 取得を停止中のソース - {len(unhealthy_sources)}件</h2>
+"""
+        for entry in unhealthy_sources:
+            last_success = (entry.get('last_success') or '').replace('T', ' ')[:16] or 'なし'
+            retry_at = (entry.get('retry_at') or '').replace('T', ' ')[:16]
+            html_content += f"""
+            <div class="upcoming-card">
+                <div class="product-name">{html.escape(entry.get('source') or '')}</div>
+                <div class="schedule-info">{HEALTH_LABELS[entry['state']]}（連続失敗 {entry.get('failures') or 0}回）</div>
+                <div class="schedule-info">✅ 最終成功: {html.escape(last_success)}</div>
+"""
+            if retry_at and entry['state'] == 'open':
+                html_content += f"""
+                <div class="schedule-info">🔁 再試行予定: {html.escape(retry_at)}</div>
+"""
+            if entry.get('last_error'):
+                html_content += f"""
+                <div class="schedule-info" style="font-size: 0.85em; color: #999;">⚠️ {html.escape(entry['last_error'])}</div>
+"""
+            html_content += """
+            </div>
+"""
+        html_content += """
+        </div>
+"""
+
+    # 商品別まとめ（終了を除いて複数店舗で受付中の商品のみ、集約済みビューを使用。通知と同じ判定）
+    multi_store_products = multi_store_offers(data.get('products', []), now)
+    if multi_store_products:
+        html_content += f"""
+        <div class="upcoming-section">
+            <h2>🧩 複数店舗で受付中の商品 - {len(multi_store_products)}商品</h2>
+"""
+        for product, offers in multi_store_products:
+            html_content += f"""
+            <div class="upcoming-card">
+                <div class="product-name">📦 {html.escape(product.get('name', ''))}</div>
+"""
+            for offer in offers:
+                kind_label = '抽選' if offer.get('kind') == 'lottery' else '予約'
+                offer_text = html.escape(f"{offer.get('store', '')}（{kind_label}）")
+                price = offer.get('price', '')
+                if price:
+                    offer_text += f" 💰 {html.escape(price)}"
+                url = offer.get('url', '')
+                if url and url.startswith('http'):
+                    offer_text += f' <a href="{html.escape(url)}" target="_blank">詳細</a>'
+                html_content += f"""
+                <div class="schedule-info">🏪 {offer_text}</div>
+"""
+            html_content += """
+            </div>
+"""
+        html_content += """
+        </div>
+"""
+
     html_content += """
         <div class="lotteries" id="lotteriesList">
             <table id="lotteriesTable" role="table">
@@ -1045,15 +1108,9 @@ def generate_html_report(data: Dict[str, Any], output_file: str = 'data/lottery_
 
     # 締切日でデフォルトソート（昇順）
     def get_sort_key(lottery):
-        end_date = lottery.get('end_date', '')
-        if isinstance(end_date, str):
-            # YYYY-MM-DD 形式で ソート（パース困難な場合は最後に）
-            try:
-                from datetime import datetime
-                return (0, datetime.strptime(end_date[:10], '%Y-%m-%d') if len(end_date) >= 10 else datetime.max)
-            except (ValueError, TypeError):
-                return (1, end_date)
-        return (1, '')
+        # ビューモデルのISO日付でソート（締切日不明は最後に）
+        end = view_of(lottery, now)['end']
+        return (0, end) if end else (1, '')
 
     all_lotteries_sorted = sorted(all_lotteries, key=get_sort_key)
 
@@ -1071,13 +1128,13 @@ def generate_html_report(data: Dict[str, Any], output_file: str = 'data/lottery_
         source = lottery.get('_source', 'unknown')
 
         # ステータスバッジを取得
-        status = get_lottery_status(lottery)
-        status_class_map = {'受付中': 'active', '終了': 'ended', '予定': 'upcoming'}
-        status_class = status_class_map.get(status, 'active')
+        view = view_of(lottery, now)
+        status_class = view['status']
+        status = STATUS_LABELS[status_class]
 
         # 新着判定
         timestamp = lottery.get('timestamp', '')
-        is_new = is_new_lottery(timestamp)
+        is_new = view['is_new']
 
         # バッジテキストと多重バッジ
         badge_html = f'<span class="status-badge {status_class}">●{status}</span>'
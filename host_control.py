@@ -0,0 +1,258 @@
+"""
+ホストごとの同時リクエスト数の自動調整（AIMD）
+
+RequestsBaseScraper と PlaywrightBaseScraper のページ取得は、リクエストの前に
+ホスト単位の枠を確保し、終了時にレイテンシと結果を報告する。
+
+- 増加（加算）: 成功かつレイテンシが基準（成功時の指数移動平均）の HOST_LATENCY_FACTOR 倍以内なら
+  同時実行数を 1/limit ずつ増やす（同時実行数ぶん成功するとおよそ +1）
+- 減少（乗算）: 429・403・5xx・タイムアウトで同時実行数を HOST_DECREASE_FACTOR 倍にする。
+  同時に返った失敗で下げすぎないよう、減少後 HOST_DECREASE_COOLDOWN_SECONDS は再度減らさず、増やしもしない
+- 学習した同時実行数と基準レイテンシは data/host_limits.json に保存し、次回の初期値にする
+- 子プロセス（scrapers.isolated）は使ったホストの増減分だけを親に返し、親の現在値に加える
+  （並行する子が読み込み時点の古い値で互いの学習結果を上書きしないようにする）
+
+リクエスト間隔（wait_time によるホスト単位のペース制御）は従来どおりで、ここでは同時実行数だけを扱う。
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from constants import (DEFAULT_PAGE_CONCURRENCY, HOST_CONCURRENCY_MAX, HOST_DECREASE_COOLDOWN_SECONDS,
+                       HOST_DECREASE_FACTOR, HOST_LATENCY_FACTOR, HOST_LIMITS_FILE)
+
+logger = logging.getLogger(__name__)
+
+# 結果の種類
+OK = 'ok'
+THROTTLED = 'throttled'  # 429 / 403 / 503
+ERROR = 'error'  # その他の 5xx・タイムアウト・通信エラー
+
+# 基準レイテンシの指数移動平均の重み
+LATENCY_SMOOTHING = 0.2
+# acquire_async で枠の空きを確認する間隔（秒）
+ASYNC_POLL_SECONDS = 0.05
+
+
+def host_of(url: str) -> str:
+    """URLのホスト名（枠の単位）"""
+    return urlparse(url).netloc
+
+
+def classify_status(status: Optional[int]) -> str:
+    """HTTPステータスを結果の種類に変換（404 等のクライアントエラーは混雑の兆候ではないため OK）"""
+    if status in (429, 403, 503):
+        return THROTTLED
+    if isinstance(status, int) and status >= 500:
+        return ERROR
+    return OK
+
+
+class HostController:
+    """ホストごとの同時実行数の制御（スレッドセーフ、非同期からも利用可）"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Args:
+            limits: ホスト → {'limit', 'latency'}（前回の学習結果）
+        """
+        self._cond = threading.Condition()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        for host, saved in (limits or {}).items():
+            self._state(host).update(
+                limit=min(HOST_CONCURRENCY_MAX, max(1.0, float(saved.get('limit', DEFAULT_PAGE_CONCURRENCY)))),
+                latency=saved.get('latency'),
+            )
+
+    def _state(self, host: str) -> Dict[str, Any]:
+        state = self._hosts.get(host)
+        if state is None:
+            # base: 最初に使った時点の同時実行数（未使用はNone、増減分の算出用）
+            state = self._hosts[host] = {
+                'limit': float(DEFAULT_PAGE_CONCURRENCY), 'latency': None, 'in_flight': 0, 'hold_until': 0.0,
+                'base': None,
+            }
+        return state
+
+    @staticmethod
+    def _touch(state: Dict[str, Any]) -> None:
+        if state['base'] is None:
+            state['base'] = state['limit']
+
+    def limit(self, host: str) -> int:
+        """現在の同時実行数の上限"""
+        with self._cond:
+            return int(self._state(host)['limit'])
+
+    def try_acquire(self, host: str) -> bool:
+        """枠が空いていれば確保"""
+        with self._cond:
+            state = self._state(host)
+            if state['in_flight'] >= int(state['limit']):
+                return False
+            state['in_flight'] += 1
+            return True
+
+    def acquire(self, host: str) -> None:
+        """枠が空くまで待って確保（スレッド用）"""
+        with self._cond:
+            state = self._state(host)
+            while state['in_flight'] >= int(state['limit']):
+                self._cond.wait()
+            state['in_flight'] += 1
+
+    async def acquire_async(self, host: str) -> None:
+        """枠が空くまで待って確保（イベントループを止めない）"""
+        while not self.try_acquire(host):
+            await asyncio.sleep(ASYNC_POLL_SECONDS)
+
+    def release(self, host: str, latency: Optional[float], outcome: str = OK) -> None:
+        """枠を返し、結果を同時実行数に反映
+
+        Args:
+            host: ホスト名
+            latency: 所要時間（秒、不明はNone）
+            outcome: OK / THROTTLED / ERROR
+        """
+        with self._cond:
+            state = self._state(host)
+            state['in_flight'] = max(0, state['in_flight'] - 1)
+            self._touch(state)
+            self._update(host, state, latency, outcome)
+            self._cond.notify_all()
+
+    def _update(self, host: str, state: Dict[str, Any], latency: Optional[float], outcome: str) -> None:
+        now = time.monotonic()
+        if outcome != OK:
+            if now < state['hold_until']:
+                return
+            previous = state['limit']
+            state['limit'] = max(1.0, previous * HOST_DECREASE_FACTOR)
+            state['hold_until'] = now + HOST_DECREASE_COOLDOWN_SECONDS
+            logger.info(f"Host {host}: {outcome}, concurrency {previous:.1f} -> {state['limit']:.1f}")
+            return
+
+        if latency is None:
+            return
+        baseline = state['latency']
+        healthy = baseline is None or latency <= baseline * HOST_LATENCY_FACTOR
+        if healthy:
+            state['latency'] = latency if baseline is None else baseline + LATENCY_SMOOTHING * (latency - baseline)
+            if now >= state['hold_until']:
+                state['limit'] = min(float(HOST_CONCURRENCY_MAX), state['limit'] + 1 / state['limit'])
+
+    @contextmanager
+    def request(self, host: str) -> Iterator[Dict[str, Any]]:
+        """枠を確保してリクエストを行う（スレッド用）
+
+        with ブロック内で report['outcome'] に結果を設定する（例外で抜けた場合は ERROR）。
+        """
+        self.acquire(host)
+        report: Dict[str, Any] = {'outcome': OK}
+        started = time.monotonic()
+        try:
+            yield report
+        except BaseException:
+            report['outcome'] = ERROR
+            raise
+        finally:
+            self.release(host, time.monotonic() - started, report['outcome'])
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """今回使ったホスト → {'limit', 'latency'}（保存用）"""
+        with self._cond:
+            return {
+                host: {'limit': round(state['limit'], 2),
+                       'latency': None if state['latency'] is None else round(state['latency'], 3)}
+                for host, state in sorted(self._hosts.items()) if state['base'] is not None
+            }
+
+    def changes(self) -> Dict[str, Dict[str, float]]:
+        """今回使ったホスト → {'limit_delta', 'latency'}（子プロセスから親への受け渡し用）"""
+        with self._cond:
+            return {
+                host: {'limit_delta': round(state['limit'] - state['base'], 3), 'latency': state['latency']}
+                for host, state in sorted(self._hosts.items()) if state['base'] is not None
+            }
+
+    def merge(self, changes: Dict[str, Dict[str, float]]) -> None:
+        """別プロセス（scrapers.isolated の子プロセス）の増減分を現在値に加える
+
+        基準レイテンシは子の値を指数移動平均で取り込む。
+
+        Args:
+            changes: 子プロセスの changes()
+        """
+        with self._cond:
+            for host, change in changes.items():
+                state = self._state(host)
+                self._touch(state)
+                limit = state['limit'] + float(change.get('limit_delta') or 0.0)
+                state['limit'] = min(float(HOST_CONCURRENCY_MAX), max(1.0, limit))
+                latency, baseline = change.get('latency'), state['latency']
+                if latency is not None:
+                    state['latency'] = (latency if baseline is None
+                                        else baseline + LATENCY_SMOOTHING * (latency - baseline))
+            self._cond.notify_all()
+
+
+_controller: Optional[HostController] = None
+_controller_lock = threading.Lock()
+
+
+def load_limits(path: str = HOST_LIMITS_FILE) -> Dict[str, Dict[str, float]]:
+    """前回の学習結果を読み込み"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {host: value for host, value in data.items() if isinstance(value, dict) and 'limit' in value}
+
+
+def controller() -> HostController:
+    """プロセス共通のコントローラー（初回使用時に前回の学習結果を読み込む）"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = HostController(load_limits())
+        return _controller
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """使用済みならプロセス共通のコントローラーの学習結果（未使用なら空）"""
+    return _controller.snapshot() if _controller is not None else {}
+
+
+def changes() -> Dict[str, Dict[str, float]]:
+    """使用済みならプロセス共通のコントローラーの増減分（未使用なら空）"""
+    return _controller.changes() if _controller is not None else {}
+
+
+def save(path: str = HOST_LIMITS_FILE) -> None:
+    """学習結果を保存（前回分に今回使ったホストを上書き、未使用なら何もしない）"""
+    merge_state(snapshot(), path)
+
+
+def merge_state(learned: Dict[str, Dict[str, float]], path: str = HOST_LIMITS_FILE) -> None:
+    """学習結果を保存済みの値に上書き（--merge ではシャードごとの snapshot() を渡す）"""
+    if not learned:
+        return
+    limits = load_limits(path)
+    limits.update(learned)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(limits.items())), f, ensure_ascii=False, indent=2)
+
+
+def reset() -> None:
+    """プロセス共通のコントローラーを破棄（テスト用）"""
+    global _controller
+    with _controller_lock:
+        _controller = None
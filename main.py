@@ -1,20 +1,36 @@
 """
 ポケモンカード抽選情報収集メインスクリプト
 """
+import argparse
+import ast
 import asyncio
 import importlib
 import json
 import logging
 import os
+import sys
+import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from typing import Any, Dict, List, Optional
 
 import yaml
 
-from constants import EXCLUDE_KEYWORDS, POKEMON_KEYWORDS
+from aggregation import build_product_view
+import catalog
+import host_control
+import probe
+import records
+import retry
+import scheduling
+import sharding
+import source_health
+import tiering
+from constants import (ALL_LOTTERIES_FILE, DEFAULT_SCRAPER_TIMEOUT_SECONDS,
+                       RUN_DEADLINE_SECONDS, WATCH_INTERVAL_MINUTES)
 from utils import (_extract_year_from_string, _parse_date_flexible,
                    build_composite_key)
+import view_model
 # Scraper imports moved to dynamic loading via config/scrapers.yaml
 # (All imports are now loaded dynamically in load_scrapers_from_config())
 
@@ -25,34 +41,41 @@ from utils import (_extract_year_from_string, _parse_date_flexible,
 # ただし、現在はmain.pyで直接設定することで簡潔性を優先している。
 DETAIL_DISPLAY_THRESHOLD = 3
 
-# logs/ ディレクトリを自動作成
-os.makedirs('logs', exist_ok=True)
-
-# ログハンドラを設定
-log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-today_str = datetime.now().strftime('%Y%m%d')
-log_filename = f'logs/scraping_{today_str}.log'
-
-# ストリームハンドラ（コンソール出力）
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(logging.Formatter(log_format))
-
-# ファイルハンドラ（RotatingFileHandler: 5MB, 最大3世代）
-file_handler = RotatingFileHandler(
-    log_filename,
-    maxBytes=5 * 1024 * 1024,  # 5MB
-    backupCount=3,  # 最大3世代
-    encoding='utf-8'
-)
-file_handler.setFormatter(logging.Formatter(log_format))
-
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[stream_handler, file_handler]
-)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 実行全体の期限で打ち切った場合の失敗理由（ソースの取得状態には記録しない）
+DEADLINE_REACHED = 'deadline reached'
+
 logger = logging.getLogger(__name__)
 
 
+def setup_logging() -> None:
+    """ログハンドラを設定（import 時の副作用を避けるため main() から呼び出す）
+
+    - ストリームハンドラ（コンソール出力）
+    - ファイルハンドラ（logs/scraping_YYYYMMDD.log、5MB・最大3世代でローテーション）
+    """
+    # logs/ ディレクトリを自動作成
+    os.makedirs('logs', exist_ok=True)
+    log_filename = f"logs/scraping_{datetime.now().strftime('%Y%m%d')}.log"
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    file_handler = RotatingFileHandler(
+        log_filename,
+        maxBytes=5 * 1024 * 1024,  # 5MB
+        backupCount=3,  # 最大3世代
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[stream_handler, file_handler]
+    )
+
+
 def _validate_scraper_config(scraper: Dict[str, Any]) -> bool:
     """スクレイパー設定の必須フィールドをバリデーション
 
@@ -97,20 +120,8 @@ def load_scrapers_from_config(config_path: str = 'config/scrapers.yaml') -> List
 
         scrapers = validated_scrapers
 
-        # 動的にスクレイパークラスをロード
+        # スクレイパークラスは実行時に resolve_scraper_class() で読み込む（起動を軽くするため）
         for scraper_config in scrapers:
-            if not scraper_config.get('skip') and isinstance(scraper_config.get('class'), str):
-                module_name = scraper_config.get('module')
-                class_name = scraper_config.get('class')
-                if module_name and class_name:
-                    try:
-                        module = importlib.import_module(module_name)
-                        scraper_config['class'] = getattr(module, class_name)
-                    except (ImportError, AttributeError) as e:
-                        logger.warning(f"Failed to load {module_name}.{class_name}: {e}")
-                        scraper_config['skip'] = True
-                        scraper_config['reason'] = f'Import failed: {e}'
-
             # スキップされていなくてもkwargsがない場合は空辞書を設定
             if not scraper_config.get('skip') and 'kwargs' not in scraper_config:
                 scraper_config['kwargs'] = {}
@@ -124,6 +135,107 @@ def load_scrapers_from_config(config_path: str = 'config/scrapers.yaml') -> List
         return []
 
 
+def scraper_timeout(config: Dict[str, Any], deadline: Optional[float] = None) -> Optional[float]:
+    """スクレイパーの制限時間（秒）
+
+    設定の timeout_seconds（省略時は DEFAULT_SCRAPER_TIMEOUT_SECONDS、0以下で無制限）と
+    実行全体の期限までの残り時間の短い方。
+
+    Args:
+        config: スクレイパー設定
+        deadline: 実行全体の期限（time.monotonic() の値）
+
+    Returns:
+        制限時間（Noneで無制限、0以下は期限切れ）
+    """
+    timeout = config.get('timeout_seconds', DEFAULT_SCRAPER_TIMEOUT_SECONDS)
+    timeout = float(timeout) if timeout and float(timeout) > 0 else None
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def resolve_scraper_class(config: Dict[str, Any]) -> Optional[type]:
+    """スクレイパークラスを初回使用時に読み込む
+
+    読み込みに失敗した場合は設定を skip 扱いにし、理由を記録する。
+
+    Args:
+        config: スクレイパー設定（'class' はクラス名またはクラス）
+
+    Returns:
+        スクレイパークラス（失敗時はNone）
+    """
+    scraper_class = config.get('class')
+    if not isinstance(scraper_class, str):
+        return scraper_class
+
+    module_name = config.get('module')
+    try:
+        module = importlib.import_module(module_name)
+        config['class'] = getattr(module, scraper_class)
+    except (ImportError, AttributeError, TypeError) as e:
+        logger.warning(f"Failed to load {module_name}.{scraper_class}: {e}")
+        config['skip'] = True
+        config['reason'] = f'Import failed: {e}'
+        return None
+    return config['class']
+
+
+def validate_scrapers(scrapers: List[Dict[str, Any]]) -> List[str]:
+    """スクレイパーをimportせずに設定を検証（--dry-run 用）
+
+    モジュールのソースを構文解析し、指定クラスが定義されているかを確認する（fallback の段も含む）。
+
+    Args:
+        scrapers: load_scrapers_from_config() の結果
+
+    Returns:
+        エラーメッセージのリスト（問題なければ空）
+    """
+    errors = []
+    for config in scrapers:
+        if config.get('skip'):
+            continue
+        name = config.get('name', 'unknown')
+        tier_error = tiering.validate(config)
+        if tier_error:
+            errors.append(tier_error)
+            continue
+        for tier in tiering.tiers_of(config):
+            module_name = tier.get('module', '')
+            path = os.path.join(*module_name.split('.')) + '.py'
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    tree = ast.parse(f.read(), filename=path)
+            except (OSError, SyntaxError) as e:
+                errors.append(f"{name}: {module_name} を読み込めません ({e})")
+                continue
+
+            class_names = {node.name for node in tree.body if isinstance(node, ast.ClassDef)}
+            if tier.get('class') not in class_names:
+                errors.append(f"{name}: {module_name} に {tier.get('class')} が定義されていません")
+        probe_error = probe.validate(config)
+        if probe_error:
+            errors.append(probe_error)
+    return errors
+
+
+def list_scrapers(scrapers: List[Dict[str, Any]], health: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    """スクレイパー一覧を表示（--list 用、取得状態があれば停止中・最終成功日時も表示）"""
+    health = health or {}
+    for config in sorted(scrapers, key=lambda c: c['num']):
+        status = f"skip ({config.get('reason', '')})" if config.get('skip') else 'active'
+        entry = health.get(config['name'])
+        if entry and not config.get('skip'):
+            state = source_health.state_of(entry)
+            if state != source_health.CLOSED:
+                status += f", {state} ({entry['failures']} failures)"
+            status += f", last success {entry['last_success'] or 'never'}"
+        print(f"{config['num']:>3}  {config['name']:<32} {config['module']}.{config['class']}  [{status}]")
+
+
 def _check_year(item: Dict[str, Any]) -> bool:
     """2025年以前のアイテムをチェック
 
@@ -239,10 +351,11 @@ def filter_pokemon_card_only(items: list) -> list:
             str(item.get('product_name', '')),
             str(item.get('title', '')),
             str(item.get('description', '')),
-        ]).lower()
-        if any(kw.lower() in text for kw in POKEMON_KEYWORDS):
+        ])
+        info = catalog.classify(text)
+        if info['tags'] & catalog.STRICT_TAGS:
             # ポケカKWマッチ後、除外KWに該当したら除外
-            if any(kw.lower() in text for kw in EXCLUDE_KEYWORDS):
+            if info['excluded']:
                 logger.info(f"非カード商品除外: {item.get('product', '?')}")
             else:
                 filtered.append(item)
@@ -267,7 +380,7 @@ def save_data(data: Dict[str, Any], filename: str) -> None:
     """データを保存"""
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, indent=2, default=records.to_json)
 
 
 def detect_changes(old_data: Optional[Dict[str, Any]], new_data: Dict[str, Any], data_type: str = 'lottery') -> tuple[bool, List[str]]:
@@ -315,41 +428,186 @@ def detect_changes(old_data: Optional[Dict[str, Any]], new_data: Dict[str, Any],
     return has_changes, changes
 
 
-async def execute_scraper(config: Dict[str, Any], semaphore: asyncio.Semaphore, total_sources: int) -> Optional[Dict[str, Any]]:
-    """単一スクレイパーを実行（Semaphoreで同時実行数制限）"""
-    async with semaphore:
-        num = config['num']
-        name = config['name']
+def _previous_data(config: Dict[str, Any],
+                   previous: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """前回データ（キャッシュがあればキャッシュ、なければ保存ファイル）"""
+    if previous is not None and config['name'] in previous:
+        return previous[config['name']]
+    return load_previous_data(config['filename'])
 
-        if config.get('skip'):
-            logger.info(f"[{num}/{total_sources}] {name}をスキップ")
-            return None
 
-        logger.info(f"[{num}/{total_sources}] {name}をチェック中...")
+async def _run_tier(config: Dict[str, Any], name: str, instance_key: str, deadline: Optional[float] = None,
+                    instances: Optional[Dict[str, Any]] = None) -> tuple:
+    """取得手段の1段を実行
+
+    Args:
+        config: 段のスクレイパー設定（tiering.tiers_of() の要素）
+        name: スクレイパー名（ログ表示用）
+        instance_key: instances のキー
+        deadline: 実行全体の期限（time.monotonic() の値、Noneで無制限）
+        instances: キー → インスタンス（指定時は再利用し、未作成なら登録する）
 
+    Returns:
+        (取得結果, 失敗理由)。成功時の失敗理由は None。
+        実行全体の期限で打ち切った場合の失敗理由は DEADLINE_REACHED（ソースの失敗としては扱わない）
+    """
+    from scrapers.isolated import ScraperTimeout, run_isolated, run_threaded
+
+    timeout = scraper_timeout(config, deadline)
+    # 制限時間がソース自身の timeout_seconds より短ければ、実行全体の期限で打ち切られている
+    limit = scraper_timeout(config)
+    cut_by_deadline = timeout is not None and (limit is None or timeout < limit)
+    if timeout is not None and timeout <= 0:
+        logger.warning(f"⏱ {name}: 実行時間の上限に達したため中断")
+        return None, DEADLINE_REACHED
+
+    scraper_class = resolve_scraper_class(config)
+    if scraper_class is None:
+        logger.warning(f"✗ {name}の読み込みに失敗: {config.get('reason', '')}")
+        return None, config.get('reason') or 'import failed'
+
+    isolate = instances is None and scheduling.scraper_kind(config) != 'browser'
+    scraper = instances.get(instance_key) if instances is not None else None
+    if scraper is None and not isolate:
         try:
-            scraper = config['class'](**config['kwargs'])
+            scraper = scraper_class(**config['kwargs'])
         except (TypeError, AttributeError) as e:
             logger.warning(f"✗ {name}の初期化に失敗: {e}")
-            return None
+            return None, f"init failed: {e}"
+        if instances is not None:
+            instances[instance_key] = scraper
 
-        try:
-            data = await asyncio.to_thread(scraper.scrape)
-        except (RuntimeError, ConnectionError, TimeoutError) as e:
-            logger.warning(f"✗ {name}の取得に失敗: {e}")
+    # ストリーミング取得のサイズ上限（ソース別設定）
+    attrs = {'max_response_bytes': config['max_response_bytes']} if config.get('max_response_bytes') else {}
+    if scraper is not None and attrs and hasattr(scraper, 'max_response_bytes'):
+        scraper.max_response_bytes = attrs['max_response_bytes']
+
+    try:
+        if isolate:
+            return await run_isolated(scraper_class, config['kwargs'], timeout, attrs), None
+        return await run_threaded(scraper, timeout), None
+    except ScraperTimeout as e:
+        if cut_by_deadline:
+            logger.warning(f"⏱ {name}: 実行時間の上限に達したため中断 ({e})")
+            return None, DEADLINE_REACHED
+        logger.warning(f"⏱ {name}: 制限時間を超えたため中断 ({e})")
+        return None, f"timeout: {e}"
+    except (RuntimeError, ConnectionError, TimeoutError) as e:
+        logger.warning(f"✗ {name}の取得に失敗: {e}")
+        return None, str(e) or type(e).__name__
+    except Exception as e:
+        logger.warning(f"✗ {name}の取得で予期しないエラー: {e}")
+        return None, f"{type(e).__name__}: {e}"
+
+
+async def execute_scraper(config: Dict[str, Any], semaphore: asyncio.Semaphore, total_sources: int,
+                          instances: Optional[Dict[str, Any]] = None,
+                          previous: Optional[Dict[str, Dict[str, Any]]] = None,
+                          durations: Optional[Dict[str, float]] = None,
+                          deadline: Optional[float] = None,
+                          outcomes: Optional[Dict[str, Optional[str]]] = None,
+                          semaphores: Optional[Dict[str, asyncio.Semaphore]] = None) -> Optional[Dict[str, Any]]:
+    """単一スクレイパーを実行（Semaphoreで同時実行数制限）
+
+    制限時間は設定の timeout_seconds（省略時は DEFAULT_SCRAPER_TIMEOUT_SECONDS）と
+    実行全体の期限の早い方。requests / API 系はインスタンスを再利用しない場合に子プロセスで実行し、
+    時間切れで強制終了する。Playwright 系はスレッドで実行し、時間切れで cancel() する。
+    設定に probe があれば先に HTTP で軽く確認し、変化がなければ前回データを再利用する（probe モジュール参照）。
+    設定に fallback があれば requests の段から順に試し、十分な結果を得た段を記録する（tiering モジュール参照）。
+
+    Args:
+        config: スクレイパー設定
+        semaphore: 同時実行数の制限
+        total_sources: スクレイパー総数（ログ表示用）
+        instances: スクレイパー名 → インスタンス（指定時は再利用し、未作成なら登録する）
+        previous: スクレイパー名 → 前回データ（指定時はファイルを読まずに差分検出し、今回データで更新）
+        durations: スクレイパー名 → 取得の所要時間（秒、指定時に記録）
+        deadline: 実行全体の期限（time.monotonic() の値、Noneで無制限）
+        outcomes: スクレイパー名 → 失敗理由（成功は None、指定時に記録。期限切れのスキップ・打ち切りは記録しない）
+        semaphores: 種類別の同時実行数の制限（指定時、種類の異なる段は semaphore の枠を返して該当の枠で実行する）
+
+    Returns:
+        {'data', 'zero_alert', 'name'}（取得失敗・スキップ・時間切れ時はNone）
+    """
+    def record(error: Optional[str] = None) -> None:
+        if outcomes is not None:
+            outcomes[name] = error
+
+    async with scheduling.Slot(semaphore) as slot:
+        num = config['num']
+        name = config['name']
+
+        if config.get('skip'):
+            logger.info(f"[{num}/{total_sources}] {name}をスキップ")
             return None
-        except Exception as e:
-            logger.warning(f"✗ {name}の取得で予期しないエラー: {e}")
+
+        timeout = scraper_timeout(config, deadline)
+        if timeout is not None and timeout <= 0:
+            logger.warning(f"⏱ {name}: 実行時間の上限に達したためスキップ")
             return None
 
+        logger.info(f"[{num}/{total_sources}] {name}をチェック中...")
+
+        from scrapers.isolated import run_in_thread
+
+        # 事前プローブで変化がなければ本処理（ブラウザ起動等）を行わず前回データを再利用
+        data = None
+        spec = probe.probe_config(config)
+        fingerprints = None
+        if spec is not None:
+            unchanged, fingerprints = await run_in_thread(lambda: probe.store().check(name, spec))
+            prev_data = _previous_data(config, previous) if unchanged else None
+            if prev_data:
+                logger.info(f"🔎 {name}: 変化なし（前回データを再利用）")
+                data = {**prev_data, 'reused_at': datetime.now().isoformat()}
+        reused = data is not None
+
+        if not reused:
+            # 安い段（requests）から試し、失敗・不十分なら次の段（ブラウザ）へ（tiering モジュール参照）
+            tiers = tiering.tiers_of(config)
+            index = tiering.store().start(name, tiers) if len(tiers) > 1 else 0
+            if index:
+                logger.info(f"⤴ {name}: 記録済みの {tiering.tier_label(tiers[index])} で取得")
+            started = time.monotonic()
+            try:
+                while True:
+                    tier = tiers[index]
+                    instance_key = name if index == 0 else f"{name}/{tiering.tier_label(tier)}"
+                    if semaphores is not None:
+                        # 種類の異なる段（http → browser 等）はその種類の同時実行数の枠で実行する
+                        await slot.switch(semaphores[scheduling.scraper_kind(tier)])
+                    data, error = await _run_tier(tier, name, instance_key, deadline, instances)
+                    lacking = error or tiering.shortfall(data, config)
+                    if not lacking or index + 1 >= len(tiers):
+                        break
+                    if deadline is not None and deadline <= time.monotonic():
+                        break
+                    index += 1
+                    logger.info(f"⤴ {name}: {lacking} のため {tiering.tier_label(tiers[index])} で再取得")
+            finally:
+                if durations is not None:
+                    durations[name] = time.monotonic() - started
+            if error:
+                # 実行全体の期限による打ち切りはソースの失敗として記録しない（停止判定に数えない）
+                if error != DEADLINE_REACHED:
+                    record(error)
+                return None
+            if len(tiers) > 1 and not lacking:
+                tiering.store().remember(name, index, tiers)
+
         if not data:
             logger.warning(f"✗ {name}の取得に失敗")
+            record('empty response')
             return None
+        record()
 
         if config.get('skip_on_empty') and not data.get('lotteries'):
             logger.info(f"✓ {name}: 抽選なし（スキップ）")
             return None
 
+        # 取り込み時に1回だけキーを正規化してレコード化
+        records.ingest(data)
+
         data_type = config.get('data_type', 'lottery')
         if data_type == 'lottery':
             for item in data.get('lotteries', []):
@@ -372,36 +630,68 @@ async def execute_scraper(config: Dict[str, Any], semaphore: asyncio.Semaphore,
             logger.warning(f"⚠️  {name}: 0件の{label}情報")
             return {'data': data, 'zero_alert': True, 'name': name}
 
-        prev_data = load_previous_data(config['filename'])
+        prev_data = _previous_data(config, previous)
         has_changes, changes = detect_changes(prev_data, data, data_type)
         if has_changes and changes != ["初回実行"]:
             logger.info(f"  変更検出: {changes}")
 
         save_data(data, config['filename'])
-        return {'data': data, 'zero_alert': False, 'name': name}
-
-
-async def run_scrapers_async(scrapers: List[Dict[str, Any]], all_results: Dict[str, Any]) -> None:
+        if previous is not None:
+            previous[name] = data
+        if not reused:
+            probe.store().commit(name, fingerprints)
+        return {'data': data, 'zero_alert': False, 'name': name, 'changes': changes if has_changes else []}
+
+
+async def run_scrapers_async(scrapers: List[Dict[str, Any]], all_results: Dict[str, Any],
+                             instances: Optional[Dict[str, Any]] = None,
+                             previous: Optional[Dict[str, Dict[str, Any]]] = None,
+                             durations: Optional[Dict[str, float]] = None,
+                             costs: Optional[Dict[str, float]] = None,
+                             limits: Optional[Dict[str, int]] = None,
+                             deadline: Optional[float] = None,
+                             outcomes: Optional[Dict[str, Optional[str]]] = None) -> List[Dict[str, Any]]:
     """複数のスクレイパーを非同期で並列実行
 
-    asyncio.gather を使用して複数のスクレイパーを並列実行し、
-    同時実行数を Semaphore で制限（最大5個）する。
+    asyncio.gather を使用して複数のスクレイパーを並列実行する。
+    実行時間の見積もりが長いものから開始し、同時実行数は種類（browser / http / api）ごとの
+    Semaphore で独立に制限する（scheduling モジュール参照）。
 
     Args:
         scrapers: スクレイパー設定のリスト
         all_results: 結果を蓄積する辞書（in-place更新）
             - sources: スクレイパー結果のリスト
             - zero_alert_sources: 0件を返したスクレイパー名のリスト
+        instances: スクレイパーインスタンスのキャッシュ（execute_scraper に渡す）
+        previous: 前回データのキャッシュ（execute_scraper に渡す）
+        durations: 所要時間の記録先（execute_scraper に渡す）
+        costs: スクレイパー名 → 過去の実行時間（秒、実行順の決定に使用）
+        limits: 種類別の同時実行数（省略時は scheduling.concurrency_limits()）
+        deadline: 実行全体の期限（time.monotonic() の値）。過ぎたスクレイパーは中断・スキップし、
+            完了した分だけを結果に含める
+        outcomes: 成否の記録先（execute_scraper に渡す）
 
     Returns:
-        None（all_results を in-place で更新）
+        取得に成功したスクレイパーの結果（{'data', 'zero_alert', 'name', ...}）のリスト
+        （all_results も in-place で更新）
     """
     total_sources = len(scrapers)
-    semaphore = asyncio.Semaphore(5)  # 同時実行数を5に制限
-
-    tasks = [execute_scraper(config, semaphore, total_sources) for config in scrapers]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
+    semaphores = scheduling.make_semaphores(limits)
+    ordered = scheduling.order_by_cost(scrapers, costs)
+
+    tasks = [
+        execute_scraper(config, semaphores[scheduling.scraper_kind(tiering.planned_tier(config))], total_sources,
+                        instances, previous, durations, deadline=deadline, outcomes=outcomes,
+                        semaphores=semaphores)
+        for config in ordered
+    ]
+    finished = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 結果は設定の順序で格納（実行順に依存させない）
+    by_config = {id(config): result for config, result in zip(ordered, finished)}
+    results = [by_config[id(config)] for config in scrapers]
+
+    succeeded = []
     for result in results:
         if result is None or isinstance(result, Exception):
             continue
@@ -409,23 +699,123 @@ async def run_scrapers_async(scrapers: List[Dict[str, Any]], all_results: Dict[s
             all_results['sources'].append(result['data'])
             if result['zero_alert']:
                 all_results['zero_alert_sources'].append(result['name'])
+            succeeded.append(result)
+    return succeeded
+
 
+def finalize_results(all_results: Dict[str, Any], filename: str = ALL_LOTTERIES_FILE) -> None:
+    """商品集約とビューモデル付与を行い、統合データを保存
 
-def main() -> None:
+    Args:
+        all_results: 統合データ（in-place更新）
+        filename: 保存先
+    """
+    # ソース横断の商品集約（レポート・通知はこの商品ビューを参照）
+    all_results['products'] = build_product_view(all_results['sources'])
+    logger.info(f"商品集約: {len(all_results['products'])}商品")
+
+    # ステータス・締切・新着を1回だけ判定（通知・レポートは item['view'] を参照）
+    annotated = view_model.annotate(all_results)
+    logger.info(f"ビューモデル付与: {annotated}件")
+
+    # 統合データを保存
+    save_data(all_results, filename)
+
+
+def _shard_spec(value: str) -> tuple:
+    """--shard の値を (i, N) に変換"""
+    try:
+        return sharding.parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description='ポケモンカード抽選情報収集')
+    parser.add_argument('--config', default='config/scrapers.yaml', help='スクレイパー設定ファイル')
+    parser.add_argument('--list', action='store_true', help='スクレイパー一覧を表示して終了')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='スクレイパーをimportせずに設定を検証して終了')
+    parser.add_argument('--watch', action='store_true',
+                        help='常駐モード（期限の来たスクレイパーを繰り返し実行、設定変更を自動反映）')
+    parser.add_argument('--shard', type=_shard_spec, metavar='i/N',
+                        help='過去の実行時間で N 分割したうち i 番目（1始まり）のスクレイパーだけ実行し、部分結果を保存')
+    parser.add_argument('--merge', nargs='*', metavar='PATH',
+                        help='シャード結果を統合して data/all_lotteries.json を作成（省略時は data/shards/ の最新の実行分、統合後に削除）')
+    parser.add_argument('--deadline', type=float, default=RUN_DEADLINE_SECONDS, metavar='SECONDS',
+                        help='スクレイパー実行全体の上限（秒）。超えた分は中断し、完了した結果だけ保存（0以下で無制限）')
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL_MINUTES,
+                        help='--watch の既定の実行間隔（分、スクレイパー別は interval_minutes で指定）')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """メイン処理フロー
 
     以下の処理を順番に実行：
     1. config/scrapers.yaml からスクレイパー設定を読み込み
-    2. 複数のスクレイパーを非同期で並列実行（最大5個同時）
+    2. 複数のスクレイパーを非同期で並列実行（実行時間の長い順、種類別に同時実行数を制限）
     3. ポケカ関連キーワードでフィルタリング
     4. 期限切れアイテムを除外
-    5. 統合データを data/all_lotteries.json に保存
+    5. ソース横断で商品を集約し、統合データを data/all_lotteries.json に保存
     6. URL検証スクリプト実行（無効URLを削除）
     7. Gmail通知を送信（環境変数 ENABLE_EMAIL_NOTIFICATION で制御）
 
+    --list / --dry-run の場合はスクレイパーをimportせず設定のみ扱う。
+    --watch の場合は常駐モード（watch.WatchDaemon）で実行する。
+    --shard i/N の場合は割り当てられたスクレイパーだけ実行して部分結果を保存し、
+    --merge でシャード結果を統合してから 5. 以降を実行する。
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
     Returns:
-        None
+        終了コード
     """
+    args = parse_args(argv)
+
+    if args.list or args.dry_run:
+        logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+        scrapers = load_scrapers_from_config(args.config)
+        if not scrapers:
+            print(f"スクレイパー設定を読み込めません: {args.config}")
+            return 1
+        if args.shard:
+            scrapers = sharding.select_shard(scrapers, *args.shard, sharding.load_costs())
+        if args.list:
+            list_scrapers(scrapers, source_health.load_health())
+        if args.dry_run:
+            errors = validate_scrapers(scrapers)
+            for error in errors:
+                print(f"✗ {error}")
+            active = sum(1 for c in scrapers if not c.get('skip'))
+            print(f"設定OK: {active}/{len(scrapers)}件が有効" if not errors else f"設定エラー: {len(errors)}件")
+            return 1 if errors else 0
+        return 0
+
+    setup_logging()
+
+    if args.watch:
+        from watch import WatchDaemon
+        # ホストごとの同時実行数・プローブの指紋・取得手段の段はサイクル間でメモリに保持し、
+        # サイクルごと（WatchDaemon.save_state）とサイクル途中の停止時に保存
+        try:
+            return WatchDaemon(args.config, default_interval=args.interval).run()
+        finally:
+            host_control.save()
+            probe.save()
+            tiering.save()
+
+    if args.merge is not None:
+        if args.merge:
+            return merge_results(args.merge)
+        # 省略時は最新の実行分だけを統合し、成功したら data/shards/ を空にする（以前の実行の残りを混ぜない）
+        code = merge_results(sharding.find_shard_files())
+        if code == 0:
+            sharding.clear_shard_files()
+        return code
+
     logger.info("=" * 60)
     logger.info("ポケモンカード抽選情報収集開始")
     logger.info(f"実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -438,21 +828,108 @@ def main() -> None:
         'zero_alert_sources': []
     }
 
-    scrapers = load_scrapers_from_config('config/scrapers.yaml')
+    scrapers = load_scrapers_from_config(args.config)
 
     if not scrapers:
-        logger.error("Failed to load scrapers from config/scrapers.yaml")
-        return
+        logger.error(f"Failed to load scrapers from {args.config}")
+        return 1
+
+    costs = sharding.load_costs()
+    if args.shard:
+        index, total = args.shard
+        scrapers = sharding.select_shard(scrapers, index, total, costs)
+        logger.info(f"シャード {index}/{total}: {', '.join(c['name'] for c in scrapers) or '割り当てなし'}")
+
+    # 失敗が続いて停止中のソースは実行しない（再試行時期のソースは短い制限時間で試す）
+    scrapers, _ = source_health.plan_run(scrapers, source_health.load_health())
+
+    # asyncio.run で並列実行（期限を過ぎたスクレイパーは中断し、完了した分だけ保存する）
+    deadline = time.monotonic() + args.deadline if args.deadline > 0 else None
+    durations: Dict[str, float] = {}
+    outcomes: Dict[str, Optional[str]] = {}
+    # 解析用プロセスプールは起動しない（requests / API 系はスクレイパーごとの子プロセスで実行され、
+    # 解析もその中で行うため。プールは同一プロセスで取得する常駐モードでのみ使う）
+    results = asyncio.run(run_scrapers_async(scrapers, all_results, durations=durations, costs=costs,
+                                             deadline=deadline, outcomes=outcomes))
+
+    if args.shard:
+        # 部分結果のみ保存し、統合・通知は --merge で行う
+        # ホスト・プローブ・段・API エンドポイントの学習結果も部分結果に含め、--merge でまとめて保存する
+        from scrapers import api_capture
+        names = [config['name'] for config in scrapers]
+        state = {'hosts': host_control.snapshot(), 'probe': probe.export_state(names),
+                 'tiers': tiering.export_state(names), 'api_endpoints': api_capture.export_state()}
+        path = sharding.shard_path(index, total)
+        save_data(sharding.build_shard_result(index, total, scrapers, all_results['timestamp'], results, durations,
+                                              outcomes, state), path)
+        logger.info(f"シャード結果を保存: {path}")
+        return 0
+
+    sharding.update_costs(durations)
+    host_control.save()
+    probe.save()
+    tiering.save()
+    update_source_health(all_results, outcomes)
+    complete_run(all_results)
+    return 0
+
+
+def merge_results(paths: List[str]) -> int:
+    """シャード結果を統合し、通常実行と同じ後処理を行う（--merge 用）
 
-    # asyncio.run で並列実行
-    asyncio.run(run_scrapers_async(scrapers, all_results))
+    Args:
+        paths: シャード結果ファイル
 
-    # 統合データを保存
-    save_data(all_results, 'data/all_lotteries.json')
+    Returns:
+        終了コード
+    """
+    outcomes: Dict[str, Optional[str]] = {}
+    state: Dict[str, Dict[str, Any]] = {}
+    try:
+        all_results, durations = sharding.merge_shards(paths, outcomes, state)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"シャード結果を統合できません: {e}")
+        return 1
+
+    logger.info(f"シャード結果を統合: {len(paths)}件 → {len(all_results['sources'])}ソース")
+    sharding.update_costs(durations)
+    host_control.merge_state(state.get('hosts', {}))
+    probe.merge_state(state.get('probe', {}))
+    tiering.merge_state(state.get('tiers', {}))
+    if state.get('api_endpoints'):
+        from scrapers import api_capture
+        api_capture.merge_state(state['api_endpoints'])
+    update_source_health(all_results, outcomes)
+    complete_run(all_results)
+    return 0
+
+
+def update_source_health(all_results: Dict[str, Any], outcomes: Dict[str, Optional[str]]) -> None:
+    """今回の成否をソースの取得状態に反映し、レポート用に統合データへ付与
+
+    Args:
+        all_results: 統合データ（source_health を追加）
+        outcomes: スクレイパー名 → 失敗理由（成功は None）
+    """
+    health = source_health.load_health()
+    if outcomes:
+        source_health.record_outcomes(health, outcomes)
+        source_health.save_health(health)
+    all_results['source_health'] = source_health.report_entries(health)
+
+
+def complete_run(all_results: Dict[str, Any]) -> None:
+    """統合データの保存・サマリー・0件アラート・URL検証・通知
+
+    Args:
+        all_results: 統合データ（sources, zero_alert_sources）
+    """
+    finalize_results(all_results)
 
     logger.info("\n" + "=" * 60)
     logger.info("収集完了")
     logger.info("=" * 60)
+    retry.log_metrics()
 
     # サマリー表示
     total_lotteries = sum(len(s.get('lotteries', [])) for s in all_results['sources'])
@@ -484,4 +961,4 @@ def main() -> None:
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
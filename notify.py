@@ -5,13 +5,13 @@ import json
 import logging
 import os
 import smtplib
-import time
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Optional, List, Dict, Any
 
-from utils import parse_date_flexible
+import retry
+from view_model import multi_store_offers, view_of
 
 logger = logging.getLogger(__name__)
 
@@ -27,50 +27,6 @@ class GmailNotifier:
         self.smtp_password = os.environ.get('SMTP_PASSWORD')
         self.recipient = os.environ.get('RECIPIENT_EMAIL')
 
-    def _parse_date(self, date_string: Optional[str]) -> Optional[datetime]:
-        """日付文字列をdatetime オブジェクトに変換（utils.parse_date_flexible を使用）"""
-        if not date_string or not isinstance(date_string, str):
-            return None
-
-        parsed_date = parse_date_flexible(date_string)
-        if parsed_date:
-            return datetime.combine(parsed_date, datetime.min.time())
-        return None
-
-        formats = ['%Y-%m-%d', '%Y/%m/%d', '%Y年%m月%d日']
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_string, fmt)
-            except ValueError:
-                continue
-        return None
-
-    def _is_ended(self, end_date_str: Optional[str]) -> bool:
-        """抽選が終了しているか判定（end_date < 今日）"""
-        if not end_date_str:
-            return False
-        end_date = self._parse_date(end_date_str)
-        if not end_date:
-            return False
-        return end_date.date() < datetime.now().date()
-
-    def _days_until_deadline(self, end_date_str: Optional[str]) -> Optional[int]:
-        """期限までの日数を計算（負なら既に終了）"""
-        if not end_date_str:
-            return None
-        end_date = self._parse_date(end_date_str)
-        if not end_date:
-            return None
-        delta = (end_date.date() - datetime.now().date()).days
-        return delta
-
-    def _is_deadline_soon(self, end_date_str: Optional[str], days: int = 3) -> bool:
-        """期限が間近か判定（3日以内）"""
-        days_left = self._days_until_deadline(end_date_str)
-        if days_left is None:
-            return False
-        return 0 <= days_left <= days
-
     def send_notification(self, all_lotteries_data: Dict[str, Any]) -> bool:
         """抽選情報をメールで通知"""
         if not self.smtp_username or not self.smtp_password or not self.recipient:
@@ -88,11 +44,12 @@ class GmailNotifier:
         deadline_soon_items = []  # 期限間近（3日以内）
         upcoming_products = all_lotteries_data.get('upcoming_products', [])
 
+        # ステータス判定は main.py のビューモデル（item['view']）を参照し、日付を再パースしない
         for source in all_lotteries_data.get('sources', []):
             # 受付終了済みを除外したロッテリーをフィルタ
             filtered_lotteries = [
                 item for item in source.get('lotteries', [])
-                if not self._is_ended(item.get('end_date', ''))
+                if view_of(item)['status'] != 'ended'
             ]
 
             lottery_count = len(filtered_lotteries)
@@ -101,12 +58,12 @@ class GmailNotifier:
             total_reservation_count += reservation_count
 
             # 先着販売中の商品を抽出（受付終了済みを除外）
-            fcfs_items = [item for item in filtered_lotteries if item.get('first_come_first_served')]
+            fcfs_items = [item for item in filtered_lotteries if view_of(item)['fcfs']]
             total_first_come_first_served += len(fcfs_items)
             first_come_first_served_items.extend(fcfs_items)
 
             # 期限間近（3日以内）を抽出
-            deadline_soon = [item for item in filtered_lotteries if self._is_deadline_soon(item.get('end_date', ''))]
+            deadline_soon = [item for item in filtered_lotteries if view_of(item)['deadline_soon']]
             deadline_soon_items.extend(deadline_soon)
 
             # 各ソースの upcoming_products を集約
@@ -139,7 +96,7 @@ class GmailNotifier:
         all_lotteries_flat = []
         for source in sources_summary:
             all_lotteries_flat.extend(source.get('lotteries', []))
-        new_items_count = sum(1 for item in all_lotteries_flat if self._is_new(item.get('timestamp', '')))
+        new_items_count = sum(1 for item in all_lotteries_flat if view_of(item)['is_new'])
         deadline_soon_count = len(deadline_soon_items)
 
         # メール本文を作成（期限間近データを最上部に表示）
@@ -151,10 +108,11 @@ class GmailNotifier:
             upcoming_products,
             deadline_soon_items,
             zero_alert=zero_alert,
-            zero_alert_sources=all_lotteries_data.get('zero_alert_sources', [])
+            zero_alert_sources=all_lotteries_data.get('zero_alert_sources', []),
+            products=all_lotteries_data.get('products', [])
         )
 
-        # メールを送信（リトライ機能付き: exponential backoff 2s, 4s, 8s）
+        # メールを送信（リトライ付き、retry.SMTP）
         msg = MIMEMultipart('alternative')
         subject_parts = []
 
@@ -187,48 +145,32 @@ class GmailNotifier:
         html_part = MIMEText(email_body, 'html')
         msg.attach(html_part)
 
-        # リトライ（最大3回）
-        max_retries = 3
-        backoff_times = [2, 4, 8]  # 秒単位
-
-        for attempt in range(max_retries):
-            try:
-                # SMTPサーバーに接続して送信
-                if self.smtp_port == 465:
-                    with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=30) as server:
-                        server.login(self.smtp_username, self.smtp_password)
-                        server.send_message(msg)
-                else:
-                    with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                        server.starttls()
-                        server.login(self.smtp_username, self.smtp_password)
-                        server.send_message(msg)
-
-                logger.info(f"✅ メール通知を送信しました: {self.recipient}")
-                return True
-
-            except smtplib.SMTPAuthenticationError as e:
-                logger.error(f"❌ SMTP認証エラー（試行{attempt+1}/{max_retries}）: {e}")
-                # 認証エラーはリトライしない
-                return False
-
-            except (smtplib.SMTPException, ConnectionError, TimeoutError) as e:
-                if attempt < max_retries - 1:
-                    wait_time = backoff_times[attempt]
-                    logger.warning(f"⚠️ メール送信エラー（試行{attempt+1}/{max_retries}）: {e}. {wait_time}秒後にリトライします...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"❌ メール送信が{max_retries}回失敗しました: {e}")
-                    return False
-
-            except Exception as e:
-                logger.error(f"❌ 予期しないメール送信エラー（試行{attempt+1}/{max_retries}）: {e}")
-                if attempt < max_retries - 1:
-                    wait_time = backoff_times[attempt]
-                    logger.info(f"ℹ️ {wait_time}秒後にリトライします...")
-                    time.sleep(wait_time)
-                else:
-                    return False
+        def send_once(attempt: int) -> None:
+            # SMTPサーバーに接続して送信
+            if self.smtp_port == 465:
+                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=30) as server:
+                    server.login(self.smtp_username, self.smtp_password)
+                    server.send_message(msg)
+            else:
+                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
+                    server.starttls()
+                    server.login(self.smtp_username, self.smtp_password)
+                    server.send_message(msg)
+
+        # リトライは retry.SMTP の方針（ジッタ付きバックオフ、認証エラーはリトライしない）
+        try:
+            retry.call(retry.SMTP, send_once, 'SMTP send',
+                       retry_on=(smtplib.SMTPException, OSError),
+                       give_up_on=(smtplib.SMTPAuthenticationError,))
+            logger.info(f"✅ メール通知を送信しました: {self.recipient}")
+            return True
+        except smtplib.SMTPAuthenticationError as e:
+            logger.error(f"❌ SMTP認証エラー: {e}")
+            return False
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"❌ メール送信が{retry.SMTP.max_attempts}回失敗しました: {e}")
+        except Exception as e:
+            logger.error(f"❌ 予期しないメール送信エラー: {e}")
 
         # フォールバック: メール送信失敗時にHTMLを保存
         logger.warning("⚠️ メール送信失敗。フォールバック: logs/notification_fallback.html に内容を保存します")
@@ -242,37 +184,19 @@ class GmailNotifier:
 
         return False
 
-    def _is_new(self, item_timestamp: Optional[str]) -> bool:
-        """アイテムが24時間以内に追加されたかチェック"""
-        if not item_timestamp:
-            return False
-        try:
-            from datetime import timedelta
-            item_time = datetime.fromisoformat(item_timestamp)
-            current_time = datetime.now()
-            return (current_time - item_time) < timedelta(hours=24)
-        except (ValueError, TypeError):
-            return False
-
-    def _is_active(self, start_date_str: Optional[str], end_date_str: Optional[str]) -> bool:
-        """抽選が「受付中」かどうか判定"""
-        if not end_date_str:
-            return False
-        # 受付終了していなければ受付中と判定
-        return not self._is_ended(end_date_str)
-
     def _sort_lotteries_by_status(self, lotteries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """抽選を受付中優先でソート"""
         active = []
         inactive = []
         for lottery in lotteries:
-            if self._is_active(lottery.get('start_date', ''), lottery.get('end_date', '')):
+            view = view_of(lottery)
+            if view['end'] and view['status'] != 'ended':
                 active.append(lottery)
             else:
                 inactive.append(lottery)
         return active + inactive
 
-    def _create_email_body(self, sources_summary: List[Dict[str, Any]], total_lottery_count: int, total_reservation_count: int, first_come_first_served_items: Optional[List[Dict[str, Any]]] = None, upcoming_products: Optional[List[Dict[str, Any]]] = None, deadline_soon_items: Optional[List[Dict[str, Any]]] = None, zero_alert: bool = False, zero_alert_sources: Optional[List[str]] = None) -> str:
+    def _create_email_body(self, sources_summary: List[Dict[str, Any]], total_lottery_count: int, total_reservation_count: int, first_come_first_served_items: Optional[List[Dict[str, Any]]] = None, upcoming_products: Optional[List[Dict[str, Any]]] = None, deadline_soon_items: Optional[List[Dict[str, Any]]] = None, zero_alert: bool = False, zero_alert_sources: Optional[List[str]] = None, products: Optional[List[Dict[str, Any]]] = None) -> str:
         """メール本文（HTML）を作成"""
         if first_come_first_served_items is None:
             first_come_first_served_items = []
@@ -282,6 +206,8 @@ class GmailNotifier:
             deadline_soon_items = []
         if zero_alert_sources is None:
             zero_alert_sources = []
+        if products is None:
+            products = []
 
         # フィルタ: 各ソースのロッテリーから受付終了済みをさらに除外
         filtered_sources_summary = []
@@ -291,7 +217,7 @@ class GmailNotifier:
                 'name': source.get('name', 'Unknown'),
                 'lottery_count': 0,
                 'reservation_count': source.get('reservation_count', 0),
-                'lotteries': [item for item in source.get('lotteries', []) if not self._is_ended(item.get('end_date', ''))],
+                'lotteries': [item for item in source.get('lotteries', []) if view_of(item)['status'] != 'ended'],
                 'reservations': source.get('reservations', [])
             }
             # ロッテリーが1件でもあれば、またはリザベーションがあれば含める
@@ -501,7 +427,7 @@ class GmailNotifier:
                 product = item.get('product', '')
                 store = item.get('store', '')
                 end_date = item.get('end_date', '')
-                days_left = self._days_until_deadline(end_date)
+                days_left = view_of(item)['days_left']
                 days_text = f'あと{days_left}日' if days_left is not None else ''
                 url = item.get('detail_url', '#')
                 html += f"""
@@ -551,6 +477,35 @@ class GmailNotifier:
         </div>
 """
 
+        # 複数店舗で受付中の商品（集約済み商品ビュー、上限15件）
+        multi_store_products = multi_store_offers(products)
+        if multi_store_products:
+            html += f"""
+        <div class="source-section">
+            <div class="section-title">🧩 複数店舗で受付中の商品 - 全{len(multi_store_products)}件</div>
+"""
+            for product, offers in multi_store_products[:15]:
+                stores_text = '、'.join(
+                    f'<a href="{offer.get("url") or "#"}" target="_blank">{offer.get("store", "")}</a>'
+                    for offer in offers
+                )
+                html += f"""
+            <div class="lottery-item">
+                <div class="product-name">📦 {product.get('name', '')}</div>
+                <div class="store-name">🏪 {len(offers)}件: {stores_text}</div>
+            </div>
+"""
+            if len(multi_store_products) > 15:
+                remaining = len(multi_store_products) - 15
+                html += f"""
+            <div style="text-align: center; color: #718096; margin-top: 15px;">
+                ... 他 {remaining} 件
+            </div>
+"""
+            html += """
+        </div>
+"""
+
         # 各ソースの情報を追加（受付終了済みを除外したフィルタ済みデータを使用）
         for source in filtered_sources_summary:
             source_count_parts = []
@@ -584,9 +539,8 @@ class GmailNotifier:
                     store = lottery.get('store', '')
                     product = lottery.get('product', '')
                     detail_url = lottery.get('detail_url', '#')
-                    timestamp = lottery.get('timestamp', '')
                     end_date = lottery.get('end_date', '')
-                    is_new = self._is_new(timestamp)
+                    is_new = view_of(lottery)['is_new']
                     new_badge = '<span class="badge-new">🆕 NEW</span>' if is_new else ''
 
                     # P1: end_date をハイライト
@@ -628,8 +582,7 @@ class GmailNotifier:
                     availability = reservation.get('availability', '')
                     url = reservation.get('url', '#')
                     release_date = reservation.get('release_date', '')
-                    timestamp = reservation.get('timestamp', '')
-                    is_new = self._is_new(timestamp)
+                    is_new = view_of(reservation)['is_new']
                     new_badge = '<span class="badge-new">🆕 NEW</span>' if is_new else ''
 
                     # P4: 価格表示
@@ -0,0 +1,265 @@
+"""
+ブラウザ描画前の事前プローブ（変化がなければ Playwright を起動しない）
+
+設定の probe を持つスクレイパーは、本処理の前に対象URLを HTTP で軽く取得し、
+前回描画したときの指紋と比べる。変化がなく、前回の描画から max_stale_hours 以内なら
+前回データを再利用する（main.execute_scraper 参照）。
+
+    probe:
+      url: https://example.com/lottery   # 複数なら urls: [...]
+      mode: headers                      # headers / body / json（既定 body）
+      ignore: ['csrf=[0-9a-f]+']         # body: 指紋から除く正規表現（毎回変わるトークン等）
+      max_stale_hours: 12                # 省略時は PROBE_MAX_STALE_HOURS
+
+- headers: ETag / Last-Modified で条件付き GET（304 なら変化なし）。どちらも返さないサーバーは本文で比較
+- body: 生の HTML（ignore を除いたもの）のハッシュ
+- json: JSON エンドポイントの内容（キー順を正規化）のハッシュ
+
+指紋は本処理が成功して保存されたときだけ更新し（commit）、data/probe_state.json に保存する。
+プローブ自体の失敗は「変化あり」として扱い、必ず本処理を行う。
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from constants import PROBE_MAX_STALE_HOURS, PROBE_STATE_FILE, PROBE_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+MODES = ('headers', 'body', 'json')
+
+
+def probe_config(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """スクレイパー設定の probe を正規化（未設定・不正はNone）
+
+    Returns:
+        {'urls', 'mode', 'ignore', 'max_stale_hours'}
+    """
+    spec = config.get('probe')
+    if not isinstance(spec, dict):
+        return None
+    urls = spec.get('urls') or ([spec['url']] if spec.get('url') else [])
+    mode = spec.get('mode', 'body')
+    if not urls or mode not in MODES:
+        return None
+    return {
+        'urls': list(urls),
+        'mode': mode,
+        'ignore': [re.compile(pattern) for pattern in spec.get('ignore', [])],
+        'max_stale_hours': spec.get('max_stale_hours', PROBE_MAX_STALE_HOURS),
+    }
+
+
+def validate(config: Dict[str, Any]) -> Optional[str]:
+    """probe 設定の誤り（--dry-run 用、問題なければNone）"""
+    spec = config.get('probe')
+    if spec is None:
+        return None
+    if not isinstance(spec, dict) or not (spec.get('url') or spec.get('urls')):
+        return f"{config.get('name')}: probe に url / urls がありません"
+    if spec.get('mode', 'body') not in MODES:
+        return f"{config.get('name')}: probe.mode は {' / '.join(MODES)} のいずれか"
+    try:
+        [re.compile(pattern) for pattern in spec.get('ignore', [])]
+    except re.error as e:
+        return f"{config.get('name')}: probe.ignore の正規表現が不正 ({e})"
+    return None
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _body_hash(spec: Dict[str, Any], response) -> str:
+    """本文の指紋（json はキー順を正規化、body は ignore を除去）"""
+    if spec['mode'] == 'json':
+        return _digest(json.dumps(response.json(), sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    text = response.text
+    for pattern in spec['ignore']:
+        text = pattern.sub('', text)
+    return _digest(text.encode('utf-8'))
+
+
+def fetch_fingerprints(spec: Dict[str, Any], known: Optional[Dict[str, Dict[str, Any]]] = None,
+                       timeout: float = PROBE_TIMEOUT_SECONDS) -> Dict[str, Dict[str, Any]]:
+    """対象URLの指紋を取得
+
+    Args:
+        spec: probe_config() の戻り値
+        known: URL → 前回の指紋（headers の条件付き GET に使用）
+
+    Returns:
+        URL → {'etag', 'last_modified', 'hash'}（304 の場合は前回の指紋）
+
+    Raises:
+        requests.RequestException: 通信エラー・4xx/5xx
+        ValueError: json で本文が JSON でない
+    """
+    # import main を軽く保つため、通信ライブラリはプローブ実行時に読み込む
+    import requests
+
+    import host_control
+    from scrapers.requests_base import RequestsBaseScraper
+
+    known = known or {}
+    fingerprints = {}
+    with requests.Session() as session:
+        session.headers['User-Agent'] = RequestsBaseScraper.DEFAULT_USER_AGENT
+        for url in spec['urls']:
+            previous = known.get(url) or {}
+            headers = {}
+            if spec['mode'] == 'headers':
+                if previous.get('etag'):
+                    headers['If-None-Match'] = previous['etag']
+                if previous.get('last_modified'):
+                    headers['If-Modified-Since'] = previous['last_modified']
+            with host_control.controller().request(host_control.host_of(url)) as report:
+                response = session.get(url, headers=headers, timeout=timeout)
+                report['outcome'] = host_control.classify_status(response.status_code)
+            if response.status_code == 304 and previous:
+                fingerprints[url] = dict(previous)
+                continue
+            response.raise_for_status()
+            fingerprint = {'etag': response.headers.get('ETag'),
+                           'last_modified': response.headers.get('Last-Modified'), 'hash': None}
+            if spec['mode'] != 'headers' or not (fingerprint['etag'] or fingerprint['last_modified']):
+                fingerprint['hash'] = _body_hash(spec, response)
+            fingerprints[url] = fingerprint
+    return fingerprints
+
+
+def _same(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> bool:
+    """指紋が一致するか（取得できた検証子・ハッシュを比較）"""
+    if not previous:
+        return False
+    keys = [key for key in ('hash', 'etag', 'last_modified') if current.get(key)]
+    return bool(keys) and all(previous.get(key) == current[key] for key in keys)
+
+
+class ProbeStore:
+    """ソース名 → {'fingerprints', 'rendered_at', 'checked_at'}（スレッドセーフ）"""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = dict(entries or {})
+        self._dirty = False
+
+    def check(self, name: str, spec: Dict[str, Any],
+              now: Optional[datetime] = None) -> Tuple[bool, Optional[Dict[str, Dict[str, Any]]]]:
+        """プローブを実行し、前回の描画から変化がないか判定
+
+        Args:
+            name: スクレイパー名
+            spec: probe_config() の戻り値
+            now: 現在時刻（テスト用）
+
+        Returns:
+            (変化なし, 今回の指紋)。変化なしでも描画期限切れなら False。
+            プローブに失敗した場合は (False, None)
+        """
+        now = now or datetime.now()
+        with self._lock:
+            entry = dict(self._entries.get(name) or {})
+        known = entry.get('fingerprints') or {}
+        try:
+            current = fetch_fingerprints(spec, known)
+        except Exception as e:
+            logger.info(f"🔎 {name}: プローブに失敗したため通常どおり取得 ({type(e).__name__}: {e})")
+            return False, None
+
+        if not all(_same(known.get(url), fingerprint) for url, fingerprint in current.items()):
+            return False, current
+        rendered_at = entry.get('rendered_at')
+        if not rendered_at or now - datetime.fromisoformat(rendered_at) >= timedelta(hours=spec['max_stale_hours']):
+            logger.info(f"🔎 {name}: 変化なし（前回の描画から {spec['max_stale_hours']} 時間以上のため取得）")
+            return False, current
+        with self._lock:
+            self._entries.setdefault(name, {})['checked_at'] = now.isoformat()
+            self._dirty = True
+        return True, current
+
+    def commit(self, name: str, fingerprints: Optional[Dict[str, Dict[str, Any]]],
+               now: Optional[datetime] = None) -> None:
+        """本処理の成功後に指紋と描画時刻を記録（プローブ失敗時は何もしない）"""
+        if not fingerprints:
+            return
+        now = now or datetime.now()
+        with self._lock:
+            self._entries[name] = {'fingerprints': fingerprints, 'rendered_at': now.isoformat(),
+                                   'checked_at': now.isoformat()}
+            self._dirty = True
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._entries.items()}
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+_store: Optional[ProbeStore] = None
+_store_lock = threading.Lock()
+
+
+def load_state(path: str = PROBE_STATE_FILE) -> Dict[str, Dict[str, Any]]:
+    """保存済みの指紋を読み込み"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {name: entry for name, entry in data.items() if isinstance(entry, dict)}
+
+
+def store() -> ProbeStore:
+    """プロセス共通の指紋（初回使用時に読み込む）"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProbeStore(load_state())
+        return _store
+
+
+def save(path: str = PROBE_STATE_FILE) -> None:
+    """指紋を保存（今回更新がなければ何もしない）"""
+    if _store is None or not _store.dirty:
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(_store.entries().items())), f, ensure_ascii=False, indent=2)
+
+
+def export_state(names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """指定したソースの指紋（--shard の結果に含め、--merge で保存する。記録なしは None）"""
+    if _store is None:
+        return {}
+    entries = _store.entries()
+    return {name: entries.get(name) for name in names}
+
+
+def merge_state(entries: Dict[str, Optional[Dict[str, Any]]], path: str = PROBE_STATE_FILE) -> None:
+    """シャードごとの指紋を保存済みの指紋に反映（--merge 用、None の記録は消す）"""
+    if not entries:
+        return
+    state = load_state(path)
+    for name, entry in entries.items():
+        if entry is None:
+            state.pop(name, None)
+        else:
+            state[name] = entry
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(state.items())), f, ensure_ascii=False, indent=2)
+
+
+def reset() -> None:
+    """プロセス共通の指紋を破棄（テスト用）"""
+    global _store
+    with _store_lock:
+        _store = None
@@ -0,0 +1,218 @@
+"""
+抽選・予約・発売予定アイテムのレコード型
+
+スクレイパーごとに異なるキー（product / product_name / title、url / detail_url）を
+main.py の取り込み時に1回だけ正規化し、__slots__ ベースのレコードに格納する。
+店舗名・ソース名などの繰り返し出現する文字列は sys.intern で共有する。
+
+レコードは MutableMapping として振る舞うため、既存の item.get('...') /
+item['...'] = ... はそのまま使える（別名キーの参照は正規化後のフィールドを返す）。
+JSON保存時は to_json を json.dump の default に渡す。
+"""
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# インターンする（値の種類が少なく繰り返し出現する）フィールド
+INTERNED_FIELDS = frozenset({'store', 'source', 'lottery_type', 'status', 'availability'})
+
+
+class Record(MutableMapping):
+    """レコード型の基底クラス
+
+    FIELDS にないキーは _extra（必要になった時だけ作成する辞書）に保持する。
+    値が None のフィールドは未設定として扱う。
+    """
+
+    __slots__ = ('_extra',)
+
+    FIELDS: Tuple[str, ...] = ()
+    # 別名キー → 正規化後のフィールド名
+    ALIASES: Dict[str, str] = {}
+    _field_set: frozenset = frozenset()
+
+    def __init__(self, **values: Any):
+        self._extra = None
+        for field in self.FIELDS:
+            object.__setattr__(self, field, None)
+        for key, value in values.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping, keep: Optional[Iterable[str]] = None) -> 'Record':
+        """辞書からレコードを作成（別名キーを正規化）
+
+        Args:
+            data: スクレイパーが返したアイテム
+            keep: 指定した場合はこのキーだけを残す（正規化後の名前で指定）
+
+        Returns:
+            レコード
+        """
+        record = cls.__new__(cls)
+        record._extra = None
+        keep = frozenset(keep) if keep is not None else None
+        fields = cls._field_set
+        for field in cls.FIELDS:
+            value = data.get(field)
+            if keep is not None and field not in keep:
+                value = None
+            elif field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(record, field, value)
+
+        for key, value in data.items():
+            if key in fields or value is None:
+                continue
+            field = cls.ALIASES.get(key)
+            if field is not None and (keep is None or field in keep) and getattr(record, field) in (None, ''):
+                # 正規フィールドが空なら別名の値で埋める
+                object.__setattr__(record, field, value)
+            elif keep is None or key in keep:
+                if record._extra is None:
+                    record._extra = {}
+                record._extra[key] = value
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON保存用の辞書に変換（未設定フィールドは省略）"""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def _resolve(self, key: str) -> Optional[str]:
+        """キーに対応するフィールド名（フィールドでなければNone）"""
+        if key in self._field_set:
+            return key
+        if self._extra and key in self._extra:
+            return None
+        return self.ALIASES.get(key)
+
+    def __getitem__(self, key: str) -> Any:
+        field = self._resolve(key)
+        if field is not None:
+            value = getattr(self, field)
+            if value is not None:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        field = self._resolve(key)
+        if field is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        if field in INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        object.__setattr__(self, field, value)
+
+    def __delitem__(self, key: str) -> None:
+        field = self._resolve(key)
+        if field is not None and getattr(self, field) is not None:
+            object.__setattr__(self, field, None)
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(1 for field in self.FIELDS if getattr(self, field) is not None)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        restored = self.from_dict(state)
+        for slot in ('_extra',) + self.FIELDS:
+            object.__setattr__(self, slot, getattr(restored, slot))
+
+
+class LotteryRecord(Record):
+    """抽選情報"""
+
+    FIELDS = (
+        'product', 'store', 'source', 'lottery_type', 'start_date', 'end_date',
+        'announcement_date', 'conditions', 'detail_url', 'price', 'period', 'status', 'timestamp',
+    )
+    __slots__ = FIELDS
+    ALIASES = {'product_name': 'product', 'title': 'product', 'url': 'detail_url'}
+
+
+class ReservationRecord(Record):
+    """予約情報"""
+
+    FIELDS = (
+        'product', 'store', 'source', 'price', 'availability', 'release_date',
+        'detail_url', 'status', 'timestamp',
+    )
+    __slots__ = FIELDS
+    ALIASES = {'product_name': 'product', 'title': 'product', 'url': 'detail_url'}
+
+
+class UpcomingProductRecord(Record):
+    """発売予定情報"""
+
+    FIELDS = ('product_name', 'release_date', 'lottery_schedule', 'store', 'source', 'detail_url')
+    __slots__ = FIELDS
+    ALIASES = {'product': 'product_name', 'name': 'product_name', 'title': 'product_name', 'url': 'detail_url'}
+
+
+# スクレイパー結果のキー → レコード型
+RECORD_TYPES = {
+    'lotteries': LotteryRecord,
+    'reservations': ReservationRecord,
+    'upcoming_products': UpcomingProductRecord,
+}
+
+
+def ingest(data: Dict[str, Any]) -> int:
+    """スクレイパー結果のアイテムをレコードに変換（in-place更新）
+
+    Args:
+        data: スクレイパーの scrape() の戻り値
+
+    Returns:
+        変換したアイテム数
+    """
+    count = 0
+    for key, record_type in RECORD_TYPES.items():
+        items = data.get(key)
+        if not isinstance(items, list):
+            continue
+        data[key] = [
+            item if isinstance(item, Record) else record_type.from_dict(item)
+            for item in items
+            if isinstance(item, Mapping)
+        ]
+        count += len(data[key])
+    return count
+
+
+def to_json(value: Any) -> Dict[str, Any]:
+    """json.dump の default 用（レコードを辞書に変換）"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
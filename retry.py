@@ -0,0 +1,259 @@
+"""
+リトライ方針（HTTP / Playwright / X API / SMTP で共通）
+
+- 待ち時間は指数バックオフ＋ジッタ。Retry-After があればそれに従い、
+  max_delay を超える指定（長時間の制限）は待たずに諦める
+- 実行全体の再試行回数に種類別の予算（constants.RETRY_BUDGETS）を設け、
+  使い切ったら以降は再試行しない（障害時に全スクレイパーが待ち続けないようにする）。
+  子プロセス（scrapers.isolated）は開始時に親の消費数を引き継いで残りの予算だけを使い、
+  子の再試行回数は集計とともに親に加算する
+- 同期版 call() はスレッド内で sleep、非同期版 call_async() は asyncio.sleep で待つ
+- 再試行・諦め・予算切れ・待ち時間をポリシー別に集計する（metrics() / log_metrics()）
+
+呼び出し側は1回分の処理を func(attempt) として渡し、再試行したい結果は
+Retry を送出して伝える（retry_on に指定した例外も再試行する）。
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from constants import RETRY_BUDGETS
+
+logger = logging.getLogger(__name__)
+
+METRIC_KEYS = ('calls', 'retries', 'give_ups', 'budget_exhausted', 'wait_seconds')
+
+_lock = threading.Lock()
+_budget_used: Dict[str, int] = {}
+_metrics: Dict[str, Dict[str, float]] = {}
+
+
+class Retry(Exception):
+    """この試行を再試行する（func から送出）"""
+
+    def __init__(self, reason: str, retry_after: Optional[float] = None):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(reason)
+
+
+class RetryExhausted(RuntimeError):
+    """再試行回数・予算を使い切った（Retry で失敗した場合）"""
+
+
+class RetryPolicy:
+    """リトライ方針（回数と待ち時間。予算と集計は name 単位で共有）"""
+
+    def __init__(self, name: str, max_attempts: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 30.0, jitter: float = 0.5):
+        """
+        Args:
+            name: ポリシー名（予算・集計の単位）
+            max_attempts: 最大試行回数（初回を含む）
+            base_delay: 初回の再試行までの待ち時間（秒、以降は倍）
+            max_delay: 待ち時間の上限（秒、Retry-After がこれを超えたら諦める）
+            jitter: 待ち時間を減らす割合の上限（0〜1）
+        """
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def with_attempts(self, max_attempts: int) -> 'RetryPolicy':
+        """試行回数だけ変えたポリシー（予算・集計は共有）"""
+        return RetryPolicy(self.name, max_attempts, self.base_delay, self.max_delay, self.jitter)
+
+    def backoff(self, attempt: int) -> float:
+        """attempt 回目（0始まり）の失敗後の待ち時間（ジッタ付き）"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay * (1 - random.uniform(0, self.jitter))
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """再試行までの待ち時間（再試行しない場合はNone）
+
+        Args:
+            attempt: 失敗した試行（0始まり）
+            retry_after: サーバーが指定した待ち時間（秒）
+
+        Returns:
+            待ち時間（秒）。回数・予算を使い切った、または Retry-After が長すぎる場合はNone
+        """
+        if attempt + 1 >= self.max_attempts:
+            _count(self.name, 'give_ups')
+            return None
+        if retry_after is not None and retry_after > self.max_delay:
+            _count(self.name, 'give_ups')
+            return None
+        if not _take_budget(self.name):
+            _count(self.name, 'budget_exhausted')
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        _count(self.name, 'retries')
+        _count(self.name, 'wait_seconds', delay)
+        return delay
+
+
+# 種類別の既定ポリシー
+HTTP = RetryPolicy('http', max_attempts=3, base_delay=1.0, max_delay=30.0)
+BROWSER = RetryPolicy('browser', max_attempts=3, base_delay=2.0, max_delay=20.0)
+API = RetryPolicy('api', max_attempts=3, base_delay=2.0, max_delay=60.0)
+SMTP = RetryPolicy('smtp', max_attempts=3, base_delay=2.0, max_delay=8.0)
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Retry-After ヘッダ（秒数または HTTP-date）を秒数に変換（不正・なしはNone）"""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def call(policy: RetryPolicy, func: Callable[[int], Any], description: str = '',
+         retry_on: Tuple[Type[BaseException], ...] = (),
+         give_up_on: Tuple[Type[BaseException], ...] = ()) -> Any:
+    """func(attempt) を方針に従って再試行（同期版、待機は time.sleep）
+
+    Args:
+        policy: リトライ方針
+        func: 1回分の処理（引数は試行番号、0始まり）
+        description: ログ用の説明（URL等）
+        retry_on: 再試行する例外
+        give_up_on: retry_on に含まれても再試行しない例外（認証エラー等）
+
+    Returns:
+        func の戻り値
+
+    Raises:
+        RetryExhausted: Retry で失敗し続けた場合
+        retry_on の例外: 最後の試行で送出された例外
+    """
+    _count(policy.name, 'calls')
+    attempt = 0
+    while True:
+        try:
+            return func(attempt)
+        except give_up_on:
+            raise
+        except (Retry, *retry_on) as e:
+            delay = _decide(policy, attempt, e, description)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def call_async(policy: RetryPolicy, func: Callable[[int], Awaitable[Any]], description: str = '',
+                     retry_on: Tuple[Type[BaseException], ...] = (),
+                     give_up_on: Tuple[Type[BaseException], ...] = ()) -> Any:
+    """call() の非同期版（待機は asyncio.sleep でイベントループを止めない）"""
+    _count(policy.name, 'calls')
+    attempt = 0
+    while True:
+        try:
+            return await func(attempt)
+        except give_up_on:
+            raise
+        except (Retry, *retry_on) as e:
+            delay = _decide(policy, attempt, e, description)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _decide(policy: RetryPolicy, attempt: int, error: BaseException, description: str) -> float:
+    """再試行までの待ち時間を返す（再試行しない場合は例外を送出）"""
+    if isinstance(error, Retry):
+        reason, retry_after = error.reason, error.retry_after
+    else:
+        reason, retry_after = f"{type(error).__name__}: {error}", None
+    delay = policy.next_delay(attempt, retry_after)
+    if delay is None:
+        logger.warning(f"Giving up {description} after {attempt + 1} attempt(s) ({reason})")
+        if isinstance(error, Retry):
+            raise RetryExhausted(f"{description}: {reason}") from error
+        raise error
+    logger.info(f"Retry {attempt + 1}/{policy.max_attempts - 1} for {description} in {delay:.1f}s ({reason})")
+    return delay
+
+
+def _take_budget(name: str) -> bool:
+    """再試行の予算を1回分消費（予算の設定がないポリシーは無制限）"""
+    limit = RETRY_BUDGETS.get(name)
+    with _lock:
+        used = _budget_used.get(name, 0)
+        if limit is not None and used >= limit:
+            return False
+        _budget_used[name] = used + 1
+        return True
+
+
+def _count(name: str, key: str, value: float = 1) -> None:
+    with _lock:
+        metrics = _metrics.setdefault(name, dict.fromkeys(METRIC_KEYS, 0))
+        metrics[key] += value
+
+
+def metrics() -> Dict[str, Dict[str, float]]:
+    """ポリシー名 → 集計（calls, retries, give_ups, budget_exhausted, wait_seconds）"""
+    with _lock:
+        return {name: dict(values) for name, values in _metrics.items()}
+
+
+def merge_metrics(other: Dict[str, Dict[str, float]]) -> None:
+    """別プロセス（scrapers.isolated の子プロセス）の集計を加算
+
+    再試行1回につき予算を1回分消費しているため、子の再試行回数を予算の消費数にも加える。
+    """
+    for name, values in other.items():
+        for key in METRIC_KEYS:
+            if values.get(key):
+                _count(name, key, values[key])
+        if values.get('retries'):
+            with _lock:
+                _budget_used[name] = _budget_used.get(name, 0) + int(values['retries'])
+
+
+def budget_used() -> Dict[str, int]:
+    """ポリシー名 → 今回の実行で消費した再試行の予算"""
+    with _lock:
+        return dict(_budget_used)
+
+
+def inherit_budget(used: Dict[str, int]) -> None:
+    """親プロセスの予算の消費数を引き継ぐ（子プロセスの開始時、残りの予算だけを使う）
+
+    Args:
+        used: 親プロセスの budget_used()
+    """
+    with _lock:
+        _budget_used.clear()
+        _budget_used.update(used)
+
+
+def reset() -> None:
+    """予算と集計をリセット（実行・常駐モードのサイクルの開始時）"""
+    with _lock:
+        _budget_used.clear()
+        _metrics.clear()
+
+
+def log_metrics() -> None:
+    """集計をログに出力（再試行がなければ何もしない）"""
+    for name, values in sorted(metrics().items()):
+        if not (values['retries'] or values['give_ups'] or values['budget_exhausted']):
+            continue
+        logger.info(
+            f"🔁 retry[{name}]: {values['calls']:.0f}件中 再試行{values['retries']:.0f}回 "
+            f"(待機{values['wait_seconds']:.1f}秒) / 諦め{values['give_ups']:.0f}件 / 予算切れ{values['budget_exhausted']:.0f}件"
+        )
@@ -0,0 +1,102 @@
+"""
+スクレイパーの実行順序と種類別の同時実行数
+
+- 種類: browser（Playwright）/ http（requests）/ api（X API 等）。
+  設定の kind で指定し、省略時はモジュール名から判定する（playwright を含めば browser）。
+- 実行順: 過去の実行時間（data/scraper_costs.json）の長い順。履歴がなければ種類別の既定値。
+  長いスクレイパーを先に始めることで、全体の所要時間を最長のスクレイパーに近づける。
+- 同時実行数: 種類ごとに独立したセマフォで制限し、軽い http が browser の後ろで待たないようにする。
+  既定値は constants.SCRAPER_CONCURRENCY、環境変数 CONCURRENCY_BROWSER 等で上書きできる。
+  実行中に別の種類の段（tiering の fallback）へ切り替える場合は Slot.switch で枠を持ち替える。
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Mapping, Optional
+
+from constants import SCRAPER_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('browser', 'http', 'api')
+
+# 履歴がないスクレイパーの実行時間の見積もり（秒）
+DEFAULT_COSTS = {'browser': 60.0, 'http': 10.0, 'api': 5.0}
+
+
+def scraper_kind(config: Dict[str, Any]) -> str:
+    """スクレイパーの種類（browser / http / api）"""
+    kind = config.get('kind')
+    if kind in KINDS:
+        return kind
+    if kind:
+        logger.warning(f"Unknown scraper kind '{kind}' for {config.get('name', 'unknown')}, treating as http")
+    if 'playwright' in str(config.get('module', '')):
+        return 'browser'
+    return 'http'
+
+
+def estimate_cost(config: Dict[str, Any], costs: Optional[Dict[str, float]] = None) -> float:
+    """スクレイパーの実行時間の見積もり（秒、履歴がなければ種類別の既定値）"""
+    if costs and config['name'] in costs:
+        return costs[config['name']]
+    return DEFAULT_COSTS[scraper_kind(config)]
+
+
+def order_by_cost(scrapers: List[Dict[str, Any]], costs: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """実行時間の見積もりが長い順に並べる（同じ見積もりは設定の番号順）"""
+    return sorted(scrapers, key=lambda c: (-estimate_cost(c, costs), c.get('num', 0), c.get('name', '')))
+
+
+def concurrency_limits(env: Optional[Mapping[str, str]] = None) -> Dict[str, int]:
+    """種類別の同時実行数（環境変数 CONCURRENCY_<KIND> で上書き、最低1）"""
+    env = os.environ if env is None else env
+    limits = {}
+    for kind in KINDS:
+        value = env.get(f'CONCURRENCY_{kind.upper()}')
+        try:
+            limits[kind] = max(1, int(value)) if value else SCRAPER_CONCURRENCY[kind]
+        except ValueError:
+            logger.warning(f"Invalid CONCURRENCY_{kind.upper()}={value}, using {SCRAPER_CONCURRENCY[kind]}")
+            limits[kind] = SCRAPER_CONCURRENCY[kind]
+    return limits
+
+
+def make_semaphores(limits: Optional[Dict[str, int]] = None) -> Dict[str, asyncio.Semaphore]:
+    """種類別のセマフォを作成（イベントループ内で呼び出す）"""
+    limits = limits or concurrency_limits()
+    return {kind: asyncio.Semaphore(limits[kind]) for kind in KINDS}
+
+
+class Slot:
+    """種類別セマフォの枠（実行中に別の種類の枠へ持ち替えられる）
+
+        async with Slot(semaphores['http']) as slot:
+            ...
+            await slot.switch(semaphores['browser'])  # http の枠を返して browser の枠を待つ
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore):
+        self._initial = semaphore
+        self._held: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'Slot':
+        await self._initial.acquire()
+        self._held = self._initial
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        if self._held is not None:
+            self._held.release()
+            self._held = None
+
+    async def switch(self, semaphore: asyncio.Semaphore) -> None:
+        """今の枠を返して semaphore の枠を確保（同じ枠なら何もしない）"""
+        if semaphore is self._held:
+            return
+        self._release()
+        await semaphore.acquire()
+        self._held = semaphore
@@ -18,11 +18,6 @@ class AeonScraper(RequestsBaseScraper):
         # イオン（403エラーが発生するため現在無効化）
         self.search_url = None  # Bot対策で403エラーになるためスキップ
         self.source_name = 'aeonretail.com'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -70,7 +65,7 @@ class AeonScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text) and '/shop/g/' in href:
+                if self.is_pokemon_card(link_text) and '/shop/g/' in href:
                     lottery = self._parse_product_link(link, href)
                     if lottery:
                         lotteries.append(lottery)
@@ -85,7 +80,7 @@ class AeonScraper(RequestsBaseScraper):
         try:
             text = item.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = item.find('a', href=True)
@@ -105,7 +100,7 @@ class AeonScraper(RequestsBaseScraper):
             if not product_name:
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:150]
                         break
 
@@ -192,13 +187,6 @@ class AeonScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
@@ -17,11 +17,6 @@ class AmazonReservationScraper(RequestsBaseScraper):
         self.base_url = "https://www.amazon.co.jp"
         self.search_url = "https://www.amazon.co.jp/s"
         self.source_name = 'amazon.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'Pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """ポケモンカードの予約情報をスクレイピング"""
@@ -72,27 +67,27 @@ class AmazonReservationScraper(RequestsBaseScraper):
             }
 
             url = self.search_url + '?' + '&'.join(f"{k}={v}" for k, v in params.items())
-            html_content = self.fetch_html(url)
-            if not html_content:
-                return products
+            products = self.crawl_pages(url, self._parse_page, page_param='page')
 
-            soup = self.parse_soup(html_content)
-            if not soup:
-                return products
+        except Exception as e:
+            logger.error(f"  Warning: Search error for '{keyword}': {e}")
 
-            # 商品要素を取得
-            items = soup.select('[data-component-type="s-search-result"]')
+        return products
 
-            for item in items[:20]:  # 上位20件を確認
-                try:
-                    product = self._parse_product(item)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    continue
+    def _parse_page(self, soup):
+        """検索結果1ページ分の商品をパース"""
+        products = []
 
-        except Exception as e:
-            logger.error(f"  Warning: Search error for '{keyword}': {e}")
+        # 商品要素を取得
+        items = soup.select('[data-component-type="s-search-result"]')
+
+        for item in items[:20]:  # 各ページ上位20件を確認
+            try:
+                product = self._parse_product(item)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                continue
 
         return products
 
@@ -106,7 +101,7 @@ class AmazonReservationScraper(RequestsBaseScraper):
             title = title_elem.get_text(strip=True)
 
             # ポケモンカード関連でない場合はスキップ
-            if not any(keyword in title for keyword in self.pokemon_keywords):
+            if not self.is_pokemon_card(title):
                 return None
 
             # URL（h2 を囲むaタグを探す）
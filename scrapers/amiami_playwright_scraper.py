@@ -5,14 +5,32 @@ Bot対策を回避するためヘッドレスブラウザを使用
 from datetime import datetime
 import logging
 
-from bs4 import BeautifulSoup
-
-from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE
+from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE, class_contains_selector
 
 logger = logging.getLogger(__name__)
 
+# ページ内抽出定義（商品アイテム + 商品詳細リンク）
+PRODUCT_SPEC = {
+    'items': {
+        'container': class_contains_selector(['div', 'li', 'article'], ['product', 'item', 'box', 'thumb', 'list']),
+        'title': class_contains_selector(['h2', 'h3', 'h4', 'p', 'span'], ['name', 'title', 'ttl']),
+    },
+    'links': {
+        'href_contains': ['/top/detail/', 'gcode='],
+        'parent': 'div, li, article',
+    },
+}
+
 
 class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
+    # 検索結果は api.amiami.jp の JSON で描画されるため、記録したエンドポイントを次回から直接取得
+    API_CAPTURE = True
+    API_ITEM_FIELDS = {
+        'product': 'gname',
+        'href': 'https://www.amiami.jp/top/detail/detail?gcode={gcode}',
+        'price': 'c_price_taxed',
+    }
+
     def __init__(self):
         super().__init__()
         self.search_url = "https://www.amiami.jp/top/search/list?s_keywords=ポケモンカード&pagemax=30"
@@ -33,13 +51,14 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
         lotteries = []
 
         try:
-            content = self.run_async(self.fetch_page_content(
+            page_data = self.run_async(self.fetch_page_records(
                 self.search_url,
+                PRODUCT_SPEC,
                 wait_selector='.product-box'
             ))
 
-            if content:
-                lotteries = self._parse_content(content)
+            if page_data:
+                lotteries = self._parse_records(page_data)
         except Exception as e:
             logger.error(f"Error scraping amiami: {e}")
 
@@ -53,38 +72,28 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
             'lotteries': unique_lotteries
         }
 
-    def _parse_content(self, content):
-        """HTMLコンテンツをパース"""
+    def _parse_records(self, page_data):
+        """ページ内抽出結果をパース"""
         lotteries = []
-        soup = BeautifulSoup(content, 'html.parser')
 
-        # 商品アイテムを探す
-        items = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and any(
-            kw in str(x).lower() for kw in ['product', 'item', 'box', 'thumb', 'list']
-        ))
-
-        for item in items:
-            lottery = self._parse_item(item)
+        for record in page_data.get('items', []):
+            lottery = self._parse_item(record)
             if lottery:
                 lotteries.append(lottery)
 
         # リンクからも探す
-        links = soup.find_all('a', href=True)
-        for link in links:
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-
-            if self.is_pokemon_card(text) and ('/top/detail/' in href or 'gcode=' in href):
-                lottery = self._parse_link(link, href, text)
+        for record in page_data.get('links', []):
+            if self.is_pokemon_card(record.get('product', '')):
+                lottery = self._parse_link(record)
                 if lottery:
                     lotteries.append(lottery)
 
         return lotteries
 
-    def _parse_item(self, item):
+    def _parse_item(self, record):
         """商品アイテムから情報を抽出"""
         try:
-            text = item.get_text(strip=True)
+            text = record.get('text', '')
 
             if not self.is_pokemon_card(text):
                 return None
@@ -93,28 +102,12 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
             if not any(kw in text for kw in ['BOX', 'ボックス', 'パック', '予約', '販売', '発売']):
                 return None
 
-            link = item.find('a', href=True)
-            href = link.get('href', '') if link else ''
-
-            if href and not href.startswith('http'):
-                href = 'https://www.amiami.jp' + href
-
-            # 商品名を取得
-            title_elem = item.find(['h2', 'h3', 'h4', 'p', 'span'], class_=lambda x: x and any(
-                kw in str(x).lower() for kw in ['name', 'title', 'ttl']
-            ))
-            product_name = title_elem.get_text(strip=True) if title_elem else ''
+            href = record.get('href', '')
 
+            # 商品名を取得（見つからない場合はテキストから推定）
+            product_name = record.get('product', '')
             if not product_name or len(product_name) < 10:
-                # テキストから商品名を推定
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                for line in lines:
-                    if self.is_pokemon_card(line) and len(line) > 10:
-                        product_name = line[:150]
-                        break
-
-            price = self.extract_price(text)
-            status = self.determine_status(text)
+                product_name = text[:150] if len(text) > 10 else product_name
 
             if product_name and href:
                 return {
@@ -122,10 +115,10 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
                     'store': 'あみあみ',
                     'product': product_name,
                     'lottery_type': '予約販売',
-                    'period': self.extract_period(text),
-                    'price': price,
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
                     'detail_url': href,
-                    'status': status
+                    'status': self.determine_status(text)
                 }
 
         except Exception as e:
@@ -133,17 +126,10 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
 
         return None
 
-    def _parse_link(self, link, href, text):
+    def _parse_link(self, record):
         """リンクから情報を抽出"""
         try:
-            if not href.startswith('http'):
-                href = 'https://www.amiami.jp' + href
-
-            parent = link.find_parent(['div', 'li', 'article'])
-            parent_text = parent.get_text() if parent else text
-
-            price = self.extract_price(parent_text)
-            status = self.determine_status(parent_text)
+            text = record.get('product', '')
 
             if len(text) > 10:
                 return {
@@ -151,10 +137,10 @@ class AmiAmiPlaywrightScraper(PlaywrightBaseScraper):
                     'store': 'あみあみ',
                     'product': text,
                     'lottery_type': '予約販売',
-                    'period': self.extract_period(parent_text),
-                    'price': price,
-                    'detail_url': href,
-                    'status': status
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
+                    'detail_url': record.get('href', ''),
+                    'status': self.determine_status(record.get('text', ''))
                 }
 
         except Exception as e:
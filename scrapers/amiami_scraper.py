@@ -17,11 +17,6 @@ class AmiAmiScraper(RequestsBaseScraper):
         # あみあみのポケモンカード関連ページ（403エラー対策: 現在無効化）
         self.search_url = None  # Bot対策で403エラーになるためスキップ
         self.source_name = 'amiami.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -82,7 +77,7 @@ class AmiAmiScraper(RequestsBaseScraper):
         try:
             text = item.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = item.find('a', href=True)
@@ -103,7 +98,7 @@ class AmiAmiScraper(RequestsBaseScraper):
                 # テキストから商品名を推定
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:150]
                         break
 
@@ -150,7 +145,7 @@ class AmiAmiScraper(RequestsBaseScraper):
         try:
             link_text = link.get_text(strip=True)
 
-            if not self._is_pokemon_card(link_text):
+            if not self.is_pokemon_card(link_text):
                 return None
 
             if href.startswith('/'):
@@ -191,13 +186,6 @@ class AmiAmiScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
@@ -0,0 +1,294 @@
+"""
+描画中の JSON 応答の記録と API モード（PlaywrightBaseScraper.API_CAPTURE）
+
+一覧を XHR / fetch の JSON で描画するサイトでは、描画中の応答から一覧にあたる
+エンドポイント（辞書の配列を含む JSON）を見つけてページURLごとに記録する。
+次回以降は記録したエンドポイントを HTTP で直接取得し、ページ内抽出と同じ形式の
+レコード（product, href, price, period, text）に変換する。
+
+- URLテンプレート: キャッシュ回避用のパラメータ（_ / t / timestamp 等・時刻値）を除いたURL
+- 形: 一覧までのキーのパスと、要素のキーの集合。記録時のキーが欠けた・一覧が見つからない・
+  空になった場合は「形が変わった」として記録を消し、描画に戻す（描画時に再度記録される）
+- 記録は data/api_endpoints.json に保存（変化したときだけ書き込む）。分割実行（--shard）では
+  記録・削除したページURLの分をシャード結果の state に含め、--merge で保存済みの記録に反映する
+"""
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+import requests
+
+import host_control
+from constants import API_ENDPOINTS_FILE, API_MODE_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# キャッシュ回避用として除くクエリパラメータ（小文字）
+VOLATILE_PARAMS = ('_', '_t', 't', 'ts', 'timestamp', 'cb', 'callback', 'nocache', 'rnd', 'rand')
+# Unix時刻（秒・ミリ秒）とみなす値
+_EPOCH_RE = re.compile(r'^\d{10}(\d{3})?$')
+
+# 一覧を探す深さと、レコードの各項目の候補キー（先頭から優先）
+MAX_SEARCH_DEPTH = 4
+PRODUCT_KEYS = ('name', 'title', 'product_name', 'productName', 'item_name', 'itemName', 'gname', 'subject', 'label')
+HREF_KEYS = ('url', 'link', 'href', 'detail_url', 'detailUrl', 'permalink')
+PRICE_KEYS = ('price', 'sale_price', 'salePrice', 'price_text', 'priceText')
+MAX_TEXT = 300
+
+
+def url_template(url: str) -> str:
+    """キャッシュ回避用のパラメータを除いたURL"""
+    parsed = urlparse(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in VOLATILE_PARAMS and not _EPOCH_RE.match(value)
+    ]
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=''))
+
+
+def find_items(data: Any, depth: int = MAX_SEARCH_DEPTH) -> Tuple[Optional[List[str]], List[Dict[str, Any]]]:
+    """JSON 内で最も長い「辞書の配列」を探す
+
+    Returns:
+        (キーのパス, 要素のリスト)。見つからなければ (None, [])
+    """
+    best: Tuple[Optional[List[str]], List[Dict[str, Any]]] = (None, [])
+    stack = [([], data, 0)]
+    while stack:
+        path, value, level = stack.pop()
+        if isinstance(value, list):
+            items = [item for item in value if isinstance(item, dict)]
+            if items and len(items) > len(best[1]):
+                best = (path, items)
+        elif isinstance(value, dict) and level < depth:
+            stack.extend((path + [key], child, level + 1) for key, child in value.items())
+    return best
+
+
+def items_at(data: Any, path: List[str]) -> Optional[List[Dict[str, Any]]]:
+    """記録したパスの一覧（たどれない・配列でなければNone）"""
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if isinstance(item, dict)]
+
+
+def item_keys(items: List[Dict[str, Any]]) -> List[str]:
+    """要素のキーの集合（ソート済み）"""
+    return sorted({key for item in items for key in item})
+
+
+def _flatten(item: Dict[str, Any]) -> Dict[str, Any]:
+    """要素のスカラー値（入れ子は1段まで「親.子」で展開）"""
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            for child, child_value in value.items():
+                if not isinstance(child_value, (dict, list)):
+                    flat[f'{key}.{child}'] = child_value
+        elif not isinstance(value, list):
+            flat[key] = value
+    return flat
+
+
+def _first(flat: Dict[str, Any], keys) -> str:
+    for key in keys:
+        value = flat.get(key)
+        if value not in (None, ''):
+            return str(value)
+    return ''
+
+
+def _field(flat: Dict[str, Any], spec: str) -> str:
+    """項目の指定（キー名、または '{gcode}' を含む書式）で値を取り出す"""
+    if '{' in spec:
+        try:
+            return spec.format_map(flat)
+        except (KeyError, IndexError, ValueError):
+            return ''
+    value = flat.get(spec)
+    return '' if value is None else str(value)
+
+
+def items_to_records(items: List[Dict[str, Any]], base_url: str, fields: Optional[Dict[str, str]] = None,
+                     price_of: Optional[Callable[[str], str]] = None,
+                     period_of: Optional[Callable[[str], str]] = None) -> List[Dict[str, str]]:
+    """一覧の要素をページ内抽出と同じ形式のレコードに変換
+
+    Args:
+        items: 一覧の要素
+        base_url: 相対URLの基準（ページURL）
+        fields: レコードの項目 → 要素のキーまたは書式（API_ITEM_FIELDS、省略した項目は候補キーから推定）
+        price_of / period_of: テキストから価格・期間を取り出す関数
+
+    Returns:
+        {'product', 'href', 'price', 'period', 'text'} のリスト
+    """
+    fields = fields or {}
+    records = []
+    for item in items:
+        flat = _flatten(item)
+        text = ' '.join(str(value) for value in flat.values() if isinstance(value, str) and value.strip())[:MAX_TEXT]
+        product = _field(flat, fields['product']) if 'product' in fields else _first(flat, PRODUCT_KEYS)
+        href = _field(flat, fields['href']) if 'href' in fields else _first(flat, HREF_KEYS)
+        price = _field(flat, fields['price']) if 'price' in fields else _first(flat, PRICE_KEYS)
+        if price.isdigit():
+            price = f'{int(price):,}円'
+        records.append({
+            'product': product[:200],
+            'href': urljoin(base_url, href) if href else '',
+            'price': price or (price_of(text) if price_of else ''),
+            'period': period_of(text) if period_of else '',
+            'text': text,
+        })
+    return records
+
+
+def custom_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """描画中のリクエストのうち API モードでも送るヘッダ（x- で始まる独自ヘッダ）"""
+    return {name: value for name, value in sorted(headers.items()) if name.lower().startswith('x-')}
+
+
+def fetch_json(endpoint: str, referer: str, user_agent: str, cookies: Optional[List[Dict[str, Any]]] = None,
+               headers: Optional[Dict[str, str]] = None, timeout: float = API_MODE_TIMEOUT_SECONDS) -> Any:
+    """記録したエンドポイントを HTTP で取得（ブラウザの Cookie を引き継ぐ）
+
+    Args:
+        endpoint: URLテンプレート
+        referer: 描画していたページのURL
+        user_agent: User-Agent
+        cookies: 保存済みのブラウザの Cookie（Playwright の storage_state 形式）
+        headers: 記録した独自ヘッダ（custom_headers）
+
+    Returns:
+        JSON の内容
+
+    Raises:
+        requests.RequestException: 通信エラー・4xx/5xx
+        ValueError: JSON でない
+    """
+    with requests.Session() as session:
+        session.headers.update({'User-Agent': user_agent, 'Referer': referer,
+                                'Accept': 'application/json, text/plain, */*', 'X-Requested-With': 'XMLHttpRequest'})
+        session.headers.update(headers or {})
+        for cookie in cookies or []:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        with host_control.controller().request(host_control.host_of(endpoint)) as report:
+            response = session.get(endpoint, timeout=timeout)
+            report['outcome'] = host_control.classify_status(response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+
+class EndpointStore:
+    """ページURL → 記録したエンドポイント（スレッドセーフ、変化時にファイルへ保存）"""
+
+    def __init__(self, path: str = API_ENDPOINTS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # このプロセスで記録・削除したページURL（export_state 用）
+        self._touched: set = set()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                data = {}
+            self._entries = {url: entry for url, entry in data.items() if isinstance(entry, dict)}
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(dict(sorted(self._entries.items())), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Failed to save API endpoints {self.path}: {e}")
+
+    def get(self, page_url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._load().get(page_url)
+            return dict(entry) if entry else None
+
+    def record(self, page_url: str, endpoint: str, path: List[str], keys: List[str],
+               headers: Optional[Dict[str, str]] = None, source: str = '') -> None:
+        """エンドポイントを記録（同じ内容なら書き込まない）"""
+        entry = {'source': source, 'endpoint': endpoint, 'path': path, 'keys': keys, 'headers': headers or {}}
+        with self._lock:
+            entries = self._load()
+            previous = dict(entries.get(page_url) or {})
+            previous.pop('captured_at', None)
+            if previous == entry:
+                return
+            entries[page_url] = {**entry, 'captured_at': datetime.now().isoformat()}
+            self._touched.add(page_url)
+            self._save()
+        logger.info(f"🛰 API endpoint captured for {page_url}: {endpoint}")
+
+    def forget(self, page_url: str) -> None:
+        with self._lock:
+            if self._load().pop(page_url, None) is not None:
+                self._touched.add(page_url)
+                self._save()
+
+    def changes(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """このプロセスで記録・削除したページURL → 記録（削除は None）"""
+        with self._lock:
+            entries = self._load() if self._touched else {}
+            return {url: entries.get(url) for url in sorted(self._touched)}
+
+    def apply(self, changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """他のプロセスの記録・削除を反映して保存（None の記録は消す）"""
+        with self._lock:
+            entries = self._load()
+            for url, entry in changes.items():
+                if entry is None:
+                    entries.pop(url, None)
+                else:
+                    entries[url] = entry
+            self._save()
+
+
+_store: Optional[EndpointStore] = None
+_store_lock = threading.Lock()
+
+
+def store() -> EndpointStore:
+    """プロセス共通の記録"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EndpointStore()
+        return _store
+
+
+def export_state() -> Dict[str, Optional[Dict[str, Any]]]:
+    """このプロセスで記録・削除したエンドポイント（--shard の結果に含め、--merge で保存する）"""
+    if _store is None:
+        return {}
+    return _store.changes()
+
+
+def merge_state(changes: Dict[str, Optional[Dict[str, Any]]], path: str = API_ENDPOINTS_FILE) -> None:
+    """シャードごとの記録を保存済みの記録に反映（--merge 用、None の記録は消す）"""
+    if not changes:
+        return
+    EndpointStore(path).apply(changes)
+
+
+def reset(path: str = API_ENDPOINTS_FILE) -> None:
+    """プロセス共通の記録を作り直す（テスト用）"""
+    global _store
+    with _store_lock:
+        _store = EndpointStore(path)
@@ -5,12 +5,22 @@ Bot対策を回避するためヘッドレスブラウザを使用
 from datetime import datetime
 import logging
 
-from bs4 import BeautifulSoup
-
-from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE
+from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE, class_contains_selector
 
 logger = logging.getLogger(__name__)
 
+# ページ内抽出定義（商品アイテム + 商品詳細リンク）
+PRODUCT_SPEC = {
+    'items': {
+        'container': class_contains_selector(['div', 'li', 'article'], ['item', 'product', 'bcs_item', 'goods']),
+        'title': class_contains_selector(['h2', 'h3', 'h4', 'p', 'span'], ['name', 'title', 'ttl']),
+    },
+    'links': {
+        'href_contains': ['/bc/item/'],
+        'parent': 'div, li, article',
+    },
+}
+
 
 class BiccameraPlaywrightScraper(PlaywrightBaseScraper):
     def __init__(self):
@@ -34,15 +44,16 @@ class BiccameraPlaywrightScraper(PlaywrightBaseScraper):
 
         try:
             # ビックカメラはタイムアウト長めに設定（重い場合がある）
-            content = self.run_async(self.fetch_page_content(
+            page_data = self.run_async(self.fetch_page_records(
                 self.search_url,
+                PRODUCT_SPEC,
                 wait_selector='.bcs_item',
                 extra_wait=8
             ))
 
-            if content:
+            if page_data:
                 # 403エラーページのチェック
-                if '403' in content or 'forbidden' in content.lower():
+                if self.is_error_page(page_data):
                     logger.warning("ビックカメラ: 403 Forbidden - アクセス制限中")
                     return {
                 'timestamp': datetime.now().isoformat(),
@@ -53,7 +64,7 @@ class BiccameraPlaywrightScraper(PlaywrightBaseScraper):
                         'error': '403 Forbidden'
                     }
 
-                lotteries = self._parse_content(content)
+                lotteries = self._parse_records(page_data)
         except TimeoutError:
             logger.error("Error scraping biccamera: Timeout - site may be slow or blocking")
             return {
@@ -77,74 +88,51 @@ class BiccameraPlaywrightScraper(PlaywrightBaseScraper):
             'lotteries': unique_lotteries
         }
 
-    def _parse_content(self, content):
-        """HTMLコンテンツをパース"""
+    def _parse_records(self, page_data):
+        """ページ内抽出結果をパース"""
         lotteries = []
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # 商品アイテムを探す
-        items = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and any(
-            kw in str(x).lower() for kw in ['item', 'product', 'bcs_item', 'goods']
-        ))
 
-        for item in items:
-            lottery = self._parse_item(item)
+        for record in page_data.get('items', []):
+            lottery = self._parse_item(record)
             if lottery:
                 lotteries.append(lottery)
 
         # リンクからも探す
-        links = soup.find_all('a', href=True)
-        for link in links:
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-
-            if self.is_pokemon_card(text) and '/bc/item/' in href:
-                lottery = self._parse_link(link, href, text)
+        for record in page_data.get('links', []):
+            if self.is_pokemon_card(record.get('product', '')):
+                lottery = self._parse_link(record)
                 if lottery:
                     lotteries.append(lottery)
 
         return lotteries
 
-    def _parse_item(self, item):
+    def _parse_item(self, record):
         """商品アイテムから情報を抽出"""
         try:
-            text = item.get_text(strip=True)
+            text = record.get('text', '')
 
             if not self.is_pokemon_card(text):
                 return None
 
-            link = item.find('a', href=True)
-            href = link.get('href', '') if link else ''
-
-            if href and not href.startswith('http'):
-                href = 'https://www.biccamera.com' + href
+            href = record.get('href', '')
 
-            # 商品名を取得
-            title_elem = item.find(['h2', 'h3', 'h4', 'p', 'span'], class_=lambda x: x and any(
-                kw in str(x).lower() for kw in ['name', 'title', 'ttl']
-            ))
-            product_name = title_elem.get_text(strip=True) if title_elem else ''
-
-            if not product_name:
-                product_name = text[:150]
+            # 商品名を取得（見つからない場合はテキストから推定）
+            product_name = record.get('product', '') or text[:150]
 
             # 抽選・予約関連のみ
             if not any(kw in text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック']):
                 return None
 
-            price = self.extract_price(text)
-            status = self.determine_status(text)
-
             if product_name and href:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ビックカメラ',
                     'product': product_name,
                     'lottery_type': '抽選販売' if '抽選' in text else '予約販売',
-                    'period': self.extract_period(text),
-                    'price': price,
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
                     'detail_url': href,
-                    'status': status
+                    'status': self.determine_status(text)
                 }
 
         except Exception as e:
@@ -152,31 +140,25 @@ class BiccameraPlaywrightScraper(PlaywrightBaseScraper):
 
         return None
 
-    def _parse_link(self, link, href, text):
+    def _parse_link(self, record):
         """リンクから情報を抽出"""
         try:
-            if not href.startswith('http'):
-                href = 'https://www.biccamera.com' + href
-
-            parent = link.find_parent(['div', 'li', 'article'])
-            parent_text = parent.get_text() if parent else text
+            text = record.get('product', '')
+            parent_text = record.get('text', '') or text
 
             if not any(kw in parent_text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック']):
                 return None
 
-            price = self.extract_price(parent_text)
-            status = self.determine_status(parent_text)
-
             if len(text) > 10:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ビックカメラ',
                     'product': text,
                     'lottery_type': '抽選販売' if '抽選' in parent_text else '予約販売',
-                    'period': self.extract_period(parent_text),
-                    'price': price,
-                    'detail_url': href,
-                    'status': status
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
+                    'detail_url': record.get('href', ''),
+                    'status': self.determine_status(parent_text)
                 }
 
         except Exception as e:
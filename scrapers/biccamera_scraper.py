@@ -20,12 +20,6 @@ class BiccameraScraper(RequestsBaseScraper):
             "https://www.biccamera.com/bc/category/?q=ポケモンカード",
         ]
         self.source_name = 'biccamera.com'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'ナイトワンダラー',
-            'テラスタル', 'クリムゾンヘイズ', 'シャイニートレジャー',
-            'レイジングサーフ', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選情報をスクレイピング"""
@@ -73,7 +67,7 @@ class BiccameraScraper(RequestsBaseScraper):
                 href = link.get('href', '')
 
                 # ポケモンカード関連かチェック
-                if self._is_pokemon_card(link_text):
+                if self.is_pokemon_card(link_text):
                     lottery_info = self._parse_lottery_link(link, href)
                     if lottery_info:
                         lotteries.append(lottery_info)
@@ -85,7 +79,7 @@ class BiccameraScraper(RequestsBaseScraper):
 
             for card in product_cards:
                 card_text = card.get_text()
-                if self._is_pokemon_card(card_text):
+                if self.is_pokemon_card(card_text):
                     lottery_info = self._parse_product_card(card)
                     if lottery_info:
                         lotteries.append(lottery_info)
@@ -107,13 +101,6 @@ class BiccameraScraper(RequestsBaseScraper):
 
         return lotteries
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _parse_lottery_link(self, link, href):
         """リンクから抽選情報を抽出"""
         try:
@@ -179,7 +166,7 @@ class BiccameraScraper(RequestsBaseScraper):
         try:
             text = card.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = card.find('a', href=True)
@@ -199,7 +186,7 @@ class BiccameraScraper(RequestsBaseScraper):
                 # テキストから商品名を推定
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:100]
                         break
 
@@ -248,7 +235,7 @@ class BiccameraScraper(RequestsBaseScraper):
                 cells = row.find_all(['td', 'th'])
                 row_text = row.get_text()
 
-                if self._is_pokemon_card(row_text):
+                if self.is_pokemon_card(row_text):
                     # リンクを取得
                     link = row.find('a', href=True)
                     href = link.get('href', '') if link else ''
@@ -264,7 +251,7 @@ class BiccameraScraper(RequestsBaseScraper):
                     # 商品名を探す
                     product_name = ''
                     for cell_text in cell_texts:
-                        if self._is_pokemon_card(cell_text):
+                        if self.is_pokemon_card(cell_text):
                             product_name = cell_text
                             break
 
@@ -18,11 +18,6 @@ class CardShopSerraScraper(RequestsBaseScraper):
         # カードショップセラ（ドメインが解決できないため無効化）
         self.urls = []  # DNS解決エラーのためスキップ
         self.source_name = 'cardshopserra.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -76,7 +71,7 @@ class CardShopSerraScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text) and '/shopdetail/' in href:
+                if self.is_pokemon_card(link_text) and '/shopdetail/' in href:
                     lottery = self._parse_product_link(link, href)
                     if lottery:
                         lotteries.append(lottery)
@@ -91,7 +86,7 @@ class CardShopSerraScraper(RequestsBaseScraper):
         try:
             text = item.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = item.find('a', href=True)
@@ -111,7 +106,7 @@ class CardShopSerraScraper(RequestsBaseScraper):
             if not product_name:
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:150]
                         break
 
@@ -195,13 +190,6 @@ class CardShopSerraScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
@@ -5,14 +5,33 @@ Bot対策を回避するためヘッドレスブラウザを使用
 from datetime import datetime
 import logging
 
-from bs4 import BeautifulSoup
-
-from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE
+from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE, class_contains_selector
 
 logger = logging.getLogger(__name__)
 
+# ページ内抽出定義（抽選コンテナ + コンテナがない場合のリンク）
+LOTTERY_SPEC = {
+    'items': {
+        'container': class_contains_selector(
+            ['div', 'article', 'section'],
+            ['lottery', 'event', 'promotion', 'campaign', 'raffle', 'entry']
+        ),
+        'title': class_contains_selector(
+            ['h1', 'h2', 'h3', 'h4', 'p', 'span'],
+            ['name', 'title', 'product', 'ttl', 'heading']
+        ),
+    },
+    'links': {
+        'min_text': 5,
+        'parent': 'div, li, article, section',
+    },
+}
+
 
 class DragonstarScraper(PlaywrightBaseScraper):
+    # 抽選一覧は fetch の JSON で描画されるため、記録したエンドポイントを次回から直接取得
+    API_CAPTURE = True
+
     def __init__(self):
         super().__init__()
         self.search_url = "https://dorasuta.membercard.jp/lottery"
@@ -33,15 +52,16 @@ class DragonstarScraper(PlaywrightBaseScraper):
         lotteries = []
 
         try:
-            content = self.run_async(self.fetch_page_content(
+            page_data = self.run_async(self.fetch_page_records(
                 self.search_url,
+                LOTTERY_SPEC,
                 wait_selector='div[class*="lottery"], [class*="event"], [class*="promotion"]',
                 scroll=True,
                 extra_wait=3
             ))
 
-            if content:
-                lotteries = self._parse_content(content)
+            if page_data:
+                lotteries = self._parse_records(page_data)
         except Exception as e:
             logger.error(f"Error scraping dragonstar: {e}")
 
@@ -55,82 +75,48 @@ class DragonstarScraper(PlaywrightBaseScraper):
             'lotteries': unique_lotteries
         }
 
-    def _parse_content(self, content):
-        """HTMLコンテンツをパース"""
+    def _parse_records(self, page_data):
+        """ページ内抽出結果をパース"""
         lotteries = []
-        soup = BeautifulSoup(content, 'html.parser')
 
-        # 抽選コンテナを探す（複数の可能性のあるセレクタ）
-        lottery_containers = soup.find_all(['div', 'article', 'section'], class_=lambda x: x and any(
-            kw in str(x).lower() for kw in ['lottery', 'event', 'promotion', 'campaign', 'raffle', 'entry']
-        ))
-
-        for container in lottery_containers:
-            lottery = self._parse_lottery_item(container)
+        for record in page_data.get('items', []):
+            lottery = self._parse_lottery_item(record)
             if lottery:
                 lotteries.append(lottery)
 
         # コンテナで見つからない場合はリンクから探す
         # ドラゴンスターはポケカ専門店なので、キーワードチェックなしで全リンク対象
         if not lotteries:
-            links = soup.find_all('a', href=True)
-            for link in links:
-                text = link.get_text(strip=True)
-                href = link.get('href', '')
-
-                # キーワードチェックをスキップ（ドラゴンスター専門店）
-                if href and len(text) >= 5:
-                    lottery = self._parse_link(link, href, text)
-                    if lottery:
-                        lotteries.append(lottery)
+            for record in page_data.get('links', []):
+                lottery = self._parse_link(record)
+                if lottery:
+                    lotteries.append(lottery)
 
         return lotteries
 
-    def _parse_lottery_item(self, item):
+    def _parse_lottery_item(self, record):
         """抽選アイテムから情報を抽出"""
         try:
-            text = item.get_text(strip=True)
-
-            # リンクを取得
-            link = item.find('a', href=True)
-            href = link.get('href', '') if link else ''
-
-            if href and not href.startswith('http'):
-                if href.startswith('/'):
-                    href = 'https://dorasuta.membercard.jp' + href
-                else:
-                    href = 'https://dorasuta.membercard.jp/' + href
-
-            # 商品名を取得
-            title_elem = item.find(['h1', 'h2', 'h3', 'h4', 'p', 'span'], class_=lambda x: x and any(
-                kw in str(x).lower() for kw in ['name', 'title', 'product', 'ttl', 'heading']
-            ))
-            product_name = title_elem.get_text(strip=True) if title_elem else ''
+            text = record.get('text', '')
+            href = record.get('href', '')
 
+            # 商品名を取得（見つからない場合はテキストから推定）
+            product_name = record.get('product', '')
             if not product_name or len(product_name) < 5:
-                # テキストから商品名を推定
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                for line in lines:
-                    if len(line) >= 5:
-                        product_name = line[:150]
-                        break
+                product_name = text[:150] if len(text) >= 5 else ''
 
             # ドラゴンスターはポケカ専門店なので、キーワードチェックをスキップ
             # （フィルタリングはmain.pyで実施）
-            price = self.extract_price(text)
-            period = self.extract_period(text)
-            status = self.determine_status(text)
-
             if product_name and href:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ドラゴンスター',
                     'product': product_name,
                     'lottery_type': '抽選',
-                    'period': period,
-                    'price': price,
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
                     'detail_url': href,
-                    'status': status
+                    'status': self.determine_status(text)
                 }
 
         except Exception as e:
@@ -138,34 +124,24 @@ class DragonstarScraper(PlaywrightBaseScraper):
 
         return None
 
-    def _parse_link(self, link, href, text):
+    def _parse_link(self, record):
         """リンクから情報を抽出"""
         try:
-            if not href.startswith('http'):
-                if href.startswith('/'):
-                    href = 'https://dorasuta.membercard.jp' + href
-                else:
-                    href = 'https://dorasuta.membercard.jp/' + href
-
-            parent = link.find_parent(['div', 'li', 'article', 'section'])
-            parent_text = parent.get_text() if parent else text
-
-            price = self.extract_price(parent_text)
-            period = self.extract_period(parent_text)
-            status = self.determine_status(parent_text)
+            text = record.get('product', '')
+            href = record.get('href', '')
 
             # ドラゴンスターはポケカ専門店なので、キーワードチェックをスキップ
             # テキスト長チェックのみ実施
-            if len(text) >= 5:
+            if href and len(text) >= 5:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ドラゴンスター',
                     'product': text[:150],
                     'lottery_type': '抽選',
-                    'period': period,
-                    'price': price,
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
                     'detail_url': href,
-                    'status': status
+                    'status': self.determine_status(record.get('text', ''))
                 }
 
         except Exception as e:
@@ -5,18 +5,24 @@ Bot対策を回避するためヘッドレスブラウザを使用
 from datetime import datetime
 import logging
 
-from bs4 import BeautifulSoup
-
+from . import site_spec
 from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 
 class EdionPlaywrightScraper(PlaywrightBaseScraper):
+    # 検索結果は XHR の JSON で描画されるため、記録したエンドポイントを次回から直接取得
+    API_CAPTURE = True
+
+    # 抽出定義は config/site_specs.yaml の edion_search（scrapers.site_spec 参照）
+    SITE = 'edion_search'
+
     def __init__(self):
         super().__init__()
-        self.search_url = "https://www.edion.com/search/?keyword=ポケモンカード"
-        self.source_name = 'エディオン (edion.com)'
+        self.spec = site_spec.load(self.SITE)
+        self.search_url = self.spec['urls'][0]
+        self.source_name = self.spec['source']
 
     def scrape(self):
         """Playwrightで抽選情報をスクレイピング"""
@@ -33,15 +39,16 @@ class EdionPlaywrightScraper(PlaywrightBaseScraper):
         lotteries = []
 
         try:
-            content = self.run_async(self.fetch_page_content(
+            page_data = self.run_async(self.fetch_page_records(
                 self.search_url,
+                site_spec.in_page_spec(self.spec),
                 wait_selector='.item',
                 extra_wait=5
             ))
 
-            if content:
+            if page_data:
                 # 403/404 エラーチェック
-                if any(code in content for code in ['403', '404', 'Not Found', 'Forbidden']):
+                if self.is_error_page(page_data):
                     logger.warning("エディオン: HTTPエラー（403/404）")
                     return {
                 'timestamp': datetime.now().isoformat(),
@@ -52,7 +59,7 @@ class EdionPlaywrightScraper(PlaywrightBaseScraper):
                         'error': 'HTTP Error (403/404)'
                     }
 
-                lotteries = self._parse_content(content)
+                lotteries = self._parse_records(page_data)
         except Exception as e:
             logger.error(f"Error scraping edion: {e}")
 
@@ -66,112 +73,9 @@ class EdionPlaywrightScraper(PlaywrightBaseScraper):
             'lotteries': unique_lotteries
         }
 
-    def _parse_content(self, content):
-        """HTMLコンテンツをパース"""
-        lotteries = []
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # 商品アイテムを探す
-        items = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and any(
-            kw in str(x).lower() for kw in ['item', 'product', 'goods', 'card']
-        ))
-
-        for item in items:
-            lottery = self._parse_item(item)
-            if lottery:
-                lotteries.append(lottery)
-
-        # リンクからも探す
-        links = soup.find_all('a', href=True)
-        for link in links:
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-
-            if self.is_pokemon_card(text) and '/detail' in href:
-                lottery = self._parse_link(link, href, text)
-                if lottery:
-                    lotteries.append(lottery)
-
-        return lotteries
-
-    def _parse_item(self, item):
-        """商品アイテムから情報を抽出"""
-        try:
-            text = item.get_text(strip=True)
-
-            if not self.is_pokemon_card(text):
-                return None
-
-            link = item.find('a', href=True)
-            href = link.get('href', '') if link else ''
-
-            if href and not href.startswith('http'):
-                href = 'https://www.edion.com' + href
-
-            # 商品名を取得
-            title_elem = item.find(['h2', 'h3', 'h4', 'p', 'span'], class_=lambda x: x and any(
-                kw in str(x).lower() for kw in ['name', 'title', 'ttl']
-            ))
-            product_name = title_elem.get_text(strip=True) if title_elem else ''
-
-            if not product_name or len(product_name) < 10:
-                product_name = text[:150]
-
-            # 抽選・予約関連のみ
-            if not any(kw in text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック']):
-                return None
-
-            price = self.extract_price(text)
-            status = self.determine_status(text)
-
-            if product_name and href:
-                return {
-                'timestamp': datetime.now().isoformat(),
-                    'store': 'エディオン',
-                    'product': product_name,
-                    'lottery_type': '抽選販売' if '抽選' in text else '予約販売',
-                    'period': self.extract_period(text),
-                    'price': price,
-                    'detail_url': href,
-                    'status': status
-                }
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-
-        return None
-
-    def _parse_link(self, link, href, text):
-        """リンクから情報を抽出"""
-        try:
-            if not href.startswith('http'):
-                href = 'https://www.edion.com' + href
-
-            parent = link.find_parent(['div', 'li', 'article'])
-            parent_text = parent.get_text() if parent else text
-
-            if not any(kw in parent_text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック']):
-                return None
-
-            price = self.extract_price(parent_text)
-            status = self.determine_status(parent_text)
-
-            if len(text) > 10:
-                return {
-                'timestamp': datetime.now().isoformat(),
-                    'store': 'エディオン',
-                    'product': text,
-                    'lottery_type': '抽選販売' if '抽選' in parent_text else '予約販売',
-                    'period': self.extract_period(parent_text),
-                    'price': price,
-                    'detail_url': href,
-                    'status': status
-                }
-
-        except Exception as e:
-            logger.error(f"Error: {e}")
-
-        return None
+    def _parse_records(self, page_data):
+        """ページ内抽出結果（API モードの結果も同じ形）をパース"""
+        return site_spec.to_lotteries(page_data, site_spec.compiled(self.spec), self.is_pokemon_card)
 
 
 if __name__ == '__main__':
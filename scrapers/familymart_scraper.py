@@ -19,11 +19,6 @@ class FamilyMartScraper(RequestsBaseScraper):
             "https://www.family.co.jp/campaign.html",
         ]
         self.source_name = 'family.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -67,7 +62,7 @@ class FamilyMartScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text):
+                if self.is_pokemon_card(link_text):
                     lottery = self._parse_campaign_link(link, href)
                     if lottery:
                         lotteries.append(lottery)
@@ -79,7 +74,7 @@ class FamilyMartScraper(RequestsBaseScraper):
 
             for item in product_items:
                 item_text = item.get_text()
-                if self._is_pokemon_card(item_text):
+                if self.is_pokemon_card(item_text):
                     lottery = self._parse_product_item(item)
                     if lottery:
                         lotteries.append(lottery)
@@ -161,7 +156,7 @@ class FamilyMartScraper(RequestsBaseScraper):
             if not product_name:
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 5:
+                    if self.is_pokemon_card(line) and len(line) > 5:
                         product_name = line[:150]
                         break
 
@@ -198,13 +193,6 @@ class FamilyMartScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
@@ -1,23 +1,88 @@
 """
 Google Formsからのポケモンカード抽選・予約情報スクレイピング
-Playwrightを使用してフォーム情報を取得
+
+公開フォームは初期HTMLにフォームの構造（タイトル・説明・質問）を FB_PUBLIC_LOAD_DATA_ として
+埋め込んでいるため、まず HTTP で全フォームを並列に取得して埋め込みデータから抽出する
+（ETag / Last-Modified があれば条件付き GET、304 なら前回の抽出結果を再利用）。
+埋め込みデータがない（ログイン必須等）フォームだけ Playwright で描画する。
 """
-import asyncio
+import json
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from bs4 import BeautifulSoup
+import requests
 
+import host_control
+from constants import GOOGLE_FORMS_CACHE_FILE
 from scrapers.playwright_base import PlaywrightBaseScraper
 
 logger = logging.getLogger(__name__)
 
+# 初期HTMLに埋め込まれたフォーム構造
+FB_PUBLIC_LOAD_DATA_RE = re.compile(r'FB_PUBLIC_LOAD_DATA_\s*=\s*(\[.*?\]);\s*</script>', re.DOTALL)
+# 受付終了時のリダイレクト先
+CLOSED_FORM_PATH = '/closedform'
+STATIC_TIMEOUT_SECONDS = 15
+
+
+def parse_form_payload(html: str) -> Optional[Dict[str, Any]]:
+    """FB_PUBLIC_LOAD_DATA_ からフォームのタイトル・説明・質問を取り出す
+
+    Args:
+        html: viewform の初期HTML
+
+    Returns:
+        {'title', 'description', 'questions'}。埋め込みデータがない・形式が違う場合はNone
+    """
+    match = FB_PUBLIC_LOAD_DATA_RE.search(html or '')
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(1))
+        form = data[1]
+        title = form[8] if len(form) > 8 and form[8] else (data[3] if len(data) > 3 else '')
+        questions = [item[1] for item in (form[1] or []) if isinstance(item, list) and len(item) > 1 and item[1]]
+        return {'title': title or '', 'description': form[0] or '', 'questions': questions}
+    except (ValueError, IndexError, TypeError) as e:
+        logger.warning(f"Unexpected FB_PUBLIC_LOAD_DATA_ format: {e}")
+        return None
+
+
+# ページ内抽出定義（セレクタ配列は先頭から優先順に試行）
+FORM_SPEC = {
+    'fields': {
+        'title': [
+            'div[role="heading"]',
+            'h1',
+            'div.OA0qFb',
+            'div.freebirdFormviewerViewHeaderTitleRequiredLegend',
+            'h1[class*="title" i], h2[class*="title" i]',
+        ],
+        'description': [
+            'div.EWp5xe',
+            'div.freebirdFormviewerViewHeaderDescription',
+            'div[class*="description" i]',
+        ],
+    },
+    'exists': {
+        'form': ['[role="form"]', 'form', 'input'],
+    },
+    # 受付終了キーワード
+    'keywords': ['受付終了', '終了しました', 'closed form', 'form is closed',
+                 '応募は終了', 'この form はもう受け付けていません'],
+}
+
 
 class GoogleFormsScraper(PlaywrightBaseScraper):
     """Google Formsスクレイパー"""
 
-    def __init__(self):
+    def __init__(self, cache_file: str = GOOGLE_FORMS_CACHE_FILE):
         super().__init__()
+        self.cache_file = cache_file
         # 調査対象のGoogle Forms
         self.forms = [
             {
@@ -33,18 +98,16 @@ class GoogleFormsScraper(PlaywrightBaseScraper):
         ]
 
     def scrape(self):
-        """Google Formsから抽選情報をスクレイピング"""
-        all_forms = []
-
-        for form in self.forms:
-            try:
-                logger.info(f"Scraping Google Form: {form['name']}")
-                form_data = self._scrape_form(form['url'], form['name'], form['store'])
-                if form_data:
-                    all_forms.append(form_data)
-            except Exception as e:
-                logger.warning(f"Error scraping {form['name']}: {e}")
-                continue
+        """Google Formsから抽選情報をスクレイピング（静的取得を並列に行い、取れなかったフォームのみ描画）"""
+        forms_by_url = {form['url']: form for form in self.forms}
+        fetched = self._fetch_static_forms()
+        missing = [url for url in forms_by_url if url not in fetched]
+        if missing:
+            logger.info(f"Rendering {len(missing)} Google Form(s) with Playwright")
+            fetched.update(self._render_forms(missing, forms_by_url))
+
+        # 出力順はフォーム定義順に揃える
+        all_forms = [fetched[form['url']] for form in self.forms if form['url'] in fetched]
 
         return {
                 'timestamp': datetime.now().isoformat(),
@@ -54,81 +117,156 @@ class GoogleFormsScraper(PlaywrightBaseScraper):
             "lotteries": self._extract_lotteries(all_forms)
         }
 
-    def _scrape_form(self, url, form_name, store_name):
-        """指定URLのGoogle Formをスクレイピング"""
-        content = self.run_async(self.fetch_page_content(
-            url,
-            wait_for_js=True,
-            scroll=False,
-            extra_wait=5,
-            wait_selector='[role="form"], form, [class*="form"]'  # フォーム要素の複数検出
-        ))
-
-        if not content:
-            logger.warning(f"Failed to fetch content for {form_name}")
+    def _fetch_static_forms(self) -> Dict[str, Dict[str, Any]]:
+        """全フォームを HTTP で並列取得し、埋め込みデータから抽出（URL → フォーム情報）"""
+        cache = self._load_cache()
+        fetched = {}
+        with requests.Session() as session:
+            session.headers['User-Agent'] = self.user_agents[0]
+            with ThreadPoolExecutor(max_workers=max(1, len(self.forms))) as executor:
+                results = executor.map(lambda form: self._fetch_static(session, form, cache.get(form['url'])), self.forms)
+                for form, result in zip(self.forms, results):
+                    if result is not None:
+                        fetched[form['url']], cache[form['url']] = result
+        self._save_cache(cache)
+        return fetched
+
+    def _fetch_static(self, session: requests.Session, form: Dict[str, str],
+                      cached: Optional[Dict[str, Any]] = None) -> Optional[tuple]:
+        """1フォームを HTTP で取得して抽出
+
+        Args:
+            session: HTTPセッション
+            form: フォーム定義（name, url, store）
+            cached: 前回の {'etag', 'last_modified', 'form'}（条件付き GET 用）
+
+        Returns:
+            (フォーム情報, キャッシュ)。埋め込みデータがなく描画が必要な場合・取得失敗時はNone
+        """
+        cached = cached or {}
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        try:
+            with host_control.controller().request(host_control.host_of(form['url'])) as report:
+                response = session.get(form['url'], headers=headers, timeout=STATIC_TIMEOUT_SECONDS)
+                report['outcome'] = host_control.classify_status(response.status_code)
+        except requests.RequestException as e:
+            logger.warning(f"Static fetch failed for {form['name']}: {e}")
             return None
 
-        soup = BeautifulSoup(content, 'html.parser')
+        if response.status_code == 304 and cached.get('form'):
+            logger.info(f"Google Form not modified: {form['name']}")
+            return {**cached['form'], 'scraped_at': datetime.now().isoformat()}, cached
+        if response.status_code >= 400:
+            logger.warning(f"Static fetch for {form['name']}: HTTP {response.status_code}")
+            return None
 
+        form_data = self._build_static_form_data(response.url, response.text, form)
+        if form_data is None:
+            return None
+        logger.info(f"Scraped Google Form (static): {form['name']}")
+        return form_data, {'etag': response.headers.get('ETag'),
+                           'last_modified': response.headers.get('Last-Modified'), 'form': form_data}
+
+    def _build_static_form_data(self, final_url: str, html: str, form: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """初期HTMLからフォーム情報を組み立てる（_build_form_data と同じ形式、描画が必要ならNone）"""
+        payload = parse_form_payload(html)
+        # 受付終了のフォームは closedform へリダイレクトされ、埋め込みデータを持たない
+        closed = CLOSED_FORM_PATH in final_url or (
+            payload is None and any(kw.lower() in html.lower() for kw in FORM_SPEC['keywords'])
+        )
+        if payload is None and not closed:
+            return None
+        payload = payload or {'title': '', 'description': '', 'questions': []}
+        return {
+            'form_name': form['name'],
+            'store': form['store'],
+            'url': form['url'],
+            'scraped_at': datetime.now().isoformat(),
+            'form_title': payload['title'],
+            'form_description': payload['description'],
+            'form_status': 'closed' if closed else 'accepting',
+            'is_accepting': not closed,
+            'questions': payload['questions'],
+            'is_pokemon_card': True,
+        }
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Failed to save Google Forms cache {self.cache_file}: {e}")
+
+    def _render_forms(self, urls: List[str], forms_by_url: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Playwright で描画して抽出（静的取得できなかったフォーム用）"""
+        fetched = {}
+        try:
+            results = self.run_async(self.collect_many(
+                urls,
+                spec=FORM_SPEC,
+                wait_for_js=True,
+                scroll=False,
+                extra_wait=5,
+                wait_selector='[role="form"], form, [class*="form"]'  # フォーム要素の複数検出
+            ))
+            for url, page_data in results or []:
+                form = forms_by_url[url]
+                logger.info(f"Scraped Google Form: {form['name']}")
+                try:
+                    form_data = self._build_form_data(page_data, url, form['name'], form['store'])
+                    if form_data:
+                        fetched[url] = form_data
+                except Exception as e:
+                    logger.warning(f"Error scraping {form['name']}: {e}")
+        except Exception as e:
+            logger.warning(f"Error scraping Google Forms: {e}")
+        return fetched
+
+    def _build_form_data(self, page_data, url, form_name, store_name):
+        """ページ内抽出結果からフォーム情報を組み立てる"""
+        if not page_data:
+            logger.warning(f"Failed to fetch content for {form_name}")
+            return None
+
+        fields = page_data.get('fields', {})
         form_data = {
             'form_name': form_name,
             'store': store_name,
             'url': url,
             'scraped_at': datetime.now().isoformat(),
-            'form_title': '',
-            'form_description': '',
+            'form_title': fields.get('title', ''),
+            'form_description': fields.get('description', ''),
             'form_status': 'accepting',  # デフォルトをacceptingに設定
             'is_accepting': True  # デフォルトをTrueに設定
         }
 
-        # フォームタイトルを取得（複数セレクタ試行）
-        title_elem = soup.find('div', {'role': 'heading'})
-        if not title_elem:
-            title_elem = soup.find('h1')
-        if not title_elem:
-            title_elem = soup.find('div', {'class': 'OA0qFb'})
-        if not title_elem:
-            title_elem = soup.find('div', {'class': 'freebirdFormviewerViewHeaderTitleRequiredLegend'})
-        if not title_elem:
-            # より広いセレクタで検索
-            title_elem = soup.find(['h1', 'h2'], class_=lambda x: x and 'title' in str(x).lower())
-        if title_elem:
-            form_data['form_title'] = title_elem.get_text(strip=True)
-
-        # フォーム説明文を取得（複数セレクタ試行）
-        description_elem = soup.find('div', {'class': 'EWp5xe'})
-        if not description_elem:
-            description_elem = soup.find('div', {'class': 'freebirdFormviewerViewHeaderDescription'})
-        if not description_elem:
-            # より広いセレクタで検索
-            description_elem = soup.find('div', class_=lambda x: x and 'description' in str(x).lower())
-        if description_elem:
-            form_data['form_description'] = description_elem.get_text(strip=True)
-
-        # フォーム全体のテキストを取得（ステータス判定用）
-        page_text = soup.get_text(separator=' ', strip=True).lower()
-
         # 受付終了判定（終了キーワードがあれば閉鎖）
-        # より確実な閉鎖判定
-        closed_keywords = ['受付終了', '終了しました', 'closed form', 'form is closed',
-                          '応募は終了', 'この form はもう受け付けていません']
-        if any(keyword in page_text for keyword in closed_keywords):
+        if page_data.get('keywords_found'):
             form_data['form_status'] = 'closed'
             form_data['is_accepting'] = False
+        elif page_data.get('exists', {}).get('form'):
+            # フォーム要素が存在する
+            form_data['form_status'] = 'accepting'
+            form_data['is_accepting'] = True
+        elif page_data.get('text_length', 0) > 100:
+            # コンテンツが取得されていれば受付中と仮定
+            form_data['form_status'] = 'accepting'
+            form_data['is_accepting'] = True
         else:
-            # フォーム要素が存在するか確認
-            form_element = soup.find('[role="form"]') or soup.find('form') or soup.find('input')
-            if form_element:
-                form_data['form_status'] = 'accepting'
-                form_data['is_accepting'] = True
-            else:
-                # コンテンツが取得されていれば受付中と仮定
-                if len(page_text) > 100:
-                    form_data['form_status'] = 'accepting'
-                    form_data['is_accepting'] = True
-                else:
-                    form_data['form_status'] = 'unknown'
-                    form_data['is_accepting'] = False
+            form_data['form_status'] = 'unknown'
+            form_data['is_accepting'] = False
 
         # ポケモンカード関連のキーワード検出（Google Formsスクレイパーなので常にTrue）
         form_data['is_pokemon_card'] = True
@@ -0,0 +1,184 @@
+"""
+制限時間付きのスクレイパー実行
+
+asyncio.to_thread で実行したブロッキングな scrape() は途中で止められないため、
+- run_isolated: requests / API 系のスクレイパーを spawn した子プロセスで実行し、
+  結果をパイプで受け取る。タイムアウト・キャンセル時は子プロセスを terminate → kill する。
+- run_threaded: インスタンスを再利用する場合（常駐モード・Playwright）はデーモンスレッドで実行し、
+  タイムアウト時は cancel() を持つスクレイパー（PlaywrightBaseScraper）に協調的な中断を要求する。
+  止まらないスレッドは待たずに切り離す（デーモンスレッドのため終了処理を妨げない）。
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import host_control
+import retry
+
+logger = logging.getLogger(__name__)
+
+# terminate 後に終了を待つ時間（秒）。過ぎたら kill する
+TERMINATE_GRACE_SECONDS = 2.0
+# cancel() 後にブラウザの終了処理を待つ時間（秒）
+CANCEL_GRACE_SECONDS = 15.0
+
+
+class ScraperTimeout(TimeoutError):
+    """スクレイパーが制限時間内に終わらなかった"""
+
+
+def _run_child(conn, scraper_class, kwargs: Dict[str, Any], attrs: Dict[str, Any],
+               budget_used: Dict[str, int]) -> None:
+    """子プロセスでスクレイパーを実行し、結果と再試行の集計・使ったホストの同時実行数の増減分を送る"""
+    # 再試行の予算は親で消費済みの分を除いた残りだけ使う（使った分は集計の retries で親に戻る）
+    retry.inherit_budget(budget_used)
+    try:
+        scraper = scraper_class(**kwargs)
+        for name, value in attrs.items():
+            setattr(scraper, name, value)
+        conn.send(('ok', scraper.scrape(), _telemetry()))
+    except BaseException as e:
+        conn.send(('error', f"{type(e).__name__}: {e}", _telemetry()))
+    finally:
+        conn.close()
+
+
+def _telemetry() -> Dict[str, Any]:
+    return {'retry': retry.metrics(), 'hosts': host_control.changes()}
+
+
+def _stop(process) -> None:
+    """子プロセスを終了（応答しなければ kill）"""
+    # 結果を送った子プロセスは直後に終了するため、少しだけ待つ
+    process.join(0.2)
+    if not process.is_alive():
+        return
+    process.terminate()
+    process.join(TERMINATE_GRACE_SECONDS)
+    if process.is_alive():
+        logger.warning(f"Scraper worker {process.pid} did not exit, killing")
+        process.kill()
+        process.join()
+
+
+async def run_isolated(scraper_class, kwargs: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                       attrs: Optional[Dict[str, Any]] = None) -> Any:
+    """スクレイパーを子プロセスで実行
+
+    Args:
+        scraper_class: スクレイパークラス（モジュールから import できること）
+        kwargs: コンストラクタ引数
+        timeout: 制限時間（秒、Noneで無制限）
+        attrs: 生成後に設定する属性（max_response_bytes 等）
+
+    Returns:
+        scrape() の戻り値（子プロセスでの再試行の集計・予算の消費・ホストの同時実行数の増減分は親プロセスに取り込む）
+
+    Raises:
+        ScraperTimeout: 制限時間を超えた場合（子プロセスは終了済み）
+        RuntimeError: 子プロセスで例外が発生した、または異常終了した場合
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_child, args=(sender, scraper_class, kwargs or {}, attrs or {}, retry.budget_used()),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+
+    loop = asyncio.get_running_loop()
+    readable = loop.create_future()
+
+    def on_readable():
+        if not readable.done():
+            readable.set_result(None)
+
+    loop.add_reader(receiver.fileno(), on_readable)
+    try:
+        try:
+            await asyncio.wait_for(readable, timeout)
+        except asyncio.TimeoutError:
+            raise ScraperTimeout(f"{scraper_class.__name__} exceeded {timeout:.0f}s")
+        loop.remove_reader(receiver.fileno())
+        try:
+            # 大きな結果の受信でイベントループを止めないようにスレッドで読む
+            status, payload, telemetry = await asyncio.to_thread(receiver.recv)
+        except EOFError:
+            raise RuntimeError(f"{scraper_class.__name__} worker exited with code {process.exitcode}")
+    finally:
+        loop.remove_reader(receiver.fileno())
+        receiver.close()
+        _stop(process)
+
+    retry.merge_metrics(telemetry['retry'])
+    if telemetry['hosts']:
+        host_control.controller().merge(telemetry['hosts'])
+    if status != 'ok':
+        raise RuntimeError(payload)
+    return payload
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+async def run_in_thread(func: Callable[[], Any]) -> Any:
+    """func をデーモンスレッドで実行して結果を待つ
+
+    asyncio.to_thread と異なり、待つのをやめたスレッドが asyncio.run の終了を妨げない。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def target():
+        try:
+            result, error = func(), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(_resolve, future, result, error)
+        except RuntimeError:
+            # 待っていたイベントループが既に終了している（切り離し済み）
+            pass
+
+    threading.Thread(target=target, name=f'scrape-{getattr(func, "__qualname__", "worker")}', daemon=True).start()
+    return await future
+
+
+async def run_threaded(scraper, timeout: Optional[float] = None) -> Any:
+    """scraper.scrape() をスレッドで実行（制限時間付き）
+
+    Args:
+        scraper: スクレイパーインスタンス
+        timeout: 制限時間（秒、Noneで無制限）
+
+    Returns:
+        scrape() の戻り値
+
+    Raises:
+        ScraperTimeout: 制限時間を超えた場合（cancel() を要求し、猶予内に終わらなければ切り離す）
+    """
+    reset = getattr(scraper, 'reset_cancel', None)
+    if reset is not None:
+        reset()
+    task = asyncio.ensure_future(run_in_thread(scraper.scrape))
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        cancel = getattr(scraper, 'cancel', None)
+        if cancel is not None:
+            cancel()
+            await asyncio.wait({task}, timeout=CANCEL_GRACE_SECONDS)
+        if not task.done():
+            logger.warning(f"{type(scraper).__name__} did not stop, abandoning worker thread")
+        # 中断時の例外を回収（未取得の警告を出さない）
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        raise ScraperTimeout(f"{type(scraper).__name__} exceeded {timeout:.0f}s")
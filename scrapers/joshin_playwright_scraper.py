@@ -5,12 +5,21 @@ Bot対策を回避するためヘッドレスブラウザを使用
 from datetime import datetime
 import logging
 
-from bs4 import BeautifulSoup
-
-from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE
+from .playwright_base import PlaywrightBaseScraper, PLAYWRIGHT_AVAILABLE, class_contains_selector
 
 logger = logging.getLogger(__name__)
 
+# ページ内抽出定義（商品アイテム + 全リンク）
+PRODUCT_SPEC = {
+    'items': {
+        'container': class_contains_selector(['div', 'li', 'article'], ['item', 'product', 'goods']),
+        'title': 'h2, h3, h4, p, span, a',
+    },
+    'links': {
+        'parent': 'div, li, article',
+    },
+}
+
 
 class JoshinPlaywrightScraper(PlaywrightBaseScraper):
     def __init__(self):
@@ -34,15 +43,16 @@ class JoshinPlaywrightScraper(PlaywrightBaseScraper):
 
         try:
             # ジョーシンもタイムアウト長めに設定
-            content = self.run_async(self.fetch_page_content(
+            page_data = self.run_async(self.fetch_page_records(
                 self.search_url,
+                PRODUCT_SPEC,
                 wait_selector='.item',
                 extra_wait=8
             ))
 
-            if content:
+            if page_data:
                 # 404/403 チェック
-                if any(code in content for code in ['404', 'Not Found', '403', 'Forbidden']):
+                if self.is_error_page(page_data):
                     logger.warning("ジョーシン: アクセスエラー（404/403）")
                     return {
                 'timestamp': datetime.now().isoformat(),
@@ -53,7 +63,7 @@ class JoshinPlaywrightScraper(PlaywrightBaseScraper):
                         'error': 'HTTP Error'
                     }
 
-                lotteries = self._parse_content(content)
+                lotteries = self._parse_records(page_data)
         except TimeoutError:
             logger.error("Error scraping joshin: Timeout")
             return {
@@ -77,52 +87,36 @@ class JoshinPlaywrightScraper(PlaywrightBaseScraper):
             'lotteries': unique_lotteries
         }
 
-    def _parse_content(self, content):
-        """HTMLコンテンツをパース"""
+    def _parse_records(self, page_data):
+        """ページ内抽出結果をパース"""
         lotteries = []
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # 商品アイテムを探す
-        items = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and any(
-            kw in str(x).lower() for kw in ['item', 'product', 'goods']
-        ))
 
-        for item in items:
-            lottery = self._parse_item(item)
+        for record in page_data.get('items', []):
+            lottery = self._parse_item(record)
             if lottery:
                 lotteries.append(lottery)
 
         # リンクからも探す
-        links = soup.find_all('a', href=True)
-        for link in links:
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-
-            if self.is_pokemon_card(text):
-                lottery = self._parse_link(link, href, text)
+        for record in page_data.get('links', []):
+            if self.is_pokemon_card(record.get('product', '')):
+                lottery = self._parse_link(record)
                 if lottery:
                     lotteries.append(lottery)
 
         return lotteries
 
-    def _parse_item(self, item):
+    def _parse_item(self, record):
         """商品アイテムから情報を抽出"""
         try:
-            text = item.get_text(strip=True)
+            text = record.get('text', '')
 
             if not self.is_pokemon_card(text):
                 return None
 
-            link = item.find('a', href=True)
-            href = link.get('href', '') if link else ''
-
-            if href and not href.startswith('http'):
-                href = 'https://joshinweb.jp' + href
-
-            # 商品名を取得
-            title_elem = item.find(['h2', 'h3', 'h4', 'p', 'span', 'a'])
-            product_name = title_elem.get_text(strip=True) if title_elem else ''
+            href = record.get('href', '')
 
+            # 商品名を取得（見つからない場合はテキストから推定）
+            product_name = record.get('product', '')
             if not product_name or len(product_name) < 10:
                 product_name = text[:150]
 
@@ -130,19 +124,16 @@ class JoshinPlaywrightScraper(PlaywrightBaseScraper):
             if not any(kw in text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック', '新発売']):
                 return None
 
-            price = self.extract_price(text)
-            status = self.determine_status(text)
-
             if product_name and href:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ジョーシン',
                     'product': product_name,
                     'lottery_type': '抽選販売' if '抽選' in text else '予約販売',
-                    'period': self.extract_period(text),
-                    'price': price,
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
                     'detail_url': href,
-                    'status': status
+                    'status': self.determine_status(text)
                 }
 
         except Exception as e:
@@ -150,32 +141,25 @@ class JoshinPlaywrightScraper(PlaywrightBaseScraper):
 
         return None
 
-    def _parse_link(self, link, href, text):
+    def _parse_link(self, record):
         """リンクから情報を抽出"""
         try:
-            if not href.startswith('http'):
-                href = 'https://joshinweb.jp' + href
+            text = record.get('product', '')
+            parent_text = record.get('text', '') or text
 
-            # 抽選・予約関連のキーワードがなければスキップ
             if not any(kw in text for kw in ['抽選', '予約', 'BOX', 'ボックス', 'パック']):
                 return None
 
-            parent = link.find_parent(['div', 'li', 'article'])
-            parent_text = parent.get_text() if parent else text
-
-            price = self.extract_price(parent_text)
-            status = self.determine_status(parent_text)
-
             if len(text) > 10:
                 return {
                 'timestamp': datetime.now().isoformat(),
                     'store': 'ジョーシン',
                     'product': text,
                     'lottery_type': '抽選販売' if '抽選' in text else '予約販売',
-                    'period': self.extract_period(parent_text),
-                    'price': price,
-                    'detail_url': href,
-                    'status': status
+                    'period': record.get('period', ''),
+                    'price': record.get('price', ''),
+                    'detail_url': record.get('href', ''),
+                    'status': self.determine_status(parent_text)
                 }
 
         except Exception as e:
@@ -18,11 +18,6 @@ class KsDenkiScraper(RequestsBaseScraper):
         self.urls = []
         self.search_url = None
         self.source_name = 'ksdenki.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選情報をスクレイピング"""
@@ -62,7 +57,7 @@ class KsDenkiScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text):
+                if self.is_pokemon_card(link_text):
                     lottery_info = self._parse_lottery_link(link, href)
                     if lottery_info:
                         lotteries.append(lottery_info)
@@ -74,7 +69,7 @@ class KsDenkiScraper(RequestsBaseScraper):
 
             for item in product_items:
                 item_text = item.get_text()
-                if self._is_pokemon_card(item_text):
+                if self.is_pokemon_card(item_text):
                     lottery = self._parse_product_item(item)
                     if lottery:
                         lotteries.append(lottery)
@@ -86,13 +81,6 @@ class KsDenkiScraper(RequestsBaseScraper):
 
         return lotteries
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _parse_lottery_link(self, link, href):
         """リンクから抽選情報を抽出"""
         try:
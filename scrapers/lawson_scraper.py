@@ -17,11 +17,6 @@ class LawsonScraper(RequestsBaseScraper):
         super().__init__(timeout=30, wait_time=1)
         self.search_url = "https://www.hmv.co.jp/search/?category=ALL&keyword=ポケモンカード"
         self.source_name = 'hmv.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -73,7 +68,7 @@ class LawsonScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text) and '/product/' in href:
+                if self.is_pokemon_card(link_text) and '/product/' in href:
                     lottery = self._parse_product_link(link, href)
                     if lottery:
                         lotteries.append(lottery)
@@ -90,7 +85,7 @@ class LawsonScraper(RequestsBaseScraper):
         try:
             text = item.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = item.find('a', href=True)
@@ -114,7 +109,7 @@ class LawsonScraper(RequestsBaseScraper):
             if not product_name:
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:150]
                         break
 
@@ -242,13 +237,6 @@ class LawsonScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
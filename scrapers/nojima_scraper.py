@@ -18,11 +18,6 @@ class NojimaScraper(RequestsBaseScraper):
         self.urls = []
         self.search_url = None  # Bot対策で403エラーになるためスキップ
         self.source_name = 'online.nojima.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選情報をスクレイピング"""
@@ -59,7 +54,7 @@ class NojimaScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text):
+                if self.is_pokemon_card(link_text):
                     lottery_info = self._parse_lottery_link(link, href)
                     if lottery_info:
                         lotteries.append(lottery_info)
@@ -71,7 +66,7 @@ class NojimaScraper(RequestsBaseScraper):
 
             for item in product_items:
                 item_text = item.get_text()
-                if self._is_pokemon_card(item_text):
+                if self.is_pokemon_card(item_text):
                     lottery = self._parse_product_item(item)
                     if lottery:
                         lotteries.append(lottery)
@@ -83,13 +78,6 @@ class NojimaScraper(RequestsBaseScraper):
 
         return lotteries
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _parse_lottery_link(self, link, href):
         """リンクから抽選情報を抽出"""
         try:
@@ -0,0 +1,115 @@
+"""
+HTML解析用プロセスプール
+
+取得（I/O）はスレッド/asyncio側に残し、BeautifulSoup による解析と
+抽出処理（GILを保持するCPU処理）を ProcessPoolExecutor で並列実行する。
+生のバイト列を渡し、抽出済みのレコード（dictのリスト）を受け取る。
+
+プールはスクレイパーを同一プロセスで実行する常駐モード（watch.WatchDaemon）が
+1回だけ start() で起動（ワーカーを事前起動）する。通常実行では requests / API 系の
+スクレイパーが個別の子プロセス（scrapers.isolated）で動くため起動しない。
+未起動の場合や関数がpickleできない場合は呼び出し元スレッドでそのまま実行する。
+"""
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    """ワーカー初期化（解析で使うモジュールを先に読み込む）"""
+    import bs4  # noqa: F401
+    import catalog  # noqa: F401
+
+
+def _ping() -> int:
+    """ウォームアップ用"""
+    return os.getpid()
+
+
+def start(workers: int) -> int:
+    """プロセスプールを起動し、全ワーカーを事前に立ち上げる
+
+    Args:
+        workers: ワーカー数（1以下の場合はプールを使わない）
+
+    Returns:
+        起動したワーカー数（プールを使わない場合は0）
+    """
+    global _pool
+    with _lock:
+        if _pool is not None:
+            return _pool._max_workers
+        if workers <= 1:
+            return 0
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            # ワーカーは遅延起動されるため、ワーカー数分のタスクで全プロセスを立ち上げる
+            pids = {future.result() for future in [pool.submit(_ping) for _ in range(workers)]}
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Process pool unavailable, parsing inline: {e}")
+            return 0
+        _pool = pool
+        logger.info(f"Parse pool started: {len(pids)}/{workers} workers warm")
+        return workers
+
+
+def shutdown() -> None:
+    """プロセスプールを停止"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def is_running() -> bool:
+    """プロセスプールが起動中か"""
+    return _pool is not None
+
+
+def submit(func: Callable[..., Any], *args: Any) -> Future:
+    """解析処理を投入（プール未起動・pickle不可の場合は同期実行済みのFutureを返す）
+
+    Args:
+        func: モジュールレベル関数、またはpickle可能なインスタンスのメソッド
+        *args: 引数（生のバイト列など）
+
+    Returns:
+        結果を保持するFuture
+    """
+    pool = _pool
+    if pool is not None and _is_picklable(func):
+        try:
+            return pool.submit(func, *args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning(f"Parse pool unavailable, parsing inline: {e}")
+
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run(func: Callable[..., Any], *args: Any) -> Any:
+    """解析処理を実行して結果を返す（submit().result() の省略形）"""
+    return submit(func, *args).result()
+
+
+def _is_picklable(func: Callable[..., Any]) -> bool:
+    """関数（バウンドメソッドの場合はインスタンスごと）がpickle可能か"""
+    try:
+        pickle.dumps(func)
+        return True
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
@@ -3,79 +3,259 @@ Playwrightを使用したベーススクレイパー
 Bot対策のあるサイトに対応するためのヘッドレスブラウザ実装
 """
 from datetime import datetime
+from urllib.parse import urlparse
 import asyncio
+import importlib.util
+import json
 import logging
 import os
 import random
 import re
+import threading
+import time
+import weakref
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+import catalog
+import host_control
+import retry
+from . import api_capture
+from .site_spec import PERIOD_PATTERNS, PRICE_PATTERN, class_contains_selector, status_of  # noqa: F401
+from constants import (
+    DEFAULT_HEADERS, DEFAULT_MAX_RETRIES, DEFAULT_NAVIGATION_TIMEOUT, DEFAULT_TIMEOUT, HOST_CONCURRENCY_MAX, STORAGE_STATE_DIR, STORAGE_STATE_TTL_HOURS, USER_AGENTS,
+)
+
+# Playwright は重いため、ブラウザ起動時に初めて読み込む
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec('playwright') is not None
+async_playwright = None
+
+
+def _get_async_playwright():
+    """playwright.async_api.async_playwright を初回使用時に読み込む"""
+    global async_playwright
+    if async_playwright is None:
+        from playwright.async_api import async_playwright as loaded
+        async_playwright = loaded
+    return async_playwright
 
-from constants import DEFAULT_HEADERS, DEFAULT_MAX_RETRIES, DEFAULT_NAVIGATION_TIMEOUT, DEFAULT_TIMEOUT, USER_AGENTS
 
 logger = logging.getLogger(__name__)
 
+# ページ・コンテキスト・ブラウザの close を待つ上限（秒）。超えたらプロセスを強制終了する
+CLOSE_TIMEOUT_SECONDS = 10
+# cancel() の確認間隔（秒）
+CANCEL_POLL_SECONDS = 0.5
+
+_PRICE_RE = re.compile(PRICE_PATTERN)
+_PERIOD_RES = [re.compile(pattern) for pattern in PERIOD_PATTERNS]
+
+# ページ内抽出スクリプト（page.evaluate で実行し、コンパクトなレコードのみ返す）
+# spec のキー:
+#   items:  {container, title, link, max_text}  商品コンテナ単位の抽出
+#   links:  {href_contains, min_text, parent, max_text}  リンク単位の抽出
+#   fields: {name: selector}  ページ内で最初に一致した要素のテキスト
+#   exists: {name: selector}  要素の有無
+#   keywords: [..]  本文（小文字化）に含まれるキーワード
+IN_PAGE_EXTRACT_JS = """
+(spec) => {
+    const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+    const clip = (s, n) => (s.length > n ? s.slice(0, n) : s);
+    const priceRe = spec.price_pattern ? new RegExp(spec.price_pattern) : null;
+    const periodRes = (spec.period_patterns || []).map((p) => new RegExp(p));
+    const priceOf = (text) => {
+        const m = priceRe ? text.match(priceRe) : null;
+        return m ? m[0] : '';
+    };
+    const periodOf = (text) => {
+        for (const re of periodRes) {
+            const m = text.match(re);
+            if (m) return m[1] || m[0];
+        }
+        return '';
+    };
+    const record = (product, href, text, maxText) => ({
+        product: clip(product, 200),
+        href: href,
+        price: priceOf(text),
+        period: periodOf(text),
+        text: clip(text, maxText || 300),
+    });
+    const out = {
+        url: location.href,
+        title: document.title,
+        items: [],
+        links: [],
+        fields: {},
+        exists: {},
+        keywords_found: [],
+        text_length: 0,
+    };
+
+    if (spec.items) {
+        const s = spec.items;
+        for (const el of document.querySelectorAll(s.container)) {
+            const text = norm(el.textContent);
+            const link = el.querySelector(s.link || 'a[href]');
+            const titleEl = s.title ? el.querySelector(s.title) : null;
+            const product = titleEl ? norm(titleEl.textContent) : '';
+            out.items.push(record(product, link ? link.href : '', text, s.max_text));
+        }
+    }
+
+    if (spec.links) {
+        const s = spec.links;
+        const needles = s.href_contains || [];
+        for (const a of document.querySelectorAll('a[href]')) {
+            const rawHref = a.getAttribute('href') || '';
+            if (needles.length && !needles.some((n) => rawHref.includes(n))) continue;
+            const text = norm(a.textContent);
+            if (text.length < (s.min_text || 0)) continue;
+            const parent = a.parentElement ? a.parentElement.closest(s.parent || 'div, li, article') : null;
+            const parentText = parent ? norm(parent.textContent) : text;
+            out.links.push(record(text, a.href, parentText, s.max_text));
+        }
+    }
+
+    // セレクタ配列は先頭から優先順に試行する
+    const first = (selectors) => {
+        for (const sel of [].concat(selectors)) {
+            const el = document.querySelector(sel);
+            if (el) return el;
+        }
+        return null;
+    };
+    for (const [name, selectors] of Object.entries(spec.fields || {})) {
+        const el = first(selectors);
+        out.fields[name] = el ? norm(el.textContent) : '';
+    }
+    for (const [name, selectors] of Object.entries(spec.exists || {})) {
+        out.exists[name] = first(selectors) !== null;
+    }
+
+    const bodyText = document.body ? norm(document.body.innerText).toLowerCase() : '';
+    out.text_length = bodyText.length;
+    for (const kw of spec.keywords || []) {
+        if (bodyText.includes(kw.toLowerCase())) out.keywords_found.push(kw);
+    }
+    return out;
+}
+"""
+
+
+# Webdriver検出を回避するスクリプト (強化版)
+STEALTH_INIT_SCRIPT = """
+    // webdriver プロパティを隠す
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // plugins を偽装
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => {
+            const plugins = [
+                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
+                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
+                { name: 'Native Client', filename: 'internal-nacl-plugin' }
+            ];
+            plugins.length = 3;
+            return plugins;
+        }
+    });
+
+    // languages を偽装
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['ja-JP', 'ja', 'en-US', 'en']
+    });
+
+    // Chrome オブジェクトを偽装
+    window.chrome = {
+        runtime: {},
+        loadTimes: function() {},
+        csi: function() {},
+        app: {}
+    };
+
+    // permissions を偽装
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // Headless検出を回避
+    Object.defineProperty(navigator, 'maxTouchPoints', {
+        get: () => 1
+    });
+
+    // WebGL vendor/renderer を偽装
+    const getParameter = WebGLRenderingContext.prototype.getParameter;
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) {
+            return 'Intel Inc.';
+        }
+        if (parameter === 37446) {
+            return 'Intel Iris OpenGL Engine';
+        }
+        return getParameter.call(this, parameter);
+    };
+"""
+
 
 class PlaywrightBaseScraper:
     """Playwrightを使用するスクレイパーの基底クラス"""
 
+    # ブラウザコンテキストごとのウォームアップ済みドメイン（コンテキストの破棄とともに消える）
+    _warmed_domains = weakref.WeakKeyDictionary()
+
+    # 描画中の JSON 応答から一覧のエンドポイントを記録し、次回以降の fetch_page_records は
+    # HTTP で直接取得する（API モード、形が変わったら描画に戻す。api_capture 参照）
+    API_CAPTURE = False
+    # API モードのレコードの項目 → JSON のキーまたは書式（例: {'href': '/detail?gcode={gcode}'}）
+    API_ITEM_FIELDS = {}
+
     def __init__(self):
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG',
-            'ナイトワンダラー', 'クリムゾンヘイズ', 'レイジングサーフ',
-            'ムニキスゼロ', 'MEGAドリーム', 'メガエルレイド', 'ロケット団',
-            '抽選', '予約'
-        ]
+        # 判定はカタログのオートマトンで行う（一覧は表示・デバッグ用）
+        self.pokemon_keywords = catalog.keywords(broad=True) + list(catalog.LOTTERY_TERMS)
         self.user_agents = USER_AGENTS
         self.timeout = DEFAULT_TIMEOUT
         self.navigation_timeout = DEFAULT_NAVIGATION_TIMEOUT
+        self.storage_state_dir = STORAGE_STATE_DIR
+        self.storage_state_ttl = STORAGE_STATE_TTL_HOURS * 3600
 
     def is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
+        """ポケモンカード関連かチェック（抽選ページ内の候補判定のため抽選・予約語も採用）"""
+        return catalog.is_pokemon_card(text, broad=True, extra_tags=('lottery',))
 
     def extract_price(self, text):
         """価格を抽出"""
         if not text:
             return ''
-        price_match = re.search(r'[\d,]+円', text)
+        price_match = _PRICE_RE.search(text)
         return price_match.group() if price_match else ''
 
     def extract_period(self, text):
         """期間を抽出"""
         if not text:
             return ''
-        patterns = [
-            r'(\d{1,2}[/月]\d{1,2}[日]?\s*[〜～\-]\s*\d{1,2}[/月]\d{1,2}[日]?)',
-            r'(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'(\d{4}/\d{1,2}/\d{1,2})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _PERIOD_RES:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return ''
 
+    def is_error_page(self, page_data):
+        """ページ内抽出結果がHTTPエラー/アクセス拒否ページか判定"""
+        if not page_data:
+            return False
+        status = page_data.get('http_status')
+        if status and status >= 400:
+            return True
+        title = (page_data.get('title') or '').lower()
+        return any(kw in title for kw in ['403', '404', 'forbidden', 'not found', 'access denied'])
+
     def determine_status(self, text):
         """ステータスを判定"""
-        if not text:
-            return 'unknown'
-        if any(kw in text for kw in ['受付中', '予約可', '在庫あり', 'カートに入れる', '販売中', '応募する', '抽選受付']):
-            return 'active'
-        elif any(kw in text for kw in ['終了', '売切', '品切', '完売', '予約終了', '受付終了']):
-            return 'closed'
-        elif any(kw in text for kw in ['近日', '予定', 'まもなく']):
-            return 'upcoming'
-        return 'unknown'
+        return status_of(text)
 
     async def fetch_page_content(self, url, wait_selector=None, wait_for_js=True, scroll=True, extra_wait=2, max_retries=None):
         """
@@ -89,6 +269,153 @@ class PlaywrightBaseScraper:
             extra_wait: 追加の待機時間（秒）
             max_retries: 最大retry回数（デフォルト1回）
         """
+        return await self._fetch_with_attempts(
+            url, self._read_html, wait_selector, wait_for_js, scroll, extra_wait, max_retries
+        )
+
+    async def fetch_page_records(self, url, spec, wait_selector=None, wait_for_js=True, scroll=True, extra_wait=2, max_retries=None):
+        """
+        ページ内抽出モードでコンパクトなレコードを取得
+
+        page.content() でDOM全体をシリアライズして BeautifulSoup で再パースする代わりに、
+        spec（セレクタ定義）を page.evaluate でブラウザ内実行し、必要な項目のみ返す。
+
+        Args:
+            url: 取得するURL
+            spec: 抽出定義（IN_PAGE_EXTRACT_JS のコメント参照）
+            その他の引数は fetch_page_content と同じ
+
+        API_CAPTURE が有効で、前回の描画でエンドポイントを記録済みなら HTTP で直接取得する
+        （items のみ。失敗・形の変化時は描画する）。
+
+        Returns:
+            抽出結果辞書（http_status, url, title, items, links, fields, exists,
+            keywords_found, text_length）。取得失敗時はNone
+        """
+        if self.API_CAPTURE:
+            page_data = await self._fetch_via_api(url)
+            if page_data is not None:
+                return page_data
+        return await self._fetch_with_attempts(
+            url, self._spec_extractor(spec), wait_selector, wait_for_js, scroll, extra_wait, max_retries
+        )
+
+    async def fetch_many(self, urls, spec=None, wait_selector=None, wait_for_js=True, scroll=True, extra_wait=2,
+                         max_retries=None, concurrency=None):
+        """
+        複数URLを1つのブラウザコンテキストで並列取得（完了順に返す非同期ジェネレータ）
+
+        ブラウザ起動・コンテキスト作成は1回のみで、各URLは同一コンテキスト内の
+        別ページとして同時に開く。同時に開くページ数はホストごとに host_control が
+        レイテンシと 429/403/5xx から自動調整する。retry はURL単位で行う。
+
+        Args:
+            urls: 取得するURLのリスト
+            spec: 指定時はページ内抽出（fetch_page_records と同じ結果）、未指定時はHTML
+            concurrency: 同時に開くページ数の全体の上限（省略時は HOST_CONCURRENCY_MAX）
+            その他の引数は fetch_page_content と同じ
+
+        Yields:
+            (url, 結果) のタプル。取得失敗時の結果はNone
+
+        Raises:
+            RuntimeError: ブラウザ起動・コンテキスト作成に失敗した場合
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            logger.warning("playwright is not installed")
+            for url in urls:
+                yield url, None
+            return
+
+        if max_retries is None:
+            max_retries = DEFAULT_MAX_RETRIES
+        extractor = self._read_html if spec is None else self._spec_extractor(spec)
+        semaphore = asyncio.Semaphore(max(1, concurrency or HOST_CONCURRENCY_MAX))
+
+        async with _get_async_playwright()() as p:
+            browser = None
+            context = None
+            tasks = []
+            try:
+                # 起動・コンテキスト作成の失敗は全URLに及ぶため呼び出し元へ伝える
+                try:
+                    browser = await self._launch_browser(p)
+                    context = await self._new_context(browser, urls)
+                except Exception as e:
+                    raise RuntimeError(f"Playwright launch failed: {e}") from e
+                for domain_url in {self._domain_of(url): url for url in urls}.values():
+                    await self._warm_up(context, domain_url)
+
+                async def worker(url):
+                    async with semaphore:
+                        try:
+                            result = await self._fetch_in_context(
+                                context, url, extractor, wait_selector, wait_for_js, scroll, extra_wait, max_retries
+                            )
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            # ページ単位の失敗は他のURLに影響させない
+                            logger.error(f"Playwright error for {url}: {e}")
+                            result = None
+                        return url, result
+
+                tasks = [asyncio.ensure_future(worker(url)) for url in urls]
+                for finished in asyncio.as_completed(tasks):
+                    yield await finished
+                await self._save_storage_state(context, urls)
+            finally:
+                # 途中で打ち切られた場合も未完了タスクとブラウザを確実に解放
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await self._close_resources(None, context, browser)
+
+    async def collect_many(self, urls, **kwargs):
+        """fetch_many の結果を完了順のリストで返す（run_async から呼び出す用）"""
+        return [item async for item in self.fetch_many(urls, **kwargs)]
+
+    async def _fetch_in_context(self, context, url, extractor, wait_selector, wait_for_js, scroll, extra_wait, max_retries):
+        """共有コンテキスト内の新規ページで1URLを取得（URL単位のretry付き）"""
+        async def attempt_once(attempt):
+            page = None
+            try:
+                page = await self._new_page(context)
+                response = await self._load_page_controlled(page, url, wait_selector, wait_for_js, scroll, extra_wait)
+                result = await extractor(page, response)
+            except (TimeoutError, RuntimeError, ConnectionError) as e:
+                raise retry.Retry(f"Playwright error: {e}")
+            except Exception as e:
+                raise retry.Retry(f"Unexpected Playwright error: {e}")
+            finally:
+                await self._close_resources(page, None, None)
+            if result is None:
+                raise retry.Retry('empty page')
+            return result
+
+        try:
+            return await retry.call_async(retry.BROWSER.with_attempts(max_retries + 1), attempt_once, url)
+        except retry.RetryExhausted:
+            return None
+
+    def _spec_extractor(self, spec):
+        """抽出定義から extractor(page, response) を生成（既定の価格・期間パターンを補完）"""
+        spec = dict(spec)
+        spec.setdefault('price_pattern', PRICE_PATTERN)
+        spec.setdefault('period_patterns', PERIOD_PATTERNS)
+
+        async def extractor(page, response):
+            return await self._evaluate_spec(page, response, spec)
+
+        return extractor
+
+    async def _fetch_with_attempts(self, url, extractor, wait_selector, wait_for_js, scroll, extra_wait, max_retries,
+                                   accept=None):
+        """retry ループ（fetch_page_content / fetch_page_records / fetch_with_retry 共通）
+
+        再試行は retry.BROWSER の方針（ジッタ付きバックオフ・実行全体の予算）に従う。
+        accept を指定した場合は accept(result) が偽の結果も再試行する。
+        """
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("playwright is not installed")
             return None
@@ -96,152 +423,339 @@ class PlaywrightBaseScraper:
         if max_retries is None:
             max_retries = DEFAULT_MAX_RETRIES
 
-        for attempt in range(max_retries + 1):
-            result = await self._fetch_page_content_internal(url, wait_selector, wait_for_js, scroll, extra_wait, attempt)
-            if result is not None:
-                return result
-            if attempt < max_retries:
-                logger.info(f"Retry {attempt + 1}/{max_retries} for {url}")
-                await asyncio.sleep(2)  # retry前に2秒待機
+        async def attempt_once(attempt):
+            result = await self._fetch_page_internal(url, extractor, wait_selector, wait_for_js, scroll, extra_wait, attempt)
+            if result is None or (accept is not None and not accept(result)):
+                raise retry.Retry('empty page')
+            return result
+
+        try:
+            return await retry.call_async(retry.BROWSER.with_attempts(max_retries + 1), attempt_once, url)
+        except retry.RetryExhausted:
+            return None
 
-        return None
+    async def _fetch_via_api(self, url):
+        """記録したエンドポイントから一覧を取得（未記録・失敗・形の変化時はNone）"""
+        entry = api_capture.store().get(url)
+        if entry is None:
+            return None
+        cookies = (self._load_storage_state([url]) or {}).get('cookies', [])
+        try:
+            data = await asyncio.to_thread(
+                api_capture.fetch_json, entry['endpoint'], url, random.choice(self.user_agents), cookies,
+                entry.get('headers')
+            )
+        except Exception as e:
+            logger.info(f"API mode failed for {url}, rendering instead: {e}")
+            return None
+
+        items = api_capture.items_at(data, entry['path'])
+        records = api_capture.items_to_records(
+            items or [], url, self.API_ITEM_FIELDS, self.extract_price, self.extract_period
+        )
+        if not items or not set(entry['keys']) <= set(api_capture.item_keys(items)) \
+                or not any(record['product'] for record in records):
+            logger.info(f"API response shape changed for {url}, rendering instead")
+            api_capture.store().forget(url)
+            return None
+
+        logger.info(f"🛰 API mode: {len(records)} items from {entry['endpoint']}")
+        return {
+            'http_status': 200, 'url': url, 'title': '', 'items': records, 'links': [], 'fields': {},
+            'exists': {}, 'keywords_found': [], 'text_length': sum(len(record['text']) for record in records),
+            'api_mode': True,
+        }
+
+    def _start_capture(self, page):
+        """描画中の JSON 応答（XHR / fetch の GET）の読み取りを開始"""
+        pending = []
+
+        def on_response(response):
+            request = response.request
+            if request.resource_type in ('xhr', 'fetch') and request.method == 'GET' \
+                    and 'json' in (response.headers.get('content-type') or ''):
+                pending.append(asyncio.ensure_future(self._read_json(response)))
+
+        page.on('response', on_response)
+        return pending
+
+    @staticmethod
+    async def _read_json(response):
+        """(URL, 独自ヘッダ, JSON)。読めなければNone"""
+        try:
+            return response.url, api_capture.custom_headers(response.request.headers), await response.json()
+        except Exception:
+            return None
+
+    async def _finish_capture(self, page, url, pending):
+        """読み取った JSON から一覧のエンドポイントを選んで記録
+
+        要素の多い順に、商品名が描画後のページ本文に現れる一覧を採用する
+        （設定・計測用の JSON を誤って記録しないため）。
+        """
+        responses = [result for result in await asyncio.gather(*pending, return_exceptions=True)
+                     if isinstance(result, tuple)]
+        candidates = []
+        for endpoint, headers, data in responses:
+            path, items = api_capture.find_items(data)
+            if path is not None:
+                candidates.append((len(items), endpoint, headers, path, items))
+        if not candidates:
+            return
+        try:
+            body = await page.inner_text('body')
+        except Exception as e:
+            logger.debug(f"Could not read page text for API capture: {e}")
+            return
+
+        for _, endpoint, headers, path, items in sorted(candidates, key=lambda c: -c[0]):
+            records = api_capture.items_to_records(items, url, self.API_ITEM_FIELDS)
+            if any(record['product'] and record['product'] in body for record in records):
+                api_capture.store().record(url, api_capture.url_template(endpoint), path,
+                                           api_capture.item_keys(items), headers, type(self).__name__)
+                return
+
+    async def _read_html(self, page, response):
+        """ページ全体のHTMLを取得"""
+        content = await page.content()
+        return content if content and len(content) > 100 else None
+
+    async def _evaluate_spec(self, page, response, spec):
+        """抽出定義をページ内で評価"""
+        result = await page.evaluate(IN_PAGE_EXTRACT_JS, spec)
+        if not result:
+            return None
+        result['http_status'] = response.status if response else None
+        return result
+
+    async def _launch_browser(self, p):
+        """より本物のブラウザに近い設定でChromiumを起動"""
+        # headlessモードを環境変数で制御（GitHub Actionsではheadless=True）
+        headless_mode = os.getenv('GITHUB_ACTIONS') is not None or os.getenv('CI') is not None
+
+        return await p.chromium.launch(
+            headless=headless_mode,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-infobars',
+                '--window-size=1920,1080',
+                '--start-maximized',
+            ]
+        )
+
+    async def _new_context(self, browser, urls=None):
+        """ランダムなUser-Agentでブラウザコンテキストを作成（保存済みストレージ状態を復元）"""
+        options = {
+            'user_agent': random.choice(self.user_agents),
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'ja-JP',
+            'timezone_id': 'Asia/Tokyo',
+            # Webdriver検出を回避
+            'extra_http_headers': DEFAULT_HEADERS,
+        }
+        storage_state = self._load_storage_state(urls or [])
+        if storage_state:
+            options['storage_state'] = storage_state
+        return await browser.new_context(**options)
+
+    @staticmethod
+    def _domain_of(url):
+        """URLのホスト名（小文字）"""
+        return (urlparse(url).hostname or '').lower()
+
+    def _storage_state_path(self, domain):
+        """ドメインごとのストレージ状態ファイルパス"""
+        return os.path.join(self.storage_state_dir, f'{domain}.json')
+
+    def _read_domain_state(self, domain):
+        """有効期限内のドメイン別ストレージ状態を読み込む（期限切れ・破損時はNone）"""
+        path = self._storage_state_path(domain)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read storage state {path}: {e}")
+            return None
+
+        if time.time() - data.get('saved_at', 0) > self.storage_state_ttl:
+            logger.info(f"Storage state expired: {domain}")
+            return None
+        return data
+
+    def _load_storage_state(self, urls):
+        """URL群のドメインの保存済み状態をマージして new_context 用の辞書を返す"""
+        cookies = []
+        origins = []
+        for domain in dict.fromkeys(self._domain_of(url) for url in urls):
+            if not domain:
+                continue
+            data = self._read_domain_state(domain)
+            if data:
+                cookies.extend(data.get('cookies', []))
+                origins.extend(data.get('origins', []))
+        if not cookies and not origins:
+            return None
+        return {'cookies': cookies, 'origins': origins}
+
+    async def _save_storage_state(self, context, urls):
+        """コンテキストのストレージ状態をドメイン別にディスクへ保存"""
+        try:
+            state = await context.storage_state()
+        except Exception as e:
+            logger.warning(f"Failed to get storage state: {e}")
+            return
+
+        for domain in dict.fromkeys(self._domain_of(url) for url in urls):
+            if not domain:
+                continue
+            data = {
+                'saved_at': time.time(),
+                'cookies': [
+                    c for c in state.get('cookies', [])
+                    if self._domain_matches(domain, c.get('domain', ''))
+                ],
+                'origins': [
+                    o for o in state.get('origins', [])
+                    if self._domain_of(o.get('origin', '')) == domain
+                ],
+            }
+            path = self._storage_state_path(domain)
+            try:
+                os.makedirs(self.storage_state_dir, exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+            except OSError as e:
+                logger.warning(f"Failed to save storage state {path}: {e}")
+
+    @staticmethod
+    def _domain_matches(domain, cookie_domain):
+        """Cookieのdomain属性が対象ドメインに適用されるか"""
+        cookie_domain = cookie_domain.lstrip('.').lower()
+        return bool(cookie_domain) and (domain == cookie_domain or domain.endswith('.' + cookie_domain))
+
+    async def _warm_up(self, context, url):
+        """
+        コンテキスト内でドメインごとに1回だけセッションをウォームアップ
+
+        保存済みの有効なストレージ状態がない場合のみトップページを開き、
+        Cookieバナー・WAFチャレンジ・初回リダイレクトをこの1回で済ませて状態を保存する。
+        """
+        domain = self._domain_of(url)
+        warmed = PlaywrightBaseScraper._warmed_domains.setdefault(context, set())
+        if not domain or domain in warmed:
+            return
+        warmed.add(domain)
 
-    async def _fetch_page_content_internal(self, url, wait_selector, wait_for_js, scroll, extra_wait, attempt=0):
-        """内部処理用の fetch_page_content（retry ロジック外）"""
+        if self._read_domain_state(domain):
+            return
+
+        parsed = urlparse(url)
+        page = None
+        try:
+            page = await self._new_page(context)
+            await page.goto(
+                f'{parsed.scheme}://{parsed.netloc}/',
+                timeout=self.navigation_timeout,
+                wait_until='domcontentloaded'
+            )
+            await self._save_storage_state(context, [url])
+            logger.info(f"Session warmed up: {domain}")
+        except Exception as e:
+            logger.warning(f"Warm-up failed for {domain}: {e}")
+        finally:
+            await self._close_resources(page, None, None)
+
+    async def _new_page(self, context):
+        """Webdriver検出回避スクリプトを適用したページを作成"""
+        page = await context.new_page()
+        await page.add_init_script(STEALTH_INIT_SCRIPT)
+        return page
+
+    async def _load_page(self, page, url, wait_selector, wait_for_js, scroll, extra_wait):
+        """ページにアクセスして動的コンテンツのロードを待つ
+
+        API_CAPTURE が有効なら、描画中の JSON 応答から一覧のエンドポイントを記録する。
+
+        Returns:
+            page.goto のレスポンス
+        """
+        capture = self._start_capture(page) if self.API_CAPTURE else None
+        response = await page.goto(
+            url,
+            timeout=self.navigation_timeout,
+            wait_until='domcontentloaded'
+        )
+
+        # 403等のHTTPエラーの場合、ページコンテンツを試しに取得してみる
+        # （サーバー側の条件付きブロック対策）
+        if response and response.status >= 400:
+            logger.warning(f"HTTP {response.status} for {url}, attempting to retrieve content anyway")
+            # 少し待ってからコンテンツを取得してみる
+            await asyncio.sleep(2)
+
+        # networkidleを待つ（タイムアウトしても続行）
+        if wait_for_js:
+            try:
+                await page.wait_for_load_state('networkidle', timeout=15000)
+            except TimeoutError:
+                logger.warning(f"networkidle wait timeout for {url}")
+
+        # 特定のセレクタを待つ場合
+        if wait_selector:
+            try:
+                await page.wait_for_selector(wait_selector, timeout=15000)
+            except TimeoutError:
+                logger.warning(f"Selector '{wait_selector}' timeout for {url}")
+
+        # ページ全体をスクロールして遅延読み込みコンテンツを取得
+        if scroll:
+            await self._smooth_scroll(page)
+
+        # 追加の待機時間（動的コンテンツのロード用）
+        if extra_wait > 0:
+            await asyncio.sleep(extra_wait)
+
+        if capture:
+            await self._finish_capture(page, url, capture)
+        return response
+
+    async def _load_page_controlled(self, page, url, wait_selector, wait_for_js, scroll, extra_wait):
+        """ホストごとの同時実行数の枠内で _load_page を行い、レイテンシとステータスを報告"""
+        controller = host_control.controller()
+        host = host_control.host_of(url)
+        await controller.acquire_async(host)
+        started = time.monotonic()
+        outcome = host_control.ERROR
+        try:
+            response = await self._load_page(page, url, wait_selector, wait_for_js, scroll, extra_wait)
+            outcome = host_control.classify_status(response.status if response else None)
+            return response
+        finally:
+            # 待機時間（extra_wait）はホストの応答時間ではないため除く
+            controller.release(host, max(0.0, time.monotonic() - started - extra_wait), outcome)
+
+    async def _fetch_page_internal(self, url, extractor, wait_selector, wait_for_js, scroll, extra_wait, attempt=0):
+        """1回分のページ取得（retry ロジック外）。extractor(page, response) の結果を返す"""
         browser = None
         context = None
         page = None
 
         try:
-            async with async_playwright() as p:
-                # headlessモードを環境変数で制御（GitHub Actionsではheadless=True）
-                headless_mode = os.getenv('GITHUB_ACTIONS') is not None or os.getenv('CI') is not None
-
-                # より本物のブラウザに近い設定でlaunch
-                browser = await p.chromium.launch(
-                    headless=headless_mode,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-dev-shm-usage',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-infobars',
-                        '--window-size=1920,1080',
-                        '--start-maximized',
-                    ]
-                )
-
-                # ランダムなUser-Agentを選択
-                user_agent = random.choice(self.user_agents)
-
-                context = await browser.new_context(
-                    user_agent=user_agent,
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='ja-JP',
-                    timezone_id='Asia/Tokyo',
-                    # Webdriver検出を回避
-                    extra_http_headers=DEFAULT_HEADERS
-                )
-
-                page = await context.new_page()
-
-                # Webdriver検出を回避するスクリプト (強化版)
-                await page.add_init_script("""
-                    // webdriver プロパティを隠す
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-
-                    // plugins を偽装
-                    Object.defineProperty(navigator, 'plugins', {
-                        get: () => {
-                            const plugins = [
-                                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
-                                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
-                                { name: 'Native Client', filename: 'internal-nacl-plugin' }
-                            ];
-                            plugins.length = 3;
-                            return plugins;
-                        }
-                    });
-
-                    // languages を偽装
-                    Object.defineProperty(navigator, 'languages', {
-                        get: () => ['ja-JP', 'ja', 'en-US', 'en']
-                    });
-
-                    // Chrome オブジェクトを偽装
-                    window.chrome = {
-                        runtime: {},
-                        loadTimes: function() {},
-                        csi: function() {},
-                        app: {}
-                    };
-
-                    // permissions を偽装
-                    const originalQuery = window.navigator.permissions.query;
-                    window.navigator.permissions.query = (parameters) => (
-                        parameters.name === 'notifications' ?
-                            Promise.resolve({ state: Notification.permission }) :
-                            originalQuery(parameters)
-                    );
-
-                    // Headless検出を回避
-                    Object.defineProperty(navigator, 'maxTouchPoints', {
-                        get: () => 1
-                    });
-
-                    // WebGL vendor/renderer を偽装
-                    const getParameter = WebGLRenderingContext.prototype.getParameter;
-                    WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                        if (parameter === 37445) {
-                            return 'Intel Inc.';
-                        }
-                        if (parameter === 37446) {
-                            return 'Intel Iris OpenGL Engine';
-                        }
-                        return getParameter.call(this, parameter);
-                    };
-                """)
-
-                # ページにアクセス
-                response = await page.goto(
-                    url,
-                    timeout=self.navigation_timeout,
-                    wait_until='domcontentloaded'
-                )
-
-                # 403等のHTTPエラーの場合、ページコンテンツを試しに取得してみる
-                # （サーバー側の条件付きブロック対策）
-                if response and response.status >= 400:
-                    logger.warning(f"HTTP {response.status} for {url}, attempting to retrieve content anyway")
-                    # 少し待ってからコンテンツを取得してみる
-                    await asyncio.sleep(2)
-
-                # networkidleを待つ（タイムアウトしても続行）
-                if wait_for_js:
-                    try:
-                        await page.wait_for_load_state('networkidle', timeout=15000)
-                    except TimeoutError:
-                        logger.warning(f"networkidle wait timeout for {url}")
-
-                # 特定のセレクタを待つ場合
-                if wait_selector:
-                    try:
-                        await page.wait_for_selector(wait_selector, timeout=15000)
-                    except TimeoutError:
-                        logger.warning(f"Selector '{wait_selector}' timeout for {url}")
-
-                # ページ全体をスクロールして遅延読み込みコンテンツを取得
-                if scroll:
-                    await self._smooth_scroll(page)
-
-                # 追加の待機時間（動的コンテンツのロード用）
-                if extra_wait > 0:
-                    await asyncio.sleep(extra_wait)
-
-                content = await page.content()
-                return content if content and len(content) > 100 else None
+            async with _get_async_playwright()() as p:
+                browser = await self._launch_browser(p)
+                context = await self._new_context(browser, [url])
+                await self._warm_up(context, url)
+                page = await self._new_page(context)
+                response = await self._load_page_controlled(page, url, wait_selector, wait_for_js, scroll, extra_wait)
+                result = await extractor(page, response)
+                if result is not None:
+                    await self._save_storage_state(context, [url])
+                return result
 
         except (TimeoutError, RuntimeError, ConnectionError) as e:
             logger.error(f"Playwright error for {url}: {e}")
@@ -250,36 +764,39 @@ class PlaywrightBaseScraper:
             logger.error(f"Unexpected Playwright error for {url}: {e}")
             return None
         finally:
-            # リソースの確実な解放（try/finallyで保証）
-            if page:
-                try:
-                    await page.close()
-                except (TimeoutError, RuntimeError) as e:
-                    logger.warning(f"Error closing page: {e}")
-            if context:
-                try:
-                    await context.close()
-                except (TimeoutError, RuntimeError) as e:
-                    logger.warning(f"Error closing context: {e}")
-            if browser:
+            await self._close_resources(page, context, browser)
+
+    async def _close_resources(self, page, context, browser):
+        """リソースの確実な解放（try/finallyから呼び出し）"""
+        if page:
+            try:
+                await asyncio.wait_for(page.close(), CLOSE_TIMEOUT_SECONDS)
+            except (TimeoutError, RuntimeError) as e:
+                logger.warning(f"Error closing page: {e}")
+        if context:
+            try:
+                await asyncio.wait_for(context.close(), CLOSE_TIMEOUT_SECONDS)
+            except (TimeoutError, RuntimeError) as e:
+                logger.warning(f"Error closing context: {e}")
+        if browser:
+            try:
+                await asyncio.wait_for(browser.close(), CLOSE_TIMEOUT_SECONDS)
+            except (TimeoutError, RuntimeError) as e:
+                # タイムアウト時は強制終了を試行
+                logger.warning(f"Browser close timeout, attempting force close: {e}")
                 try:
-                    await browser.close()
-                except (TimeoutError, RuntimeError) as e:
-                    # タイムアウト時は強制終了を試行
-                    logger.warning(f"Browser close timeout, attempting force close: {e}")
-                    try:
-                        # Playwrightの内部的な強制終了
-                        if hasattr(browser, '_impl') and hasattr(browser._impl, '_launch_process'):
-                            process = browser._impl._launch_process
-                            # kill() が callable か確認（str型等の誤判定を防止）
-                            if hasattr(process, 'kill') and callable(process.kill):
-                                try:
-                                    process.kill()
-                                    logger.info("Browser process force killed")
-                                except Exception as kill_err:
-                                    logger.warning(f"Force kill failed: {kill_err}")
-                    except Exception as inner_e:
-                        logger.warning(f"Force close attempt failed: {inner_e}")
+                    # Playwrightの内部的な強制終了
+                    if hasattr(browser, '_impl') and hasattr(browser._impl, '_launch_process'):
+                        process = browser._impl._launch_process
+                        # kill() が callable か確認（str型等の誤判定を防止）
+                        if hasattr(process, 'kill') and callable(process.kill):
+                            try:
+                                process.kill()
+                                logger.info("Browser process force killed")
+                            except Exception as kill_err:
+                                logger.warning(f"Force kill failed: {kill_err}")
+                except Exception as inner_e:
+                    logger.warning(f"Force close attempt failed: {inner_e}")
 
     async def _smooth_scroll(self, page):
         """人間らしいスムーズスクロール"""
@@ -309,20 +826,48 @@ class PlaywrightBaseScraper:
         except Exception as e:
             logger.warning(f"Scroll error: {e}")
 
-    async def fetch_with_retry(self, url, wait_selector=None, max_retries=3, **kwargs):
-        """リトライ付きでページを取得"""
-        for attempt in range(max_retries):
-            content = await self.fetch_page_content(url, wait_selector, **kwargs)
-            if content and len(content) > 1000:  # 最低限のコンテンツがあるか確認
-                return content
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2  # 2, 4, 6秒と増加
-                logger.info(f"Retry {attempt + 1}/{max_retries} for {url}, waiting {wait_time}s...")
-                await asyncio.sleep(wait_time)
-        return None
+    async def fetch_with_retry(self, url, wait_selector=None, max_retries=3, wait_for_js=True, scroll=True, extra_wait=2):
+        """最低限のコンテンツ（1000文字超）が得られるまで取得（ブラウザ起動は最大 max_retries 回）"""
+        return await self._fetch_with_attempts(
+            url, self._read_html, wait_selector, wait_for_js, scroll, extra_wait, max_retries - 1,
+            accept=lambda content: len(content) > 1000,
+        )
+
+    def cancel(self):
+        """実行中・以降の run_async を打ち切る（別スレッドから呼び出し可）
+
+        実行中のコルーチンは CancelledError で中断され、finally でブラウザを閉じる。
+        """
+        self._get_cancel_event().set()
+
+    def reset_cancel(self):
+        """cancel() を解除（インスタンスを再利用する前に呼び出す）"""
+        self._get_cancel_event().clear()
+
+    def _get_cancel_event(self):
+        # サブクラスが __init__ を呼ばない場合もあるため初回使用時に作成
+        event = self.__dict__.get('_cancel_event')
+        if event is None:
+            event = self.__dict__.setdefault('_cancel_event', threading.Event())
+        return event
+
+    async def _run_cancellable(self, coro):
+        """cancel() が呼ばれたらコルーチンをキャンセルする"""
+        event = self._get_cancel_event()
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            if event.is_set():
+                task.cancel()
+                break
+            await asyncio.wait({task}, timeout=CANCEL_POLL_SECONDS)
+        return await task
 
     def run_async(self, coro):
-        """非同期処理を同期的に実行"""
+        """非同期処理を同期的に実行（cancel() で打ち切り可能）"""
+        if self._get_cancel_event().is_set():
+            coro.close()
+            raise asyncio.CancelledError()
+        coro = self._run_cancellable(coro)
         created_new_loop = False
         loop = None
         try:
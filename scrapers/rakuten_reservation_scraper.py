@@ -33,7 +33,6 @@ class RakutenReservationScraper(RequestsBaseScraper):
                 logger.info(f"  検索中: {keyword}")
                 keyword_products = self._search_products(keyword)
                 products.extend(keyword_products)
-                time.sleep(2)  # レート制限対策
 
             # 重複除外
             unique_products = self._remove_duplicates(products)
@@ -59,27 +58,28 @@ class RakutenReservationScraper(RequestsBaseScraper):
         try:
             search_url = f"{self.search_url}?sv=30&f=0&g=001&v=2&e=0&s=5&sitem={keyword}"
 
-            html_content = self.fetch_html(search_url)
-            if not html_content:
-                return products
+            # リクエスト間隔は crawl_pages 内でホスト単位に制御
+            products = self.crawl_pages(search_url, self._parse_page, page_param='p')
 
-            soup = self.parse_soup(html_content)
-            if not soup:
-                return products
+        except Exception as e:
+            logger.info(f"  Warning: Search error for '{keyword}': {e}")
 
-            # 商品要素を取得
-            items = soup.select('.item-list .item')
+        return products
 
-            for item in items[:20]:  # 上位20件を確認
-                try:
-                    product = self._parse_product(item)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    continue
+    def _parse_page(self, soup):
+        """検索結果1ページ分の商品をパース"""
+        products = []
 
-        except Exception as e:
-            logger.info(f"  Warning: Search error for '{keyword}': {e}")
+        # 商品要素を取得
+        items = soup.select('.item-list .item')
+
+        for item in items[:20]:  # 各ページ上位20件を確認
+            try:
+                product = self._parse_product(item)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                continue
 
         return products
 
@@ -7,19 +7,79 @@ requests系スクレイパーの共通基底クラス
 - User-Agent設定
 - タイムアウト処理
 - エラーハンドリング
-- 429/403リトライ対応
+- 429/5xx・タイムアウトのリトライ（retry.HTTP の方針、Retry-After 対応）と403/404の即時中止
+- ストリーミング取得（サイズ上限・逐次デコード・キーワード走査）
+- 検索結果のページネーション（ホスト単位のペース制御下で並列取得）
+- ホストごとの同時リクエスト数の自動調整（host_control）
 """
+import codecs
 import logging
+import re
+import threading
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup
 
+import catalog
+import host_control
+import retry
+from . import parse_pool
+
 logger = logging.getLogger(__name__)
 
+# ページ番号パラメータとして扱うクエリ名（小文字）
+PAGE_PARAM_CANDIDATES = ('page', 'p', 'pg', 'pageno', 'page_no', 'pagenum', 'pno')
+
+# <meta charset="..."> / <meta http-equiv content="...; charset=..."> の検出用
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+# 再試行するステータスコード（Retry-After があれば従う）
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class KeywordScanner:
+    """
+    ストリーミングされたテキストからキーワードを逐次検出
+
+    チャンク境界をまたぐキーワードを取りこぼさないよう、直前チャンクの末尾
+    （最長キーワード長-1文字）だけを保持して走査する。全文は保持しない。
+    """
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keyword_groups: グループ名 → キーワードリスト（大文字小文字は区別しない）
+        """
+        self.keyword_groups = {
+            name: [kw.lower() for kw in keywords] for name, keywords in keyword_groups.items()
+        }
+        self.found: Dict[str, Optional[str]] = {name: None for name in self.keyword_groups}
+        longest = max((len(kw) for kws in self.keyword_groups.values() for kw in kws), default=1)
+        self._overlap = max(longest - 1, 0)
+        self._tail = ''
+
+    def feed(self, text: str) -> None:
+        """テキストチャンクを走査"""
+        window = self._tail + text.lower()
+        for name, keywords in self.keyword_groups.items():
+            if self.found[name] is None:
+                for kw in keywords:
+                    if kw in window:
+                        self.found[name] = kw
+                        break
+        self._tail = window[-self._overlap:] if self._overlap else ''
+
+    def any_found(self, groups: Iterable[str]) -> bool:
+        """指定グループのいずれかでキーワードが見つかったか"""
+        return any(self.found.get(name) for name in groups)
+
 
 class RequestsBaseScraper:
     """requests系スクレイパーの基底クラス"""
@@ -29,7 +89,10 @@ class RequestsBaseScraper:
     DEFAULT_WAIT_TIME = 1
     DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
     MAX_RETRIES = 3
-    RETRY_WAIT_BASE = 2  # 指数バックオフの基数
+    MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # ストリーミング取得時のサイズ上限（ソース別に config で上書き可）
+    STREAM_CHUNK_SIZE = 64 * 1024
+    MAX_PAGES = 5  # ページネーションで取得する最大ページ数
+    PAGE_CONCURRENCY = None  # 同時に取得するページ数（None でホスト別に自動調整）
 
     def __init__(self, timeout: int = None, wait_time: float = None):
         """
@@ -41,11 +104,29 @@ class RequestsBaseScraper:
         """
         self.timeout = timeout or self.DEFAULT_TIMEOUT
         self.wait_time = wait_time or self.DEFAULT_WAIT_TIME
+        self.max_response_bytes = self.MAX_RESPONSE_BYTES
+        # ホストごとの次回リクエスト開始時刻（並列取得時もリクエスト間隔を保証）
+        self._host_next_slot: Dict[str, float] = {}
+        self._pacing_lock = threading.Lock()
         self.session = requests.Session()
         self.headers = self.get_headers()
         # Sessionにヘッダを設定
         self.session.headers.update(self.headers)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """pickle用の状態（プロセスプールへ解析メソッドごと渡すため、通信用の状態は除く）"""
+        state = self.__dict__.copy()
+        for name in ('session', '_pacing_lock', '_host_next_slot'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._host_next_slot = {}
+        self._pacing_lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
     def get_headers(self) -> Dict[str, str]:
         """
         HTTPリクエストヘッダを取得
@@ -64,52 +145,405 @@ class RequestsBaseScraper:
         Args:
             url: 対象URL
 
+        ボディはチャンク単位で読み、max_response_bytes を超えた分は読まずに打ち切る。
+
         Returns:
             HTMLコンテンツ（取得失敗時はNone）
         """
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                # リクエスト間隔（ジッタ付き）
-                jitter = random.uniform(-0.5, 0.5)
-                wait_time = max(0.1, self.wait_time + jitter)
-                time.sleep(wait_time)
+        response = self._send_request(url, stream=True)
+        if response is None:
+            return None
 
+        limit = self.max_response_bytes
+        body = bytearray()
+        try:
+            for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                body.extend(chunk)
+                if limit and len(body) > limit:
+                    logger.warning(f"Response exceeded {limit} bytes for {url}. Truncating.")
+                    del body[limit:]
+                    break
+        except requests.RequestException as e:
+            logger.error(f"Failed to read {url}: {e}")
+            return None
+        finally:
+            response.close()
+        return bytes(body)
+
+    def _send_request(self, url: str, stream: bool = False) -> Optional[requests.Response]:
+        """
+        GETリクエストを送信（429/5xx・タイムアウトは retry.HTTP の方針で再試行、403/404は即中止）
+
+        Args:
+            url: 対象URL
+            stream: Trueの場合ボディを読まずにレスポンスを返す（呼び出し側で close する）
+
+        Returns:
+            成功したレスポンス（取得失敗時はNone）
+        """
+        try:
+            return retry.call(
+                retry.HTTP.with_attempts(self.MAX_RETRIES),
+                lambda attempt: self._request_once(url, stream),
+                url,
+                retry_on=(requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+            )
+        except retry.RetryExhausted as e:
+            logger.error(f"Retries exhausted for {url}: {e}")
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout fetching {url}")
+        except requests.exceptions.ConnectionError:
+            logger.error(f"Connection error for {url}")
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+        return None
+
+    def _request_once(self, url: str, stream: bool) -> Optional[requests.Response]:
+        """
+        1回分のGETリクエスト
+
+        Returns:
+            成功したレスポンス（403/404はNone）
+
+        Raises:
+            retry.Retry: 429/5xx（Retry-After 付き）
+            requests.RequestException: 通信エラー・その他のHTTPエラー
+        """
+        # リクエスト間隔（ジッタ付き、ホスト単位）
+        self._wait_for_slot(url)
+
+        # ホストごとの同時実行数の枠内で送信し、レイテンシとステータスを報告
+        with host_control.controller().request(host_control.host_of(url)) as report:
+            if stream:
+                response = self.session.get(url, timeout=self.timeout, stream=True)
+            else:
                 response = self.session.get(url, timeout=self.timeout)
+            status = response.status_code
+            report['outcome'] = host_control.classify_status(status)
+
+        # ステータスコード別処理（エラー時はストリーミング接続を解放）
+        if stream and (status in (403, 404) or status in RETRY_STATUSES):
+            response.close()
+        if status == 404:
+            logger.warning(f"Not found (404) for {url}")
+            return None
+        elif status == 403:
+            logger.error(f"Access forbidden (403) for {url}. Aborting.")
+            return None
+        elif status in RETRY_STATUSES:
+            raise retry.Retry(f"HTTP {status}", retry.parse_retry_after(response.headers.get('Retry-After')))
+
+        try:
+            response.raise_for_status()
+        except requests.RequestException:
+            if stream:
+                response.close()
+            raise
+        return response
+
+    def _wait_for_slot(self, url: str) -> None:
+        """
+        同一ホストへのリクエスト開始間隔を確保
+
+        直列時は従来どおりジッタ付き wait_time だけ待機し、並列時は
+        ホストごとの開始時刻を予約して wait_time 間隔に直列化する。
+        """
+        jitter = random.uniform(-0.5, 0.5)
+        wait_time = max(0.1, self.wait_time + jitter)
+        host = urlparse(url).netloc
+        with self._pacing_lock:
+            now = time.monotonic()
+            start = max(now, self._host_next_slot.get(host, now)) + wait_time
+            self._host_next_slot[host] = start
+        time.sleep(start - now)
+
+    def crawl_pages(self, first_url: str, parse_page: Callable[[BeautifulSoup], list],
+                    page_param: Optional[str] = None, item_key: Optional[Callable[[dict], Any]] = None,
+                    max_pages: Optional[int] = None, concurrency: Optional[int] = None) -> list:
+        """
+        検索結果を複数ページにわたって取得
+
+        1ページ目から次ページリンク・ページ番号パラメータを検出し、2ページ目以降を
+        concurrency 件ずつ並列取得する（リクエスト間隔はホスト単位で維持）。
+        新しいアイテムが1件も得られないページがあった時点で以降の取得をやめる。
 
-                # ステータスコード別処理
-                if response.status_code == 404:
-                    logger.warning(f"Not found (404) for {url}")
-                    return None
-                elif response.status_code == 403:
-                    logger.error(f"Access forbidden (403) for {url}. Aborting.")
-                    return None
-                elif response.status_code == 429:
-                    # 429: Too Many Requests - リトライ
-                    if attempt < self.MAX_RETRIES - 1:
-                        wait_seconds = (self.RETRY_WAIT_BASE ** attempt) + random.uniform(0, 1)
-                        logger.warning(f"Rate limited (429) for {url}. Retrying in {wait_seconds:.1f}s (attempt {attempt+1}/{self.MAX_RETRIES})")
-                        time.sleep(wait_seconds)
+        Args:
+            first_url: 1ページ目のURL
+            parse_page: soup → アイテムリスト（ポケモンカード関連のみ）を返す関数
+            page_param: ページ番号パラメータ名のヒント（リンクから検出できない場合に使用）
+            item_key: アイテムの同一性判定キー（デフォルト: url/detail_url/product/title）
+            max_pages: 最大ページ数（デフォルト: MAX_PAGES）
+            concurrency: 同時取得ページ数（デフォルト: PAGE_CONCURRENCY、None ならホストの現在の上限）
+
+        Returns:
+            全ページのアイテムリスト（2ページ目以降は新規アイテムのみ）
+        """
+        max_pages = max_pages or self.MAX_PAGES
+        concurrency = concurrency or self.PAGE_CONCURRENCY
+        host = host_control.host_of(first_url)
+        item_key = item_key or self._default_item_key
+
+        content = self.fetch_html(first_url)
+        if not content:
+            return []
+
+        first = self._resolve_page(first_url, parse_pool.submit(
+            self._extract_page, content, first_url, parse_page, page_param), parse_page, content, page_param)
+        if first is None:
+            return []
+
+        items = first['items']
+        seen = {item_key(item) for item in items}
+        if not items or max_pages <= 1:
+            return items
+
+        param = first['page_param']
+        if param:
+            pending = [self._with_query_param(first_url, param, n) for n in range(2, max_pages + 1)]
+        else:
+            # パラメータが分からない場合は「次へ」リンクを順にたどる
+            pending = [first['next_url']] if first['next_url'] else []
+
+        visited = {first_url}
+        pages = 1
+        while pending and pages < max_pages:
+            # 固定値がなければウェーブごとにホストの現在の上限を使う
+            wave_size = max(1, concurrency or host_control.controller().limit(host))
+            wave = []
+            while pending and len(wave) < min(wave_size, max_pages - pages):
+                url = pending.pop(0)
+                if url not in visited:
+                    visited.add(url)
+                    wave.append(url)
+            if not wave:
+                break
+
+            # 取得はスレッドで並列、解析は取得できたページから順にプロセスプールへ投入
+            with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+                contents = list(executor.map(self.fetch_html, wave))
+            futures = [
+                parse_pool.submit(self._extract_page, page_content, url, parse_page, param) if page_content else None
+                for url, page_content in zip(wave, contents)
+            ]
+
+            exhausted = False
+            for url, page_content, future in zip(wave, contents, futures):
+                pages += 1
+                page = self._resolve_page(url, future, parse_page, page_content, param)
+                if page is None:
+                    exhausted = True
+                    continue
+
+                new_count = 0
+                for item in page['items']:
+                    key = item_key(item)
+                    if key in seen:
                         continue
-                    else:
-                        logger.error(f"Rate limited (429) for {url}. Max retries exceeded.")
-                        return None
-
-                response.raise_for_status()
-                return response.content
-
-            except requests.exceptions.Timeout:
-                logger.error(f"Timeout fetching {url}: {attempt+1}/{self.MAX_RETRIES}")
-                if attempt == self.MAX_RETRIES - 1:
-                    return None
-            except requests.exceptions.ConnectionError:
-                logger.error(f"Connection error for {url}: {attempt+1}/{self.MAX_RETRIES}")
-                if attempt == self.MAX_RETRIES - 1:
-                    return None
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch {url}: {e}")
-                return None
+                    seen.add(key)
+                    items.append(item)
+                    new_count += 1
 
-        return None
+                if new_count == 0:
+                    exhausted = True
+                elif not param and page['next_url']:
+                    pending.append(page['next_url'])
+
+            if exhausted:
+                logger.info(f"Pagination stopped at page {pages} for {first_url}")
+                break
+
+        return items
+
+    def _extract_page(self, content: bytes, url: str, parse_page: Callable[[BeautifulSoup], list],
+                      page_param: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        1ページ分の解析と抽出（プロセスプールのワーカーで実行される）
+
+        Args:
+            content: 取得した生のHTML
+            url: ページURL（相対リンクの解決用）
+            parse_page: soup → アイテムリストを返す関数
+            page_param: ページ番号パラメータ名のヒント
+
+        Returns:
+            {'items': アイテムリスト, 'page_param': 検出したパラメータ名, 'next_url': 次ページURL}
+            （解析失敗時はNone）
+        """
+        soup = self.parse_soup(content)
+        if soup is None:
+            return None
+        return {
+            'items': list(parse_page(soup) or []),
+            'page_param': self._detect_page_param(soup, url, page_param),
+            'next_url': self._find_next_link(soup, url),
+        }
+
+    def _resolve_page(self, url: str, future, parse_page: Callable[[BeautifulSoup], list],
+                      content: Optional[bytes], page_param: Optional[str]) -> Optional[Dict[str, Any]]:
+        """解析結果を受け取る（プールが落ちた場合はこのスレッドで解析し直す）"""
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse pool failed for {url}, parsing inline: {e}")
+            return self._extract_page(content, url, parse_page, page_param)
+
+    @staticmethod
+    def _default_item_key(item: dict) -> Any:
+        """アイテムの同一性判定キー"""
+        for field in ('url', 'detail_url', 'product', 'title'):
+            if item.get(field):
+                return item[field]
+        return id(item)
+
+    def _detect_page_param(self, soup: BeautifulSoup, current_url: str, hint: Optional[str] = None) -> Optional[str]:
+        """ページ内リンクからページ番号クエリパラメータ名を検出"""
+        current = urlparse(current_url)
+        current_query = dict(parse_qsl(current.query))
+        candidates = {}
+
+        for link in soup.find_all(['a', 'link'], href=True):
+            target = urlparse(urljoin(current_url, link['href']))
+            if target.netloc != current.netloc or target.path != current.path:
+                continue
+            for name, value in parse_qsl(target.query):
+                if not value.isdigit() or current_query.get(name) == value:
+                    continue
+                if name.lower() in PAGE_PARAM_CANDIDATES or (hint and name == hint):
+                    candidates[name] = candidates.get(name, 0) + 1
+
+        if candidates:
+            return max(candidates, key=candidates.get)
+        return hint
+
+    def _find_next_link(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
+        """rel="next" または「次へ」リンクのURLを返す"""
+        link = soup.find(['link', 'a'], rel='next', href=True)
+        if not link:
+            link = soup.find('a', href=True, string=re.compile(r'^\s*(次へ|次のページ|Next|>|»|＞)\s*$', re.IGNORECASE))
+        if not link:
+            return None
+        next_url = urljoin(current_url, link['href'])
+        return next_url if next_url != current_url else None
+
+    @staticmethod
+    def _with_query_param(url: str, name: str, value: Any) -> str:
+        """クエリパラメータを置換（なければ追加）したURLを返す"""
+        parsed = urlparse(url)
+        query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k != name]
+        query.append((name, str(value)))
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    def stream_text(self, url: str, max_bytes: Optional[int] = None) -> Iterator[str]:
+        """
+        URLのボディをチャンク単位で逐次デコードして返すジェネレータ
+
+        ボディ全体をバッファせず、max_bytes（既定: self.max_response_bytes）を
+        超えた時点で読み込みを打ち切る。呼び出し側が途中で反復をやめた場合も
+        接続は解放される。
+
+        Args:
+            url: 対象URL
+            max_bytes: 読み込む最大バイト数
+
+        Yields:
+            デコード済みテキストチャンク
+        """
+        response = self._send_request(url, stream=True)
+        if response is None:
+            return
+
+        limit = max_bytes or self.max_response_bytes
+        received = 0
+        decoder = None
+        try:
+            for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                if decoder is None:
+                    encoding = self._detect_stream_encoding(response, chunk)
+                    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+                received += len(chunk)
+                if received > limit:
+                    logger.warning(f"Response exceeded {limit} bytes for {url}. Truncating.")
+                    yield decoder.decode(chunk[:len(chunk) - (received - limit)], final=True)
+                    return
+
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+
+            if decoder is not None:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+        except requests.RequestException as e:
+            logger.error(f"Failed to stream {url}: {e}")
+        finally:
+            response.close()
+
+    def scan_keywords(self, url: str, keyword_groups: Dict[str, Iterable[str]],
+                      stop_groups: Iterable[str] = (), max_bytes: Optional[int] = None) -> Optional[Dict[str, Optional[str]]]:
+        """
+        ストリーミング取得しながらキーワードを走査
+
+        Args:
+            url: 対象URL
+            keyword_groups: グループ名 → キーワードリスト
+            stop_groups: いずれかのキーワードが見つかった時点で読み込みを打ち切るグループ
+            max_bytes: 読み込む最大バイト数
+
+        Returns:
+            グループ名 → 最初に見つかったキーワード（未検出はNone）。取得失敗時はNone
+        """
+        stop_groups = list(stop_groups)
+        scanner = KeywordScanner(keyword_groups)
+        received_any = False
+
+        stream = self.stream_text(url, max_bytes=max_bytes)
+        try:
+            for text in stream:
+                received_any = True
+                scanner.feed(text)
+                if stop_groups and scanner.any_found(stop_groups):
+                    break
+        finally:
+            # 途中で打ち切った場合も接続を解放
+            stream.close()
+
+        return scanner.found if received_any else None
+
+    @staticmethod
+    def _detect_stream_encoding(response: requests.Response, head: bytes) -> str:
+        """ヘッダのcharset → 先頭チャンクの<meta charset> → UTF-8 の順にエンコーディングを決定"""
+        content_type = response.headers.get('Content-Type', '') if response.headers else ''
+        candidates: List[str] = []
+        if 'charset=' in content_type.lower():
+            candidates.append(content_type.lower().split('charset=')[-1].split(';')[0].strip().strip('"\''))
+        match = _META_CHARSET_RE.search(head[:4096])
+        if match:
+            candidates.append(match.group(1).decode('ascii', errors='ignore'))
+        for encoding in candidates:
+            try:
+                codecs.lookup(encoding)
+                return encoding
+            except LookupError:
+                continue
+        return 'utf-8'
+
+    def is_pokemon_card(self, text: Optional[str]) -> bool:
+        """
+        ポケモンカード関連かチェック（商品カタログで判定）
+
+        Args:
+            text: 商品名・リンクテキスト等
+
+        Returns:
+            関連していればTrue
+        """
+        return catalog.is_pokemon_card(text, broad=True)
 
     def parse_soup(self, html_content: str) -> Optional[BeautifulSoup]:
         """
@@ -18,11 +18,6 @@ class SevenElevenScraper(RequestsBaseScraper):
         self.search_url = "https://7net.omni7.jp/search/?keyword=ポケモンカード&searchKeywordFlg=1"
         self.source_name = '7net.omni7.jp'
         self.check_availability = check_availability
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング（リトライ + レート制限対応）"""
@@ -81,7 +76,7 @@ class SevenElevenScraper(RequestsBaseScraper):
                     link_text = link.get_text(strip=True)
                     href = link.get('href', '')
 
-                    if self._is_pokemon_card(link_text) and '/detail/' in href:
+                    if self.is_pokemon_card(link_text) and '/detail/' in href:
                         lottery = self._parse_product_link(link, href)
                         if lottery:
                             lotteries.append(lottery)
@@ -111,7 +106,7 @@ class SevenElevenScraper(RequestsBaseScraper):
         try:
             text = item.get_text(strip=True)
 
-            if not self._is_pokemon_card(text):
+            if not self.is_pokemon_card(text):
                 return None
 
             link = item.find('a', href=True)
@@ -129,7 +124,7 @@ class SevenElevenScraper(RequestsBaseScraper):
             if not product_name:
                 lines = [line.strip() for line in text.split('\n') if line.strip()]
                 for line in lines:
-                    if self._is_pokemon_card(line) and len(line) > 10:
+                    if self.is_pokemon_card(line) and len(line) > 10:
                         product_name = line[:150]
                         break
 
@@ -220,13 +215,6 @@ class SevenElevenScraper(RequestsBaseScraper):
 
         return None
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _normalize_url(self, href):
         """URLを正規化"""
         if not href:
@@ -280,64 +268,64 @@ class SevenElevenScraper(RequestsBaseScraper):
         if not url:
             return False
 
+        # ページが見つからない・アクセスできないパターン
+        not_found_keywords = [
+            'ご指定のページにアクセスできませんでした',
+            'ページが見つかりません',
+            'お探しのページは見つかりませんでした',
+            'ページにアクセスできません',
+            '404'
+        ]
+
+        # 在庫切れを示すキーワード
+        out_of_stock_keywords = [
+            '在庫切れ', '売り切れ', '販売終了', '完売', '品切れ',
+            'sold out', 'out of stock', '取り扱いを終了',
+            '現在お取り扱いできません', '販売を終了しました',
+            '予約受付は終了', '受付終了', '抽選受付は終了',
+            '予約終了', '終了しました', '受付期間外',
+            'カートに入れることができません', '購入できません',
+            'お取り扱いしておりません', '販売しておりません',
+            'ただいまお取り扱いできません', '現在販売しておりません'
+        ]
+
+        # 購入可能を示すキーワード
+        available_keywords = [
+            'カートに入れる', 'カートに追加', '購入する', '予約する',
+            '抽選に応募', '応募する', '申し込む', '予約受付中',
+            '抽選受付中', '販売中', 'お気に入りに追加'
+        ]
+
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            html = response.text.lower()
-
-            # ページが見つからない・アクセスできないパターン
-            not_found_keywords = [
-                'ご指定のページにアクセスできませんでした',
-                'ページが見つかりません',
-                'お探しのページは見つかりませんでした',
-                'ページにアクセスできません',
-                '404'
-            ]
-
-            for keyword in not_found_keywords:
-                if keyword in html:
-                    logger.info(f"  Info: {url} - ページなし: {keyword}")
-                    return False
-
-            # 在庫切れを示すキーワード
-            out_of_stock_keywords = [
-                '在庫切れ', '売り切れ', '販売終了', '完売', '品切れ',
-                'sold out', 'out of stock', '取り扱いを終了',
-                '現在お取り扱いできません', '販売を終了しました',
-                '予約受付は終了', '受付終了', '抽選受付は終了',
-                '予約終了', '終了しました', '受付期間外',
-                'カートに入れることができません', '購入できません',
-                'お取り扱いしておりません', '販売しておりません',
-                'ただいまお取り扱いできません', '現在販売しておりません'
-            ]
-
-            for keyword in out_of_stock_keywords:
-                if keyword in html:
-                    logger.info(f"  Info: {url} - 在庫切れ: {keyword}")
-                    return False
-
-            # 購入可能を示すキーワードがあるかチェック
-            available_keywords = [
-                'カートに入れる', 'カートに追加', '購入する', '予約する',
-                '抽選に応募', '応募する', '申し込む', '予約受付中',
-                '抽選受付中', '販売中', 'お気に入りに追加'
-            ]
-
-            has_available_keyword = any(keyword in html for keyword in available_keywords)
-
-            if not has_available_keyword:
+            # 本文全体を保持せずストリーミングで走査（ページなし・在庫切れが見つかった時点で打ち切り）
+            found = self.scan_keywords(
+                url,
+                {
+                    'not_found': not_found_keywords,
+                    'out_of_stock': out_of_stock_keywords,
+                    'available': available_keywords,
+                },
+                stop_groups=['not_found', 'out_of_stock'],
+            )
+
+            if found is None:
+                logger.info(f"  Info: {url} - 取得失敗")
+                return False
+
+            if found['not_found']:
+                logger.info(f"  Info: {url} - ページなし: {found['not_found']}")
+                return False
+
+            if found['out_of_stock']:
+                logger.info(f"  Info: {url} - 在庫切れ: {found['out_of_stock']}")
+                return False
+
+            if not found['available']:
                 logger.info(f"  Info: {url} - 購入可能キーワードなし")
                 return False
 
             return True
 
-        except requests.exceptions.HTTPError as e:
-            logger.info(f"  Info: {url} - HTTPエラー({e.response.status_code})")
-            return False
-        except requests.exceptions.Timeout:
-            logger.info(f"  Warning: {url} - タイムアウト")
-            return False
         except Exception as e:
             logger.info(f"  Warning: {url} - エラー: {e}")
             return False
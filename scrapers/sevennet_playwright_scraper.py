@@ -46,16 +46,27 @@ class SevenNetPlaywrightScraper(PlaywrightBaseScraper):
             (self.search_url, '検索ページ'),
         ]
 
-        for url, name in urls_to_try:
-            try:
-                # セレクタ待機なしで全コンテンツ取得（JS実行後に自動待機10秒）
-                content = self.run_async(self.fetch_page_content(
-                    url,
-                    wait_selector=None,
-                    wait_for_js=True,
-                    extra_wait=8
-                ))
+        names = dict(urls_to_try)
+        error = None
+
+        try:
+            # 3ページを同一ブラウザコンテキストで並列取得
+            # セレクタ待機なしで全コンテンツ取得（JS実行後に自動待機10秒）
+            results = self.run_async(self.collect_many(
+                [url for url, _ in urls_to_try],
+                wait_selector=None,
+                wait_for_js=True,
+                extra_wait=8
+            ))
+        except Exception as e:
+            # ブラウザ起動失敗などは取得失敗として呼び出し元へ伝える
+            logger.error(f"Error scraping sevennet: {e}")
+            error = str(e)
+            results = []
 
+        for url, content in results or []:
+            name = names[url]
+            try:
                 if content:
                     # Incapsulaブロックチェック
                     if 'Incapsula' in content or 'Request unsuccessful' in content:
@@ -73,13 +84,16 @@ class SevenNetPlaywrightScraper(PlaywrightBaseScraper):
 
         unique_lotteries = self.remove_duplicates(lotteries)
 
-        return {
+        data = {
                 'timestamp': datetime.now().isoformat(),
             'source': self.source_name,
             'source_url': self.lottery_url,
             'scraped_at': datetime.now().isoformat(),
             'lotteries': unique_lotteries
         }
+        if error:
+            data['error'] = error
+        return data
 
     def _parse_content(self, content):
         """HTMLコンテンツをパース"""
@@ -0,0 +1,335 @@
+"""
+宣言的なサイト別抽出定義（config/site_specs.yaml）と共通の抽出エンジン
+
+サイトごとの「商品コンテナ・項目のセレクタ・正規表現・URLの基準」を設定に書き、
+requests 系（BeautifulSoup + soupsieve）と Playwright 系（IN_PAGE_EXTRACT_JS によるページ内抽出）の
+どちらでも同じ定義から同じ形のレコード（product, href, price, period, text）を取り出し、
+抽選情報に組み立てる。セレクタと正規表現は定義ごとに1回だけコンパイルする（compiled）。
+
+    sites:
+      edion_event:
+        store: エディオン
+        source: エディオン (edion.com)
+        base_url: https://www.edion.com/      # 相対リンクの基準
+        urls: [https://www.edion.com/event/]
+        max_pages: 1                          # 検索結果のページ数（RequestsBaseScraper.crawl_pages）
+        lottery_type: 抽選販売                # 固定値、または {キーワード: 種別, default: 種別}
+        items:                                # 商品コンテナ単位の抽出
+          container: {tags: [div, li], class_contains: [item, product]}   # CSS 文字列も可
+          title: h2, h3, h4, span, p, strong  # 商品名（見つからない・min_product 未満ならテキスト先頭 max_product 文字）
+          require_any: [抽選, 予約]           # コンテナのテキスト（links はリンクのテキスト）に含まれる必要があるキーワード
+          status: {active: [受付中], closed: [終了]}   # 省略時は STATUS_KEYWORDS
+        links:                                # リンク単位の抽出
+          href_contains: [/detail]
+          min_text: 6
+          parent: div, li, article, tr        # 期間・状態を読む親要素
+          href_any: [lottery]                 # require_any の代わりに href で一致してもよい
+
+ポケモンカード関連かの判定は、items はコンテナのテキスト、links はリンクのテキストで行う
+（判定関数はスクレイパーの is_pokemon_card を渡す）。
+"""
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import soupsieve
+import yaml
+
+from constants import SITE_SPECS_FILE
+
+logger = logging.getLogger(__name__)
+
+# 価格・期間の抽出パターン（Python側とページ内抽出で共用）
+PRICE_PATTERN = r'[\d,]+円'
+PERIOD_PATTERNS = [
+    r'(\d{1,2}[/月]\d{1,2}[日]?\s*[〜～\-]\s*\d{1,2}[/月]\d{1,2}[日]?)',
+    r'(\d{4}年\d{1,2}月\d{1,2}日)',
+    r'(\d{4}/\d{1,2}/\d{1,2})',
+]
+
+# 状態の判定キーワード（先頭の状態から順に判定し、どれにも当たらなければ unknown）
+STATUS_KEYWORDS = {
+    'active': ['受付中', '予約可', '在庫あり', 'カートに入れる', '販売中', '応募する', '抽選受付'],
+    'closed': ['終了', '売切', '品切', '完売', '予約終了', '受付終了'],
+    'upcoming': ['近日', '予定', 'まもなく'],
+}
+
+SECTIONS = ('items', 'links')
+DEFAULT_MAX_TEXT = 300
+DEFAULT_MAX_PRODUCT = 100
+_LINK_SELECTOR = 'a[href]'
+_DEFAULT_PARENT = 'div, li, article'
+_SPACE_RE = re.compile(r'\s+')
+
+
+def class_contains_selector(tags, keywords):
+    """class属性の部分一致（大文字小文字無視）CSSセレクタを生成
+
+    BeautifulSoup の ``class_=lambda x: any(kw in str(x).lower() ...)`` と同等の
+    条件をページ内の querySelectorAll（および soupsieve）で評価するために使用する。
+
+    Args:
+        tags: 対象タグ名のリスト（例: ['div', 'li']）
+        keywords: class名に含まれるキーワードのリスト
+
+    Returns:
+        CSSセレクタ文字列
+    """
+    return ', '.join(f'{tag}[class*="{kw}" i]' for tag in tags for kw in keywords)
+
+
+def status_of(text: Optional[str], keywords: Optional[Dict[str, List[str]]] = None) -> str:
+    """テキストから状態（active / closed / upcoming / unknown）を判定"""
+    if not text:
+        return 'unknown'
+    for status, words in (keywords or STATUS_KEYWORDS).items():
+        if any(word in text for word in words):
+            return status
+    return 'unknown'
+
+
+def _selector(value: Any) -> str:
+    """セレクタの指定（CSS 文字列・文字列のリスト・{tags, class_contains}）を CSS 文字列にする"""
+    if isinstance(value, dict):
+        return class_contains_selector(value.get('tags', []), value.get('class_contains', []))
+    if isinstance(value, (list, tuple)):
+        return ', '.join(value)
+    return value
+
+
+def normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """定義のセレクタを CSS 文字列に揃え、既定値を補う（pickle・JSON 化できる辞書のまま）
+
+    Raises:
+        ValueError: store がない、items / links のどちらもない、セレクタ・正規表現が不正
+    """
+    if not spec.get('store'):
+        raise ValueError('store がありません')
+    if not any(spec.get(section) for section in SECTIONS):
+        raise ValueError('items / links のどちらかが必要です')
+    spec = dict(spec)
+    spec.setdefault('price_pattern', PRICE_PATTERN)
+    spec.setdefault('period_patterns', list(PERIOD_PATTERNS))
+    if 'items' in spec:
+        items = dict(spec['items'])
+        if not items.get('container'):
+            raise ValueError('items.container がありません')
+        for key in ('container', 'title', 'link'):
+            if items.get(key):
+                items[key] = _selector(items[key])
+        spec['items'] = items
+    if 'links' in spec:
+        links = dict(spec['links'] or {})
+        links['parent'] = _selector(links.get('parent') or _DEFAULT_PARENT)
+        spec['links'] = links
+    CompiledSpec(spec)
+    return spec
+
+
+_specs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+_specs_lock = threading.Lock()
+
+
+def load(site: str, path: str = SITE_SPECS_FILE) -> Dict[str, Any]:
+    """設定ファイルからサイトの定義を読み込む（ファイルはプロセスごとに1回だけ読む）
+
+    Raises:
+        KeyError: サイトの定義がない
+        ValueError: 定義が不正
+    """
+    with _specs_lock:
+        if path not in _specs:
+            with open(path, 'r', encoding='utf-8') as f:
+                _specs[path] = (yaml.safe_load(f) or {}).get('sites') or {}
+        sites = _specs[path]
+    if site not in sites:
+        raise KeyError(f'{path} に {site} の定義がありません')
+    try:
+        return normalize(sites[site])
+    except (ValueError, re.error, soupsieve.SelectorSyntaxError) as e:
+        raise ValueError(f'{path} の {site} が不正です: {e}') from e
+
+
+def in_page_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Playwright のページ内抽出（IN_PAGE_EXTRACT_JS）に渡す形"""
+    out = {'price_pattern': spec['price_pattern'], 'period_patterns': spec['period_patterns']}
+    if spec.get('items'):
+        out['items'] = {key: spec['items'][key] for key in ('container', 'title', 'link', 'max_text')
+                        if spec['items'].get(key)}
+    if spec.get('links'):
+        out['links'] = {key: spec['links'][key] for key in ('href_contains', 'min_text', 'parent', 'max_text')
+                        if spec['links'].get(key)}
+    return out
+
+
+class CompiledSpec:
+    """コンパイル済みの定義（セレクタは soupsieve、パターンは re）"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.store = spec['store']
+        self.base_url = spec.get('base_url', '')
+        self.lottery_type = spec.get('lottery_type', '抽選販売')
+        self.price_re = re.compile(spec.get('price_pattern', PRICE_PATTERN))
+        self.period_res = [re.compile(pattern) for pattern in spec.get('period_patterns', PERIOD_PATTERNS)]
+        self.link = soupsieve.compile(_LINK_SELECTOR)
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        items = spec.get('items')
+        if items:
+            self.sections['items'] = {
+                **items,
+                'container': soupsieve.compile(items['container']),
+                'title': soupsieve.compile(items['title']) if items.get('title') else None,
+                'link': soupsieve.compile(items.get('link') or _LINK_SELECTOR),
+            }
+        links = spec.get('links')
+        if links is not None:
+            self.sections['links'] = {**links, 'parent': soupsieve.compile(links.get('parent') or _DEFAULT_PARENT)}
+
+    def price(self, text: str) -> str:
+        match = self.price_re.search(text)
+        return match.group() if match else ''
+
+    def period(self, text: str) -> str:
+        for pattern in self.period_res:
+            match = pattern.search(text)
+            if match:
+                return match.group(1) if match.groups() else match.group()
+        return ''
+
+    def record(self, product: str, href: str, text: str, max_text: Optional[int] = None) -> Dict[str, str]:
+        """ページ内抽出と同じ形のレコード"""
+        return {
+            'product': product[:200],
+            'href': href,
+            'price': self.price(text),
+            'period': self.period(text),
+            'text': text[:max_text or DEFAULT_MAX_TEXT],
+        }
+
+
+_compiled: Dict[str, CompiledSpec] = {}
+_compiled_lock = threading.Lock()
+
+
+def compiled(spec: Dict[str, Any]) -> CompiledSpec:
+    """定義ごとにコンパイル結果を再利用（プロセスプールのワーカーでもワーカーごとに1回）"""
+    key = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+    with _compiled_lock:
+        if key not in _compiled:
+            _compiled[key] = CompiledSpec(spec)
+        return _compiled[key]
+
+
+def _norm(text: str) -> str:
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def extract(soup, spec: CompiledSpec, page_url: str = '') -> Dict[str, Any]:
+    """解析済みのHTMLから定義に沿ってレコードを取り出す（IN_PAGE_EXTRACT_JS の Python 版）
+
+    Args:
+        soup: BeautifulSoup
+        spec: compiled() の戻り値
+        page_url: ページURL（定義に base_url がない場合の相対リンクの基準）
+
+    Returns:
+        {'url', 'title', 'items', 'links'}
+    """
+    base = spec.base_url or page_url
+    out = {'url': page_url, 'title': _norm(soup.title.get_text()) if soup.title else '', 'items': [], 'links': []}
+
+    items = spec.sections.get('items')
+    if items:
+        for element in items['container'].select(soup):
+            text = _norm(element.get_text(' '))
+            link = items['link'].select_one(element)
+            title = items['title'].select_one(element) if items['title'] else None
+            href = urljoin(base, link.get('href', '')) if link else ''
+            out['items'].append(spec.record(_norm(title.get_text(' ')) if title else '', href, text,
+                                            items.get('max_text')))
+
+    links = spec.sections.get('links')
+    if links is not None:
+        needles = links.get('href_contains') or []
+        for anchor in spec.link.select(soup):
+            raw_href = anchor.get('href', '')
+            if needles and not any(needle in raw_href for needle in needles):
+                continue
+            text = _norm(anchor.get_text(' '))
+            if len(text) < links.get('min_text', 0):
+                continue
+            parent = links['parent'].closest(anchor.parent) if anchor.parent is not None else None
+            parent_text = _norm(parent.get_text(' ')) if parent is not None else text
+            out['links'].append(spec.record(text, urljoin(base, raw_href), parent_text, links.get('max_text')))
+    return out
+
+
+def _lottery_type(rule: Any, text: str) -> str:
+    if not isinstance(rule, dict):
+        return rule
+    for keyword, lottery_type in rule.items():
+        if keyword != 'default' and keyword in text:
+            return lottery_type
+    return rule.get('default', '抽選販売')
+
+
+def _required(section: Dict[str, Any], text: str, href: str) -> bool:
+    """require_any / href_any のどちらかに一致するか（どちらも未指定なら常に True）"""
+    words, needles = section.get('require_any'), section.get('href_any')
+    if not words and not needles:
+        return True
+    return (any(word in text for word in words or [])
+            or any(needle in href.lower() for needle in needles or []))
+
+
+def to_lotteries(page_data: Optional[Dict[str, Any]], spec: CompiledSpec,
+                 is_pokemon_card: Callable[[str], bool], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """抽出したレコード（extract / ページ内抽出 / API モード）を抽選情報に組み立てる
+
+    Args:
+        page_data: {'items', 'links'}
+        spec: compiled() の戻り値
+        is_pokemon_card: ポケモンカード関連かの判定（スクレイパーの is_pokemon_card）
+        now: 取得時刻（テスト用）
+
+    Returns:
+        抽選情報のリスト（重複は呼び出し側の remove_duplicates で除く）
+    """
+    if not page_data:
+        return []
+    timestamp = (now or datetime.now()).isoformat()
+    lotteries = []
+    for name in SECTIONS:
+        section = spec.sections.get(name)
+        if section is None:
+            continue
+        for record in page_data.get(name) or []:
+            text = record.get('text', '') or record.get('product', '')
+            product = record.get('product', '')
+            href = record.get('href', '')
+            if name == 'items':
+                if not is_pokemon_card(text):
+                    continue
+                if len(product) < section.get('min_product', 1):
+                    product = text[:section.get('max_product', DEFAULT_MAX_PRODUCT)]
+            elif len(product) < section.get('min_text', 0) or not is_pokemon_card(product):
+                continue
+            # require_any は items ならコンテナ、links ならリンク自体のテキストで判定する
+            if not product or not href or not _required(section, text if name == 'items' else product, href):
+                continue
+            lotteries.append({
+                'timestamp': timestamp,
+                'store': spec.store,
+                'product': product,
+                'lottery_type': _lottery_type(section.get('lottery_type', spec.lottery_type), text),
+                'period': record.get('period', ''),
+                'price': record.get('price', ''),
+                'detail_url': href,
+                'status': status_of(text, section.get('status') or spec.spec.get('status')),
+            })
+    return lotteries
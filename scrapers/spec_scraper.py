@@ -0,0 +1,63 @@
+"""
+サイト別抽出定義（config/site_specs.yaml）で動く requests 系スクレイパー
+
+定義だけで新しいサイトを追加できる（config/scrapers.yaml の kwargs で site を指定）。
+既存のスクレイパーは SITE を指定した派生クラスとして移行する。
+
+    - name: エディオン
+      module: scrapers.spec_scraper
+      class: SpecScraper
+      kwargs: {site: edion_event}
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from . import site_spec
+from .requests_base import RequestsBaseScraper
+
+logger = logging.getLogger(__name__)
+
+
+class SpecScraper(RequestsBaseScraper):
+    """抽出定義に沿って各URLを取得・解析する（解析は parse_pool のワーカーで実行）"""
+
+    SITE: Optional[str] = None
+
+    def __init__(self, site: Optional[str] = None, spec: Optional[Dict[str, Any]] = None,
+                 timeout: int = None, wait_time: float = None):
+        """
+        初期化
+
+        Args:
+            site: config/site_specs.yaml のサイト名（省略時は SITE）
+            spec: 抽出定義（指定時は設定ファイルを読まない、テスト用）
+            timeout: リクエストタイムアウト（秒）
+            wait_time: リクエスト間隔（秒）
+        """
+        super().__init__(timeout=timeout, wait_time=wait_time)
+        self.spec = site_spec.normalize(spec) if spec else site_spec.load(site or self.SITE)
+        self.urls: List[str] = list(self.spec.get('urls') or [])
+        self.base_url = self.spec.get('base_url') or (self.urls[0] if self.urls else '')
+        self.source_name = self.spec.get('source') or self.spec['store']
+
+    def scrape(self) -> Optional[Dict[str, Any]]:
+        """抽選情報をスクレイピング"""
+        all_lotteries = []
+        for url in self.urls:
+            try:
+                all_lotteries.extend(self.crawl_pages(url, self._parse_page, max_pages=self.spec.get('max_pages', 1)))
+            except Exception as e:
+                logger.error(f"Error scraping {url}: {e}", exc_info=True)
+
+        return {
+            'source': self.source_name,
+            'source_url': self.urls[0] if self.urls else '',
+            'scraped_at': datetime.now().isoformat(),
+            'lotteries': self.remove_duplicates(all_lotteries),
+        }
+
+    def _parse_page(self, soup) -> List[Dict[str, Any]]:
+        """1ページ分の抽選情報（コンパイル済みの定義はプロセスごとに再利用）"""
+        spec = site_spec.compiled(self.spec)
+        return site_spec.to_lotteries(site_spec.extract(soup, spec), spec, self.is_pokemon_card)
@@ -19,12 +19,6 @@ class SurugayaScraper(RequestsBaseScraper):
             "https://www.suruga-ya.jp/search?keyword=ポケモンカード&cabinet=1&sort=popular&condition=all"
         ]
         self.source_name = 'suruga-ya.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'ナイトワンダラー',
-            'テラスタル', 'クリムゾンヘイズ', 'シャイニートレジャー',
-            'レイジングサーフ', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -50,77 +44,82 @@ class SurugayaScraper(RequestsBaseScraper):
         }
 
     def _scrape_url(self, url):
-        """指定URLをスクレイピング"""
+        """指定URLをスクレイピング（複数ページ）"""
         lotteries = []
         reservations = []
 
         try:
-            html_content = self.fetch_html(url)
-            if not html_content:
-                return lotteries, reservations
-
-            soup = self.parse_soup(html_content)
-            if not soup:
-                return lotteries, reservations
-
-            # 商品一覧を取得
-            product_items = soup.select('div.item_box, div.product-item')
-
-            for item in product_items:
-                try:
-                    # 商品名を取得
-                    name_elem = item.select_one('a.item_name, a.product-name')
-                    if not name_elem:
-                        continue
-
-                    product_name = name_elem.get_text(strip=True)
-
-                    # ポケモンキーワードフィルタ
-                    if not any(keyword in product_name for keyword in self.pokemon_keywords):
-                        continue
-
-                    # リンク取得
-                    product_link = name_elem.get('href', '')
-                    if product_link and not product_link.startswith('http'):
-                        product_link = self.base_url + product_link
-
-                    # 価格取得
-                    price_elem = item.select_one('span.price, span.sale-price')
-                    price = price_elem.get_text(strip=True) if price_elem else "価格未定"
-
-                    # ステータス確認（予約中/販売中/抽選中等）
-                    status_elem = item.select_one('span.status, span.badge')
-                    status = status_elem.get_text(strip=True) if status_elem else "未定"
-
-                    # 予約か抽選かを判定
-                    if '予約' in status or '予約受付' in status:
-                        reservations.append({
-                            'title': product_name,
-                            'price': price,
-                            'availability': status,
-                            'url': product_link,
-                            'source': 'suruga-ya.jp',
-                            'scraped_at': datetime.now().isoformat()
-                        })
-                    elif '抽選' in status or '抽選受付' in status:
-                        lotteries.append({
-                            'product': product_name,
-                            'price': price,
-                            'status': status,
-                            'url': product_link,
-                            'store': '駿河屋',
-                            'source': 'suruga-ya.jp',
-                            'scraped_at': datetime.now().isoformat()
-                        })
-                except Exception as e:
-                    logger.debug(f"Error parsing product item: {e}")
-                    continue
+            entries = self.crawl_pages(url, self._parse_page, page_param='page')
+
+            # 抽選（status）と予約（availability）に振り分け
+            for entry in entries:
+                if 'status' in entry:
+                    lotteries.append(entry)
+                else:
+                    reservations.append(entry)
 
             logger.info(f"Found {len(lotteries)} lottery entries and {len(reservations)} reservations")
 
-        except requests.RequestException as e:
-            logger.error(f"Request error: {e}")
         except Exception as e:
             logger.error(f"Scraping error: {e}")
 
         return lotteries, reservations
+
+    def _parse_page(self, soup):
+        """検索結果1ページ分の商品をパース"""
+        entries = []
+
+        # 商品一覧を取得
+        product_items = soup.select('div.item_box, div.product-item')
+
+        for item in product_items:
+            try:
+                # 商品名を取得
+                name_elem = item.select_one('a.item_name, a.product-name')
+                if not name_elem:
+                    continue
+
+                product_name = name_elem.get_text(strip=True)
+
+                # ポケモンキーワードフィルタ
+                if not self.is_pokemon_card(product_name):
+                    continue
+
+                # リンク取得
+                product_link = name_elem.get('href', '')
+                if product_link and not product_link.startswith('http'):
+                    product_link = self.base_url + product_link
+
+                # 価格取得
+                price_elem = item.select_one('span.price, span.sale-price')
+                price = price_elem.get_text(strip=True) if price_elem else "価格未定"
+
+                # ステータス確認（予約中/販売中/抽選中等）
+                status_elem = item.select_one('span.status, span.badge')
+                status = status_elem.get_text(strip=True) if status_elem else "未定"
+
+                # 予約か抽選かを判定
+                if '予約' in status or '予約受付' in status:
+                    entries.append({
+                        'title': product_name,
+                        'price': price,
+                        'availability': status,
+                        'url': product_link,
+                        'source': 'suruga-ya.jp',
+                        'scraped_at': datetime.now().isoformat()
+                    })
+                elif '抽選' in status or '抽選受付' in status:
+                    entries.append({
+                        'product': product_name,
+                        'price': price,
+                        'status': status,
+                        'url': product_link,
+                        'store': '駿河屋',
+                        'source': 'suruga-ya.jp',
+                        'scraped_at': datetime.now().isoformat()
+                    })
+            except Exception as e:
+                logger.debug(f"Error parsing product item: {e}")
+                continue
+
+        return entries
@@ -19,12 +19,6 @@ class TsutayaScraper(RequestsBaseScraper):
         self.search_urls = [
             "https://tsutaya.tsite.jp/search/?keyword=ポケモンカード&sort=release_date&area=&status=",
         ]
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'ナイトワンダラー',
-            'テラスタル', 'クリムゾンヘイズ', 'シャイニートレジャー',
-            'レイジングサーフ', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """予約・抽選情報をスクレイピング"""
@@ -77,7 +71,7 @@ class TsutayaScraper(RequestsBaseScraper):
                     product_name = name_elem.get_text(strip=True)
 
                     # ポケモンキーワードフィルタ
-                    if not any(keyword in product_name for keyword in self.pokemon_keywords):
+                    if not self.is_pokemon_card(product_name):
                         continue
 
                     # リンク取得
@@ -0,0 +1,217 @@
+"""
+X(Twitter) API クライアントのレート制限管理
+
+tweepy.Client をラップし、レスポンスヘッダ（x-rate-limit-*）からエンドポイント別の
+残り回数を記録する。残り回数に収まるようにアカウントの取得順を計画し、
+収まらないアカウントは失敗扱いにせず次回の実行へ回す。
+
+X_API_BASE_URL を指定すると api.twitter.com 宛てのリクエストを別ホスト
+（tests/fake_x_api.py のローカル偽APIサーバー等）へ転送する。
+"""
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import retry
+
+logger = logging.getLogger(__name__)
+
+API_HOST = 'https://api.twitter.com'
+
+# ヘッダにリセット時刻がない場合に仮定するレート制限ウィンドウ（秒）
+RATE_WINDOW_SECONDS = 15 * 60
+
+# エンドポイント名（レート制限はエンドポイント単位）
+USER_LOOKUP = 'users/by/username'
+USER_TWEETS = 'users/tweets'
+
+_ENDPOINT_PATTERNS = [
+    (re.compile(r'/2/users/by/username/[^/]+$'), USER_LOOKUP),
+    (re.compile(r'/2/users/[^/]+/tweets$'), USER_TWEETS),
+]
+
+
+class RateLimitDeferred(Exception):
+    """レート制限の残り回数がなく、取得を次回へ回す"""
+
+    def __init__(self, endpoint: str, reset: Optional[float] = None):
+        self.endpoint = endpoint
+        self.reset = reset
+        super().__init__(f"Rate limit exhausted for {endpoint}")
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """api.twitter.com 宛てのリクエストを base_url へ転送"""
+
+    def __init__(self, base_url: str, **kwargs):
+        self.base_url = base_url.rstrip('/')
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(API_HOST):]
+        return super().send(request, **kwargs)
+
+
+def endpoint_of(url: str) -> Optional[str]:
+    """URLからレート制限のエンドポイント名を返す（対象外はNone）"""
+    path = urlparse(url).path
+    for pattern, name in _ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return None
+
+
+class RateLimitedXClient:
+    """レート制限を考慮した X API クライアント"""
+
+    def __init__(self, client: Any, base_url: Optional[str] = None):
+        """
+        Args:
+            client: tweepy.Client
+            base_url: 転送先（例: http://127.0.0.1:8080、省略時は api.twitter.com）
+        """
+        self.client = client
+        self.limits: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        session = getattr(client, 'session', None)
+        if isinstance(session, requests.Session):
+            session.hooks['response'].append(self._record_response)
+            if base_url:
+                session.mount(API_HOST, _RedirectAdapter(base_url))
+
+    def get_user(self, **params):
+        return self._call(USER_LOOKUP, self.client.get_user, **params)
+
+    def get_users_tweets(self, **params):
+        return self._call(USER_TWEETS, self.client.get_users_tweets, **params)
+
+    def _call(self, endpoint: str, func, **params):
+        """残り回数を確認してから呼び出す
+
+        429 は待たずに RateLimitDeferred に変換し（リセット時刻まで次回へ回す）、
+        5xx・通信エラーは retry.API の方針で再試行する。
+        """
+        def attempt_once(attempt: int):
+            self._acquire(endpoint)
+            try:
+                return func(**params)
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                status = getattr(response, 'status_code', None)
+                if isinstance(status, int) and status >= 500:
+                    raise retry.Retry(f"HTTP {status}", retry.parse_retry_after(response.headers.get('Retry-After'))) from e
+                if status != 429:
+                    raise
+                self._record(endpoint, response.headers)
+                with self._lock:
+                    limit = self.limits.setdefault(endpoint, {})
+                    limit['remaining'] = 0
+                    reset = limit.setdefault('reset', time.time() + RATE_WINDOW_SECONDS)
+                raise RateLimitDeferred(endpoint, reset) from e
+
+        return retry.call(retry.API, attempt_once, endpoint,
+                          retry_on=(requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def _acquire(self, endpoint: str) -> None:
+        """1回分の枠を確保（残りがなければ RateLimitDeferred）"""
+        with self._lock:
+            limit = self.limits.get(endpoint)
+            if not limit or limit.get('reset', 0) <= time.time():
+                return
+            if limit.get('remaining', 1) <= 0:
+                raise RateLimitDeferred(endpoint, limit.get('reset'))
+            # ヘッダで正しい値に更新されるまでの仮の消費
+            limit['remaining'] -= 1
+
+    def _record_response(self, response, *args, **kwargs):
+        """requests のレスポンスフックでヘッダを記録"""
+        endpoint = endpoint_of(response.url)
+        if endpoint:
+            self._record(endpoint, response.headers)
+        return response
+
+    def _record(self, endpoint: str, headers) -> None:
+        """x-rate-limit-* ヘッダを記録"""
+        try:
+            limit = {
+                'limit': int(headers['x-rate-limit-limit']),
+                'remaining': int(headers['x-rate-limit-remaining']),
+                'reset': float(headers['x-rate-limit-reset']),
+            }
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.limits[endpoint] = limit
+
+    def available(self, endpoint: str) -> Optional[int]:
+        """エンドポイントの残り回数（不明・リセット済みの場合はNone）"""
+        with self._lock:
+            limit = self.limits.get(endpoint)
+            if not limit or limit.get('reset', 0) <= time.time():
+                return None
+            return int(limit.get('remaining', 0))
+
+    def plan(self, accounts: Iterable[str], states: Dict[str, Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """残り回数に収まるようにアカウントの取得順を決める
+
+        優先順: 直近に抽選情報を投稿したアカウント → 最終取得が古いアカウント。
+        1アカウントあたりツイート取得1回（ユーザーID未キャッシュならユーザー検索1回を追加）。
+
+        Args:
+            accounts: 監視対象アカウント
+            states: アカウント別の保存済み状態
+
+        Returns:
+            (今回取得するアカウント, 次回へ回すアカウント)
+        """
+        ordered = sorted(accounts, key=lambda account: _priority(states.get(account, {})))
+        tweets_left = self.available(USER_TWEETS)
+        lookups_left = self.available(USER_LOOKUP)
+
+        scheduled, deferred = [], []
+        for account in ordered:
+            needs_lookup = not states.get(account, {}).get('user_id')
+            if (tweets_left is not None and tweets_left < 1) or \
+                    (needs_lookup and lookups_left is not None and lookups_left < 1):
+                deferred.append(account)
+                continue
+            if tweets_left is not None:
+                tweets_left -= 1
+            if needs_lookup and lookups_left is not None:
+                lookups_left -= 1
+            scheduled.append(account)
+        return scheduled, deferred
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """保存用のレート制限状態（リセット済みのものは除く）"""
+        now = time.time()
+        with self._lock:
+            return {name: dict(limit) for name, limit in self.limits.items() if limit.get('reset', 0) > now}
+
+    def restore(self, limits: Dict[str, Dict[str, float]]) -> None:
+        """前回保存したレート制限状態を復元"""
+        with self._lock:
+            for name, limit in (limits or {}).items():
+                self.limits.setdefault(name, dict(limit))
+
+
+def _priority(state: Dict[str, Any]) -> Tuple[float, str]:
+    """アカウントの優先度キー（小さいほど優先）"""
+    latest = ''
+    for lottery in state.get('lotteries', []):
+        latest = max(latest, lottery.get('tweet_date', '') or '')
+    latest_ts = 0.0
+    if latest:
+        try:
+            latest_ts = datetime.fromisoformat(latest).timestamp()
+        except ValueError:
+            pass
+    return -latest_ts, state.get('updated_at', '')
@@ -3,18 +3,31 @@ X(Twitter)公式アカウントからポケモンカード抽選情報を収集
 GEO、TSUTAYA、ヨドバシなどの公式アカウントを監視
 """
 from datetime import datetime, timedelta
+import importlib.util
 import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import catalog
+from constants import X_ACCOUNT_CONCURRENCY, X_RETENTION_DAYS, X_STATE_FILE
+from .x_api import RateLimitDeferred, RateLimitedXClient
 
 logger = logging.getLogger(__name__)
 
-try:
-    import tweepy
-    TWEEPY_AVAILABLE = True
-except ImportError:
-    TWEEPY_AVAILABLE = False
+# tweepy は重いため、クライアント初期化時に初めて読み込む
+TWEEPY_AVAILABLE = importlib.util.find_spec('tweepy') is not None
+tweepy = None
+
+
+def _import_tweepy():
+    """tweepy を初回使用時に読み込む"""
+    global tweepy
+    if tweepy is None:
+        import tweepy as module
+        tweepy = module
+    return tweepy
 
 
 class XLotteryScraper:
@@ -31,43 +44,44 @@ class XLotteryScraper:
             'paboratory',        # ポケモン情報
         ]
 
-        # 抽選関連キーワード
-        self.lottery_keywords = [
-            '抽選', '予約', 'ポケモンカード', 'ポケカ', 'TCG',
-            '応募', '当選', '販売', '受付', '申込',
-            'ボックス', 'BOX', 'パック', '拡張パック'
-        ]
-
         # X API認証情報（環境変数から取得）
         self.bearer_token = os.environ.get('X_BEARER_TOKEN')
         self.api_key = os.environ.get('X_API_KEY')
         self.api_secret = os.environ.get('X_API_SECRET')
         self.access_token = os.environ.get('X_ACCESS_TOKEN')
         self.access_token_secret = os.environ.get('X_ACCESS_TOKEN_SECRET')
+        # 偽APIサーバー等への転送先（オフラインテスト・ベンチマーク用）
+        self.api_base_url = os.environ.get('X_API_BASE_URL')
 
         self.client = None
 
+        # アカウント別の取得状態（since_id・ユーザーIDキャッシュ・抽出済み抽選情報）
+        self.state_file = X_STATE_FILE
+        self.retention_days = X_RETENTION_DAYS
+        self.concurrency = X_ACCOUNT_CONCURRENCY
+
     def _init_client(self):
         """Tweepyクライアントを初期化"""
         if not TWEEPY_AVAILABLE:
             logger.warning("tweepy is not installed. X scraping will be skipped.")
             return False
+        _import_tweepy()
 
         if self.bearer_token:
             try:
-                self.client = tweepy.Client(bearer_token=self.bearer_token)
+                self.client = RateLimitedXClient(tweepy.Client(bearer_token=self.bearer_token), self.api_base_url)
                 return True
             except Exception as e:
                 logger.error(f"Error initializing X client with bearer token: {e}")
 
         if self.api_key and self.api_secret and self.access_token and self.access_token_secret:
             try:
-                self.client = tweepy.Client(
+                self.client = RateLimitedXClient(tweepy.Client(
                     consumer_key=self.api_key,
                     consumer_secret=self.api_secret,
                     access_token=self.access_token,
                     access_token_secret=self.access_token_secret
-                )
+                ), self.api_base_url)
                 return True
             except Exception as e:
                 logger.error(f"Error initializing X client with OAuth: {e}")
@@ -76,9 +90,11 @@ class XLotteryScraper:
         return False
 
     def scrape(self):
-        """X(Twitter)から抽選情報を収集"""
-        lotteries = []
+        """X(Twitter)から抽選情報を収集
 
+        アカウントごとの状態（ユーザーID・最新ツイートID・抽出済み抽選情報）を
+        state_file に保存し、2回目以降は since_id で新着ツイートのみ取得する。
+        """
         # API認証を確認
         if not self._init_client():
             return {
@@ -89,12 +105,38 @@ class XLotteryScraper:
                 'error': 'X API credentials not configured or tweepy not installed'
             }
 
+        state = self._load_state()
+        accounts = state.setdefault('accounts', {})
+
+        # 前回のレート制限状態から、残り回数に収まるアカウントだけ取得する
+        self.client.restore(state.get('rate_limits', {}))
+        scheduled, deferred = self.client.plan(self.target_accounts, accounts)
+        if deferred:
+            logger.info(f"レート制限の残りが不足のため次回へ: {', '.join('@' + a for a in deferred)}")
+
+        # アカウントを並列取得（同時数はレート制限の枠内に抑える）
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(scheduled) or 1))) as executor:
+            futures = {
+                executor.submit(self._scrape_account, account, dict(accounts.get(account, {}))): account
+                for account in scheduled
+            }
+            for future in as_completed(futures):
+                account = futures[future]
+                try:
+                    accounts[account] = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping @{account}: {e}")
+
+        # 保存済みの抽選情報とマージ（保持期間を過ぎたものは破棄）
+        lotteries = []
         for account in self.target_accounts:
-            try:
-                account_lotteries = self._scrape_account(account)
-                lotteries.extend(account_lotteries)
-            except Exception as e:
-                logger.error(f"Error scraping @{account}: {e}")
+            entry = accounts.get(account)
+            if entry:
+                entry['lotteries'] = self._prune_lotteries(entry.get('lotteries', []))
+                lotteries.extend(entry['lotteries'])
+
+        state['rate_limits'] = self.client.snapshot()
+        self._save_state(state)
 
         # 重複除去
         unique_lotteries = self._remove_duplicates(lotteries)
@@ -108,64 +150,114 @@ class XLotteryScraper:
 
         return result
 
-    def _scrape_account(self, username):
-        """指定アカウントのツイートから抽選情報を取得"""
-        lotteries = []
+    def _scrape_account(self, username, entry):
+        """指定アカウントの新着ツイートから抽選情報を取得
+
+        Args:
+            username: アカウント名
+            entry: 前回までの状態（user_id / since_id / lotteries）
+
+        Returns:
+            更新後の状態（取得失敗時は since_id を進めずに返す）
+        """
+        entry.setdefault('lotteries', [])
 
         try:
-            # ユーザーIDを取得
-            user = self.client.get_user(username=username)
-            if not user.data:
-                logger.warning(f"User @{username} not found")
-                return []
-
-            user_id = user.data.id
-
-            # 最近のツイートを取得（最大100件、過去7日分）
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(days=7)
-
-            tweets = self.client.get_users_tweets(
-                id=user_id,
-                max_results=100,
-                start_time=start_time.isoformat() + 'Z',
-                tweet_fields=['created_at', 'text', 'entities'],
-                expansions=['author_id']
-            )
-
-            if not tweets.data:
-                return []
-
-            for tweet in tweets.data:
+            # ユーザーIDはキャッシュを優先
+            user_id = entry.get('user_id')
+            if not user_id:
+                user = self.client.get_user(username=username)
+                if not user.data:
+                    logger.warning(f"User @{username} not found")
+                    return entry
+                user_id = str(user.data.id)
+                entry['user_id'] = user_id
+
+            params = {
+                'id': user_id,
+                'max_results': 100,
+                'tweet_fields': ['created_at', 'text', 'entities'],
+                'expansions': ['author_id'],
+            }
+            if entry.get('since_id'):
+                # 前回以降の新着のみ
+                params['since_id'] = entry['since_id']
+            else:
+                # 初回は過去 retention_days 日分
+                start_time = datetime.utcnow() - timedelta(days=self.retention_days)
+                params['start_time'] = start_time.isoformat() + 'Z'
+
+            tweets = self.client.get_users_tweets(**params)
+
+            new_lotteries = []
+            newest_id = int(entry.get('since_id') or 0)
+            for tweet in tweets.data or []:
+                newest_id = max(newest_id, int(tweet.id))
                 # ポケモンカード関連かつ抽選関連のツイートを抽出
                 if self._is_lottery_related(tweet.text):
                     lottery_info = self._parse_tweet(tweet, username)
                     if lottery_info:
-                        lotteries.append(lottery_info)
-
-        except tweepy.errors.TooManyRequests:
-            logger.warning(f"Rate limit exceeded for @{username}")
+                        new_lotteries.append(lottery_info)
+
+            if newest_id:
+                entry['since_id'] = str(newest_id)
+            entry['lotteries'] = new_lotteries + entry['lotteries']
+            entry['updated_at'] = datetime.now().isoformat()
+            if new_lotteries:
+                logger.info(f"@{username}: {len(new_lotteries)}件の新着抽選情報")
+
+        except RateLimitDeferred as e:
+            # 失敗扱いにせず、since_id を進めないまま次回へ回す
+            logger.info(f"@{username}: {e.endpoint} のレート制限に達したため次回へ")
         except tweepy.errors.Forbidden as e:
             logger.error(f"Access forbidden for @{username}: {e}")
         except Exception as e:
             logger.error(f"Error fetching tweets from @{username}: {e}")
 
-        return lotteries
+        return entry
+
+    def _prune_lotteries(self, lotteries):
+        """保持期間（retention_days）を過ぎた抽選情報を除外"""
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        kept = []
+        for lottery in lotteries:
+            try:
+                tweet_date = datetime.fromisoformat(lottery.get('tweet_date', ''))
+            except ValueError:
+                kept.append(lottery)
+                continue
+            if tweet_date.tzinfo is not None:
+                tweet_date = tweet_date.astimezone().replace(tzinfo=None)
+            if tweet_date >= cutoff:
+                kept.append(lottery)
+        return kept
+
+    def _load_state(self):
+        """アカウント別の状態を読み込む（未作成・破損時は空）"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read X state {self.state_file}: {e}")
+            return {}
+
+    def _save_state(self, state):
+        """アカウント別の状態を保存"""
+        state['saved_at'] = datetime.now().isoformat()
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Failed to save X state {self.state_file}: {e}")
 
     def _is_lottery_related(self, text):
-        """ポケモンカード抽選関連のツイートかチェック"""
+        """ポケモンカード抽選関連のツイートかチェック（判定語は catalog と共通）"""
         if not text:
             return False
-
-        text_lower = text.lower()
-
-        # ポケモンカード関連
-        is_pokemon = any(kw in text_lower for kw in ['ポケモンカード', 'ポケカ', 'pokemon card', 'tcg'])
-
-        # 抽選・予約関連
-        is_lottery = any(kw in text_lower for kw in ['抽選', '予約', '応募', '受付', '販売'])
-
-        return is_pokemon and is_lottery
+        return catalog.is_pokemon_card(text) and any(term in text for term in catalog.LOTTERY_TERMS)
 
     def _parse_tweet(self, tweet, username):
         """ツイートから抽選情報を抽出"""
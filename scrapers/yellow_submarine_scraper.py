@@ -17,11 +17,6 @@ class YellowSubmarineScraper(RequestsBaseScraper):
             "https://www.yellowsubmarine.co.jp/",
         ]
         self.source_name = 'yellowsubmarine.co.jp'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'テラスタル',
-            'シャイニートレジャー', 'バトルマスター', 'TCG'
-        ]
 
     def scrape(self):
         """抽選・予約情報をスクレイピング"""
@@ -66,7 +61,7 @@ class YellowSubmarineScraper(RequestsBaseScraper):
                 link_text = link.get_text(strip=True)
                 href = link.get('href', '')
 
-                if self._is_pokemon_card(link_text):
+                if self.is_pokemon_card(link_text):
                     lottery = self._parse_lottery_link(link, href)
                     if lottery:
                         lotteries.append(lottery)
@@ -144,7 +139,7 @@ class YellowSubmarineScraper(RequestsBaseScraper):
             for row in rows:
                 row_text = row.get_text()
 
-                if not self._is_pokemon_card(row_text):
+                if not self.is_pokemon_card(row_text):
                     continue
 
                 cells = row.find_all(['td', 'th'])
@@ -160,7 +155,7 @@ class YellowSubmarineScraper(RequestsBaseScraper):
                 product_name = ''
                 for cell in cells:
                     cell_text = cell.get_text(strip=True)
-                    if self._is_pokemon_card(cell_text) and len(cell_text) > 10:
+                    if self.is_pokemon_card(cell_text) and len(cell_text) > 10:
                         product_name = cell_text
                         break
 
@@ -190,13 +185,6 @@ class YellowSubmarineScraper(RequestsBaseScraper):
 
         return lotteries
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _remove_duplicates(self, lotteries):
         """重複を除去"""
         seen = set()
@@ -15,12 +15,6 @@ class YodobashiScraper(RequestsBaseScraper):
         super().__init__(timeout=30, wait_time=1)
         self.url = "https://limited.yodobashi.com/"
         self.source_name = 'yodobashi.com'
-        self.pokemon_keywords = [
-            'ポケモンカード', 'ポケカ', 'pokemon', 'ポケモン',
-            'スカーレット', 'バイオレット', 'ナイトワンダラー',
-            'テラスタル', 'クリムゾンヘイズ', 'シャイニートレジャー',
-            'レイジングサーフ', 'バトルマスター'
-        ]
 
     def scrape(self):
         """抽選情報をスクレイピング"""
@@ -48,7 +42,7 @@ class YodobashiScraper(RequestsBaseScraper):
                 href = link.get('href', '')
 
                 # ポケモンカード関連かどうかチェック
-                if self._is_pokemon_card(link_text) or self._is_pokemon_card(href):
+                if self.is_pokemon_card(link_text) or self.is_pokemon_card(href):
                     lottery_info = self._parse_lottery_link(link, href)
                     if lottery_info:
                         lotteries.append(lottery_info)
@@ -95,13 +89,6 @@ class YodobashiScraper(RequestsBaseScraper):
                 'error': str(e)
             }
 
-    def _is_pokemon_card(self, text):
-        """ポケモンカード関連かチェック"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.pokemon_keywords)
-
     def _parse_lottery_link(self, link, href):
         """リンクから抽選情報を抽出"""
         try:
@@ -156,7 +143,7 @@ class YodobashiScraper(RequestsBaseScraper):
             for item in items:
                 text = item.get_text(strip=True)
 
-                if self._is_pokemon_card(text):
+                if self.is_pokemon_card(text):
                     link = item.find('a', href=True)
                     href = link.get('href', '') if link else ''
 
@@ -0,0 +1,250 @@
+"""
+スクレイパーの分割実行（main.py --shard i/N）とシャード結果の統合（main.py --merge）
+
+スクレイパーを過去の実行時間で見積もり、LPT（実行時間の長い順に、その時点で
+合計が最小のシャードへ割り当て）で N 個のシャードに分ける。各シャードは
+data/shards/shard_<i>_of_<N>.json に部分結果を書き出し、--merge でスクレイパー設定の
+番号順に統合して data/all_lotteries.json を作成する（入力が同じなら結果も同じ）。
+パスを省略した --merge は最新の実行のシャード結果だけを統合し、成功したら data/shards/ を空にする
+（data/ はコミットされるため、以前の実行の残りを次回の統合に混ぜない）。
+
+実行時間の履歴は data/scraper_costs.json に指数移動平均で保存する
+（シャード実行中は書き込まず、通常実行と --merge の時だけ更新する）。
+ホスト別の同時実行数・プローブの指紋・取得手段の段・API エンドポイントの記録も同様に、
+シャード結果の state に含めて --merge で保存する（並行するシャードが互いの記録を上書きせず、
+別のランナーで実行したシャードの記録も統合側に届くようにする）。
+"""
+import glob
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from constants import SCRAPER_COSTS_FILE, SHARD_DIR, SHARD_RUN_WINDOW_MINUTES
+from scheduling import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+# 実行時間の指数移動平均の重み（新しい計測値の比率）
+COST_SMOOTHING = 0.5
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """シャード指定 "i/N"（1始まり）を (i, N) に変換
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    try:
+        index, total = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}' (expected i/N)")
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Invalid shard spec '{spec}' (expected 1 <= i <= N)")
+    return index, total
+
+
+def shard_path(index: int, total: int, shard_dir: str = SHARD_DIR) -> str:
+    """シャード結果の保存先"""
+    return os.path.join(shard_dir, f'shard_{index}_of_{total}.json')
+
+
+def load_costs(path: str = SCRAPER_COSTS_FILE) -> Dict[str, float]:
+    """スクレイパー別の実行時間の履歴（秒）を読み込み"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {name: float(cost) for name, cost in data.items() if isinstance(cost, (int, float))}
+
+
+def update_costs(durations: Dict[str, float], path: str = SCRAPER_COSTS_FILE) -> Dict[str, float]:
+    """今回の実行時間を履歴に反映して保存
+
+    Args:
+        durations: スクレイパー名 → 今回の実行時間（秒）
+        path: 保存先
+
+    Returns:
+        更新後の履歴
+    """
+    costs = load_costs(path)
+    for name, elapsed in durations.items():
+        previous = costs.get(name)
+        costs[name] = elapsed if previous is None else previous + COST_SMOOTHING * (elapsed - previous)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({name: round(cost, 2) for name, cost in sorted(costs.items())}, f, ensure_ascii=False, indent=2)
+    return costs
+
+
+def assign_shards(scrapers: List[Dict[str, Any]], total: int,
+                  costs: Optional[Dict[str, float]] = None) -> List[List[Dict[str, Any]]]:
+    """有効なスクレイパーを見積もりの合計が均等になるように N 個に分割（LPT）
+
+    Args:
+        scrapers: スクレイパー設定
+        total: シャード数
+        costs: 実行時間の履歴
+
+    Returns:
+        シャードごとのスクレイパー設定（各シャード内は設定の番号順）
+    """
+    costs = costs or {}
+    active = [config for config in scrapers if not config.get('skip')]
+    ordered = sorted(active, key=lambda c: (-estimate_cost(c, costs), c['num'], c['name']))
+
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(total)]
+    loads = [0.0] * total
+    for config in ordered:
+        target = min(range(total), key=lambda i: (loads[i], i))
+        shards[target].append(config)
+        loads[target] += estimate_cost(config, costs)
+
+    for index, shard in enumerate(shards, 1):
+        logger.debug(f"shard {index}/{total}: {loads[index - 1]:.0f}s {[c['name'] for c in shard]}")
+    return [sorted(shard, key=lambda c: (c['num'], c['name'])) for shard in shards]
+
+
+def select_shard(scrapers: List[Dict[str, Any]], index: int, total: int,
+                 costs: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """i 番目（1始まり）のシャードに割り当てられたスクレイパー設定"""
+    return assign_shards(scrapers, total, costs)[index - 1]
+
+
+def build_shard_result(index: int, total: int, scrapers: List[Dict[str, Any]], timestamp: str,
+                       results: List[Dict[str, Any]], durations: Dict[str, float],
+                       outcomes: Optional[Dict[str, Optional[str]]] = None,
+                       state: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """シャードの部分結果を作成
+
+    Args:
+        index, total: シャード番号と総数
+        scrapers: このシャードで実行したスクレイパー設定
+        timestamp: 実行開始時刻
+        results: run_scrapers_async の戻り値（{'data', 'zero_alert', 'name'} のリスト）
+        durations: スクレイパー名 → 実行時間（秒）
+        outcomes: スクレイパー名 → 失敗理由（成功は None、取得状態の更新は --merge で行う）
+        state: 種類（hosts / probe / tiers / api_endpoints）→ 学習結果（保存は --merge で行う）
+
+    Returns:
+        部分結果（entries はスクレイパーごとの取得データと0件フラグ）
+    """
+    by_name = {result['name']: result for result in results}
+    entries = []
+    for config in scrapers:
+        result = by_name.get(config['name'])
+        if result is None:
+            continue
+        entries.append({
+            'num': config['num'],
+            'name': config['name'],
+            'zero_alert': result['zero_alert'],
+            'data': result['data'],
+        })
+    return {
+        'shard': f'{index}/{total}',
+        'timestamp': timestamp,
+        'scrapers': [config['name'] for config in scrapers],
+        'entries': entries,
+        'durations': durations,
+        'outcomes': outcomes or {},
+        'state': state or {},
+    }
+
+
+def _shard_files(shard_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(shard_dir, 'shard_*_of_*.json')))
+
+
+def find_shard_files(shard_dir: str = SHARD_DIR, window_minutes: float = SHARD_RUN_WINDOW_MINUTES) -> List[str]:
+    """最新の実行のシャード結果ファイルの一覧（名前順）
+
+    最新のシャード結果と分割数が同じで、開始時刻が window_minutes 以内のものだけを返す
+    （分割数の違うもの・古いものは以前の実行の残りとして警告して無視する）。
+    """
+    runs: Dict[str, Tuple[int, datetime]] = {}
+    for path in _shard_files(shard_dir):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shard = json.load(f)
+            runs[path] = (int(shard['shard'].split('/')[1]), datetime.fromisoformat(shard['timestamp']))
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            logger.warning(f"⚠️  シャード結果を読み込めません: {path} ({e})")
+    if not runs:
+        return []
+
+    total, newest = max(runs.values(), key=lambda run: run[1])
+    window = timedelta(minutes=window_minutes)
+    current = [path for path, (n, started) in runs.items() if n == total and newest - started <= window]
+    stale = sorted(set(runs) - set(current))
+    if stale:
+        logger.warning(f"⚠️  以前の実行のシャード結果を無視: {', '.join(os.path.basename(p) for p in stale)}")
+    return current
+
+
+def clear_shard_files(shard_dir: str = SHARD_DIR) -> None:
+    """シャード結果ファイルを削除（パス省略の --merge が成功した後に呼ぶ）"""
+    for path in _shard_files(shard_dir):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"⚠️  シャード結果を削除できません: {path} ({e})")
+
+
+def merge_shards(paths: Iterable[str], outcomes: Optional[Dict[str, Optional[str]]] = None,
+                 state: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """シャード結果を統合（通常実行と同じ形式の統合データ）
+
+    同じスクレイパーが複数のシャード結果にある場合は新しい方を採用する。
+    ソースと0件スクレイパーはスクレイパー設定の番号順に並べる。
+
+    Args:
+        paths: シャード結果ファイル
+        outcomes: スクレイパー名 → 失敗理由の記録先（指定時に in-place 更新）
+        state: 種類 → 学習結果の記録先（指定時に in-place 更新、新しいシャードの値を優先）
+
+    Returns:
+        (統合データ, スクレイパー名 → 実行時間)
+
+    Raises:
+        ValueError: シャード結果がない場合
+    """
+    shards = []
+    for path in sorted(paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            shards.append(json.load(f))
+    if not shards:
+        raise ValueError("No shard results to merge")
+
+    totals = {int(shard['shard'].split('/')[1]) for shard in shards}
+    if len(totals) > 1:
+        raise ValueError(f"Shard results from different splits: {sorted(totals)}")
+    total = totals.pop()
+    present = {int(shard['shard'].split('/')[0]) for shard in shards}
+    missing = sorted(set(range(1, total + 1)) - present)
+    if missing:
+        logger.warning(f"⚠️  シャード結果が不足しています: {', '.join(f'{i}/{total}' for i in missing)}")
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    durations: Dict[str, float] = {}
+    for shard in sorted(shards, key=lambda s: (s['timestamp'], s['shard'])):
+        for entry in shard['entries']:
+            entries[entry['name']] = entry
+        durations.update(shard.get('durations', {}))
+        if outcomes is not None:
+            outcomes.update(shard.get('outcomes', {}))
+        if state is not None:
+            for kind, learned in shard.get('state', {}).items():
+                state.setdefault(kind, {}).update(learned)
+
+    ordered = sorted(entries.values(), key=lambda e: (e['num'], e['name']))
+    all_results = {
+        'timestamp': max(shard['timestamp'] for shard in shards),
+        'sources': [entry['data'] for entry in ordered],
+        'zero_alert': False,
+        'zero_alert_sources': [entry['name'] for entry in ordered if entry['zero_alert']],
+    }
+    return all_results, durations
@@ -0,0 +1,151 @@
+"""
+ソースごとの取得状態（サーキットブレーカー）
+
+失敗（WAF の 403・URL 切れ・タイムアウト等）が続くソースを自動で止め、
+間隔を空けて短い制限時間で試す。状態は data/source_health.json に保存し、
+config/scrapers.yaml は書き換えない（手動の skip / reason はそのまま優先される）。
+
+- closed: 通常どおり実行。連続失敗が BREAKER_FAILURE_THRESHOLD 回に達すると open
+- open: retry_at まで実行しない。待ち時間は open になるたびに倍（上限あり）
+- half_open: retry_at を過ぎたソース。制限時間を BREAKER_PROBE_TIMEOUT_SECONDS に
+  縮めて1回だけ試し、成功すれば closed、失敗すれば再び open
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from constants import (BREAKER_COOLDOWN_HOURS, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_COOLDOWN_HOURS,
+                       BREAKER_PROBE_TIMEOUT_SECONDS, SOURCE_HEALTH_FILE)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+STATE_LABELS = {CLOSED: '正常', OPEN: '停止中', HALF_OPEN: '再試行待ち'}
+
+
+def _new_entry() -> Dict[str, Any]:
+    return {
+        'state': CLOSED,
+        'failures': 0,
+        'trips': 0,
+        'last_success': None,
+        'last_failure': None,
+        'last_error': '',
+        'retry_at': None,
+    }
+
+
+def load_health(path: str = SOURCE_HEALTH_FILE) -> Dict[str, Dict[str, Any]]:
+    """ソース名 → 取得状態を読み込み"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {name: {**_new_entry(), **entry} for name, entry in data.items() if isinstance(entry, dict)}
+
+
+def save_health(health: Dict[str, Dict[str, Any]], path: str = SOURCE_HEALTH_FILE) -> None:
+    """取得状態を保存"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(health.items())), f, ensure_ascii=False, indent=2)
+
+
+def state_of(entry: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> str:
+    """現在の状態（open で retry_at を過ぎていれば half_open）"""
+    if not entry or entry.get('state') != OPEN:
+        return CLOSED if not entry else entry.get('state', CLOSED)
+    now = now or datetime.now()
+    retry_at = entry.get('retry_at')
+    if retry_at and datetime.fromisoformat(retry_at) <= now:
+        return HALF_OPEN
+    return OPEN
+
+
+def plan_run(scrapers: List[Dict[str, Any]], health: Dict[str, Dict[str, Any]],
+             now: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """今回実行するスクレイパーを選ぶ
+
+    open のソースは除外し、half_open のソースは制限時間を縮めた設定で試す。
+
+    Args:
+        scrapers: スクレイパー設定
+        health: 取得状態
+        now: 現在時刻
+
+    Returns:
+        (実行するスクレイパー設定, 停止中のソース名)
+    """
+    runnable, blocked = [], []
+    for config in scrapers:
+        if config.get('skip'):
+            runnable.append(config)
+            continue
+        state = state_of(health.get(config['name']), now)
+        if state == OPEN:
+            blocked.append(config['name'])
+            continue
+        if state == HALF_OPEN:
+            timeout = config.get('timeout_seconds') or BREAKER_PROBE_TIMEOUT_SECONDS
+            config = {**config, 'timeout_seconds': min(timeout, BREAKER_PROBE_TIMEOUT_SECONDS)}
+            logger.info(f"🔌 {config['name']}: 停止中のソースを再試行（制限時間 {config['timeout_seconds']}秒）")
+        runnable.append(config)
+    if blocked:
+        logger.warning(f"🔌 停止中のためスキップ: {', '.join(blocked)}")
+    return runnable, blocked
+
+
+def record_outcomes(health: Dict[str, Dict[str, Any]], outcomes: Dict[str, Optional[str]],
+                    now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+    """今回の結果を取得状態に反映（in-place）
+
+    Args:
+        health: 取得状態
+        outcomes: ソース名 → 失敗理由（成功は None）
+        now: 現在時刻
+
+    Returns:
+        更新後の取得状態
+    """
+    now = now or datetime.now()
+    stamp = now.isoformat(timespec='seconds')
+    for name, error in outcomes.items():
+        entry = health.setdefault(name, _new_entry())
+        if error is None:
+            if entry['state'] != CLOSED:
+                logger.info(f"🔌 {name}: 取得が回復しました")
+            entry.update(state=CLOSED, failures=0, trips=0, last_success=stamp, retry_at=None)
+            continue
+
+        probing = state_of(entry, now) == HALF_OPEN
+        entry['failures'] += 1
+        entry['last_failure'] = stamp
+        entry['last_error'] = error[:200]
+        if probing or entry['failures'] >= BREAKER_FAILURE_THRESHOLD:
+            entry['trips'] += 1
+            hours = min(BREAKER_COOLDOWN_HOURS * 2 ** (entry['trips'] - 1), BREAKER_MAX_COOLDOWN_HOURS)
+            entry['state'] = OPEN
+            entry['retry_at'] = (now + timedelta(hours=hours)).isoformat(timespec='seconds')
+            logger.warning(f"🔌 {name}: {entry['failures']}回連続で失敗したため{hours}時間停止 ({error})")
+    return health
+
+
+def report_entries(health: Dict[str, Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """レポート用の取得状態（ソース名順、state は現在の状態）"""
+    return [
+        {
+            'source': name,
+            'state': state_of(entry, now),
+            'failures': entry['failures'],
+            'last_success': entry['last_success'],
+            'last_error': entry['last_error'],
+            'retry_at': entry['retry_at'],
+        }
+        for name, entry in sorted(health.items())
+    ]
@@ -0,0 +1,164 @@
+"""
+X API v2 のローカル偽サーバー（オフラインテスト・ベンチマーク用）
+
+XLotteryScraper が使う2つのエンドポイントだけを実装する:
+- GET /2/users/by/username/<username>
+- GET /2/users/<id>/tweets（since_id / start_time / max_results 対応）
+
+エンドポイント別に x-rate-limit-* ヘッダを返し、上限を超えると 429 を返す。
+X_API_BASE_URL に base_url を指定して使う。
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+USER_LOOKUP = 'users/by/username'
+USER_TWEETS = 'users/tweets'
+
+
+class FakeXApi:
+    """偽 X API サーバー"""
+
+    def __init__(self, limits=None, window=900, latency=0.0):
+        """
+        Args:
+            limits: エンドポイント別の上限回数（例: {'users/tweets': 3}）
+            window: レート制限ウィンドウ（秒）
+            latency: 1リクエストあたりの応答遅延（秒）
+        """
+        self.limits = {USER_LOOKUP: 300, USER_TWEETS: 900, **(limits or {})}
+        self.window = window
+        self.latency = latency
+        self.users = {}
+        self.tweets = {}
+        self.calls = {USER_LOOKUP: 0, USER_TWEETS: 0}
+        self._used = {}
+        self._reset_at = 0.0
+        self._next_id = 1000
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def add_tweet(self, username, text, days_ago=0):
+        """ツイートを追加（IDは追加順に増加）"""
+        with self._lock:
+            if username not in self.users:
+                self.users[username] = str(len(self.users) + 1)
+                self.tweets[self.users[username]] = []
+            self._next_id += 1
+            created = datetime.now(timezone.utc) - timedelta(days=days_ago)
+            self.tweets[self.users[username]].append({
+                'id': str(self._next_id),
+                'text': text,
+                'created_at': created.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'author_id': self.users[username],
+                'edit_history_tweet_ids': [str(self._next_id)],
+            })
+            return self._next_id
+
+    def reset_limits(self):
+        """レート制限ウィンドウをリセット"""
+        with self._lock:
+            self._used = {}
+            self._reset_at = 0.0
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _consume(self, endpoint):
+        """1回分を消費し、(許可されたか, ヘッダ) を返す"""
+        with self._lock:
+            now = time.time()
+            if self._reset_at <= now:
+                self._used = {}
+                self._reset_at = now + self.window
+            used = self._used.get(endpoint, 0)
+            allowed = used < self.limits[endpoint]
+            if allowed:
+                self._used[endpoint] = used + 1
+                self.calls[endpoint] += 1
+            headers = {
+                'x-rate-limit-limit': str(self.limits[endpoint]),
+                'x-rate-limit-remaining': str(max(0, self.limits[endpoint] - self._used.get(endpoint, 0))),
+                'x-rate-limit-reset': str(int(self._reset_at)),
+            }
+            return allowed, headers
+
+    def _route(self, path, query):
+        """(エンドポイント, ステータス, ボディ) を返す"""
+        parts = path.strip('/').split('/')
+        if parts[:3] == ['2', 'users', 'by'] and len(parts) == 5:
+            user_id = self.users.get(parts[4])
+            if user_id is None:
+                return USER_LOOKUP, 200, {'errors': [{'title': 'Not Found Error'}]}
+            return USER_LOOKUP, 200, {'data': {'id': user_id, 'name': parts[4], 'username': parts[4]}}
+
+        if parts[:2] == ['2', 'users'] and len(parts) == 4 and parts[3] == 'tweets':
+            tweets = sorted(self.tweets.get(parts[2], []), key=lambda t: int(t['id']), reverse=True)
+            if 'since_id' in query:
+                tweets = [t for t in tweets if int(t['id']) > int(query['since_id'][0])]
+            if 'start_time' in query:
+                start = datetime.fromisoformat(query['start_time'][0])
+                tweets = [t for t in tweets if datetime.fromisoformat(t['created_at']) >= start]
+            tweets = tweets[:int(query.get('max_results', ['10'])[0])]
+            if not tweets:
+                return USER_TWEETS, 200, {'meta': {'result_count': 0}}
+            return USER_TWEETS, 200, {
+                'data': tweets,
+                'meta': {'result_count': len(tweets), 'newest_id': tweets[0]['id'], 'oldest_id': tweets[-1]['id']},
+            }
+
+        return None, 404, {'title': 'Not Found'}
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if api.latency:
+                    time.sleep(api.latency)
+                parsed = urlparse(self.path)
+                endpoint, status, body = api._route(parsed.path, parse_qs(parsed.query))
+                headers = {}
+                if endpoint:
+                    allowed, headers = api._consume(endpoint)
+                    if not allowed:
+                        status, body = 429, {'title': 'Too Many Requests'}
+
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,69 @@
+"""
+ソース横断の商品集約のユニットテスト
+"""
+import pytest
+from aggregation import build_product_view, product_key
+from catalog import normalize
+
+
+class TestProductKey:
+    """商品キー正規化のテスト"""
+
+    def test_width_and_case_folding(self):
+        """全角英数・半角カナの表記ゆれを吸収"""
+        assert normalize('ＢＯＸ ﾎﾟｹﾓﾝ') == normalize('box ポケモン')
+
+    def test_same_set_and_form(self):
+        """店舗ごとの表記違いでも同じセット・形態なら同一キー"""
+        a = product_key('ポケモンカードゲーム スカーレット＆バイオレット 拡張パック「ロケット団の栄光」BOX')
+        b = product_key('【予約】ロケット団の栄光 ボックス')
+        assert a == b == 'set:ロケット団の栄光|box'
+
+    def test_box_and_pack_are_different(self):
+        """BOXとパックは別商品"""
+        assert product_key('熱風のアリーナ BOX') != product_key('熱風のアリーナ 1パック')
+
+    def test_unknown_set_falls_back_to_name(self):
+        """セット名が分からない場合は正規化済み商品名をキーにする"""
+        assert product_key('ポケモンカード スペシャルセット') == 'name:ポケモンカードスペシャルセット'
+        assert product_key('') is None
+
+
+class TestBuildProductView:
+    """商品ビュー作成のテスト"""
+
+    @pytest.fixture
+    def sources(self):
+        return [
+            {
+                'source': 'store-a',
+                'lotteries': [
+                    {'product': '拡張パック 熱風のアリーナ BOX', 'store': '店舗A', 'detail_url': 'https://a.example/1'},
+                    {'product': '拡張パック 熱風のアリーナ BOX', 'store': '店舗A', 'detail_url': 'https://a.example/1'},
+                ],
+            },
+            {
+                'source': 'amazon.co.jp',
+                'reservations': [
+                    {'title': '熱風のアリーナ ボックス', 'price': '¥5,400', 'url': 'https://b.example/2'},
+                    {'title': 'ポケモンカード サプライ', 'url': 'https://b.example/3'},
+                ],
+            },
+        ]
+
+    def test_merges_offers_across_sources(self, sources):
+        """同一商品の抽選・予約を1商品に集約し、重複オファーは除外"""
+        products = build_product_view(sources)
+
+        assert len(products) == 2
+        merged = products[0]
+        assert merged['key'] == 'set:熱風のアリーナ|box'
+        assert merged['offer_count'] == 2
+        assert [offer['kind'] for offer in merged['offers']] == ['lottery', 'reservation']
+        assert merged['stores'] == ['amazon.co.jp', '店舗A']
+        # 表示名は最も簡潔な表記
+        assert merged['name'] == '熱風のアリーナ ボックス'
+
+    def test_empty_sources(self):
+        """ソースがない場合は空リスト"""
+        assert build_product_view([]) == []
@@ -0,0 +1,178 @@
+"""
+描画中の JSON 応答の記録と API モード（scrapers.api_capture）のユニットテスト
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scrapers import api_capture
+from scrapers.amiami_playwright_scraper import AmiAmiPlaywrightScraper
+from scrapers.dragonstar_scraper import DragonstarScraper
+
+PAGE_URL = 'https://shop.example.com/lottery'
+ENDPOINT = 'https://shop.example.com/api/lotteries?page=1'
+LIST_JSON = {'meta': {'total': 2}, 'data': {'items': [
+    {'id': 1, 'title': 'ポケモンカード 拡張パック 抽選', 'url': '/lottery/1', 'price': 5400},
+    {'id': 2, 'title': 'ポケモンカード スターターセット 抽選', 'url': '/lottery/2', 'price': 1650},
+]}}
+CONFIG_JSON = {'features': [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]}
+
+
+@pytest.fixture(autouse=True)
+def endpoint_store(tmp_path):
+    api_capture.reset(str(tmp_path / 'api_endpoints.json'))
+    yield api_capture.store()
+    api_capture.reset()
+
+
+def _json_response(url, data, resource_type='fetch', headers=None):
+    response = MagicMock()
+    response.url = url
+    response.headers = {'content-type': 'application/json; charset=utf-8'}
+    response.request.resource_type = resource_type
+    response.request.method = 'GET'
+    response.request.headers = headers or {}
+    response.json = AsyncMock(return_value=data)
+    return response
+
+
+def _scraper(cls=DragonstarScraper):
+    scraper = cls.__new__(cls)
+    scraper.user_agents = ['test-agent']
+    scraper.storage_state_dir = '/nonexistent'
+    scraper.storage_state_ttl = 0
+    return scraper
+
+
+class TestHelpers:
+    """テンプレート化・一覧の検出・レコード変換のテスト"""
+
+    def test_url_template_drops_cache_busters(self):
+        url = 'https://shop.example.com/api/list?q=pokemon&_=1715300000000&page=2&ts=1715300000#top'
+        assert api_capture.url_template(url) == 'https://shop.example.com/api/list?q=pokemon&page=2'
+
+    def test_find_items_picks_longest_list(self):
+        path, items = api_capture.find_items(LIST_JSON)
+        assert path == ['data', 'items']
+        assert len(items) == 2
+        assert api_capture.find_items({'ok': True}) == (None, [])
+        assert api_capture.items_at(LIST_JSON, ['data', 'items']) == items
+        assert api_capture.items_at(LIST_JSON, ['data', 'rows']) is None
+
+    def test_items_to_records(self):
+        records = api_capture.items_to_records(LIST_JSON['data']['items'], PAGE_URL)
+        assert records[0]['product'] == 'ポケモンカード 拡張パック 抽選'
+        assert records[0]['href'] == 'https://shop.example.com/lottery/1'
+        assert records[0]['price'] == '5,400円'
+
+    def test_item_fields_template(self):
+        items = [{'gcode': 'CARD-123', 'gname': 'ポケモンカード BOX', 'c_price_taxed': 5400}]
+        records = api_capture.items_to_records(items, PAGE_URL, AmiAmiPlaywrightScraper.API_ITEM_FIELDS)
+        assert records[0]['product'] == 'ポケモンカード BOX'
+        assert records[0]['href'] == 'https://www.amiami.jp/top/detail/detail?gcode=CARD-123'
+
+
+class TestCapture:
+    """描画中の記録のテスト"""
+
+    def test_records_list_endpoint_shown_on_page(self, endpoint_store):
+        scraper = _scraper()
+        page = MagicMock()
+        page.inner_text = AsyncMock(return_value='抽選一覧 ポケモンカード 拡張パック 抽選 受付中')
+
+        async def run():
+            pending = scraper._start_capture(page)
+            handler = page.on.call_args.args[1]
+            handler(_json_response('https://shop.example.com/api/config', CONFIG_JSON))
+            handler(_json_response(ENDPOINT + '&_=1715300000000', LIST_JSON, headers={'x-api-key': 'k', 'accept': '*/*'}))
+            handler(_json_response('https://shop.example.com/app.js', LIST_JSON, resource_type='script'))
+            await scraper._finish_capture(page, PAGE_URL, pending)
+
+        asyncio.run(run())
+        entry = endpoint_store.get(PAGE_URL)
+        assert entry['endpoint'] == ENDPOINT
+        assert entry['path'] == ['data', 'items']
+        assert entry['keys'] == ['id', 'price', 'title', 'url']
+        assert entry['headers'] == {'x-api-key': 'k'}
+        assert entry['source'] == 'DragonstarScraper'
+
+    def test_nothing_recorded_when_items_not_on_page(self, endpoint_store):
+        scraper = _scraper()
+        page = MagicMock()
+        page.inner_text = AsyncMock(return_value='メンテナンス中')
+
+        async def run():
+            pending = scraper._start_capture(page)
+            page.on.call_args.args[1](_json_response(ENDPOINT, LIST_JSON))
+            await scraper._finish_capture(page, PAGE_URL, pending)
+
+        asyncio.run(run())
+        assert endpoint_store.get(PAGE_URL) is None
+
+    def test_shard_changes_are_merged_into_saved_endpoints(self, endpoint_store, tmp_path):
+        """シャードで記録・削除したエンドポイントだけを --merge で保存済みの記録に反映する"""
+        saved = tmp_path / 'merged_endpoints.json'
+        saved.write_text(json.dumps({'https://other.example.com/': {'endpoint': 'x'},
+                                     'https://gone.example.com/': {'endpoint': 'y'}}), encoding='utf-8')
+        assert api_capture.export_state() == {}
+
+        endpoint_store.record(PAGE_URL, ENDPOINT, ['data', 'items'], ['id'])
+        endpoint_store.record('https://gone.example.com/', ENDPOINT, ['items'], ['id'])
+        endpoint_store.forget('https://gone.example.com/')
+        exported = api_capture.export_state()
+        assert exported['https://gone.example.com/'] is None
+        assert exported[PAGE_URL]['endpoint'] == ENDPOINT
+
+        api_capture.merge_state(exported, str(saved))
+        merged = json.loads(saved.read_text(encoding='utf-8'))
+        assert set(merged) == {'https://other.example.com/', PAGE_URL}
+        assert merged[PAGE_URL]['path'] == ['data', 'items']
+
+
+class TestApiMode:
+    """記録済みエンドポイントの直接取得と描画へのフォールバックのテスト"""
+
+    def _record(self, store):
+        store.record(PAGE_URL, ENDPOINT, ['data', 'items'], ['id', 'price', 'title', 'url'], {'x-api-key': 'k'})
+
+    def test_uses_endpoint_without_rendering(self, endpoint_store):
+        self._record(endpoint_store)
+        scraper = _scraper()
+        render = AsyncMock()
+        with patch('scrapers.api_capture.fetch_json', return_value=LIST_JSON) as fetch, \
+                patch.object(scraper, '_fetch_with_attempts', render):
+            page_data = asyncio.run(scraper.fetch_page_records(PAGE_URL, {}))
+
+        render.assert_not_called()
+        assert fetch.call_args.args[0] == ENDPOINT
+        assert fetch.call_args.args[4] == {'x-api-key': 'k'}
+        assert page_data['api_mode']
+        assert [record['product'] for record in page_data['items']] == [
+            'ポケモンカード 拡張パック 抽選', 'ポケモンカード スターターセット 抽選']
+        assert [lottery['detail_url'] for lottery in scraper._parse_records(page_data)] == [
+            'https://shop.example.com/lottery/1', 'https://shop.example.com/lottery/2']
+
+    def test_shape_change_falls_back_to_render(self, endpoint_store):
+        self._record(endpoint_store)
+        scraper = _scraper()
+        changed = {'data': {'items': [{'id': 1, 'name': 'ポケモンカード BOX'}]}}
+        render = AsyncMock(return_value={'items': [], 'links': []})
+        with patch('scrapers.api_capture.fetch_json', return_value=changed), \
+                patch.object(scraper, '_fetch_with_attempts', render):
+            assert asyncio.run(scraper.fetch_page_records(PAGE_URL, {})) == {'items': [], 'links': []}
+
+        render.assert_awaited_once()
+        assert endpoint_store.get(PAGE_URL) is None
+
+    def test_network_error_renders_but_keeps_endpoint(self, endpoint_store):
+        self._record(endpoint_store)
+        scraper = _scraper()
+        render = AsyncMock(return_value=None)
+        with patch('scrapers.api_capture.fetch_json', side_effect=ConnectionError('reset')), \
+                patch.object(scraper, '_fetch_with_attempts', render):
+            asyncio.run(scraper.fetch_page_records(PAGE_URL, {}))
+
+        render.assert_awaited_once()
+        assert endpoint_store.get(PAGE_URL) is not None
@@ -0,0 +1,85 @@
+"""
+商品カタログ（セット名認識・ポケカ判定）のユニットテスト
+"""
+import pytest
+import catalog
+from catalog import KeywordAutomaton, classify, is_pokemon_card
+
+
+class TestKeywordAutomaton:
+    """Aho-Corasick オートマトンのテスト"""
+
+    def test_overlapping_patterns(self):
+        """重なり合うパターンをすべて検出"""
+        automaton = KeywordAutomaton()
+        for word in ('he', 'she', 'his', 'hers'):
+            automaton.add(word, word)
+        automaton.build()
+
+        matches = [(start, value) for start, _, value in automaton.iter_matches('ushers')]
+        assert sorted(matches) == [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+    def test_no_match(self):
+        """一致しない場合は何も返さない"""
+        automaton = KeywordAutomaton()
+        automaton.add('abc', 1)
+        automaton.build()
+        assert list(automaton.iter_matches('abxabd')) == []
+
+
+class TestClassify:
+    """商品タイトル分類のテスト"""
+
+    def test_longest_set_name_wins(self):
+        """セット名は最長一致（シャイニートレジャー < シャイニートレジャーex）"""
+        info = classify('シャイニートレジャーex BOX')
+        assert info['set']['name'] == 'シャイニートレジャーex'
+        assert info['form'] == 'box'
+
+    def test_alias_and_width_folding(self):
+        """別名と全角表記を吸収"""
+        assert classify('ＭＥＧＡドリーム　１パック')['set']['name'] == 'MEGAドリームex'
+        assert classify('ＭＥＧＡドリーム　１パック')['form'] == 'pack'
+
+    def test_form_priority(self):
+        """BOXとパックが両方含まれる場合はBOXを採用"""
+        assert classify('ステラミラクル 拡張パック BOX')['form'] == 'box'
+
+    def test_release_date(self):
+        """発売日が登録されている"""
+        assert classify('変幻の仮面')['set']['release_date'] == '2024-04-26'
+
+    def test_excluded(self):
+        """除外キーワードを検出"""
+        info = classify('ポケモンカード ぬいぐるみ')
+        assert info['excluded'] is True
+        assert 'card' in info['tags']
+
+    def test_empty(self):
+        """空文字・Noneは分類なし"""
+        assert classify('')['set'] is None
+        assert classify(None)['tags'] == set()
+
+
+class TestIsPokemonCard:
+    """ポケカ判定のテスト"""
+
+    @pytest.mark.parametrize('text', ['ポケモンカード', 'ポケカ', 'Pokemon Card', 'ロケット団の栄光 BOX'])
+    def test_strict_true(self, text):
+        """厳密判定で採用"""
+        assert is_pokemon_card(text) is True
+
+    def test_broad_terms(self):
+        """「ポケモン」単体は広い判定のみ採用"""
+        assert is_pokemon_card('ポケモン 抽選') is False
+        assert is_pokemon_card('ポケモン 抽選', broad=True) is True
+
+    def test_extra_tags(self):
+        """追加タグで抽選語を採用"""
+        assert is_pokemon_card('抽選販売のお知らせ', broad=True) is False
+        assert is_pokemon_card('抽選販売のお知らせ', broad=True, extra_tags=('lottery',)) is True
+
+    def test_keywords_include_sets(self):
+        """キーワード一覧にカタログのセット名が含まれる"""
+        assert '熱風のアリーナ' in catalog.keywords()
+        assert 'ポケモン' in catalog.keywords(broad=True)
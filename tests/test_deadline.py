@@ -0,0 +1,175 @@
+"""
+実行時間の上限（スクレイパー別の制限時間・子プロセスの強制終了・協調的なキャンセル）のユニットテスト
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+import main
+import retry
+from scrapers.isolated import ScraperTimeout, run_isolated, run_threaded
+from scrapers.playwright_base import PlaywrightBaseScraper
+
+
+class QuickScraper:
+    """すぐに結果を返すテスト用スクレイパー（子プロセスから import される）"""
+
+    def __init__(self, label='BOX'):
+        self.label = label
+        self.max_response_bytes = None
+
+    def scrape(self):
+        return {'source': self.label, 'limit': self.max_response_bytes, 'lotteries': []}
+
+
+class RetryingScraper:
+    """引き継いだ予算を返し、再試行を1回行うテスト用スクレイパー"""
+
+    def scrape(self):
+        inherited = retry.budget_used()
+        attempts = iter([retry.Retry('busy'), None])
+
+        def once(attempt):
+            error = next(attempts)
+            if error:
+                raise error
+            return 'ok'
+
+        retry.call(retry.RetryPolicy('http', base_delay=0), once)
+        return {'source': 'retry', 'inherited': inherited, 'lotteries': []}
+
+
+class HangingScraper:
+    """終わらないテスト用スクレイパー"""
+
+    def scrape(self):
+        time.sleep(60)
+        return {'source': 'hang', 'lotteries': []}
+
+
+class FailingScraper:
+    """例外を送出するテスト用スクレイパー"""
+
+    def scrape(self):
+        raise ValueError('broken page')
+
+
+class SlowPlaywrightScraper(PlaywrightBaseScraper):
+    """cancel() されるまで待ち続けるテスト用 Playwright スクレイパー"""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    async def _scrape_async(self):
+        try:
+            await asyncio.sleep(60)
+        finally:
+            self.closed.set()
+        return {'source': 'slow', 'lotteries': []}
+
+    def scrape(self):
+        return self.run_async(self._scrape_async())
+
+
+class TestIsolated:
+    """子プロセス実行のテスト"""
+
+    def test_returns_result_and_applies_attrs(self):
+        data = asyncio.run(run_isolated(QuickScraper, {'label': 'a'}, timeout=30, attrs={'max_response_bytes': 10}))
+        assert data == {'source': 'a', 'limit': 10, 'lotteries': []}
+
+    def test_retry_budget_is_shared_with_child(self):
+        """子プロセスは親の予算の消費数を引き継ぎ、子の再試行は親の消費数に加わる"""
+        retry.reset()
+        retry.inherit_budget({'http': 5})
+        try:
+            data = asyncio.run(run_isolated(RetryingScraper, timeout=30))
+            assert data['inherited'] == {'http': 5}
+            assert retry.budget_used() == {'http': 6}
+        finally:
+            retry.reset()
+
+    def test_kills_worker_on_timeout(self):
+        started = time.monotonic()
+        with pytest.raises(ScraperTimeout):
+            asyncio.run(run_isolated(HangingScraper, timeout=1))
+        assert time.monotonic() - started < 15
+
+    def test_child_error_is_runtime_error(self):
+        with pytest.raises(RuntimeError, match='broken page'):
+            asyncio.run(run_isolated(FailingScraper, timeout=30))
+
+
+class TestCooperativeCancel:
+    """Playwright スクレイパーの協調的なキャンセルのテスト"""
+
+    def test_cancel_from_another_thread(self):
+        scraper = SlowPlaywrightScraper()
+        threading.Timer(0.2, scraper.cancel).start()
+        started = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            scraper.scrape()
+        assert scraper.closed.is_set()
+        assert time.monotonic() - started < 5
+
+    def test_run_threaded_cancels_on_timeout(self):
+        scraper = SlowPlaywrightScraper()
+        with pytest.raises(ScraperTimeout):
+            asyncio.run(run_threaded(scraper, timeout=0.3))
+        assert scraper.closed.wait(5)
+
+        # 再利用時はキャンセル状態を解除してから実行する
+        scraper.closed.clear()
+        with pytest.raises(ScraperTimeout):
+            asyncio.run(run_threaded(scraper, timeout=0.3))
+        assert scraper.closed.wait(5)
+
+
+class TestRunDeadline:
+    """実行全体の期限のテスト"""
+
+    def _config(self, name, cls, **extra):
+        return {'num': 1, 'name': name, 'module': 'tests.test_deadline', 'class': cls, 'skip': False,
+                'kwargs': {}, 'filename': f'/nonexistent/{name}.json', **extra}
+
+    def test_scraper_timeout(self):
+        assert main.scraper_timeout({'timeout_seconds': 30}) == 30
+        assert main.scraper_timeout({'timeout_seconds': 0}) is None
+        assert main.scraper_timeout({}) == main.DEFAULT_SCRAPER_TIMEOUT_SECONDS
+        assert main.scraper_timeout({'timeout_seconds': 30}, time.monotonic() + 5) <= 5
+
+    def test_skips_after_deadline(self):
+        config = self._config('late', 'QuickScraper')
+        result = asyncio.run(main.execute_scraper(config, asyncio.Semaphore(1), 1, deadline=time.monotonic() - 1))
+        assert result is None
+
+    def test_partial_results_are_kept(self):
+        """時間切れのスクレイパーがあっても完了した分は結果に含める"""
+        scrapers = [
+            self._config('hang', 'HangingScraper', timeout_seconds=1),
+            dict(self._config('quick', 'QuickScraper', kwargs={'label': 'quick'}), num=2),
+        ]
+        all_results = {'sources': [], 'zero_alert_sources': []}
+        durations = {}
+        started = time.monotonic()
+        asyncio.run(main.run_scrapers_async(scrapers, all_results, durations=durations,
+                                            deadline=time.monotonic() + 30))
+
+        assert time.monotonic() - started < 20
+        assert [source['source'] for source in all_results['sources']] == ['quick']
+        assert all_results['zero_alert_sources'] == ['quick']
+        assert durations['hang'] < 10
+
+    def test_deadline_cutoff_is_not_a_failure(self):
+        """実行全体の期限による打ち切りは成否に記録せず、ソース自身の制限時間超過は失敗として記録する"""
+        scrapers = [
+            self._config('cut', 'HangingScraper'),
+            dict(self._config('slow', 'HangingScraper', timeout_seconds=0.5), num=2),
+        ]
+        outcomes = {}
+        asyncio.run(main.run_scrapers_async(scrapers, {'sources': [], 'zero_alert_sources': []},
+                                            outcomes=outcomes, deadline=time.monotonic() + 1.5))
+
+        assert 'cut' not in outcomes
+        assert outcomes['slow'].startswith('timeout')
@@ -0,0 +1,112 @@
+"""
+Google Forms の静的取得（FB_PUBLIC_LOAD_DATA_ の抽出）と描画へのフォールバックのユニットテスト
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import host_control
+from scrapers.google_forms_scraper import GoogleFormsScraper, parse_form_payload
+
+PAYLOAD = [None, ['抽選のご案内です', [
+    [123, 'お名前', None, 0, [[1, None, 1]]],
+    [456, '希望商品', None, 2, [[2, [['BOX']]]]],
+], None, None, None, None, None, None, 'ポケモンカード 拡張パック 抽選受付'], '/forms', '抽選フォーム']
+FORM_HTML = ('<html><head><title>抽選フォーム</title></head><body>'
+             f'<script type="text/javascript" nonce="abc">var FB_PUBLIC_LOAD_DATA_ = {json.dumps(PAYLOAD, ensure_ascii=False)};'
+             '</script></body></html>')
+SIGN_IN_HTML = '<html><body>ログインしてください</body></html>'
+CLOSED_HTML = '<html><body>このフォームは回答を受け付けていません</body></html>'
+
+
+@pytest.fixture(autouse=True)
+def fresh_controller():
+    host_control.reset()
+    with patch('host_control.load_limits', return_value={}):
+        yield
+    host_control.reset()
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return GoogleFormsScraper(cache_file=str(tmp_path / 'google_forms_cache.json'))
+
+
+def _response(url, text='', status=200, headers=None):
+    return MagicMock(url=url, text=text, status_code=status, headers=headers or {})
+
+
+def _serve(scraper, pages):
+    """フォームの定義順に応答を返す Session.get の代役"""
+    by_url = dict(zip([form['url'] for form in scraper.forms], pages))
+
+    def get(url, **kwargs):
+        page = by_url[url]
+        return page if isinstance(page, MagicMock) else page(url, kwargs)
+
+    return get
+
+
+class TestParsePayload:
+    """埋め込みデータの抽出のテスト"""
+
+    def test_extracts_title_description_and_questions(self):
+        assert parse_form_payload(FORM_HTML) == {
+            'title': 'ポケモンカード 拡張パック 抽選受付',
+            'description': '抽選のご案内です',
+            'questions': ['お名前', '希望商品'],
+        }
+
+    def test_missing_or_broken_payload(self):
+        assert parse_form_payload(SIGN_IN_HTML) is None
+        assert parse_form_payload('<script>FB_PUBLIC_LOAD_DATA_ = [1];</script>') is None
+
+
+class TestScrape:
+    """scrape() の取得経路のテスト"""
+
+    def test_static_path_skips_browser(self, scraper):
+        first, second = [form['url'] for form in scraper.forms]
+        pages = [_response(first, FORM_HTML), _response(second.replace('viewform', 'closedform'), CLOSED_HTML)]
+        with patch('requests.Session.get', side_effect=_serve(scraper, pages)), \
+                patch.object(scraper, 'run_async') as run_async:
+            data = scraper.scrape()
+
+        run_async.assert_not_called()
+        assert [form['form_status'] for form in data['forms']] == ['accepting', 'closed']
+        assert data['lotteries'][0]['product'] == 'ポケモンカード 拡張パック 抽選受付'
+        assert data['forms'][0]['questions'] == ['お名前', '希望商品']
+
+    def test_renders_only_forms_without_payload(self, scraper):
+        first, second = [form['url'] for form in scraper.forms]
+        pages = [_response(first, FORM_HTML), _response(second, SIGN_IN_HTML)]
+        rendered = [(second, {'fields': {'title': '予約フォーム', 'description': ''}, 'exists': {'form': True}})]
+        with patch('requests.Session.get', side_effect=_serve(scraper, pages)), \
+                patch.object(scraper, 'collect_many', MagicMock()) as collect_many, \
+                patch.object(scraper, 'run_async', return_value=rendered):
+            data = scraper.scrape()
+
+        assert collect_many.call_args.args[0] == [second]
+        assert [form['form_title'] for form in data['forms']] == ['ポケモンカード 拡張パック 抽選受付', '予約フォーム']
+
+    def test_conditional_get_reuses_cached_form(self, scraper):
+        first, second = [form['url'] for form in scraper.forms]
+        with patch('requests.Session.get', side_effect=_serve(scraper, [
+            _response(first, FORM_HTML, headers={'ETag': '"v1"'}), _response(second, FORM_HTML),
+        ])):
+            scraper.scrape()
+
+        sent = {}
+
+        def not_modified(url, kwargs):
+            sent[url] = kwargs['headers']
+            return _response(url, status=304)
+
+        with patch('requests.Session.get', side_effect=_serve(scraper, [not_modified, _response(second, FORM_HTML)])), \
+                patch.object(scraper, 'run_async') as run_async:
+            data = scraper.scrape()
+
+        run_async.assert_not_called()
+        assert sent[first] == {'If-None-Match': '"v1"'}
+        assert data['forms'][0]['form_title'] == 'ポケモンカード 拡張パック 抽選受付'
@@ -0,0 +1,177 @@
+"""
+ホストごとの同時実行数の自動調整（host_control）のユニットテスト
+"""
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import host_control
+from constants import DEFAULT_PAGE_CONCURRENCY, HOST_CONCURRENCY_MAX
+from scrapers.isolated import run_isolated
+from scrapers.playwright_base import PlaywrightBaseScraper
+from scrapers.requests_base import RequestsBaseScraper
+
+HOST = 'shop.example.com'
+
+
+@pytest.fixture(autouse=True)
+def fresh_controller():
+    host_control.reset()
+    with patch('host_control.load_limits', return_value={}):
+        yield
+    host_control.reset()
+
+
+class HostScraper:
+    """子プロセスで1ホストだけにリクエストしたことにするテスト用スクレイパー"""
+
+    def __init__(self, host, outcome):
+        self.host = host
+        self.outcome = outcome
+
+    def scrape(self):
+        controller = host_control.controller()
+        controller.acquire(self.host)
+        controller.release(self.host, 0.1, self.outcome)
+        return {'source': self.host, 'lotteries': []}
+
+
+def _succeed(controller, times, latency=0.1, host=HOST):
+    for _ in range(times):
+        controller.acquire(host)
+        controller.release(host, latency, host_control.OK)
+
+
+class TestAimd:
+    """増減のテスト"""
+
+    def test_additive_increase_when_healthy(self):
+        controller = host_control.HostController()
+        assert controller.limit(HOST) == DEFAULT_PAGE_CONCURRENCY
+        # 1成功ごとに 1/limit 増える（同時実行数ぶん強の成功でおよそ +1）
+        _succeed(controller, DEFAULT_PAGE_CONCURRENCY + 1)
+        assert controller.limit(HOST) == DEFAULT_PAGE_CONCURRENCY + 1
+
+        _succeed(controller, 200)
+        assert controller.limit(HOST) == HOST_CONCURRENCY_MAX
+
+    def test_slow_responses_do_not_increase(self):
+        controller = host_control.HostController()
+        _succeed(controller, 1, latency=0.1)
+        before = controller.snapshot()[HOST]['limit']
+        _succeed(controller, 10, latency=5.0)
+        assert controller.snapshot()[HOST]['limit'] == before
+
+    def test_multiplicative_decrease_once_per_cooldown(self):
+        """同時に返った 429 で下げすぎない"""
+        controller = host_control.HostController({HOST: {'limit': 8, 'latency': 0.1}})
+        for _ in range(3):
+            controller.acquire(HOST)
+        for _ in range(3):
+            controller.release(HOST, 0.1, host_control.THROTTLED)
+        assert controller.limit(HOST) == 4
+
+        # 減少直後は健全な応答でも増やさない
+        _succeed(controller, 10)
+        assert controller.limit(HOST) == 4
+
+    def test_classify_status(self):
+        assert host_control.classify_status(429) == host_control.THROTTLED
+        assert host_control.classify_status(403) == host_control.THROTTLED
+        assert host_control.classify_status(500) == host_control.ERROR
+        assert host_control.classify_status(404) == host_control.OK
+        assert host_control.classify_status(None) == host_control.OK
+
+    def test_acquire_waits_for_free_slot(self):
+        controller = host_control.HostController({HOST: {'limit': 1}})
+        controller.acquire(HOST)
+        assert not controller.try_acquire(HOST)
+
+        acquired = threading.Event()
+        worker = threading.Thread(target=lambda: (controller.acquire(HOST), acquired.set()))
+        worker.start()
+        assert not acquired.wait(0.1)
+        controller.release(HOST, 0.1)
+        assert acquired.wait(2)
+        worker.join()
+
+    def test_acquire_async_waits_for_free_slot(self):
+        controller = host_control.HostController({HOST: {'limit': 1}})
+        controller.acquire(HOST)
+
+        async def run():
+            waiter = asyncio.ensure_future(controller.acquire_async(HOST))
+            await asyncio.sleep(0.1)
+            assert not waiter.done()
+            controller.release(HOST, 0.1)
+            await asyncio.wait_for(waiter, 2)
+
+        asyncio.run(run())
+
+    def test_limits_persist(self, tmp_path):
+        path = str(tmp_path / 'host_limits.json')
+        controller = host_control.controller()
+        _succeed(controller, DEFAULT_PAGE_CONCURRENCY + 1)
+        host_control.save(path)
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        assert data[HOST]['limit'] > DEFAULT_PAGE_CONCURRENCY + 1
+        assert data[HOST]['latency'] == 0.1
+        assert host_control.HostController(data).limit(HOST) == DEFAULT_PAGE_CONCURRENCY + 1
+
+    def test_snapshot_only_includes_used_hosts(self):
+        """読み込んだだけのホストは保存・受け渡しの対象にしない"""
+        controller = host_control.HostController({'idle.example.com': {'limit': 6, 'latency': 0.2}})
+        _succeed(controller, 1)
+        assert list(controller.snapshot()) == [HOST]
+        assert list(controller.changes()) == [HOST]
+
+    def test_children_merge_deltas_for_their_own_hosts(self):
+        """並行する子プロセスは使ったホストの増減分だけを返し、他のホストの学習結果を上書きしない"""
+        learned = {'a.example.com': {'limit': 5.44, 'latency': 0.3}, 'b.example.com': {'limit': 5.44, 'latency': 0.3}}
+        with patch('host_control.load_limits', return_value=learned):
+            controller = host_control.controller()
+
+        async def run():
+            return await asyncio.gather(
+                run_isolated(HostScraper, {'host': 'a.example.com', 'outcome': host_control.THROTTLED}, timeout=30),
+                run_isolated(HostScraper, {'host': 'b.example.com', 'outcome': host_control.OK}, timeout=30),
+            )
+
+        asyncio.run(run())
+        limits = controller.snapshot()
+        # a は子の減少分（既定値 3 → 1.5）だけ下がり、b は増加分（+1/3）だけ上がる
+        assert limits['a.example.com'] == {'limit': 3.94, 'latency': 0.3}
+        assert limits['b.example.com']['limit'] == pytest.approx(5.77, abs=0.01)
+        assert limits['b.example.com']['latency'] == pytest.approx(0.26)
+
+    def test_save_without_use_writes_nothing(self, tmp_path):
+        path = tmp_path / 'host_limits.json'
+        host_control.save(str(path))
+        assert not path.exists()
+
+
+class TestIntegration:
+    """RequestsBaseScraper / PlaywrightBaseScraper からの報告のテスト"""
+
+    def test_requests_429_reduces_host_limit(self):
+        scraper = RequestsBaseScraper(wait_time=0.1)
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        ok = MagicMock(status_code=200, headers={}, content=b'<html></html>')
+        ok.iter_content.return_value = [b'<html></html>']
+        with patch.object(scraper.session, 'get', side_effect=[throttled, ok]), patch('time.sleep'):
+            assert scraper.fetch_html(f'https://{HOST}/search') == b'<html></html>'
+        assert host_control.controller().limit(HOST) == 1
+
+    def test_playwright_load_reports_status(self):
+        scraper = PlaywrightBaseScraper.__new__(PlaywrightBaseScraper)
+        response = MagicMock(status=503)
+        with patch.object(scraper, '_load_page', AsyncMock(return_value=response)):
+            result = asyncio.run(scraper._load_page_controlled(MagicMock(), f'https://{HOST}/lottery', None, False, False, 0))
+        assert result is response
+        assert host_control.controller().limit(HOST) == 1
+        assert host_control.controller().try_acquire(HOST)
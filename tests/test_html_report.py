@@ -6,9 +6,10 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from generate_html_report import (
-    load_data, normalize_schema, parse_date, get_lottery_status,
-    cleanup_old_data, is_new_lottery, generate_html_report
+    load_data, normalize_schema, parse_date,
+    cleanup_old_data, generate_html_report
 )
+from view_model import annotate
 
 
 class TestParseDate:
@@ -45,63 +46,6 @@ class TestParseDate:
         assert result is None
 
 
-class TestGetLotteryStatus:
-    """抽選ステータス判定のテスト"""
-
-    def test_status_active(self):
-        """受付中のステータス"""
-        lottery = {
-            'start_date': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
-            'end_date': (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
-        }
-        status = get_lottery_status(lottery)
-        assert status == '受付中'
-
-    def test_status_ended(self):
-        """終了したステータス"""
-        lottery = {
-            'start_date': (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d'),
-            'end_date': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
-        }
-        status = get_lottery_status(lottery)
-        assert status == '終了'
-
-    def test_status_upcoming(self):
-        """予定のステータス"""
-        lottery = {
-            'start_date': (datetime.now() + timedelta(days=5)).strftime('%Y-%m-%d'),
-            'end_date': (datetime.now() + timedelta(days=10)).strftime('%Y-%m-%d'),
-        }
-        status = get_lottery_status(lottery)
-        assert status == '予定'
-
-    def test_status_missing_dates(self):
-        """日付がない場合のステータス"""
-        lottery = {'start_date': '', 'end_date': ''}
-        status = get_lottery_status(lottery)
-        assert status == '受付中'
-
-
-class TestIsNewLottery:
-    """新着判定機能のテスト"""
-
-    def test_is_new_true(self):
-        """24時間以内の新規追加"""
-        recent_timestamp = (datetime.now() - timedelta(hours=1)).isoformat()
-        assert is_new_lottery(recent_timestamp) is True
-
-    def test_is_new_false(self):
-        """24時間以上前のデータ"""
-        old_timestamp = (datetime.now() - timedelta(hours=25)).isoformat()
-        assert is_new_lottery(old_timestamp) is False
-
-    def test_is_new_invalid(self):
-        """無効なタイムスタンプ"""
-        assert is_new_lottery('') is False
-        assert is_new_lottery(None) is False
-        assert is_new_lottery('invalid') is False
-
-
 class TestNormalizeSchema:
     """スキーマ正規化機能のテスト"""
 
@@ -229,6 +173,27 @@ class TestCleanupOldData:
         assert len(cleaned['sources'][0]['lotteries']) == 1
         assert cleaned['sources'][0]['lotteries'][0]['product'] == '最近の商品'
 
+    def test_cleanup_keeps_time_of_day_with_view(self):
+        """ビューモデル付きでも、時刻付きの開始日時は時刻まで比較する"""
+        base_time = datetime(2026, 5, 10, 9, 0, 0)
+        data = {
+            'timestamp': base_time.isoformat(),
+            'sources': [{
+                'source': 'test-source',
+                'lotteries': [
+                    {'product': '期限日の午後', 'start_date': '2026-04-10T12:00:00'},
+                    {'product': '期限日の朝', 'start_date': '2026-04-10T08:00:00'},
+                    {'product': '期限日（日付のみ）', 'start_date': '2026-04-10'},
+                    {'product': '翌日（日付のみ）', 'start_date': '2026/04/11'},
+                ],
+            }],
+        }
+        annotate(data, base_time)
+
+        cleaned = cleanup_old_data(data, days=30)
+        assert [lottery['product'] for lottery in cleaned['sources'][0]['lotteries']] == [
+            '期限日の午後', '翌日（日付のみ）']
+
 
 class TestGenerateHtmlReport:
     """HTMLレポート生成機能のテスト"""
@@ -322,3 +287,28 @@ class TestGenerateHtmlReport:
 
         assert 'status-badge' in content
         assert 'active' in content or '受付中' in content
+
+    def test_multi_store_section_excludes_ended_offers(self, sample_data, tmp_path):
+        """複数店舗で受付中の商品は、通知と同じく終了したオファーを除いて判定・表示する"""
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+        sample_data['products'] = [
+            {'name': '終了混在BOX', 'stores': ['店舗A', '店舗B'], 'offers': [
+                {'store': '店舗A', 'kind': 'lottery', 'end_date': tomorrow},
+                {'store': '店舗B', 'kind': 'lottery', 'end_date': yesterday},
+            ]},
+            {'name': '受付中BOX', 'stores': ['店舗C', '店舗D', '店舗E'], 'offers': [
+                {'store': '店舗C', 'kind': 'lottery', 'end_date': tomorrow},
+                {'store': '店舗D', 'kind': 'reservation', 'end_date': ''},
+                {'store': '店舗E', 'kind': 'lottery', 'end_date': yesterday},
+            ]},
+        ]
+        output_file = str(tmp_path / 'test_report.html')
+        generate_html_report(sample_data, output_file)
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        assert '複数店舗で受付中の商品 - 1商品' in content
+        assert '受付中BOX' in content and '店舗D' in content
+        assert '終了混在BOX' not in content and '店舗E' not in content
@@ -4,8 +4,10 @@ test_main.py - メインモジュール（main.py）の基本テスト
 テスト対象：
 - build_composite_key: 複合キー生成の正確性
 - detect_changes: 変更検出ロジック
+- 遅延ロード: スクレイパークラスの実行時解決・--dry-run の設定検証
 """
 import json
+import subprocess
 import unittest
 import tempfile
 import os
@@ -15,7 +17,8 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from main import build_composite_key, detect_changes, save_data, load_previous_data
+from main import (build_composite_key, detect_changes, save_data, load_previous_data,
+                  resolve_scraper_class, validate_scrapers)
 
 
 class TestBuildCompositeKey(unittest.TestCase):
@@ -117,5 +120,47 @@ class TestLoadSaveData(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestLazyLoading(unittest.TestCase):
+    """スクレイパーの遅延ロードと起動時の副作用のテスト"""
+
+    ROOT = str(Path(__file__).parent.parent)
+
+    def test_import_has_no_heavy_dependencies(self):
+        """import main でスクレイパー依存（bs4/requests）を読み込まない"""
+        code = 'import sys, main; print(sorted(m for m in ("bs4", "requests", "scrapers") if m in sys.modules))'
+        result = subprocess.run([sys.executable, '-c', code], cwd=self.ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_resolve_scraper_class(self):
+        """クラス名は初回使用時にクラスへ解決される"""
+        config = {'module': 'scrapers.requests_base', 'class': 'RequestsBaseScraper'}
+        cls = resolve_scraper_class(config)
+        self.assertEqual(cls.__name__, 'RequestsBaseScraper')
+        self.assertIs(config['class'], cls)
+
+    def test_resolve_failure_marks_skip(self):
+        """読み込みに失敗した設定は skip 扱いになる"""
+        config = {'module': 'scrapers.no_such_scraper', 'class': 'Missing'}
+        self.assertIsNone(resolve_scraper_class(config))
+        self.assertTrue(config['skip'])
+        self.assertIn('Import failed', config['reason'])
+
+    def test_validate_scrapers_without_import(self):
+        """--dry-run はソースの構文解析だけでクラス定義を確認する"""
+        cwd = os.getcwd()
+        os.chdir(self.ROOT)
+        try:
+            errors = validate_scrapers([
+                {'name': 'ok', 'module': 'scrapers.requests_base', 'class': 'RequestsBaseScraper'},
+                {'name': 'typo', 'module': 'scrapers.requests_base', 'class': 'NoSuchScraper'},
+                {'name': 'skipped', 'module': 'scrapers.none', 'class': 'X', 'skip': True},
+            ])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(len(errors), 1)
+        self.assertIn('NoSuchScraper', errors[0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,164 @@
+"""
+ブラウザ描画前の事前プローブ（probe）のユニットテスト
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import host_control
+import main
+import probe
+
+NOW = datetime(2026, 5, 10, 9, 0, 0)
+URL = 'https://shop.example.com/lottery'
+LOTTERY = {'product': 'ポケモンカード 拡張パック BOX', 'store': 'shop', 'end_date': '2099-12-31'}
+
+
+class RenderedScraper:
+    """描画結果を返すテスト用スクレイパー（呼ばれた回数を記録）"""
+
+    calls = 0
+
+    def scrape(self):
+        RenderedScraper.calls += 1
+        return {'source': 'shop', 'lotteries': [dict(LOTTERY)]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    probe.reset()
+    host_control.reset()
+    RenderedScraper.calls = 0
+    with patch('probe.load_state', return_value={}), patch('host_control.load_limits', return_value={}):
+        yield
+    probe.reset()
+    host_control.reset()
+
+
+def _response(status=200, text='<html>lottery</html>', headers=None):
+    response = MagicMock(status_code=status, text=text, headers=headers or {})
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f'HTTP {status}')
+    return response
+
+
+def _spec(**extra):
+    return probe.probe_config({'probe': {'url': URL, **extra}})
+
+
+def _render(store, spec, response, when=NOW):
+    """初回描画を済ませた状態にする"""
+    with patch('requests.Session.get', return_value=response):
+        unchanged, fingerprints = store.check('shop', spec, when)
+    store.commit('shop', fingerprints, when)
+    return unchanged
+
+
+class TestProbeStore:
+    """変化の判定のテスト"""
+
+    def test_conditional_get_not_modified(self):
+        store = probe.ProbeStore()
+        spec = _spec(mode='headers')
+        assert not _render(store, spec, _response(headers={'ETag': '"v1"'}))
+
+        with patch('requests.Session.get', return_value=_response(304)) as get:
+            unchanged, _ = store.check('shop', spec, NOW + timedelta(hours=1))
+        assert unchanged
+        assert get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+
+        with patch('requests.Session.get', return_value=_response(headers={'ETag': '"v2"'})):
+            assert not store.check('shop', spec, NOW + timedelta(hours=1))[0]
+
+    def test_body_hash_ignores_volatile_tokens(self):
+        store = probe.ProbeStore()
+        spec = _spec(ignore=['token=[0-9a-f]+'])
+        _render(store, spec, _response(text='<p>BOX</p> token=abc123'))
+
+        with patch('requests.Session.get', return_value=_response(text='<p>BOX</p> token=ffff00')):
+            assert store.check('shop', spec, NOW)[0]
+        with patch('requests.Session.get', return_value=_response(text='<p>BOX 2nd</p> token=ffff00')):
+            assert not store.check('shop', spec, NOW)[0]
+
+    def test_json_mode_normalizes_key_order(self):
+        store = probe.ProbeStore()
+        spec = _spec(mode='json')
+        first = _response()
+        first.json.return_value = {'a': 1, 'b': [1, 2]}
+        _render(store, spec, first)
+
+        second = _response()
+        second.json.return_value = {'b': [1, 2], 'a': 1}
+        with patch('requests.Session.get', return_value=second):
+            assert store.check('shop', spec, NOW)[0]
+
+    def test_stale_render_forces_refresh(self):
+        store = probe.ProbeStore()
+        spec = _spec(max_stale_hours=6)
+        _render(store, spec, _response())
+        with patch('requests.Session.get', return_value=_response()):
+            assert store.check('shop', spec, NOW + timedelta(hours=5))[0]
+            assert not store.check('shop', spec, NOW + timedelta(hours=6))[0]
+
+    def test_probe_failure_means_changed(self):
+        store = probe.ProbeStore()
+        spec = _spec()
+        _render(store, spec, _response())
+        with patch('requests.Session.get', return_value=_response(503)):
+            assert store.check('shop', spec, NOW) == (False, None)
+
+    def test_validate(self):
+        assert probe.validate({'name': 'a'}) is None
+        assert probe.validate({'name': 'a', 'probe': {'url': URL, 'mode': 'headers'}}) is None
+        assert 'url' in probe.validate({'name': 'a', 'probe': {'mode': 'body'}})
+        assert 'mode' in probe.validate({'name': 'a', 'probe': {'url': URL, 'mode': 'dom'}})
+        assert 'ignore' in probe.validate({'name': 'a', 'probe': {'url': URL, 'ignore': ['(']}})
+
+    def test_save_writes_only_after_use(self, tmp_path):
+        path = tmp_path / 'probe_state.json'
+        probe.save(str(path))
+        assert not path.exists()
+
+        probe.store().commit('shop', {URL: {'hash': 'x'}}, NOW)
+        probe.save(str(path))
+        saved = json.loads(path.read_text(encoding='utf-8'))
+        assert saved['shop']['rendered_at'] == NOW.isoformat()
+
+
+class TestExecuteScraper:
+    """main.execute_scraper からの利用のテスト"""
+
+    def _config(self, tmp_path):
+        return {'num': 1, 'name': 'shop', 'module': 'tests.test_probe', 'class': 'RenderedScraper',
+                'kind': 'browser', 'skip': False, 'kwargs': {}, 'filename': str(tmp_path / 'shop.json'),
+                'probe': {'url': URL}}
+
+    def _run(self, config, previous):
+        return asyncio.run(main.execute_scraper(config, asyncio.Semaphore(1), 1, {}, previous))
+
+    def test_renders_then_reuses_when_unchanged(self, tmp_path):
+        config = self._config(tmp_path)
+        previous = {}
+        with patch('requests.Session.get', return_value=_response()):
+            first = self._run(config, previous)
+            second = self._run(config, previous)
+
+        assert RenderedScraper.calls == 1
+        assert second['changes'] == []
+        assert second['data']['reused_at']
+        assert [item.product for item in second['data']['lotteries']] == [LOTTERY['product']]
+        assert first['data']['lotteries'] == second['data']['lotteries']
+
+    def test_renders_when_page_changed(self, tmp_path):
+        config = self._config(tmp_path)
+        previous = {}
+        with patch('requests.Session.get', return_value=_response(text='v1')):
+            self._run(config, previous)
+        with patch('requests.Session.get', return_value=_response(text='v2')):
+            result = self._run(config, previous)
+        assert RenderedScraper.calls == 2
+        assert 'reused_at' not in result['data']
@@ -0,0 +1,95 @@
+"""
+レコード型（取り込み時の正規化・JSON変換）のユニットテスト
+"""
+import json
+import pickle
+
+from main import save_data
+from records import LotteryRecord, ReservationRecord, UpcomingProductRecord, ingest
+from utils import build_composite_key
+
+
+class TestRecord:
+    """レコード型のテスト"""
+
+    def test_aliases_are_normalized(self):
+        """別名キーは正規フィールドに統一"""
+        record = ReservationRecord.from_dict({'title': 'テラスタルフェスex BOX', 'url': 'https://example.com/1'})
+        assert record.to_dict() == {'product': 'テラスタルフェスex BOX', 'detail_url': 'https://example.com/1'}
+        # 別名での参照も可能
+        assert record['title'] == 'テラスタルフェスex BOX'
+        assert record.get('url') == 'https://example.com/1'
+
+        upcoming = UpcomingProductRecord.from_dict({'name': 'メガドリームex', 'release_date': '2026-06-01'})
+        assert upcoming['product_name'] == 'メガドリームex'
+
+    def test_canonical_key_wins_over_alias(self):
+        """正規キーと別名キーが両方ある場合は正規キーを採用し、別名は残す"""
+        record = LotteryRecord.from_dict({'title': 'お知らせ', 'product': 'BOX'})
+        assert record['product'] == 'BOX'
+        assert record['title'] == 'お知らせ'
+
+    def test_mapping_behavior_and_extra_fields(self):
+        """辞書と同様に読み書きでき、未定義キーも保持"""
+        record = LotteryRecord.from_dict({'product': 'BOX', 'store': 'テスト店舗'})
+        record['view'] = {'status': 'active'}
+        record['expiry_status'] = 'active'
+
+        assert 'view' in record
+        assert 'end_date' not in record
+        assert record.get('end_date', '') == ''
+        assert dict(record) == {
+            'product': 'BOX', 'store': 'テスト店舗',
+            'view': {'status': 'active'}, 'expiry_status': 'active',
+        }
+        del record['expiry_status']
+        assert len(record) == 3
+
+    def test_store_is_interned(self):
+        """店舗名はインターンされ、同じ店舗で共有"""
+        a = LotteryRecord.from_dict({'store': ''.join(['ヨドバシ', 'カメラ'])})
+        b = LotteryRecord.from_dict({'store': ''.join(['ヨドバシカ', 'メラ'])})
+        assert a['store'] is b['store']
+
+    def test_keep_restricts_fields(self):
+        """keep で指定したフィールドだけを残す"""
+        record = LotteryRecord.from_dict(
+            {'product': 'BOX', 'status': 'active', '_source': 'x', 'view': {}},
+            keep={'product', 'view'},
+        )
+        assert record.to_dict() == {'product': 'BOX', 'view': {}}
+
+    def test_no_instance_dict(self):
+        """__slots__ のみで __dict__ を持たない"""
+        assert not hasattr(LotteryRecord.from_dict({'product': 'BOX'}), '__dict__')
+
+    def test_pickle_roundtrip(self):
+        """プロセス間で受け渡せる"""
+        record = LotteryRecord.from_dict({'product': 'BOX', 'note': 'メモ'})
+        assert pickle.loads(pickle.dumps(record)) == record
+
+
+class TestIngest:
+    """取り込み時の変換とJSON保存のテスト"""
+
+    def test_ingest_and_save(self, tmp_path):
+        """レコード化したデータを正規キーのJSONとして保存"""
+        data = {
+            'source': 'test',
+            'lotteries': [{'product': 'BOX', 'url': 'https://example.com/a'}],
+            'reservations': [{'title': 'BOX', 'url': 'https://example.com/b'}],
+        }
+        assert ingest(data) == 2
+        assert isinstance(data['lotteries'][0], LotteryRecord)
+
+        path = tmp_path / 'data.json'
+        save_data(data, str(path))
+        saved = json.loads(path.read_text(encoding='utf-8'))
+        assert saved['reservations'] == [{'product': 'BOX', 'detail_url': 'https://example.com/b'}]
+
+    def test_composite_key_matches_legacy_data(self):
+        """旧形式の保存データと正規化後のレコードで同じ複合キーになる"""
+        legacy = {'title': 'BOX', 'url': 'https://example.com/b'}
+        record = ReservationRecord.from_dict(legacy)
+        assert build_composite_key(legacy, 'reservation') == build_composite_key(record, 'reservation')
+        assert build_composite_key(record.to_dict(), 'reservation') == build_composite_key(record, 'reservation')
@@ -2,10 +2,14 @@
 RequestsBaseScraper の詳細テスト
 リトライロジック、ヘッダ設定、タイムアウト設定
 """
+import os
+import pickle
+
 import pytest
 from unittest.mock import patch, MagicMock, call
 import requests
-from scrapers.requests_base import RequestsBaseScraper
+from scrapers import parse_pool
+from scrapers.requests_base import KeywordScanner, RequestsBaseScraper
 
 
 class TestRequestsBaseScraperHeaders:
@@ -42,6 +46,7 @@ class TestRequestsBaseScraperTimeout:
         with patch.object(scraper.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.content = b'<html></html>'
+            mock_response.iter_content.return_value = [b'<html></html>']
             mock_get.return_value = mock_response
 
             scraper.fetch_html('http://example.com')
@@ -77,6 +82,7 @@ class TestRequestsBaseScraperWaitTime:
         with patch.object(scraper.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.content = b'<html></html>'
+            mock_response.iter_content.return_value = [b'<html></html>']
             mock_get.return_value = mock_response
 
             scraper.fetch_html('http://example.com')
@@ -189,6 +195,7 @@ class TestRequestsBaseScraperIntegration:
         with patch.object(scraper.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.content = html_content.encode('utf-8')
+            mock_response.iter_content.return_value = [html_content.encode('utf-8')]
             mock_get.return_value = mock_response
 
             # fetch
@@ -252,11 +259,13 @@ class TestRequestsBaseScraperRetryLogic:
             mock_response_429 = MagicMock()
             mock_response_429.status_code = 429
             mock_response_429.content = b''
+            mock_response_429.iter_content.return_value = [b'']
 
             # 2番目の呼び出しで200を返す
             mock_response_200 = MagicMock()
             mock_response_200.status_code = 200
             mock_response_200.content = b'<html><body>Success</body></html>'
+            mock_response_200.iter_content.return_value = [b'<html><body>Success</body></html>']
 
             mock_get.side_effect = [mock_response_429, mock_response_200]
 
@@ -273,6 +282,7 @@ class TestRequestsBaseScraperRetryLogic:
             mock_response = MagicMock()
             mock_response.status_code = 403
             mock_response.content = b''
+            mock_response.iter_content.return_value = [b'']
             mock_get.return_value = mock_response
 
             result = scraper.fetch_html('http://example.com')
@@ -288,6 +298,7 @@ class TestRequestsBaseScraperRetryLogic:
             mock_response = MagicMock()
             mock_response.status_code = 404
             mock_response.content = b''
+            mock_response.iter_content.return_value = [b'']
             mock_get.return_value = mock_response
 
             result = scraper.fetch_html('http://example.com')
@@ -306,6 +317,7 @@ class TestRequestsBaseScraperJitter:
         with patch.object(scraper.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.content = b'<html></html>'
+            mock_response.iter_content.return_value = [b'<html></html>']
             mock_get.return_value = mock_response
 
             scraper.fetch_html('http://example.com')
@@ -367,3 +379,218 @@ class TestRequestsBaseScraperTimeoutHandling:
 
             result = scraper.fetch_html('http://example.com')
             assert result is None
+
+
+class TestRequestsBaseScraperStreaming:
+    """ストリーミング取得のテスト"""
+
+    @pytest.fixture
+    def scraper(self):
+        return RequestsBaseScraper()
+
+    @staticmethod
+    def _stream_response(chunks, content_type='text/html'):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {'Content-Type': content_type}
+        response.iter_content.return_value = iter(chunks)
+        return response
+
+    def test_keyword_across_chunk_boundary(self):
+        """チャンク境界をまたぐキーワードも検出する"""
+        scanner = KeywordScanner({'stock': ['在庫切れ']})
+        scanner.feed('<div>現在在庫')
+        scanner.feed('切れです</div>')
+        assert scanner.found['stock'] == '在庫切れ'
+
+    @patch('time.sleep')
+    def test_stream_text_decodes_incrementally(self, mock_sleep, scraper):
+        """マルチバイト文字がチャンクで分割されても正しくデコードする"""
+        body = '<html>ポケモンカード</html>'.encode('utf-8')
+        chunks = [body[:8], body[8:13], body[13:]]
+
+        with patch.object(scraper.session, 'get', return_value=self._stream_response(chunks)) as mock_get:
+            text = ''.join(scraper.stream_text('http://example.com'))
+
+        assert text == '<html>ポケモンカード</html>'
+        assert mock_get.call_args[1]['stream'] is True
+
+    @patch('time.sleep')
+    def test_stream_text_meta_charset(self, mock_sleep, scraper):
+        """ヘッダにcharsetがない場合は<meta charset>を使用する"""
+        body = '<meta charset="Shift_JIS"><p>抽選受付中</p>'.encode('shift_jis')
+
+        with patch.object(scraper.session, 'get', return_value=self._stream_response([body])):
+            text = ''.join(scraper.stream_text('http://example.com'))
+
+        assert '抽選受付中' in text
+
+    @patch('time.sleep')
+    def test_stream_text_size_cap(self, mock_sleep, scraper):
+        """サイズ上限を超えたら読み込みを打ち切り、接続を閉じる"""
+        response = self._stream_response([b'a' * 10, b'b' * 10, b'c' * 10])
+
+        with patch.object(scraper.session, 'get', return_value=response):
+            text = ''.join(scraper.stream_text('http://example.com', max_bytes=15))
+
+        assert text == 'a' * 10 + 'b' * 5
+        response.close.assert_called_once()
+
+    @patch('time.sleep')
+    def test_fetch_html_size_cap(self, mock_sleep, scraper):
+        """fetch_html もチャンク単位で読み、max_response_bytes で打ち切る"""
+        chunks = iter([b'a' * 10, b'b' * 10, b'c' * 10])
+        response = self._stream_response(chunks)
+        scraper.max_response_bytes = 15
+
+        with patch.object(scraper.session, 'get', return_value=response) as mock_get:
+            html = scraper.fetch_html('http://example.com')
+
+        assert html == b'a' * 10 + b'b' * 5
+        assert mock_get.call_args[1]['stream'] is True
+        # 上限到達後のチャンクは読まない
+        assert next(chunks) == b'c' * 10
+        response.close.assert_called_once()
+
+    @patch('time.sleep')
+    def test_scan_keywords_stops_early(self, mock_sleep, scraper):
+        """停止グループのキーワードが見つかった時点で読み込みをやめる"""
+        chunks = [b'<p>sold out</p>', b'<p>never read</p>']
+        response = self._stream_response(iter(chunks))
+
+        with patch.object(scraper.session, 'get', return_value=response):
+            found = scraper.scan_keywords(
+                'http://example.com',
+                {'out_of_stock': ['Sold Out'], 'available': ['never read']},
+                stop_groups=['out_of_stock'],
+            )
+
+        assert found == {'out_of_stock': 'sold out', 'available': None}
+        response.close.assert_called_once()
+
+    @patch('time.sleep')
+    def test_scan_keywords_fetch_failure(self, mock_sleep, scraper):
+        """取得失敗時はNoneを返す"""
+        response = MagicMock()
+        response.status_code = 404
+
+        with patch.object(scraper.session, 'get', return_value=response):
+            assert scraper.scan_keywords('http://example.com', {'a': ['x']}) is None
+
+
+class TestRequestsBaseScraperPagination:
+    """ページネーション取得のテスト"""
+
+    @pytest.fixture
+    def scraper(self):
+        return RequestsBaseScraper()
+
+    @staticmethod
+    def _page(items, links=''):
+        lis = ''.join(f'<li class="item"><a href="/detail/{i}">ポケモンカード {i}</a></li>' for i in items)
+        return f'<html><body><ul>{lis}</ul>{links}</body></html>'.encode('utf-8')
+
+    @staticmethod
+    def _parse(soup):
+        return [{'url': a['href'], 'product': a.get_text()} for a in soup.select('li.item a')]
+
+    def test_pages_by_discovered_param(self, scraper):
+        """リンクから検出したページ番号パラメータで2ページ目以降を取得"""
+        pager = '<a href="/search?q=x&page=2">2</a><a href="/search?q=x&page=3">3</a>'
+        pages = {
+            'https://shop.example.com/search?q=x': self._page([1, 2], pager),
+            'https://shop.example.com/search?q=x&page=2': self._page([3, 4], pager),
+            'https://shop.example.com/search?q=x&page=3': self._page([5], pager),
+            'https://shop.example.com/search?q=x&page=4': self._page([], pager),
+        }
+
+        with patch.object(scraper, 'fetch_html', side_effect=lambda url: pages.get(url)) as mock_fetch:
+            items = scraper.crawl_pages('https://shop.example.com/search?q=x', self._parse, max_pages=4)
+
+        assert [item['url'] for item in items] == ['/detail/1', '/detail/2', '/detail/3', '/detail/4', '/detail/5']
+        assert mock_fetch.call_count == 4
+
+    def test_stops_when_no_new_items(self, scraper):
+        """新規アイテムがないページで以降の取得をやめる"""
+        same = self._page([1, 2])
+
+        with patch.object(scraper, 'fetch_html', return_value=same) as mock_fetch:
+            items = scraper.crawl_pages('https://shop.example.com/search?q=x', self._parse,
+                                        page_param='page', max_pages=10, concurrency=2)
+
+        assert len(items) == 2
+        # 1ページ目 + 1ウェーブ（2ページ）で終了
+        assert mock_fetch.call_count == 3
+
+    def test_follows_next_link(self, scraper):
+        """ページ番号が分からない場合は rel="next" をたどる"""
+        pages = {
+            'https://shop.example.com/list': self._page([1], '<a rel="next" href="/list/2">次へ</a>'),
+            'https://shop.example.com/list/2': self._page([2], '<a rel="next" href="/list/3">次へ</a>'),
+            'https://shop.example.com/list/3': self._page([3]),
+        }
+
+        with patch.object(scraper, 'fetch_html', side_effect=lambda url: pages.get(url)):
+            items = scraper.crawl_pages('https://shop.example.com/list', self._parse)
+
+        assert [item['url'] for item in items] == ['/detail/1', '/detail/2', '/detail/3']
+
+    @patch('time.sleep')
+    def test_host_pacing_serializes_concurrent_requests(self, mock_sleep, scraper):
+        """同一ホストへの連続リクエストは wait_time 間隔で予約される"""
+        with patch('scrapers.requests_base.random.uniform', return_value=0.0):
+            scraper._wait_for_slot('https://shop.example.com/a')
+            scraper._wait_for_slot('https://shop.example.com/b')
+            scraper._wait_for_slot('https://other.example.com/a')
+
+        waits = [c[0][0] for c in mock_sleep.call_args_list]
+        assert waits[0] == pytest.approx(1.0, abs=0.05)
+        assert waits[1] == pytest.approx(2.0, abs=0.05)
+        # 別ホストは独立
+        assert waits[2] == pytest.approx(1.0, abs=0.05)
+
+
+class _ListScraper(RequestsBaseScraper):
+    """プロセスプールへ渡すためモジュールレベルで定義したスクレイパー"""
+
+    def parse_items(self, soup):
+        return [{'url': a['href'], 'pid': os.getpid()} for a in soup.select('li.item a')]
+
+
+class TestParsePool:
+    """解析用プロセスプールのテスト"""
+
+    PAGE = '<ul><li class="item"><a href="/detail/1">ポケモンカード</a></li></ul>'.encode('utf-8')
+
+    def test_inline_when_not_started(self):
+        """未起動時は呼び出し元で実行"""
+        assert not parse_pool.is_running()
+        assert parse_pool.run(len, b'abc') == 3
+
+    def test_scraper_is_picklable(self):
+        """通信用の状態を除いてpickleでき、復元後も利用できる"""
+        scraper = _ListScraper()
+        restored = pickle.loads(pickle.dumps(scraper.parse_items))
+        assert restored.__self__.session is not scraper.session
+        assert restored.__self__.headers == scraper.headers
+
+    def test_unpicklable_falls_back_inline(self):
+        """pickleできない関数（lambda）は呼び出し元で実行"""
+        try:
+            parse_pool.start(2)
+            assert parse_pool.run(lambda content: content.upper(), b'abc') == b'ABC'
+        finally:
+            parse_pool.shutdown()
+
+    def test_extract_page_runs_in_worker(self):
+        """解析・抽出はワーカープロセスで実行され、レコードだけが返る"""
+        scraper = _ListScraper()
+        try:
+            assert parse_pool.start(2) == 2
+            page = parse_pool.run(scraper._extract_page, self.PAGE, 'https://shop.example.com/', scraper.parse_items)
+        finally:
+            parse_pool.shutdown()
+
+        assert page['items'][0]['url'] == '/detail/1'
+        assert page['items'][0]['pid'] != os.getpid()
+        assert not parse_pool.is_running()
@@ -0,0 +1,178 @@
+"""
+共通リトライ方針（retry モジュール）と各呼び出し箇所のユニットテスト
+"""
+import asyncio
+import smtplib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import retry
+from notify import GmailNotifier
+from scrapers.playwright_base import PlaywrightBaseScraper
+from scrapers.requests_base import RequestsBaseScraper
+
+
+@pytest.fixture(autouse=True)
+def reset_retry():
+    retry.reset()
+    yield
+    retry.reset()
+
+
+def _response(status, headers=None, content=b'<html>ok</html>'):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.content = content
+    response.iter_content.return_value = [content]
+    return response
+
+
+class TestRetryPolicy:
+    """方針（待ち時間・予算・集計）のテスト"""
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = retry.RetryPolicy('t', base_delay=1.0, max_delay=5.0, jitter=0.5)
+        for attempt, upper in ((0, 1.0), (1, 2.0), (5, 5.0)):
+            delay = policy.backoff(attempt)
+            assert upper * 0.5 <= delay <= upper
+
+    def test_parse_retry_after(self):
+        assert retry.parse_retry_after('7') == 7.0
+        later = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 <= retry.parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+        assert retry.parse_retry_after('soon') is None
+        assert retry.parse_retry_after(None) is None
+
+    def test_retry_after_is_honored(self):
+        calls = []
+
+        def func(attempt):
+            calls.append(attempt)
+            if attempt == 0:
+                raise retry.Retry('HTTP 429', retry_after=3)
+            return 'ok'
+
+        with patch('retry.time.sleep') as sleep:
+            assert retry.call(retry.RetryPolicy('t', max_delay=10), func) == 'ok'
+        sleep.assert_called_once_with(3)
+        assert calls == [0, 1]
+
+    def test_long_retry_after_gives_up(self):
+        def func(attempt):
+            raise retry.Retry('HTTP 503', retry_after=600)
+
+        with patch('retry.time.sleep') as sleep, pytest.raises(retry.RetryExhausted):
+            retry.call(retry.RetryPolicy('t', max_delay=30), func)
+        sleep.assert_not_called()
+
+    def test_budget_is_shared_across_calls(self):
+        """予算を使い切ったら以降の呼び出しは再試行しない"""
+        policy = retry.RetryPolicy('http', max_attempts=10, base_delay=0)
+        attempts = []
+
+        def func(attempt):
+            attempts.append(attempt)
+            raise ConnectionError('down')
+
+        with patch.dict('retry.RETRY_BUDGETS', {'http': 3}), patch('retry.time.sleep'):
+            for _ in range(2):
+                with pytest.raises(ConnectionError):
+                    retry.call(policy, func, retry_on=(ConnectionError,))
+
+        assert len(attempts) == 4 + 1  # 1回目の呼び出しで3回再試行、2回目は再試行なし
+        metrics = retry.metrics()['http']
+        assert metrics['calls'] == 2
+        assert metrics['retries'] == 3
+        assert metrics['budget_exhausted'] == 2
+
+    def test_give_up_on_is_not_retried(self):
+        func = MagicMock(side_effect=smtplib.SMTPAuthenticationError(535, b'bad'))
+        with pytest.raises(smtplib.SMTPAuthenticationError):
+            retry.call(retry.SMTP, func, retry_on=(smtplib.SMTPException,),
+                       give_up_on=(smtplib.SMTPAuthenticationError,))
+        assert func.call_count == 1
+
+    def test_async_backoff_does_not_block_loop(self):
+        """非同期版の待機中も他のタスクが進む"""
+        ticks = []
+
+        async def flaky(attempt):
+            if attempt == 0:
+                raise retry.Retry('empty page', retry_after=0.2)
+            return 'ok'
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(1)
+                await asyncio.sleep(0.02)
+
+        async def run():
+            return await asyncio.gather(retry.call_async(retry.RetryPolicy('t'), flaky), ticker())
+
+        assert asyncio.run(run())[0] == 'ok'
+        assert len(ticks) == 3
+
+    def test_merge_metrics(self):
+        retry.merge_metrics({'http': {'calls': 2, 'retries': 1, 'wait_seconds': 1.5}})
+        retry.merge_metrics({'http': {'calls': 1}})
+        metrics = retry.metrics()['http']
+        assert metrics['calls'] == 3
+        assert metrics['wait_seconds'] == 1.5
+        # 子プロセスの再試行は予算の消費にも加算する
+        assert retry.budget_used() == {'http': 1}
+
+    def test_child_uses_remaining_budget(self):
+        """子プロセスは親の消費数を引き継ぎ、残りの予算だけ再試行する"""
+        policy = retry.RetryPolicy('http', max_attempts=10, base_delay=0)
+        func = MagicMock(side_effect=ConnectionError('down'))
+
+        with patch.dict('retry.RETRY_BUDGETS', {'http': 3}), patch('retry.time.sleep'):
+            retry.inherit_budget({'http': 2})
+            with pytest.raises(ConnectionError):
+                retry.call(policy, func, retry_on=(ConnectionError,))
+
+        assert func.call_count == 2
+        assert retry.budget_used() == {'http': 3}
+
+
+class TestCallSites:
+    """HTTP / Playwright / SMTP の呼び出し箇所のテスト"""
+
+    def test_requests_honors_retry_after(self):
+        scraper = RequestsBaseScraper(wait_time=0.1)
+        responses = [_response(503, {'Retry-After': '4'}), _response(200)]
+        with patch.object(scraper.session, 'get', side_effect=responses), patch('time.sleep') as sleep:
+            assert scraper.fetch_html('http://example.com') == b'<html>ok</html>'
+        # リクエスト間隔の待機2回の間に Retry-After の待機
+        assert sleep.call_args_list[1].args == (4.0,)
+
+    def test_playwright_fetch_with_retry_launches_at_most_max_retries(self):
+        """fetch_with_retry は内側の retry と重ねず、ブラウザ起動は max_retries 回まで"""
+        scraper = PlaywrightBaseScraper.__new__(PlaywrightBaseScraper)
+        fetch = AsyncMock(return_value='<html>short</html>')
+        with patch.object(scraper, '_fetch_page_internal', fetch), \
+                patch('scrapers.playwright_base.PLAYWRIGHT_AVAILABLE', True), \
+                patch('retry.asyncio.sleep', AsyncMock()):
+            assert asyncio.run(scraper.fetch_with_retry('http://example.com', max_retries=3)) is None
+        assert fetch.await_count == 3
+
+    def test_smtp_retries_with_policy(self, monkeypatch):
+        monkeypatch.setenv('SMTP_USERNAME', 'user')
+        monkeypatch.setenv('SMTP_PASSWORD', 'pass')
+        monkeypatch.setenv('RECIPIENT_EMAIL', 'to@example.com')
+        notifier = GmailNotifier()
+        server = MagicMock()
+        smtp = MagicMock(side_effect=[smtplib.SMTPServerDisconnected('bye'), server])
+        with patch('notify.smtplib.SMTP_SSL', smtp), patch('retry.time.sleep') as sleep:
+            data = {
+                'timestamp': datetime.now().isoformat(),
+                'sources': [{'source': 'shop', 'lotteries': [{'product': 'ポケモンカード BOX', 'end_date': '2099-12-31'}]}],
+            }
+            assert notifier.send_notification(data)
+        assert smtp.call_count == 2
+        sleep.assert_called_once()
+        assert retry.metrics()['smtp']['retries'] == 1
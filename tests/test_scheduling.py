@@ -0,0 +1,69 @@
+"""
+実行順序と種類別の同時実行数のユニットテスト
+"""
+import asyncio
+from unittest.mock import patch
+
+import main
+import scheduling
+
+
+def _config(num, name, module='scrapers.example_scraper', **extra):
+    return {'num': num, 'name': name, 'module': module, 'skip': False, **extra}
+
+
+class TestScheduling:
+    """スケジューリングのテスト"""
+
+    def test_scraper_kind(self):
+        assert scheduling.scraper_kind(_config(1, 'a', module='scrapers.aeon_playwright_scraper')) == 'browser'
+        assert scheduling.scraper_kind(_config(2, 'b')) == 'http'
+        assert scheduling.scraper_kind(_config(3, 'c', kind='api')) == 'api'
+        assert scheduling.scraper_kind(_config(4, 'd', kind='unknown')) == 'http'
+
+    def test_order_by_cost(self):
+        """履歴の長い順、履歴がなければ種類別の既定値で並べる"""
+        scrapers = [
+            _config(1, 'http'),
+            _config(2, 'browser', module='scrapers.x_playwright_scraper'),
+            _config(3, 'slow_http'),
+        ]
+        ordered = scheduling.order_by_cost(scrapers, {'slow_http': 120.0})
+        assert [c['name'] for c in ordered] == ['slow_http', 'browser', 'http']
+
+    def test_concurrency_limits_from_env(self):
+        limits = scheduling.concurrency_limits({'CONCURRENCY_BROWSER': '1', 'CONCURRENCY_HTTP': 'x'})
+        assert limits['browser'] == 1
+        assert limits['http'] == scheduling.SCRAPER_CONCURRENCY['http']
+        assert limits['api'] == scheduling.SCRAPER_CONCURRENCY['api']
+
+    def test_run_scrapers_async_uses_separate_pools(self):
+        """種類ごとに同時実行数を制限し、結果は設定の順序で格納"""
+        scrapers = [_config(i, f'http{i}') for i in range(1, 5)] + [
+            _config(i, f'browser{i}', module='scrapers.x_playwright_scraper') for i in range(5, 8)
+        ]
+        active = {'browser': 0, 'http': 0}
+        peak = {'browser': 0, 'http': 0}
+        started = []
+
+        async def fake_execute(config, semaphore, total, instances=None, previous=None, durations=None,
+                               deadline=None, outcomes=None, semaphores=None):
+            kind = scheduling.scraper_kind(config)
+            async with semaphore:
+                started.append(config['name'])
+                active[kind] += 1
+                peak[kind] = max(peak[kind], active[kind])
+                await asyncio.sleep(0.01)
+                active[kind] -= 1
+            return {'data': {'source': config['name']}, 'zero_alert': False, 'name': config['name']}
+
+        all_results = {'sources': [], 'zero_alert_sources': []}
+        with patch('main.execute_scraper', side_effect=fake_execute):
+            asyncio.run(main.run_scrapers_async(
+                scrapers, all_results, limits={'browser': 1, 'http': 3, 'api': 1},
+            ))
+
+        assert peak == {'browser': 1, 'http': 3}
+        # 見積もりの長い browser から開始
+        assert started[0] == 'browser5'
+        assert [s['source'] for s in all_results['sources']] == [c['name'] for c in scrapers]
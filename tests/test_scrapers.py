@@ -1,9 +1,12 @@
 """
 Scraper基底クラスのユニットテスト
 """
+import asyncio
 import pytest
 import logging
-from scrapers.playwright_base import PlaywrightBaseScraper
+import weakref
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers.playwright_base import PlaywrightBaseScraper, class_contains_selector
 
 
 class TestPlaywrightBaseScraper:
@@ -137,3 +140,236 @@ class TestPlaywrightBaseScraper:
             test_logger.warning("Test warning message")
             # ログが記録されていることを確認
             assert len(caplog.records) > 0
+
+
+class TestInPageExtraction:
+    """ページ内抽出モードのテスト"""
+
+    @pytest.fixture
+    def scraper(self):
+        return PlaywrightBaseScraper()
+
+    def test_class_contains_selector(self):
+        """タグ×クラスキーワードのCSSセレクタ生成"""
+        selector = class_contains_selector(['div', 'li'], ['item', 'goods'])
+        assert selector == ('div[class*="item" i], div[class*="goods" i], '
+                            'li[class*="item" i], li[class*="goods" i]')
+
+    def test_evaluate_spec_adds_http_status(self, scraper):
+        """抽出結果にHTTPステータスが付与される"""
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value={'title': 'ok', 'items': [], 'links': []})
+        response = MagicMock(status=200)
+
+        result = asyncio.run(scraper._evaluate_spec(page, response, {'items': {}}))
+
+        assert result['http_status'] == 200
+        args = page.evaluate.call_args[0]
+        assert args[1] == {'items': {}}
+
+    def test_is_error_page(self, scraper):
+        """HTTPステータス/タイトルでエラーページを判定"""
+        assert scraper.is_error_page({'http_status': 403, 'title': ''}) is True
+        assert scraper.is_error_page({'http_status': 200, 'title': '404 Not Found'}) is True
+        assert scraper.is_error_page({'http_status': 200, 'title': 'ポケモンカード 予約'}) is False
+        # 本文中の数字（価格など）では誤判定しない
+        assert scraper.is_error_page({'http_status': 200, 'title': '商品一覧', 'items': [{'price': '4,030円'}]}) is False
+
+    def test_parse_records(self):
+        """ページ内抽出レコードから抽選情報を組み立てる"""
+        from scrapers.edion_playwright_scraper import EdionPlaywrightScraper
+
+        scraper = EdionPlaywrightScraper()
+        page_data = {
+            'items': [{
+                'product': 'ポケモンカードゲーム 拡張パック BOX',
+                'href': 'https://www.edion.com/detail.html?p_cd=1',
+                'price': '5,400円',
+                'period': '2026年1月10日～2026年1月20日',
+                'text': 'ポケモンカードゲーム 拡張パック BOX 抽選受付中 5,400円',
+            }, {
+                'product': 'ぬいぐるみ',
+                'href': 'https://www.edion.com/detail.html?p_cd=2',
+                'price': '',
+                'period': '',
+                'text': 'ピカチュウ ぬいぐるみ',
+            }],
+            'links': [],
+        }
+
+        lotteries = scraper._parse_records(page_data)
+
+        assert len(lotteries) == 1
+        assert lotteries[0]['lottery_type'] == '抽選販売'
+        assert lotteries[0]['price'] == '5,400円'
+        assert lotteries[0]['detail_url'] == 'https://www.edion.com/detail.html?p_cd=1'
+
+
+class TestFetchMany:
+    """fetch_many（共有コンテキストでの並列取得）のテスト"""
+
+    @pytest.fixture
+    def scraper(self):
+        scraper = PlaywrightBaseScraper()
+        scraper._launch_browser = AsyncMock(return_value=MagicMock())
+        scraper._new_context = AsyncMock(return_value=MagicMock())
+        scraper._close_resources = AsyncMock()
+        scraper._warm_up = AsyncMock()
+        scraper._save_storage_state = AsyncMock()
+        return scraper
+
+    @staticmethod
+    def _fake_playwright():
+        manager = MagicMock()
+        manager.__aenter__ = AsyncMock(return_value=MagicMock())
+        manager.__aexit__ = AsyncMock(return_value=False)
+        return MagicMock(return_value=manager)
+
+    def test_results_in_completion_order_with_limit(self, scraper):
+        """完了順に返し、同時実行数を上限以内に抑える"""
+        delays = {'https://a.example': 0.05, 'https://b.example': 0.0, 'https://c.example': 0.02}
+        running = {'now': 0, 'max': 0}
+
+        async def fake_fetch(context, url, *args):
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+            await asyncio.sleep(delays[url])
+            running['now'] -= 1
+            return f'<html>{url}</html>'
+
+        scraper._fetch_in_context = fake_fetch
+        with patch('scrapers.playwright_base.PLAYWRIGHT_AVAILABLE', True), \
+                patch('scrapers.playwright_base.async_playwright', self._fake_playwright(), create=True):
+            results = asyncio.run(scraper.collect_many(list(delays), concurrency=2))
+
+        assert [url for url, _ in results] == ['https://b.example', 'https://c.example', 'https://a.example']
+        assert running['max'] == 2
+        # ブラウザ・コンテキストは1回だけ作成
+        assert scraper._launch_browser.await_count == 1
+        assert scraper._new_context.await_count == 1
+
+    def test_fetch_in_context_retries_per_url(self, scraper):
+        """URL単位でretryし、成功した結果を返す"""
+        scraper._new_page = AsyncMock(return_value=MagicMock())
+        scraper._load_page = AsyncMock(side_effect=[RuntimeError('boom'), MagicMock(status=200)])
+        extractor = AsyncMock(return_value='<html>ok</html>')
+
+        with patch('scrapers.playwright_base.asyncio.sleep', new=AsyncMock()):
+            result = asyncio.run(scraper._fetch_in_context(
+                MagicMock(), 'https://a.example', extractor, None, True, False, 0, 1
+            ))
+
+        assert result == '<html>ok</html>'
+        assert scraper._load_page.await_count == 2
+        # 各試行のページを閉じる
+        assert scraper._close_resources.await_count == 2
+
+    def test_launch_failure_is_raised(self, scraper):
+        """ブラウザ起動の失敗は握りつぶさずRuntimeErrorとして伝える"""
+        scraper._launch_browser = AsyncMock(side_effect=OSError('no display'))
+        with patch('scrapers.playwright_base.PLAYWRIGHT_AVAILABLE', True), \
+                patch('scrapers.playwright_base.async_playwright', self._fake_playwright(), create=True):
+            with pytest.raises(RuntimeError, match='launch failed'):
+                asyncio.run(scraper.collect_many(['https://a.example']))
+
+    def test_page_failure_yields_none(self, scraper):
+        """ページ単位の失敗は該当URLのみNoneにする"""
+        async def fake_fetch(context, url, *args):
+            if url == 'https://a.example':
+                raise ValueError('broken page')
+            return '<html>ok</html>'
+
+        scraper._fetch_in_context = fake_fetch
+        with patch('scrapers.playwright_base.PLAYWRIGHT_AVAILABLE', True), \
+                patch('scrapers.playwright_base.async_playwright', self._fake_playwright(), create=True):
+            results = asyncio.run(scraper.collect_many(['https://a.example', 'https://b.example']))
+
+        assert sorted(results) == [('https://a.example', None), ('https://b.example', '<html>ok</html>')]
+
+    def test_playwright_unavailable(self, scraper):
+        """playwright未インストール時は全URLをNoneで返す"""
+        with patch('scrapers.playwright_base.PLAYWRIGHT_AVAILABLE', False):
+            results = asyncio.run(scraper.collect_many(['https://a.example']))
+        assert results == [('https://a.example', None)]
+
+
+class TestStorageState:
+    """ストレージ状態の永続化・ウォームアップのテスト"""
+
+    @pytest.fixture
+    def scraper(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(PlaywrightBaseScraper, '_warmed_domains', weakref.WeakKeyDictionary())
+        scraper = PlaywrightBaseScraper()
+        scraper.storage_state_dir = str(tmp_path)
+        return scraper
+
+    @staticmethod
+    def _context(state):
+        context = MagicMock()
+        context.storage_state = AsyncMock(return_value=state)
+        return context
+
+    def test_save_and_load_per_domain(self, scraper):
+        """ドメインごとに分けて保存し、マージして復元する"""
+        state = {
+            'cookies': [
+                {'name': 'a', 'value': '1', 'domain': '.shop.example.com'},
+                {'name': 'b', 'value': '2', 'domain': 'other.example.org'},
+            ],
+            'origins': [
+                {'origin': 'https://shop.example.com', 'localStorage': [{'name': 'k', 'value': 'v'}]},
+            ],
+        }
+        asyncio.run(scraper._save_storage_state(self._context(state), ['https://shop.example.com/list']))
+
+        loaded = scraper._load_storage_state(['https://shop.example.com/detail'])
+        assert [c['name'] for c in loaded['cookies']] == ['a']
+        assert loaded['origins'][0]['origin'] == 'https://shop.example.com'
+        # 未保存ドメインはNone
+        assert scraper._load_storage_state(['https://other.example.org/']) is None
+
+    def test_expired_state_is_ignored(self, scraper):
+        """有効期限切れの状態は復元しない"""
+        state = {'cookies': [{'name': 'a', 'value': '1', 'domain': 'shop.example.com'}], 'origins': []}
+        asyncio.run(scraper._save_storage_state(self._context(state), ['https://shop.example.com/']))
+
+        scraper.storage_state_ttl = -1
+        assert scraper._load_storage_state(['https://shop.example.com/']) is None
+
+    def test_warm_up_once_per_domain(self, scraper):
+        """ウォームアップは1回の実行でドメインごとに1回のみ"""
+        page = MagicMock()
+        page.goto = AsyncMock()
+        scraper._new_page = AsyncMock(return_value=page)
+        scraper._close_resources = AsyncMock()
+        context = self._context({'cookies': [], 'origins': []})
+
+        asyncio.run(scraper._warm_up(context, 'https://shop.example.com/a'))
+        asyncio.run(scraper._warm_up(context, 'https://shop.example.com/b'))
+
+        assert page.goto.await_count == 1
+        assert page.goto.call_args[0][0] == 'https://shop.example.com/'
+
+    def test_warm_up_again_in_new_context(self, scraper):
+        """新しいコンテキスト（--watch の次サイクル等）では再度ウォームアップする"""
+        page = MagicMock()
+        page.goto = AsyncMock()
+        scraper._new_page = AsyncMock(return_value=page)
+        scraper._close_resources = AsyncMock()
+        # 保存した状態は期限切れ扱いにして、コンテキスト単位の記録だけで判定させる
+        scraper.storage_state_ttl = -1
+
+        asyncio.run(scraper._warm_up(self._context({'cookies': [], 'origins': []}), 'https://shop.example.com/a'))
+        asyncio.run(scraper._warm_up(self._context({'cookies': [], 'origins': []}), 'https://shop.example.com/a'))
+
+        assert page.goto.await_count == 2
+
+    def test_warm_up_skipped_with_stored_state(self, scraper):
+        """保存済みの有効な状態があればトップページを開かない"""
+        state = {'cookies': [{'name': 'a', 'value': '1', 'domain': 'shop.example.com'}], 'origins': []}
+        asyncio.run(scraper._save_storage_state(self._context(state), ['https://shop.example.com/']))
+        scraper._new_page = AsyncMock()
+
+        asyncio.run(scraper._warm_up(MagicMock(), 'https://shop.example.com/a'))
+
+        scraper._new_page.assert_not_awaited()
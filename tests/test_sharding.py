@@ -0,0 +1,158 @@
+"""
+分割実行（シャード割り当て・部分結果の統合）のユニットテスト
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+import main
+import sharding
+
+
+def _config(num, name, module='scrapers.example_scraper', skip=False):
+    return {'num': num, 'name': name, 'module': module, 'skip': skip}
+
+
+def _shard_file(tmp_path, index, total, entries, timestamp='2026-05-10T09:00:00', state=None):
+    path = tmp_path / f'shard_{index}_of_{total}.json'
+    path.write_text(json.dumps({
+        'shard': f'{index}/{total}',
+        'timestamp': timestamp,
+        'scrapers': [entry['name'] for entry in entries],
+        'entries': entries,
+        'durations': {entry['name']: 1.0 for entry in entries},
+        'state': state or {},
+    }, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def _entry(num, name, lotteries=1, zero_alert=False):
+    return {
+        'num': num,
+        'name': name,
+        'zero_alert': zero_alert,
+        'data': {'source': name, 'lotteries': [{'product': f'{name} BOX'}] * lotteries},
+    }
+
+
+class TestAssignShards:
+    """シャード割り当てのテスト"""
+
+    def test_parse_shard(self):
+        assert sharding.parse_shard('2/3') == (2, 3)
+        for spec in ('0/3', '4/3', '1', 'a/b', '1/0'):
+            with pytest.raises(ValueError):
+                sharding.parse_shard(spec)
+
+    def test_balances_by_historical_cost(self):
+        """実行時間の長いスクレイパーから均等に割り当て、全スクレイパーを1回ずつ含む"""
+        scrapers = [_config(i, f's{i}') for i in range(1, 7)] + [_config(7, 'skipped', skip=True)]
+        costs = {'s1': 90, 's2': 60, 's3': 50, 's4': 40, 's5': 10, 's6': 10}
+
+        shards = sharding.assign_shards(scrapers, 2, costs)
+
+        names = [[c['name'] for c in shard] for shard in shards]
+        assert names == [['s1', 's4'], ['s2', 's3', 's5', 's6']]  # 130s / 130s
+        assert sorted(sum(names, [])) == [f's{i}' for i in range(1, 7)]
+        # 同じ入力なら同じ割り当て
+        assert sharding.assign_shards(list(reversed(scrapers)), 2, costs) == shards
+
+    def test_default_cost_by_kind(self):
+        """履歴がない場合は Playwright を重く見積もる"""
+        scrapers = [
+            _config(1, 'pw', module='scrapers.aeon_playwright_scraper'),
+            _config(2, 'r1'), _config(3, 'r2'), _config(4, 'r3'),
+        ]
+        shards = sharding.assign_shards(scrapers, 2)
+        assert [c['name'] for c in shards[0]] == ['pw']
+
+    def test_update_costs_smooths_history(self, tmp_path):
+        path = str(tmp_path / 'costs.json')
+        sharding.update_costs({'a': 10.0}, path)
+        assert sharding.update_costs({'a': 20.0, 'b': 5.0}, path) == {'a': 15.0, 'b': 5.0}
+
+
+class TestMergeShards:
+    """部分結果の統合のテスト"""
+
+    def test_merge_is_deterministic(self, tmp_path):
+        """シャードの順序によらずスクレイパー番号順に統合"""
+        first = _shard_file(tmp_path, 1, 2, [_entry(5, 'e'), _entry(1, 'a')])
+        second = _shard_file(tmp_path, 2, 2, [_entry(3, 'c', lotteries=0, zero_alert=True)],
+                             timestamp='2026-05-10T09:05:00')
+
+        merged, durations = sharding.merge_shards([second, first])
+
+        assert [source['source'] for source in merged['sources']] == ['a', 'c', 'e']
+        assert merged['zero_alert_sources'] == ['c']
+        assert merged['timestamp'] == '2026-05-10T09:05:00'
+        assert set(durations) == {'a', 'c', 'e'}
+        assert sharding.merge_shards([first, second])[0] == merged
+
+    def test_merge_collects_learned_state(self, tmp_path):
+        """シャードごとの学習結果を種類別にまとめる（同じキーは新しいシャードを優先）"""
+        first = _shard_file(tmp_path, 1, 2, [_entry(1, 'a')], state={
+            'hosts': {'shop.example.com': {'limit': 2.0, 'latency': 0.1}},
+            'tiers': {'a': {'tier': 1, 'class': 'APlaywrightScraper'}},
+        })
+        second = _shard_file(tmp_path, 2, 2, [_entry(2, 'b')], timestamp='2026-05-10T09:05:00', state={
+            'hosts': {'shop.example.com': {'limit': 4.0, 'latency': 0.2}},
+            'tiers': {'b': None},
+        })
+
+        state = {}
+        sharding.merge_shards([second, first], state=state)
+
+        assert state['hosts'] == {'shop.example.com': {'limit': 4.0, 'latency': 0.2}}
+        assert state['tiers'] == {'a': {'tier': 1, 'class': 'APlaywrightScraper'}, 'b': None}
+
+    def test_rejects_mixed_splits(self, tmp_path):
+        paths = [_shard_file(tmp_path, 1, 2, [_entry(1, 'a')]), _shard_file(tmp_path, 1, 3, [_entry(2, 'b')])]
+        with pytest.raises(ValueError):
+            sharding.merge_shards(paths)
+
+    def test_merge_command_runs_post_processing(self, tmp_path):
+        """--merge は統合後に通常実行と同じ後処理を行う"""
+        probe_state = {'a': {'fingerprints': {}, 'rendered_at': '2026-05-10T09:00:00'}}
+        endpoints = {'https://shop.example.com/lottery': {'endpoint': 'https://shop.example.com/api'}}
+        path = _shard_file(tmp_path, 1, 1, [_entry(1, 'a')], state={'probe': probe_state, 'api_endpoints': endpoints})
+        with patch('main.complete_run') as complete_run, \
+                patch('main.sharding.update_costs') as update_costs, \
+                patch('main.host_control.merge_state') as merge_hosts, \
+                patch('main.probe.merge_state') as merge_probe, \
+                patch('main.tiering.merge_state') as merge_tiers, \
+                patch('scrapers.api_capture.merge_state') as merge_endpoints, \
+                patch('main.setup_logging'):
+            assert main.main(['--merge', path]) == 0
+
+        all_results = complete_run.call_args.args[0]
+        assert all_results['sources'][0]['source'] == 'a'
+        update_costs.assert_called_once_with({'a': 1.0})
+        # シャード実行では保存しない学習結果を --merge で保存する
+        merge_hosts.assert_called_once_with({})
+        merge_probe.assert_called_once_with(probe_state)
+        merge_tiers.assert_called_once_with({})
+        merge_endpoints.assert_called_once_with(endpoints)
+
+    def test_find_shard_files_ignores_stale_shards(self, tmp_path):
+        """最新の実行と分割数が違うもの・開始時刻が離れたものは以前の実行の残りとして無視する"""
+        current = [_shard_file(tmp_path, 1, 3, [_entry(1, 'a')], timestamp='2026-05-10T09:00:00'),
+                   _shard_file(tmp_path, 3, 3, [_entry(3, 'c')], timestamp='2026-05-10T09:01:00')]
+        _shard_file(tmp_path, 2, 3, [_entry(2, 'stale')], timestamp='2026-05-09T09:00:00')
+        _shard_file(tmp_path, 1, 2, [_entry(1, 'old')], timestamp='2026-05-09T21:00:00')
+        assert sharding.find_shard_files(str(tmp_path)) == current
+
+        sharding.clear_shard_files(str(tmp_path))
+        assert sharding.find_shard_files(str(tmp_path)) == []
+
+    def test_default_merge_clears_shards_only_on_success(self, tmp_path):
+        """パス省略の --merge は最新の実行分を統合し、成功した時だけシャード結果を削除する"""
+        path = _shard_file(tmp_path, 1, 1, [_entry(1, 'a')])
+        for code, cleared in ((0, True), (1, False)):
+            with patch('main.sharding.find_shard_files', return_value=[path]), \
+                    patch('main.sharding.clear_shard_files') as clear, \
+                    patch('main.merge_results', return_value=code) as merge_results, \
+                    patch('main.setup_logging'):
+                assert main.main(['--merge']) == code
+            merge_results.assert_called_once_with([path])
+            assert clear.called is cleared
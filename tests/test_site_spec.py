@@ -0,0 +1,158 @@
+"""
+サイト別抽出定義（scrapers.site_spec）と SpecScraper のユニットテスト
+"""
+import pickle
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+import soupsieve
+from bs4 import BeautifulSoup
+
+from scrapers import site_spec
+from scrapers.edion_playwright_scraper import EdionPlaywrightScraper
+from scrapers.edion_scraper import EdionScraper
+from scrapers.joshin_scraper import JoshinScraper
+from scrapers.spec_scraper import SpecScraper
+
+NOW = datetime(2026, 5, 10, 9, 0, 0)
+SPEC = {
+    'store': 'ショップ',
+    'source': 'ショップ (shop.example.com)',
+    'base_url': 'https://shop.example.com/',
+    'urls': ['https://shop.example.com/lottery'],
+    'lottery_type': {'抽選': '抽選販売', 'default': '予約販売'},
+    'items': {
+        'container': {'tags': ['div', 'li'], 'class_contains': ['item']},
+        'title': '.name',
+        'require_any': ['抽選', '予約'],
+    },
+    'links': {
+        'href_contains': ['/detail'],
+        'min_text': 6,
+        'parent': 'tr',
+        'status': {'active': ['申込'], 'closed': ['終了']},
+    },
+}
+PAGE = """<html><head><title>抽選一覧</title></head><body>
+<div class="ItemBox"><span class="name">ポケモンカードゲーム 拡張パック BOX</span>
+  <a href="/detail?id=1">詳細</a> 抽選受付中 5,400円 4/10〜4/20</div>
+<li class="item"><span class="name">ピカチュウ ぬいぐるみ</span><a href="/detail?id=2">詳細</a> 予約受付中</li>
+<table><tr><td><a href="/detail?id=3">ポケモンカード スターターセット</a></td><td>申込受付 2026/4/30</td></tr></table>
+<a href="/news/1">ポケモンカード 入荷のお知らせ</a>
+</body></html>"""
+
+
+def _soup(html=PAGE):
+    return BeautifulSoup(html, 'html.parser')
+
+
+class TestSpec:
+    """定義の正規化・読み込みのテスト"""
+
+    def test_normalize_builds_css_and_defaults(self):
+        spec = site_spec.normalize(SPEC)
+        assert spec['items']['container'] == 'div[class*="item" i], li[class*="item" i]'
+        assert spec['links']['parent'] == 'tr'
+        assert spec['price_pattern'] == site_spec.PRICE_PATTERN
+        assert SPEC['items']['container'] == {'tags': ['div', 'li'], 'class_contains': ['item']}
+
+    def test_invalid_specs(self):
+        with pytest.raises(ValueError):
+            site_spec.normalize({'items': {'container': 'div'}})
+        with pytest.raises(ValueError):
+            site_spec.normalize({'store': 'x'})
+        with pytest.raises(soupsieve.SelectorSyntaxError):
+            site_spec.normalize({'store': 'x', 'items': {'container': 'div[', 'title': 'h2'}})
+
+    def test_load_from_file(self, tmp_path):
+        path = tmp_path / 'site_specs.yaml'
+        path.write_text('sites:\n  shop:\n    store: ショップ\n    links: {min_text: 3}\n', encoding='utf-8')
+        assert site_spec.load('shop', str(path))['links']['parent'] == 'div, li, article'
+        with pytest.raises(KeyError):
+            site_spec.load('missing', str(path))
+
+    def test_repository_specs_are_valid(self):
+        for site in ('edion_event', 'edion_search', 'joshin_search'):
+            assert site_spec.load(site)['urls']
+
+    def test_in_page_spec_matches_extract_js_keys(self):
+        spec = site_spec.in_page_spec(site_spec.load('edion_search'))
+        assert spec['items']['container'].startswith('div[class*="item" i]')
+        assert spec['links'] == {'href_contains': ['/detail'], 'min_text': 11, 'parent': 'div, li, article'}
+        assert spec['period_patterns'] == site_spec.PERIOD_PATTERNS
+
+
+class TestExtract:
+    """HTML からのレコード抽出と抽選情報の組み立てのテスト"""
+
+    def test_extract_records(self):
+        page = site_spec.extract(_soup(), site_spec.compiled(site_spec.normalize(SPEC)))
+        assert page['title'] == '抽選一覧'
+        first = page['items'][0]
+        assert first['product'] == 'ポケモンカードゲーム 拡張パック BOX'
+        assert first['href'] == 'https://shop.example.com/detail?id=1'
+        assert (first['price'], first['period']) == ('5,400円', '4/10〜4/20')
+        # href_contains と min_text で絞り込み、期間は親要素（tr）から読む
+        assert [(link['href'], link['period']) for link in page['links']] == [
+            ('https://shop.example.com/detail?id=3', '2026/4/30')]
+
+    def test_to_lotteries(self):
+        spec = site_spec.compiled(site_spec.normalize(SPEC))
+        page = site_spec.extract(_soup(), spec)
+        lotteries = site_spec.to_lotteries(page, spec, lambda text: 'ポケモンカード' in text, NOW)
+
+        assert [(lottery['product'], lottery['lottery_type'], lottery['status']) for lottery in lotteries] == [
+            ('ポケモンカードゲーム 拡張パック BOX', '抽選販売', 'active'),
+            ('ポケモンカード スターターセット', '予約販売', 'active'),
+        ]
+        assert lotteries[0]['timestamp'] == NOW.isoformat()
+        assert lotteries[0]['store'] == 'ショップ'
+
+    def test_links_require_any_checks_link_text(self):
+        """links の require_any は親要素ではなくリンクのテキストで判定する"""
+        spec = site_spec.compiled(site_spec.normalize({
+            'store': 'ショップ', 'base_url': 'https://shop.example.com/',
+            'links': {'require_any': ['抽選', '予約'], 'href_any': ['lottery'], 'min_text': 6,
+                      'parent': 'div, li, article, tr'},
+        }))
+        html = ('<ul><li><a href="/p/1">ポケモンカード 拡張パック</a> 抽選受付中</li>'
+                '<li><a href="/p/2">ポケモンカード 抽選販売 BOX</a></li>'
+                '<li><a href="/lottery/3">ポケモンカード スターターセット</a></li></ul>')
+        page = site_spec.extract(_soup(html), spec)
+        lotteries = site_spec.to_lotteries(page, spec, lambda text: 'ポケモンカード' in text, NOW)
+        assert [lottery['detail_url'] for lottery in lotteries] == [
+            'https://shop.example.com/p/2', 'https://shop.example.com/lottery/3']
+
+    def test_compiled_is_cached_per_spec(self):
+        spec = site_spec.normalize(SPEC)
+        assert site_spec.compiled(spec) is site_spec.compiled(dict(spec))
+
+    def test_status_of(self):
+        assert site_spec.status_of('抽選受付中') == 'active'
+        assert site_spec.status_of('受付終了') == 'closed'
+        assert site_spec.status_of('入荷予定') == 'upcoming'
+        assert site_spec.status_of('', {'active': ['x']}) == 'unknown'
+
+
+class TestSpecScraper:
+    """定義で動くスクレイパーのテスト"""
+
+    def test_scrape_with_spec(self):
+        scraper = SpecScraper(spec=SPEC)
+        with patch.object(scraper, 'fetch_html', return_value=PAGE.encode('utf-8')):
+            data = scraper.scrape()
+        assert data['source'] == 'ショップ (shop.example.com)'
+        assert data['source_url'] == 'https://shop.example.com/lottery'
+        assert [lottery['detail_url'] for lottery in data['lotteries']] == [
+            'https://shop.example.com/detail?id=1', 'https://shop.example.com/detail?id=3']
+
+    def test_parse_method_is_picklable_for_parse_pool(self):
+        scraper = SpecScraper(spec=SPEC)
+        restored = pickle.loads(pickle.dumps(scraper._parse_page))
+        assert restored(_soup())[0]['product'] == 'ポケモンカードゲーム 拡張パック BOX'
+
+    def test_migrated_scrapers_use_site_specs(self):
+        assert EdionScraper().urls[-1] == 'https://www.edion.com/event/'
+        assert JoshinScraper().spec['max_pages'] == 5
+        assert EdionPlaywrightScraper().source_name == 'エディオン (edion.com)'
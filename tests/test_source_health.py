@@ -0,0 +1,117 @@
+"""
+ソースの取得状態（サーキットブレーカー）のユニットテスト
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import generate_html_report
+import main
+import sharding
+import source_health
+from constants import BREAKER_COOLDOWN_HOURS, BREAKER_FAILURE_THRESHOLD, BREAKER_PROBE_TIMEOUT_SECONDS
+
+NOW = datetime(2026, 5, 10, 9, 0, 0)
+
+
+def _config(name, **extra):
+    return {'num': 1, 'name': name, 'module': 'tests.test_deadline', 'class': 'QuickScraper',
+            'skip': False, 'kwargs': {}, **extra}
+
+
+def _fail(health, name, times, now=NOW):
+    for _ in range(times):
+        source_health.record_outcomes(health, {name: 'HTTP 403'}, now)
+
+
+class TestBreaker:
+    """状態遷移のテスト"""
+
+    def test_opens_after_consecutive_failures(self):
+        health = {}
+        _fail(health, 'a', BREAKER_FAILURE_THRESHOLD - 1)
+        assert source_health.state_of(health['a'], NOW) == source_health.CLOSED
+
+        _fail(health, 'a', 1)
+        entry = health['a']
+        assert source_health.state_of(entry, NOW) == source_health.OPEN
+        assert entry['retry_at'] == (NOW + timedelta(hours=BREAKER_COOLDOWN_HOURS)).isoformat()
+        assert entry['last_error'] == 'HTTP 403'
+
+    def test_success_resets_failures(self):
+        health = {}
+        _fail(health, 'a', BREAKER_FAILURE_THRESHOLD - 1)
+        source_health.record_outcomes(health, {'a': None}, NOW)
+        assert health['a']['failures'] == 0
+        assert health['a']['last_success'] == NOW.isoformat()
+
+    def test_half_open_probe(self):
+        """再試行時期を過ぎたら短い制限時間で1回試し、失敗すれば停止時間を倍にする"""
+        health = {}
+        _fail(health, 'a', BREAKER_FAILURE_THRESHOLD)
+        later = NOW + timedelta(hours=BREAKER_COOLDOWN_HOURS)
+        assert source_health.state_of(health['a'], later) == source_health.HALF_OPEN
+
+        runnable, blocked = source_health.plan_run([_config('a', timeout_seconds=300)], health, later)
+        assert blocked == []
+        assert runnable[0]['timeout_seconds'] == BREAKER_PROBE_TIMEOUT_SECONDS
+
+        _fail(health, 'a', 1, later)
+        assert health['a']['retry_at'] == (later + timedelta(hours=BREAKER_COOLDOWN_HOURS * 2)).isoformat()
+
+        source_health.record_outcomes(health, {'a': None}, later + timedelta(days=1))
+        assert health['a']['state'] == source_health.CLOSED
+        assert health['a']['trips'] == 0
+
+    def test_plan_run_skips_open_sources(self):
+        health = {}
+        _fail(health, 'a', BREAKER_FAILURE_THRESHOLD)
+        runnable, blocked = source_health.plan_run([_config('a'), _config('b')], health, NOW)
+        assert [c['name'] for c in runnable] == ['b']
+        assert blocked == ['a']
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / 'health.json')
+        health = {}
+        _fail(health, 'a', 1)
+        source_health.save_health(health, path)
+        assert source_health.load_health(path) == health
+
+
+class TestOutcomes:
+    """成否の記録とレポート表示のテスト"""
+
+    def test_execute_scraper_records_outcomes(self):
+        outcomes = {}
+        configs = [
+            _config('ok', filename='/nonexistent/ok.json'),
+            _config('broken', **{'class': 'FailingScraper'}),
+        ]
+        all_results = {'sources': [], 'zero_alert_sources': []}
+        asyncio.run(main.run_scrapers_async(configs, all_results, outcomes=outcomes))
+        assert outcomes['ok'] is None
+        assert 'broken page' in outcomes['broken']
+
+    def test_merge_collects_shard_outcomes(self, tmp_path):
+        path = tmp_path / 'shard_1_of_1.json'
+        result = sharding.build_shard_result(1, 1, [], '2026-05-10T09:00:00', [], {}, {'a': 'timeout'})
+        path.write_text(json.dumps(result), encoding='utf-8')
+        outcomes = {}
+        sharding.merge_shards([str(path)], outcomes)
+        assert outcomes == {'a': 'timeout'}
+
+    def test_report_shows_stopped_sources(self, tmp_path):
+        health = {}
+        _fail(health, 'ヨドバシカメラ', BREAKER_FAILURE_THRESHOLD)
+        source_health.record_outcomes(health, {'楽天ブックス': None}, NOW)
+        data = generate_html_report.normalize_schema({
+            'timestamp': NOW.isoformat(),
+            'sources': [],
+            'source_health': source_health.report_entries(health, NOW),
+        })
+        assert [entry['source'] for entry in data['source_health']] == ['ヨドバシカメラ']
+
+        output = generate_html_report.generate_html_report(data, str(tmp_path / 'report.html'))
+        content = open(output, encoding='utf-8').read()
+        assert '取得を停止中のソース' in content
+        assert 'HTTP 403' in content
@@ -0,0 +1,221 @@
+"""
+取得手段の段階的な切り替え（tiering）のユニットテスト
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+import host_control
+import main
+import probe
+import tiering
+
+NOW = datetime(2026, 5, 10, 9, 0, 0)
+LOTTERY = {'product': 'ポケモンカード 拡張パック BOX', 'store': 'shop', 'end_date': '2099-12-31'}
+
+
+class RequestsTier:
+    """段 0 のテスト用スクレイパー（blocked なら WAF で弾かれた結果を返す）"""
+
+    blocked = True
+    calls = 0
+
+    def scrape(self):
+        RequestsTier.calls += 1
+        if RequestsTier.blocked:
+            return {'source': 'shop', 'lotteries': [], 'error': 'HTTP Error (403)'}
+        return {'source': 'shop', 'lotteries': [dict(LOTTERY)]}
+
+
+class BrowserTier:
+    """段 1 のテスト用スクレイパー（semaphores があれば実行中の枠の状態を記録）"""
+
+    calls = 0
+    semaphores = None
+    held = None
+
+    def scrape(self):
+        BrowserTier.calls += 1
+        if BrowserTier.semaphores is not None:
+            BrowserTier.held = {kind: sem.locked() for kind, sem in BrowserTier.semaphores.items()}
+        return {'source': 'shop', 'lotteries': [dict(LOTTERY)]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    tiering.reset()
+    probe.reset()
+    host_control.reset()
+    RequestsTier.blocked = True
+    RequestsTier.calls = BrowserTier.calls = 0
+    BrowserTier.semaphores = BrowserTier.held = None
+    with patch('tiering.load_state', return_value={}), patch('probe.load_state', return_value={}), \
+            patch('host_control.load_limits', return_value={}):
+        yield
+    tiering.reset()
+    probe.reset()
+    host_control.reset()
+
+
+def _config(tmp_path, **extra):
+    return {'num': 1, 'name': 'shop', 'module': 'tests.test_tiering', 'class': 'RequestsTier', 'kind': 'http',
+            'skip': False, 'kwargs': {}, 'filename': str(tmp_path / 'shop.json'),
+            'fallback': [{'module': 'tests.test_tiering', 'class': 'BrowserTier', 'kind': 'browser'}], **extra}
+
+
+def _run(config, instances=None):
+    return asyncio.run(main.execute_scraper(config, asyncio.Semaphore(1), 1, {} if instances is None else instances))
+
+
+class TestTiers:
+    """段の組み立て・判定のテスト"""
+
+    def test_tiers_of(self, tmp_path):
+        config = _config(tmp_path, kwargs={'check_availability': True}, timeout_seconds=60)
+        base, browser = tiering.tiers_of(config)
+        assert base['class'] == 'RequestsTier' and base['kwargs'] == {'check_availability': True}
+        assert 'fallback' not in base
+        assert browser['class'] == 'BrowserTier' and browser['kind'] == 'browser'
+        assert browser['kwargs'] == {} and 'timeout_seconds' not in browser
+        assert browser['filename'] == config['filename']
+
+        plain = {'name': 'plain', 'module': 'm', 'class': 'C'}
+        assert tiering.tiers_of(plain)[0] is plain
+
+    def test_shortfall(self):
+        assert tiering.shortfall(None, {}) == 'empty response'
+        assert tiering.shortfall({'lotteries': [], 'error': 'blocked'}, {}) == 'error: blocked'
+        assert tiering.shortfall({'lotteries': []}, {}) == '0 items (expected 1)'
+        assert tiering.shortfall({'lotteries': [LOTTERY]}, {}) is None
+        assert tiering.shortfall({'reservations': [LOTTERY]}, {'data_type': 'reservation'}) is None
+        assert tiering.shortfall({'lotteries': [LOTTERY]}, {'expect_min_items': 2}) is not None
+
+    def test_validate(self):
+        assert tiering.validate({'name': 'a'}) is None
+        assert tiering.validate({'name': 'a', 'fallback': [{'module': 'm', 'class': 'C'}]}) is None
+        assert 'module' in tiering.validate({'name': 'a', 'fallback': [{'class': 'C'}]})
+        assert 'リスト' in tiering.validate({'name': 'a', 'fallback': {'module': 'm'}})
+
+
+class TestTierStore:
+    """段の記録と再確認のテスト"""
+
+    def test_remember_and_recheck(self, tmp_path):
+        store = tiering.TierStore()
+        tiers = tiering.tiers_of(_config(tmp_path))
+        assert store.start('shop', tiers, NOW) == 0
+
+        store.remember('shop', 1, tiers, NOW)
+        assert store.start('shop', tiers, NOW + timedelta(hours=23)) == 1
+        assert store.start('shop', tiers, NOW + timedelta(hours=24)) == 0
+
+        # 再確認でも段 1 が必要なら、開始時刻を保ったまま再確認の時期だけ延ばす
+        store.remember('shop', 1, tiers, NOW + timedelta(hours=24))
+        entry = store.entries()['shop']
+        assert entry['since'] == NOW.isoformat()
+        assert entry['recheck_at'] == (NOW + timedelta(hours=48)).isoformat()
+
+        store.remember('shop', 0, tiers, NOW + timedelta(hours=48))
+        assert store.entries() == {}
+
+    def test_changed_config_restarts_from_requests(self, tmp_path):
+        store = tiering.TierStore({'shop': {'tier': 1, 'class': 'OldBrowserTier', 'since': NOW.isoformat(),
+                                            'recheck_at': (NOW + timedelta(hours=24)).isoformat()}})
+        assert store.start('shop', tiering.tiers_of(_config(tmp_path)), NOW) == 0
+
+    def test_save_writes_only_after_change(self, tmp_path):
+        path = tmp_path / 'tier_state.json'
+        tiering.save(str(path))
+        assert not path.exists()
+
+        tiering.store().remember('shop', 1, tiering.tiers_of(_config(tmp_path)), NOW)
+        tiering.save(str(path))
+        saved = json.loads(path.read_text(encoding='utf-8'))
+        assert saved['shop']['class'] == 'BrowserTier'
+
+    def test_shard_state_is_merged_into_saved_state(self, tmp_path):
+        """シャードの記録は担当したソースだけを保存済みの記録に反映する（記録なしは削除）"""
+        path = tmp_path / 'tier_state.json'
+        path.write_text(json.dumps({'other': {'tier': 1}, 'shop': {'tier': 1}, 'cheap': {'tier': 1}}),
+                        encoding='utf-8')
+        assert tiering.export_state(['shop']) == {}
+
+        tiering.store().remember('shop', 1, tiering.tiers_of(_config(tmp_path)), NOW)
+        exported = tiering.export_state(['shop', 'cheap'])
+        assert exported['cheap'] is None
+
+        with patch('tiering.load_state', side_effect=lambda p: json.loads(open(p, encoding='utf-8').read())):
+            tiering.merge_state(exported, str(path))
+        saved = json.loads(path.read_text(encoding='utf-8'))
+        assert set(saved) == {'other', 'shop'}
+        assert saved['shop']['class'] == 'BrowserTier'
+
+
+class TestExecuteScraper:
+    """main.execute_scraper からの利用のテスト"""
+
+    def test_escalates_when_blocked_and_remembers(self, tmp_path):
+        config = _config(tmp_path)
+        instances = {}
+        first = _run(config, instances)
+        assert (RequestsTier.calls, BrowserTier.calls) == (1, 1)
+        assert [item.product for item in first['data']['lotteries']] == [LOTTERY['product']]
+        assert set(instances) == {'shop', 'shop/BrowserTier'}
+
+        # 次回は記録した段から開始（requests は再確認まで試さない）
+        _run(config, instances)
+        assert (RequestsTier.calls, BrowserTier.calls) == (1, 2)
+        assert tiering.planned_tier(config)['class'] == 'BrowserTier'
+
+    def test_recheck_returns_to_requests(self, tmp_path):
+        config = _config(tmp_path)
+        _run(config)
+        RequestsTier.blocked = False
+        with patch('tiering.datetime') as clock:
+            clock.now.return_value = datetime.now() + timedelta(hours=25)
+            clock.fromisoformat = datetime.fromisoformat
+            _run(config)
+        assert (RequestsTier.calls, BrowserTier.calls) == (2, 1)
+        assert tiering.store().entries() == {}
+
+    def test_requests_success_stays_on_cheapest_tier(self, tmp_path):
+        RequestsTier.blocked = False
+        config = _config(tmp_path)
+        assert _run(config)['data']['lotteries']
+        assert (RequestsTier.calls, BrowserTier.calls) == (1, 0)
+        assert not tiering.store().dirty
+
+    def test_browser_tier_runs_in_browser_slot(self, tmp_path):
+        """ブラウザの段は http の枠を返し、browser の枠で実行する"""
+        config = _config(tmp_path)
+
+        async def run():
+            semaphores = {'http': asyncio.Semaphore(1), 'browser': asyncio.Semaphore(1)}
+            BrowserTier.semaphores = semaphores
+            result = await main.execute_scraper(config, semaphores['http'], 1, {}, semaphores=semaphores)
+            return result, semaphores
+
+        result, semaphores = asyncio.run(run())
+        assert result is not None
+        assert BrowserTier.held == {'http': False, 'browser': True}
+        # 終了後はどちらの枠も返している
+        assert not semaphores['http'].locked() and not semaphores['browser'].locked()
+
+    def test_import_failure_escalates_without_skipping_source(self, tmp_path):
+        config = _config(tmp_path, **{'class': 'MissingScraper'})
+        outcomes = {}
+        result = asyncio.run(main.execute_scraper(config, asyncio.Semaphore(1), 1, {}, outcomes=outcomes))
+        assert result is not None and BrowserTier.calls == 1
+        assert outcomes == {'shop': None}
+        assert not config['skip']
+
+    def test_validate_scrapers_checks_fallback(self, tmp_path):
+        config = _config(tmp_path, module='scrapers.edion_scraper', **{'class': 'EdionScraper'})
+        config['fallback'] = [{'module': 'scrapers.edion_playwright_scraper', 'class': 'EdionPlaywrightScraper'}]
+        assert main.validate_scrapers([config]) == []
+        config['fallback'][0]['class'] = 'MissingScraper'
+        assert main.validate_scrapers([config]) == [
+            'shop: scrapers.edion_playwright_scraper に MissingScraper が定義されていません']
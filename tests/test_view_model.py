@@ -0,0 +1,148 @@
+"""
+通知・レポート共通のビューモデルのユニットテスト
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import view_model
+from generate_html_report import normalize_schema
+from notify import GmailNotifier
+from view_model import STATUS_LABELS, annotate, classify_item, multi_store_offers, parse_day, view_of
+
+
+NOW = datetime(2026, 5, 10, 12, 0, 0)
+
+
+class TestClassifyItem:
+    """ビューモデル作成のテスト"""
+
+    def test_active_deadline_soon(self):
+        """締切3日以内の受付中アイテム"""
+        view = classify_item({'start_date': '2026/05/01', 'end_date': '2026年5月12日'}, NOW)
+        assert view['start'] == '2026-05-01'
+        assert view['end'] == '2026-05-12'
+        assert view['status'] == 'active'
+        assert view['days_left'] == 2
+        assert view['deadline_soon'] is True
+
+    def test_ended_and_upcoming(self):
+        """終了・予定の判定"""
+        assert classify_item({'end_date': '2026-05-09'}, NOW)['status'] == 'ended'
+        assert classify_item({'start_date': '2026-05-20'}, NOW)['status'] == 'upcoming'
+
+    def test_unparsable_dates(self):
+        """パースできない日付は受付中扱い・締切日数なし"""
+        view = classify_item({'start_date': '未定', 'end_date': 'invalid'}, NOW)
+        assert view['start'] == '' and view['end'] == ''
+        assert view['status'] == 'active'
+        assert view['days_left'] is None
+        assert view['deadline_soon'] is False
+
+    def test_is_new_and_fcfs(self):
+        """新着・先着フラグ"""
+        recent = (NOW - timedelta(hours=2)).isoformat()
+        old = (NOW - timedelta(days=2)).isoformat()
+        assert classify_item({'timestamp': recent, 'first_come_first_served': True}, NOW)['is_new'] is True
+        assert classify_item({'timestamp': recent, 'first_come_first_served': True}, NOW)['fcfs'] is True
+        assert classify_item({'timestamp': old}, NOW)['is_new'] is False
+
+
+class TestClassifyRelativeToToday:
+    """現在時刻基準の判定（通知・レポートの旧判定関数から移したテスト）"""
+
+    @staticmethod
+    def _day(days):
+        return (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+
+    def test_parse_day_formats(self):
+        """日付パース - 複数フォーマット対応・無効な入力"""
+        for value in ('2026-04-01', '2026/04/01', '2026年04月01日'):
+            assert parse_day(value).isoformat() == '2026-04-01'
+        for value in ('invalid-date', '', None):
+            assert parse_day(value) is None
+
+    def test_status(self):
+        """受付中・終了・予定の判定と表示ラベル"""
+        assert STATUS_LABELS[view_of({'start_date': self._day(-1), 'end_date': self._day(1)})['status']] == '受付中'
+        assert STATUS_LABELS[view_of({'start_date': self._day(-3), 'end_date': self._day(-1)})['status']] == '終了'
+        assert STATUS_LABELS[view_of({'start_date': self._day(5), 'end_date': self._day(10)})['status']] == '予定'
+        assert STATUS_LABELS[view_of({'start_date': '', 'end_date': ''})['status']] == '受付中'
+        for end_date in ('', None, 'invalid'):
+            assert classify_item({'end_date': end_date})['status'] != 'ended'
+
+    def test_days_left_and_deadline_soon(self):
+        """締切までの日数と期限間近（3日以内）"""
+        assert classify_item({'end_date': self._day(1)})['days_left'] == 1
+        assert classify_item({'end_date': self._day(3)})['days_left'] == 3
+        assert classify_item({'end_date': self._day(2)})['deadline_soon'] is True
+        assert classify_item({'end_date': self._day(10)})['deadline_soon'] is False
+        for end_date in ('', None, 'invalid'):
+            view = classify_item({'end_date': end_date})
+            assert view['days_left'] is None and view['deadline_soon'] is False
+
+    def test_is_new(self):
+        """新着判定 - 24時間以内・24時間以上前・無効なタイムスタンプ"""
+        assert classify_item({'timestamp': (datetime.now() - timedelta(hours=1)).isoformat()})['is_new'] is True
+        assert classify_item({'timestamp': (datetime.now() - timedelta(hours=25)).isoformat()})['is_new'] is False
+        for timestamp in ('', None, 'invalid'):
+            assert classify_item({'timestamp': timestamp})['is_new'] is False
+
+
+class TestAnnotate:
+    """1回の判定パスで付与したビューモデルの利用テスト"""
+
+    @pytest.fixture
+    def data(self):
+        return {
+            'timestamp': NOW.isoformat(),
+            'sources': [{
+                'source': 'test',
+                'lotteries': [
+                    {'product': 'A', 'end_date': '2026-05-11'},
+                    {'product': 'B', 'end_date': '2026-05-01'},
+                ],
+                'reservations': [{'product': 'C', 'timestamp': NOW.isoformat()}],
+            }],
+            'products': [{'name': 'A', 'offers': [{'store': 'X', 'end_date': '2026-05-11'}]}],
+        }
+
+    def test_annotate_all_items(self, data):
+        """抽選・予約・オファーすべてに付与"""
+        assert annotate(data, NOW) == 4
+        lotteries = data['sources'][0]['lotteries']
+        assert lotteries[0]['view']['deadline_soon'] is True
+        assert lotteries[1]['view']['status'] == 'ended'
+        assert data['sources'][0]['reservations'][0]['view']['is_new'] is True
+        assert data['products'][0]['offers'][0]['view']['end'] == '2026-05-11'
+
+    def test_consumers_do_not_reparse(self, data):
+        """付与済みのアイテムは通知・レポートで日付を再パースしない"""
+        annotate(data, NOW)
+        normalized = normalize_schema(data)
+        assert normalized['sources'][0]['lotteries'][0]['view'] == data['sources'][0]['lotteries'][0]['view']
+        assert 'view' in normalized['products'][0]['offers'][0]
+
+        with patch.object(view_model, 'classify_item') as classify:
+            statuses = [STATUS_LABELS[view_of(item)['status']] for item in normalized['sources'][0]['lotteries']]
+            active = GmailNotifier()._sort_lotteries_by_status(data['sources'][0]['lotteries'])
+            classify.assert_not_called()
+
+        assert statuses == ['受付中', '終了']
+        assert [item['product'] for item in active] == ['A', 'B']
+
+    def test_view_of_falls_back_without_annotation(self):
+        """ビューモデルがないアイテムはその場で判定"""
+        assert view_of({'end_date': '2026-05-01'}, NOW)['status'] == 'ended'
+
+    def test_multi_store_offers_skip_ended(self):
+        """終了したオファーを除いて2店舗以上の商品だけを返す"""
+        products = [
+            {'name': 'A', 'offers': [{'store': 'X', 'end_date': '2026-05-11'},
+                                     {'store': 'Y', 'end_date': '2026-05-01'}]},
+            {'name': 'B', 'offers': [{'store': 'X'}, {'store': 'Y', 'end_date': '2026-05-11'},
+                                     {'store': 'Z', 'end_date': '2026-05-01'}]},
+        ]
+        result = multi_store_offers(products, NOW)
+        assert [(product['name'], [offer['store'] for offer in offers]) for product, offers in result] == [
+            ('B', ['X', 'Y'])]
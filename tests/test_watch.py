@@ -0,0 +1,165 @@
+"""
+常駐モード（WatchDaemon）のユニットテスト
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import yaml
+from constants import BREAKER_PROBE_TIMEOUT_SECONDS
+from watch import WatchDaemon
+
+
+class FakeScraper:
+    """呼び出し回数を数えるテスト用スクレイパー"""
+
+    created = 0
+
+    def __init__(self, label='BOX'):
+        FakeScraper.created += 1
+        self.label = label
+        self.calls = 0
+
+    def scrape(self):
+        self.calls += 1
+        lotteries = [{'product': f'ポケモンカード テラスタルフェスex {self.label}', 'end_date': '2099-12-31'}]
+        if self.calls > 1:
+            lotteries.append({'product': f'ポケモンカード バトルパートナーズ {self.label}', 'end_date': '2099-12-31'})
+        return {'source': 'fake', 'lotteries': lotteries}
+
+
+def _write_config(path, tmp_path, names, **overrides):
+    scrapers = []
+    for num, name in enumerate(names, 1):
+        config = {
+            'num': num,
+            'name': name,
+            'module': 'tests.test_watch',
+            'class': 'FakeScraper',
+            'filename': str(tmp_path / f'{name}_latest.json'),
+            'skip': False,
+            'interval_minutes': 0,
+            'kwargs': {},
+        }
+        config.update(overrides.get(name, {}))
+        scrapers.append(config)
+    path.write_text(yaml.safe_dump({'scrapers': scrapers}, allow_unicode=True), encoding='utf-8')
+    # 同一タイムスタンプ内の書き換えも検知できるように更新時刻を進める
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _open_entry(retry_at):
+    return {'state': 'open', 'failures': 3, 'trips': 1, 'last_success': None, 'last_failure': None,
+            'last_error': 'HTTP Error (403)', 'retry_at': retry_at}
+
+
+class TestWatchDaemon:
+    """常駐モードのテスト"""
+
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        FakeScraper.created = 0
+        path = tmp_path / 'scrapers.yaml'
+        _write_config(path, tmp_path, ['a', 'b'])
+        return path
+
+    @pytest.fixture(autouse=True)
+    def state_files(self):
+        """サイクルごとの保存はリポジトリの data/ に書かない"""
+        with patch('watch.update_costs', side_effect=lambda durations: dict(durations)) as update_costs, \
+                patch('source_health.load_health', return_value={}), \
+                patch('source_health.save_health') as save_health, \
+                patch('host_control.save') as host_save, patch('probe.save') as probe_save, \
+                patch('tiering.save') as tier_save:
+            yield {'costs': update_costs, 'health': save_health, 'host': host_save, 'probe': probe_save,
+                   'tier': tier_save}
+
+    @pytest.fixture
+    def daemon(self, config_path, tmp_path):
+        return WatchDaemon(str(config_path), poll_seconds=0.01, output_file=str(tmp_path / 'all.json'))
+
+    def test_instances_and_state_are_reused(self, daemon, tmp_path):
+        """インスタンスと前回データはメモリ上で再利用し、ファイルは初回のみ読む"""
+        with patch('main.load_previous_data', return_value=None) as load_previous:
+            assert daemon.run(max_cycles=2) == 0
+
+        assert FakeScraper.created == 2
+        assert all(instance.calls == 2 for instance in daemon.instances.values())
+        assert load_previous.call_count == 2
+
+        with open(tmp_path / 'all.json', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert len(saved['sources']) == 2
+        assert all(len(source['lotteries']) == 2 for source in saved['sources'])
+
+    def test_state_saved_every_cycle(self, daemon, state_files, tmp_path):
+        """実行時間・取得状態・学習結果をサイクルごとに保存する"""
+        with patch('main.load_previous_data', return_value=None):
+            daemon.run(max_cycles=2)
+
+        for save in state_files.values():
+            assert save.call_count == 2
+        durations = state_files['costs'].call_args[0][0]
+        assert set(durations) == {'a', 'b'}
+        assert daemon.costs == durations
+        outcomes = state_files['health'].call_args[0][0]
+        assert {name: entry['failures'] for name, entry in outcomes.items()} == {'a': 0, 'b': 0}
+
+        with open(tmp_path / 'all.json', encoding='utf-8') as f:
+            assert [entry['source'] for entry in json.load(f)['source_health']] == ['a', 'b']
+
+    def test_open_breaker_is_not_run(self, daemon, state_files, tmp_path):
+        """停止中のソースは実行せず、停止回数を増やさずに再試行時期まで次回を延ばす"""
+        retry_at = (datetime.now() + timedelta(hours=6)).isoformat(timespec='seconds')
+        health = {'b': _open_entry(retry_at)}
+        with patch('source_health.load_health', return_value=health), \
+                patch('main.load_previous_data', return_value=None):
+            daemon.run(max_cycles=2)
+
+        assert daemon.instances['a'].calls == 2
+        assert 'b' not in daemon.instances
+        assert health['b']['trips'] == 1 and health['b']['retry_at'] == retry_at
+        assert daemon.next_run['b'] - time.monotonic() > 5 * 3600
+
+    def test_half_open_source_runs_with_probe_timeout(self, daemon, tmp_path):
+        """再試行時期を過ぎたソースは短い制限時間で試す"""
+        retry_at = (datetime.now() - timedelta(minutes=1)).isoformat(timespec='seconds')
+        health = {'b': _open_entry(retry_at)}
+        daemon.reload_config()
+        with patch('source_health.load_health', return_value=health), \
+                patch('watch.run_scrapers_async', return_value=[]) as run_scrapers:
+            asyncio.run(daemon.run_cycle(daemon.due(time.monotonic())))
+        timeouts = {config['name']: config.get('timeout_seconds') for config in run_scrapers.call_args[0][0]}
+        assert timeouts == {'a': None, 'b': BREAKER_PROBE_TIMEOUT_SECONDS}
+
+    def test_interval_schedules_only_due_scrapers(self, daemon, config_path, tmp_path):
+        """間隔が来ていないスクレイパーは実行しない"""
+        _write_config(config_path, tmp_path, ['a', 'b'], b={'interval_minutes': 60})
+        daemon.run(max_cycles=2)
+
+        assert daemon.instances['a'].calls == 2
+        assert daemon.instances['b'].calls == 1
+
+    def test_config_hot_reload(self, daemon, config_path, tmp_path):
+        """設定の変更・削除を反映し、変更のないスクレイパーはそのまま"""
+        daemon.reload_config()
+        daemon.instances = {'a': object(), 'b': object()}
+        daemon.sources = {'a': {}, 'b': {}}
+        kept = daemon.instances['a']
+        assert daemon.reload_config() is False
+
+        _write_config(config_path, tmp_path, ['a', 'c'])
+        assert daemon.reload_config() is True
+        assert set(daemon.configs) == {'a', 'c'}
+        assert daemon.instances == {'a': kept}
+        assert 'b' not in daemon.sources
+        assert [config['name'] for config in daemon.due(float('inf'))] == ['a', 'c']
+
+        _write_config(config_path, tmp_path, ['a', 'c'], a={'kwargs': {'label': 'パック'}})
+        daemon.reload_config()
+        assert 'a' not in daemon.instances
@@ -0,0 +1,189 @@
+"""
+XLotteryScraper の増分取得（since_id・ユーザーIDキャッシュ）と
+レート制限を考慮した取得計画のユニットテスト
+"""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from scrapers import x_lottery_scraper
+from scrapers.x_api import USER_LOOKUP, USER_TWEETS, RateLimitedXClient
+from scrapers.x_lottery_scraper import XLotteryScraper
+from tests.fake_x_api import FakeXApi
+
+
+def _tweet(tweet_id, text, days_ago=0):
+    return SimpleNamespace(
+        id=tweet_id,
+        text=text,
+        created_at=datetime.now(timezone.utc) - timedelta(days=days_ago),
+    )
+
+
+def _response(tweets):
+    return SimpleNamespace(data=tweets)
+
+
+class TestXLotteryIncremental:
+    """増分取得のテスト"""
+
+    @pytest.fixture
+    def scraper(self, tmp_path):
+        x_lottery_scraper._import_tweepy()
+        scraper = XLotteryScraper()
+        scraper.target_accounts = ['GEO_official']
+        scraper.state_file = str(tmp_path / 'x_state.json')
+        scraper.client = RateLimitedXClient(MagicMock())
+        scraper.client.client.get_user.return_value = SimpleNamespace(data=SimpleNamespace(id=42))
+        return scraper
+
+    def _run(self, scraper):
+        with patch.object(scraper, '_init_client', return_value=True):
+            return scraper.scrape()
+
+    def test_first_run_uses_time_window_and_saves_state(self, scraper):
+        """初回は期間指定で取得し、ユーザーIDと最新ツイートIDを保存"""
+        scraper.client.client.get_users_tweets.return_value = _response([
+            _tweet(200, 'ポケモンカード【テラスタルフェスex BOX】抽選受付開始'),
+            _tweet(150, '本日の営業時間のお知らせ'),
+        ])
+
+        data = self._run(scraper)
+
+        kwargs = scraper.client.client.get_users_tweets.call_args.kwargs
+        assert 'start_time' in kwargs and 'since_id' not in kwargs
+        assert len(data['lotteries']) == 1
+
+        with open(scraper.state_file, encoding='utf-8') as f:
+            state = json.load(f)
+        account = state['accounts']['GEO_official']
+        assert account['user_id'] == '42'
+        assert account['since_id'] == '200'
+
+    def test_second_run_fetches_only_new_and_merges(self, scraper):
+        """2回目は since_id で新着のみ取得し、保存済みの抽選情報とマージ"""
+        scraper.client.client.get_users_tweets.return_value = _response([
+            _tweet(200, 'ポケモンカード【テラスタルフェスex BOX】抽選受付開始'),
+        ])
+        self._run(scraper)
+
+        scraper.client.client.get_user.reset_mock()
+        scraper.client.client.get_users_tweets.return_value = _response([
+            _tweet(300, 'ポケカ【バトルパートナーズ BOX】予約受付中'),
+        ])
+        data = self._run(scraper)
+
+        # ユーザーIDはキャッシュから
+        scraper.client.client.get_user.assert_not_called()
+        assert scraper.client.client.get_users_tweets.call_args.kwargs['since_id'] == '200'
+        assert {lottery['product'] for lottery in data['lotteries']} == {
+            'テラスタルフェスex BOX', 'バトルパートナーズ BOX',
+        }
+
+    def test_failure_keeps_checkpoint(self, scraper):
+        """取得失敗時は since_id を進めず、保存済みの抽選情報を返す"""
+        scraper.client.client.get_users_tweets.return_value = _response([
+            _tweet(200, 'ポケモンカード【テラスタルフェスex BOX】抽選受付開始'),
+        ])
+        self._run(scraper)
+
+        scraper.client.client.get_users_tweets.side_effect = RuntimeError('network down')
+        data = self._run(scraper)
+
+        with open(scraper.state_file, encoding='utf-8') as f:
+            assert json.load(f)['accounts']['GEO_official']['since_id'] == '200'
+        assert len(data['lotteries']) == 1
+
+    def test_expired_lotteries_are_pruned(self, scraper):
+        """保持期間を過ぎた抽選情報は破棄"""
+        old = {'product': '古い抽選', 'tweet_date': (datetime.now() - timedelta(days=30)).isoformat()}
+        new = {'product': '新しい抽選', 'tweet_date': datetime.now(timezone.utc).isoformat()}
+        assert scraper._prune_lotteries([old, new]) == [new]
+
+    def test_lottery_related_uses_catalog_terms(self, scraper):
+        """ポケカ判定は catalog.is_pokemon_card、抽選判定は catalog.LOTTERY_TERMS を使う"""
+        assert scraper._is_lottery_related('ポケカ【バトルパートナーズ BOX】予約受付中')
+        assert scraper._is_lottery_related('テラスタルフェスex 抽選のお知らせ')
+        assert not scraper._is_lottery_related('ポケモンカード 入荷しました')
+        assert not scraper._is_lottery_related('ワンピース TCG 抽選受付開始')
+        assert not scraper._is_lottery_related('')
+
+
+class TestRateLimitedXClient:
+    """レート制限の記録と取得計画のテスト"""
+
+    def test_plan_prioritizes_recent_lottery_accounts(self):
+        """残り回数に収まる分だけ、直近に抽選情報を投稿したアカウントから取得"""
+        client = RateLimitedXClient(MagicMock())
+        client.restore({USER_TWEETS: {'limit': 10, 'remaining': 2, 'reset': time.time() + 600}})
+        recent = datetime.now(timezone.utc).isoformat()
+        older = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+        states = {
+            'a': {'user_id': '1', 'lotteries': []},
+            'b': {'user_id': '2', 'lotteries': [{'tweet_date': older}]},
+            'c': {'user_id': '3', 'lotteries': [{'tweet_date': recent}]},
+        }
+
+        scheduled, deferred = client.plan(['a', 'b', 'c'], states)
+
+        assert scheduled == ['c', 'b']
+        assert deferred == ['a']
+
+    def test_plan_ignores_expired_window(self):
+        """リセット時刻を過ぎた記録は無視して全アカウントを取得"""
+        client = RateLimitedXClient(MagicMock())
+        client.restore({USER_TWEETS: {'limit': 10, 'remaining': 0, 'reset': time.time() - 1}})
+        assert client.plan(['a', 'b'], {}) == (['a', 'b'], [])
+        assert client.snapshot() == {}
+
+
+class TestFakeXApi:
+    """ローカル偽APIサーバーを使った結合テスト"""
+
+    ACCOUNTS = ['acc1', 'acc2', 'acc3', 'acc4']
+
+    @pytest.fixture
+    def api(self):
+        with FakeXApi(limits={USER_TWEETS: 2}) as api:
+            for i, account in enumerate(self.ACCOUNTS):
+                api.add_tweet(account, f'ポケモンカード【テラスタルフェスex BOX {i}】抽選受付開始')
+            yield api
+
+    @pytest.fixture
+    def scraper(self, api, tmp_path):
+        with patch.dict('os.environ', {'X_BEARER_TOKEN': 'token', 'X_API_BASE_URL': api.base_url}):
+            scraper = XLotteryScraper()
+        scraper.target_accounts = list(self.ACCOUNTS)
+        scraper.state_file = str(tmp_path / 'x_state.json')
+        return scraper
+
+    def test_exhausted_accounts_are_deferred(self, api, scraper):
+        """上限を超えたアカウントは失敗せず次回へ回し、次回は since_id で取得"""
+        data = scraper.scrape()
+
+        assert api.calls[USER_TWEETS] == 2
+        assert len(data['lotteries']) == 2
+        with open(scraper.state_file, encoding='utf-8') as f:
+            state = json.load(f)
+        assert state['rate_limits'][USER_TWEETS]['remaining'] == 0
+        fetched = [a for a, entry in state['accounts'].items() if entry.get('since_id')]
+        assert len(fetched) == 2
+
+        # 保存済みの残り回数から、リセットまでは呼び出さずに次回へ回す
+        data = scraper.scrape()
+        assert api.calls[USER_TWEETS] == 2
+        assert len(data['lotteries']) == 2
+
+        # ウィンドウのリセット後は残りのアカウントを取得
+        api.reset_limits()
+        state['rate_limits'] = {}
+        with open(scraper.state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        api.limits[USER_TWEETS] = 10
+        data = scraper.scrape()
+
+        assert len(data['lotteries']) == 4
+        assert api.calls[USER_LOOKUP] == 4
@@ -0,0 +1,224 @@
+"""
+取得手段の段階的な切り替え（requests で取れなければ Playwright へ）
+
+設定の fallback を持つスクレイパーは、本体（module / class）を段 0 とし、
+取得に失敗した・ブロックされた・期待する件数に届かなかった場合に fallback の段を順に試す。
+
+    - num: 11
+      name: エディオン
+      module: scrapers.edion_scraper          # 段 0（requests）
+      class: EdionScraper
+      fallback:
+      - module: scrapers.edion_playwright_scraper   # 段 1（ブラウザ）
+        class: EdionPlaywrightScraper
+        kind: browser                         # 省略時は scheduling.scraper_kind と同じ推定
+        kwargs: {}                            # 省略時は {}（段 0 の kwargs は引き継がない）
+      expect_min_items: 1                     # 省略時は 1
+
+成功した段はソースごとに data/tier_state.json に記録し、次回からその段で開始する。
+段 1 以降を記録した場合は TIER_RECHECK_HOURS ごとに段 0 から試し直し、
+安い手段で取れるようになっていれば記録を消す（main.execute_scraper 参照）。
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from constants import TIER_RECHECK_HOURS, TIER_STATE_FILE
+
+logger = logging.getLogger(__name__)
+
+# 段ごとに差し替える設定項目（その他の項目は本体の設定を引き継ぐ）
+TIER_KEYS = ('module', 'class', 'kind', 'kwargs', 'timeout_seconds', 'fallback')
+
+
+def tiers_of(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """取得手段の段（安い順）
+
+    fallback がなければ [config] をそのまま返す。fallback があれば各段は設定のコピーで、
+    クラスの読み込み結果（resolve_scraper_class）は本体の設定に書き戻されない。
+
+    Args:
+        config: スクレイパー設定
+
+    Returns:
+        段ごとのスクレイパー設定のリスト
+    """
+    fallback = config.get('fallback')
+    if not fallback:
+        return [config]
+    base = {key: value for key, value in config.items() if key not in TIER_KEYS}
+    tiers = [{key: value for key, value in config.items() if key != 'fallback'}]
+    for entry in fallback:
+        tiers.append({**base, 'kwargs': {}, **entry})
+    for tier in tiers:
+        tier.setdefault('kwargs', {})
+    return tiers
+
+
+def validate(config: Dict[str, Any]) -> Optional[str]:
+    """fallback 設定の誤り（--dry-run 用、問題なければNone）"""
+    fallback = config.get('fallback')
+    if fallback is None:
+        return None
+    if not isinstance(fallback, list) or not fallback:
+        return f"{config.get('name')}: fallback は段の設定のリストで指定してください"
+    for entry in fallback:
+        if not isinstance(entry, dict) or not entry.get('module') or not entry.get('class'):
+            return f"{config.get('name')}: fallback の各段に module / class が必要です"
+    return None
+
+
+def shortfall(data: Optional[Dict[str, Any]], config: Dict[str, Any]) -> Optional[str]:
+    """取得結果が不十分な理由（十分ならNone）
+
+    エラー付きの結果（ブロック・HTTPエラー・ライブラリ未導入等）と、
+    件数が expect_min_items（省略時は1）に届かない結果を不十分とする。
+    件数はフィルタ前の値で数える。
+    """
+    if not data:
+        return 'empty response'
+    if data.get('error'):
+        return f"error: {data['error']}"
+    key = 'reservations' if config.get('data_type', 'lottery') == 'reservation' else 'lotteries'
+    count = len(data.get(key) or [])
+    expected = config.get('expect_min_items', 1)
+    if count < expected:
+        return f"{count} items (expected {expected})"
+    return None
+
+
+def tier_label(tier: Dict[str, Any]) -> str:
+    """段の表示名（クラス名）"""
+    tier_class = tier.get('class')
+    return tier_class if isinstance(tier_class, str) else getattr(tier_class, '__name__', str(tier_class))
+
+
+class TierStore:
+    """ソース名 → {'tier', 'class', 'since', 'recheck_at'}（スレッドセーフ）"""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = dict(entries or {})
+        self._dirty = False
+
+    def start(self, name: str, tiers: List[Dict[str, Any]], now: Optional[datetime] = None) -> int:
+        """開始する段
+
+        記録がない・再確認の時期を過ぎた・設定が変わって記録の段が見つからない場合は 0。
+
+        Args:
+            name: スクレイパー名
+            tiers: tiers_of() の戻り値
+            now: 現在時刻（テスト用）
+        """
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._entries.get(name)
+        if not entry:
+            return 0
+        index = entry.get('tier', 0)
+        if not 0 < index < len(tiers) or tier_label(tiers[index]) != entry.get('class'):
+            return 0
+        if now >= datetime.fromisoformat(entry['recheck_at']):
+            return 0
+        return index
+
+    def remember(self, name: str, index: int, tiers: List[Dict[str, Any]], now: Optional[datetime] = None) -> None:
+        """十分な結果を得た段を記録（段 0 なら記録を消す）"""
+        now = now or datetime.now()
+        with self._lock:
+            if index == 0:
+                if self._entries.pop(name, None) is not None:
+                    self._dirty = True
+                return
+            previous = self._entries.get(name) or {}
+            label = tier_label(tiers[index])
+            since = previous.get('since') if previous.get('class') == label else None
+            self._entries[name] = {
+                'tier': index,
+                'class': label,
+                'since': since or now.isoformat(),
+                'recheck_at': (now + timedelta(hours=TIER_RECHECK_HOURS)).isoformat(),
+            }
+            self._dirty = True
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._entries.items()}
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+_store: Optional[TierStore] = None
+_store_lock = threading.Lock()
+
+
+def load_state(path: str = TIER_STATE_FILE) -> Dict[str, Dict[str, Any]]:
+    """保存済みの段の記録を読み込み"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {name: entry for name, entry in data.items() if isinstance(entry, dict)}
+
+
+def store() -> TierStore:
+    """プロセス共通の段の記録（初回使用時に読み込む）"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TierStore(load_state())
+        return _store
+
+
+def planned_tier(config: Dict[str, Any]) -> Dict[str, Any]:
+    """今回開始する段の設定（同時実行数の種類の決定に使用）"""
+    if not config.get('fallback'):
+        return config
+    tiers = tiers_of(config)
+    return tiers[store().start(config['name'], tiers)]
+
+
+def save(path: str = TIER_STATE_FILE) -> None:
+    """段の記録を保存（今回更新がなければ何もしない）"""
+    if _store is None or not _store.dirty:
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(_store.entries().items())), f, ensure_ascii=False, indent=2)
+
+
+def export_state(names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """指定したソースの段の記録（--shard の結果に含め、--merge で保存する。記録なしは None）"""
+    if _store is None:
+        return {}
+    entries = _store.entries()
+    return {name: entries.get(name) for name in names}
+
+
+def merge_state(entries: Dict[str, Optional[Dict[str, Any]]], path: str = TIER_STATE_FILE) -> None:
+    """シャードごとの段の記録を保存済みの段の記録に反映（--merge 用、None の記録は消す）"""
+    if not entries:
+        return
+    state = load_state(path)
+    for name, entry in entries.items():
+        if entry is None:
+            state.pop(name, None)
+        else:
+            state[name] = entry
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(state.items())), f, ensure_ascii=False, indent=2)
+
+
+def reset() -> None:
+    """プロセス共通の段の記録を破棄（テスト用）"""
+    global _store
+    with _store_lock:
+        _store = None
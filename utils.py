@@ -87,15 +87,15 @@ def build_composite_key(item: dict, data_type: str) -> str:
         item: スクレイパーから取得した抽選/予約情報辞書
         data_type: 'lottery' または 'reservation'
                   - 'lottery': product フィールドを使用
-                  - 'reservation': title フィールドを使用
+                  - 'reservation': product フィールド（旧形式の保存データは title）を使用
 
     Returns:
         str: "{url}|{title}" 形式の複合キー（重複検出に使用）
     """
+    # 取り込み時に正規化したキー（detail_url / product）を優先し、旧形式の保存データにも対応
+    url = item.get('detail_url', '') or item.get('url', '')
     if data_type == 'lottery':
-        url = item.get('url', '')
         title = item.get('product', '')
     else:  # reservation
-        url = item.get('url', '')
-        title = item.get('title', '')
+        title = item.get('product', '') or item.get('title', '')
     return f"{url}|{title}"
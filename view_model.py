@@ -0,0 +1,138 @@
+"""
+通知・レポート共通のビューモデル
+
+各アイテムの開始日・締切日・ステータス・締切までの日数・新着・先着フラグを
+main.py で実行ごとに1回だけ判定し、item['view'] に付与する。
+notify.py / generate_html_report.py は付与済みの view を参照し、日付を再パースしない
+（view がないアイテムは view_of() がその場で判定する）。
+"""
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import parse_date_flexible
+
+VIEW_KEY = 'view'
+
+# 期限間近とみなす日数・新着とみなす時間
+DEADLINE_SOON_DAYS = 3
+NEW_ITEM_HOURS = 24
+
+# ステータス（レポートの表示ラベル）
+STATUS_LABELS = {'active': '受付中', 'ended': '終了', 'upcoming': '予定'}
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(value: str, today: date) -> Optional[date]:
+    # ISO datetime形式を先に試す（fromisoformatはTを含む形式に対応）
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        pass
+    return parse_date_flexible(value, today)
+
+
+def parse_day(value: Any, today: Optional[date] = None) -> Optional[date]:
+    """日付文字列を date に変換（同じ文字列の再パースはキャッシュで省略）"""
+    if not value or not isinstance(value, str):
+        return None
+    return _parse_day(value, today or datetime.now().date())
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """ISO形式のタイムスタンプを naive なローカル時刻の datetime に変換"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def classify_item(item: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """アイテムのビューモデルを作成
+
+    Args:
+        item: 抽選・予約・オファー等のアイテム
+        now: 判定基準時刻（省略時は現在時刻）
+
+    Returns:
+        {'start', 'end' (ISO日付 or ''), 'status' ('active'/'ended'/'upcoming'),
+         'days_left' (締切までの日数 or None), 'deadline_soon', 'is_new', 'fcfs'}
+    """
+    now = now or datetime.now()
+    today = now.date()
+
+    start = parse_day(item.get('start_date'), today)
+    end = parse_day(item.get('end_date'), today)
+
+    if end and end < today:
+        status = 'ended'
+    elif start and start > today:
+        status = 'upcoming'
+    else:
+        status = 'active'
+
+    days_left = (end - today).days if end else None
+    timestamp = parse_timestamp(item.get('timestamp') or item.get('detected_at'))
+
+    return {
+        'start': start.isoformat() if start else '',
+        'end': end.isoformat() if end else '',
+        'status': status,
+        'days_left': days_left,
+        'deadline_soon': days_left is not None and 0 <= days_left <= DEADLINE_SOON_DAYS,
+        'is_new': timestamp is not None and (now - timestamp) < timedelta(hours=NEW_ITEM_HOURS),
+        'fcfs': bool(item.get('first_come_first_served')),
+    }
+
+
+def view_of(item: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """付与済みのビューモデルを返す（未付与ならその場で判定）"""
+    return item.get(VIEW_KEY) or classify_item(item, now)
+
+
+def multi_store_offers(products: List[Dict[str, Any]],
+                       now: Optional[datetime] = None) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """複数店舗で受付中の商品（通知・レポートの「複数店舗で受付中の商品」で共通）
+
+    Args:
+        products: 集約済み商品ビュー
+        now: 判定基準時刻（未付与のオファーの判定に使う）
+
+    Returns:
+        (商品, 終了していないオファー) のリスト（終了を除いて2店舗以上の商品のみ）
+    """
+    result = []
+    for product in products:
+        offers = [offer for offer in product.get('offers', []) if view_of(offer, now)['status'] != 'ended']
+        if len({offer.get('store') for offer in offers}) >= 2:
+            result.append((product, offers))
+    return result
+
+
+def annotate(all_results: Dict[str, Any], now: Optional[datetime] = None) -> int:
+    """全ソースのアイテムと集約済み商品のオファーにビューモデルを付与
+
+    Args:
+        all_results: main.py の統合データ（in-place更新）
+        now: 判定基準時刻（省略時は現在時刻、全アイテムで共通）
+
+    Returns:
+        ビューモデルを付与したアイテム数
+    """
+    now = now or datetime.now()
+    count = 0
+    for source in all_results.get('sources', []):
+        for key in ('lotteries', 'reservations'):
+            for item in source.get(key, []):
+                item[VIEW_KEY] = classify_item(item, now)
+                count += 1
+    for product in all_results.get('products', []):
+        for offer in product.get('offers', []):
+            offer[VIEW_KEY] = classify_item(offer, now)
+            count += 1
+    return count
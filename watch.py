@@ -0,0 +1,289 @@
+"""
+常駐モード（main.py --watch）
+
+発売日など短い間隔で監視したい時のために、cron で毎回起動する代わりに
+1プロセスで常駐し、以下をメモリ上に保持する:
+- スクレイパー設定（config/scrapers.yaml の更新を検知して再読み込み）
+- スクレイパーインスタンス（requests.Session のコネクションプール、X APIのレート制限状態など）
+- 解析用プロセスプールとカタログのキーワードマッチャー
+- ソース別の最新データ（差分検出に使い、*_latest.json を毎回読み直さない）
+
+各スクレイパーは interval_minutes（省略時は --interval）ごとに実行し、
+実行したソースのファイルと統合データだけを書き出す。
+失敗が続いて停止中のソース（source_health）は通常実行と同じく除外し、再試行時期まで次回を延ばす。
+実行時間の履歴・ソースの取得状態・ホスト別の同時実行数・プローブの指紋・取得手段の段は
+サイクルごとに保存し、強制終了されても直前のサイクルまでの学習結果を失わない。
+Playwright のブラウザはイベントループに紐づくため、取得ごとの起動のままとする。
+"""
+import asyncio
+import copy
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from constants import ALL_LOTTERIES_FILE, DEFAULT_PARSE_WORKERS, WATCH_INTERVAL_MINUTES, WATCH_POLL_SECONDS
+from main import finalize_results, load_scrapers_from_config, run_scrapers_async, update_source_health
+import host_control
+import probe
+import retry
+import source_health
+import tiering
+from sharding import load_costs, update_costs
+
+logger = logging.getLogger(__name__)
+
+
+class WatchDaemon:
+    """期限の来たスクレイパーを繰り返し実行する常駐デーモン"""
+
+    def __init__(self, config_path: str, default_interval: float = WATCH_INTERVAL_MINUTES,
+                 poll_seconds: float = WATCH_POLL_SECONDS, output_file: str = ALL_LOTTERIES_FILE):
+        """
+        Args:
+            config_path: スクレイパー設定ファイル
+            default_interval: 既定の実行間隔（分）
+            poll_seconds: 期限・設定変更の確認間隔（秒）
+            output_file: 統合データの保存先
+        """
+        self.config_path = config_path
+        self.default_interval = default_interval
+        self.poll_seconds = poll_seconds
+        self.output_file = output_file
+
+        self.configs: Dict[str, Dict[str, Any]] = {}
+        self.instances: Dict[str, Any] = {}
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.next_run: Dict[str, float] = {}
+        self.zero_alert_sources: set = set()
+        self.costs: Dict[str, float] = load_costs()
+        self.source_health: List[Dict[str, Any]] = []
+        self.cycles = 0
+
+        self._raw: Dict[str, Dict[str, Any]] = {}
+        self._config_mtime: Optional[int] = None
+        self._stopping = False
+
+    def stop(self, *args) -> None:
+        """次の確認時に停止する（シグナルハンドラ）"""
+        logger.info("常駐モードを停止します")
+        self._stopping = True
+
+    def reload_config(self) -> bool:
+        """設定ファイルが更新されていれば再読み込み
+
+        追加・変更されたスクレイパーはインスタンスを作り直して即時実行の対象にし、
+        削除されたスクレイパーは保持しているデータごと破棄する。
+
+        Returns:
+            再読み込みした場合True
+        """
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+        except OSError as e:
+            logger.warning(f"設定ファイルを確認できません ({self.config_path}): {e}")
+            return False
+        if mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+
+        scrapers = load_scrapers_from_config(self.config_path)
+        if not scrapers and self.configs:
+            logger.warning("設定を読み込めないため、前回の設定で継続します")
+            return False
+
+        now = time.monotonic()
+        configs = {}
+        for config in scrapers:
+            name = config['name']
+            raw = copy.deepcopy(config)
+            if self._raw.get(name) == raw:
+                # 変更なし: 解決済みのクラス・インスタンスをそのまま使う
+                configs[name] = self.configs[name]
+                continue
+            if name in self.configs:
+                logger.info(f"設定変更を反映: {name}")
+            configs[name] = config
+            self._raw[name] = raw
+            self.instances.pop(name, None)
+            self.next_run[name] = now
+
+        for name in set(self.configs) - set(configs):
+            logger.info(f"設定から削除: {name}")
+            for store in (self._raw, self.instances, self.previous, self.sources, self.next_run):
+                store.pop(name, None)
+            self.zero_alert_sources.discard(name)
+
+        self.configs = configs
+        return True
+
+    def interval_of(self, config: Dict[str, Any]) -> float:
+        """スクレイパーの実行間隔（秒）"""
+        return float(config.get('interval_minutes', self.default_interval)) * 60
+
+    def due(self, now: float) -> List[Dict[str, Any]]:
+        """実行時刻を過ぎたスクレイパー設定"""
+        return [
+            config for name, config in self.configs.items()
+            if not config.get('skip') and self.next_run.get(name, 0) <= now
+        ]
+
+    async def run_cycle(self, due: List[Dict[str, Any]]) -> List[str]:
+        """期限の来たスクレイパーを並列実行
+
+        Args:
+            due: 実行するスクレイパー設定
+
+        Returns:
+            前回から変更のあったスクレイパー名
+        """
+        # 停止中のソースは実行せず、再試行時期まで次回を延ばす（再試行時期のソースは短い制限時間で試す）
+        health = source_health.load_health()
+        runnable, blocked = source_health.plan_run(due, health)
+        self.postpone(blocked, health)
+        if not runnable:
+            return []
+
+        # 再試行の予算はサイクルごと
+        retry.reset()
+        cycle_results = {'sources': [], 'zero_alert_sources': []}
+        durations: Dict[str, float] = {}
+        outcomes: Dict[str, Optional[str]] = {}
+        results = await run_scrapers_async(
+            runnable, cycle_results, self.instances, self.previous, durations=durations, costs=self.costs,
+            outcomes=outcomes,
+        )
+        retry.log_metrics()
+        self.save_state(cycle_results, durations, outcomes)
+
+        finished = time.monotonic()
+        for config in runnable:
+            self.next_run[config['name']] = finished + self.interval_of(config)
+
+        # 取得に失敗したスクレイパーは前回のデータを保持
+        changed = []
+        for result in results:
+            name = result['name']
+            self.sources[name] = result['data']
+            if result['zero_alert']:
+                self.zero_alert_sources.add(name)
+            else:
+                self.zero_alert_sources.discard(name)
+            if result.get('changes') and result['changes'] != ["初回実行"]:
+                changed.append(name)
+        return changed
+
+    def postpone(self, blocked: List[str], health: Dict[str, Dict[str, Any]]) -> None:
+        """停止中のソースの次回実行を、実行間隔と再試行時期の遅い方まで延ばす
+
+        Args:
+            blocked: source_health.plan_run が除外したソース名
+            health: 取得状態
+        """
+        now, wall = time.monotonic(), datetime.now()
+        for name in blocked:
+            wait = self.interval_of(self.configs[name])
+            retry_at = health.get(name, {}).get('retry_at')
+            if retry_at:
+                wait = max(wait, (datetime.fromisoformat(retry_at) - wall).total_seconds())
+            self.next_run[name] = now + wait
+
+    def save_state(self, cycle_results: Dict[str, Any], durations: Dict[str, float],
+                   outcomes: Dict[str, Optional[str]]) -> None:
+        """サイクルの結果を実行時間の履歴・ソースの取得状態に反映し、学習結果を保存
+
+        Args:
+            cycle_results: このサイクルの結果（source_health を追加）
+            durations: スクレイパー名 → 今回の実行時間（秒）
+            outcomes: スクレイパー名 → 失敗理由（成功は None）
+        """
+        # 実行順の見積もりは通常実行と同じく平滑化した履歴を使う
+        self.costs = update_costs(durations)
+        update_source_health(cycle_results, outcomes)
+        self.source_health = cycle_results['source_health']
+        host_control.save()
+        probe.save()
+        tiering.save()
+
+    def publish(self, changed: List[str]) -> Dict[str, Any]:
+        """保持しているソースから統合データを作成して保存し、変更があれば通知
+
+        Args:
+            changed: 変更のあったスクレイパー名
+
+        Returns:
+            統合データ
+        """
+        all_results = {
+            'timestamp': datetime.now().isoformat(),
+            'sources': [self.sources[name] for name in self.configs if name in self.sources],
+            'zero_alert': False,
+            'zero_alert_sources': [name for name in self.configs if name in self.zero_alert_sources],
+            'source_health': self.source_health,
+        }
+        finalize_results(all_results, self.output_file)
+
+        if changed:
+            logger.info(f"変更検出: {', '.join(changed)}")
+            if os.environ.get('ENABLE_EMAIL_NOTIFICATION') == 'true':
+                from notify import GmailNotifier
+                GmailNotifier().send_notification(all_results)
+        return all_results
+
+    def sleep_seconds(self, now: float) -> float:
+        """次の確認までの待ち時間（秒）"""
+        pending = [
+            self.next_run.get(name, 0) for name, config in self.configs.items() if not config.get('skip')
+        ]
+        if not pending:
+            return self.poll_seconds
+        return max(0.0, min(self.poll_seconds, min(pending) - now))
+
+    async def _loop(self, max_cycles: Optional[int]) -> int:
+        self.reload_config()
+        if not self.configs:
+            logger.error(f"Failed to load scrapers from {self.config_path}")
+            return 1
+
+        logger.info(f"常駐モード開始: {len(self.configs)}件（既定の間隔 {self.default_interval:g}分）")
+        while not self._stopping:
+            self.reload_config()
+            due = self.due(time.monotonic())
+            if not due:
+                await asyncio.sleep(self.sleep_seconds(time.monotonic()))
+                continue
+
+            changed = await self.run_cycle(due)
+            self.publish(changed)
+            self.cycles += 1
+            if max_cycles is not None and self.cycles >= max_cycles:
+                break
+        return 0
+
+    def run(self, max_cycles: Optional[int] = None) -> int:
+        """常駐して実行（SIGTERM / Ctrl+C で停止）
+
+        Args:
+            max_cycles: 実行サイクル数の上限（省略時は停止されるまで）
+
+        Returns:
+            終了コード
+        """
+        from scrapers import parse_pool
+        parse_pool.start(int(os.environ.get('PARSE_WORKERS', DEFAULT_PARSE_WORKERS)))
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, self.stop)
+        try:
+            return asyncio.run(self._loop(max_cycles))
+        except KeyboardInterrupt:
+            logger.info("常駐モードを停止しました")
+            return 0
+        finally:
+            parse_pool.shutdown()
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)